@@ -3,11 +3,21 @@ Shared constants and helper functions for AWS CDK infrastructure.
 Keeps everything consistent across all business units.
 """
 
-from typing import Dict
+from typing import Any, Dict
 import os
+import zlib
 from constructs import Construct
 from aws_cdk import aws_s3_deployment as s3deploy
 
+# Pure module of the Lambda package (no shared.* imports) - one key layout for Lambdas and tools
+from lambdas.shared.shard_keys import SUBMISSION_PREFIX, all_shard_keys, partition_key
+from infrastructure.shared.managers.website_assets import (
+    API_CONFIG_PLACEHOLDER, CACHE_POLICIES, FILES_DIR, api_config_script, build_site, viewer_paths
+)
+
+# Website build output (relative to the project root, like website/ itself)
+WEBSITE_BUILD_DIR = os.path.join("build", "website")
+
 
 def get_mandatory_tags(business_unit: str, country: str = "DE", environment: str = "dev") -> Dict[str, str]:
     """
@@ -75,6 +85,56 @@ def get_resource_names(business_unit: str, resource_type: str, country: str = ""
     return "-".join(parts).lower()
 
 
+# Write shards per business unit for contact submissions (pk BU#<UNIT>#00..NN, see lambdas/shared/sharding.py)
+# May only grow - readers fan out over 0..N-1, lowering it hides the items of the dropped shards
+CONTACT_SHARD_COUNT = 4
+
+
+def get_contact_partition_key(business_unit: str, contact_id: str, shard_count: int = CONTACT_SHARD_COUNT) -> str:
+    """
+    Partition key a submission is written under (the Lambdas' key layout, lambdas/shared/shard_keys.py).
+
+    Args:
+        business_unit: construction, retail, etc.
+        contact_id: the submission's uuid - crc32 of it picks the shard
+        shard_count: write shards (1 = unsharded)
+
+    Returns:
+        ex. BU#CONSTRUCTION#03 (BU#CONSTRUCTION when unsharded)
+    """
+    return partition_key(business_unit, contact_id, shard_count)
+
+
+def get_contact_partition_keys(business_unit: str, shard_count: int = CONTACT_SHARD_COUNT) -> list:
+    """
+    All partition keys holding a business unit's submissions (lambdas/shared/shard_keys.py).
+
+    Args:
+        business_unit: construction, retail, etc.
+        shard_count: write shards (1 = unsharded)
+
+    Returns:
+        ["BU#CONSTRUCTION#00", ..., "BU#CONSTRUCTION"] - the unsharded key holds not yet migrated items
+    """
+    return all_shard_keys(f"{SUBMISSION_PREFIX}{business_unit.upper()}", shard_count)
+
+
+def get_contact_table_name(business_unit: str) -> str:
+    """
+    Name of a business unit's contact form table.
+
+    Kept in CamelCase (older than get_resource_names) - renaming would replace the table and its data.
+    Shared by the CDK manager and the export tool so both always point at the same table.
+
+    Args:
+        business_unit: construction, retail, etc.
+
+    Returns:
+        Table name, ex. RanjdarGroup-ConstructionContactForm
+    """
+    return f"RanjdarGroup-{business_unit.title()}ContactForm"
+
+
 def is_prod_environment(environment: str) -> bool:
     """
     Checks if we're in production.
@@ -109,27 +169,135 @@ def get_retention_days(environment: str) -> int:
     return 7 # Else dev
 
 
+
+# Compute profiles of the contact Lambdas (the per-unit contact handler and the shared router)
+# Graviton (arm64) starts and runs the pure Python code faster for ~20% less per GB-second
+# More memory = proportionally more CPU - imports and JSON/validation finish sooner on cold starts
+LAMBDA_COMPUTE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "dev": {
+        "architecture": "arm64",
+        "memory_mb": 512,
+        "ephemeral_storage_mb": 512,  # /tmp is unused - 512 is the minimum (and free)
+        "reserved_concurrency": None,  # new accounts have too little unreserved concurrency to set it aside
+        "provisioned_min": 0,  # 0 = no alias, no provisioned concurrency (nothing paid while idle)
+        "provisioned_max": 0,
+        "provisioned_utilization": 0.7,
+        "business_hours_min": 0,
+        "business_hours": ("07:00", "19:00"),  # Europe/Berlin, Monday to Friday
+    },
+    "prod": {
+        "architecture": "arm64",
+        "memory_mb": 1024,
+        "ephemeral_storage_mb": 512,
+        "reserved_concurrency": 50,  # caps a flood of submissions - must stay >= provisioned_max
+        "provisioned_min": 1,  # one warm environment around the clock
+        "provisioned_max": 10,  # utilization scaling stays below this
+        "provisioned_utilization": 0.7,  # scale out when 70% of the provisioned environments are busy
+        "business_hours_min": 2,  # when the forms are filled in, no visitor should wait for a cold start
+        "business_hours": ("07:00", "19:00"),
+    }
+}
+
+# Per business unit changes on top of the environment's profile (the shared router is "router")
+LAMBDA_COMPUTE_OVERRIDES: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "router": {
+        # Serves all units - more traffic, more warm environments
+        "prod": {"provisioned_max": 20, "business_hours_min": 3}
+    }
+}
+
+
+def get_compute_profile(environment: str, business_unit: str) -> Dict[str, Any]:
+    """
+    Defines the compute settings of a contact Lambda.
+
+    Prod profile for prod, dev profile for everything else (like get_retention_days),
+    plus the business unit's overrides.
+
+    Args:
+        environment: dev, prod
+        business_unit: construction, retail, etc. - or router for the shared router Lambda
+
+    Returns:
+        New dict with the keys of LAMBDA_COMPUTE_PROFILES
+
+    Raises:
+        ValueError: for profiles the Lambda service would reject at deploy time
+    """
+    environment = "prod" if is_prod_environment(environment) else "dev"
+    profile = {
+        **LAMBDA_COMPUTE_PROFILES[environment],
+        **LAMBDA_COMPUTE_OVERRIDES.get(business_unit, {}).get(environment, {})
+    }
+
+    if profile["provisioned_max"] < max(profile["provisioned_min"], profile["business_hours_min"]):
+        raise ValueError(f"{business_unit}/{environment}: provisioned_max below the provisioned minimums")
+    reserved = profile["reserved_concurrency"]
+    if reserved is not None and reserved < profile["provisioned_max"]:
+        raise ValueError(f"{business_unit}/{environment}: reserved_concurrency below provisioned_max")
+    return profile
+
 from aws_cdk import aws_s3_deployment as s3deploy
 from constructs import Construct
 
 
-def deploy_website(scope: Construct, business_unit: str, bucket, api_url: str) -> None:
-    """Deploy website with API config for all languages"""
+def deploy_website(scope: Construct, business_unit: str, bucket, api_url: str, distribution=None) -> None:
+    """
+    Builds website/<unit> (minified, hashed assets, precompressed variants - see website_assets.py)
+    and uploads it with per-type metadata from the build manifest.
 
-    # Config content (same for all languages - API doesn't change)
-    config_content = f"""window.API_CONFIG = {{
-        baseUrl: '{api_url}',
-        contactEndpoint: '{api_url}api/v1/contact',
-        businessUnit: '{business_unit}'
-    }};"""
+    One BucketDeployment per (content type, encoding, cache policy) group - S3 metadata is set per deployment.
+    The API config is written into the pages that load it (the URL is a deploy-time token).
+    With a distribution, the groups that aren't content-hashed invalidate their paths after the upload.
 
-    # Create config for each language folder
-    sources = [s3deploy.Source.asset(f"website/{business_unit}")]
-    for lang in ['en', 'de', 'ro']:
-        sources.append(s3deploy.Source.data(f"{lang}/api-config.js", config_content))
+    Every change re-syncs all groups - infrastructure/tools/deploy_website.py uploads only changed
+    files instead (stacks deployed with -c website_deploy=incremental leave the website to it).
 
-    s3deploy.BucketDeployment(
-        scope, f"{business_unit}-deployment",
-        sources=sources,
-        destination_bucket=bucket
-    )
\ No newline at end of file
+    This path never deletes anything (prune=False): old assets/style.<hash>.css, script.<hash>.js and
+    their .gz/.br variants, and pages removed from website/, stay in the bucket. Pruning per group
+    wouldn't help - each deployment only syncs its own include list. deploy_website.py deletes removed
+    files, but only the ones it uploaded itself - leftovers from this path are removed by hand.
+    """
+    build_dir = os.path.join(WEBSITE_BUILD_DIR, business_unit)
+    manifest = build_site(os.path.join("website", business_unit), build_dir)
+    files_dir = os.path.join(build_dir, FILES_DIR)
+
+    # Config content (same for all pages - API doesn't change)
+    config_content = api_config_script(api_url, business_unit)
+
+    groups: Dict[tuple, Dict[str, list]] = {}
+    for entry in manifest["files"]:
+        group = groups.setdefault(
+            (entry["content_type"], entry["content_encoding"], entry["cache_control"]),
+            {"keys": [], "data": []}
+        )
+        if entry["api_config"]:
+            with open(os.path.join(files_dir, *entry["key"].split("/")), encoding="utf-8") as f:
+                html = f.read()
+            # Later sources win - the filled-in page replaces the built one
+            group["data"].append(s3deploy.Source.data(entry["key"], html.replace(API_CONFIG_PLACEHOLDER, config_content)))
+        group["keys"].append(entry["key"])
+
+    for (content_type, content_encoding, cache_control), group in sorted(groups.items(), key=lambda item: str(item[0])):
+        # Stable ID per group - a new group adds a deployment, it doesn't renumber the others
+        group_id = f"{zlib.crc32(f'{content_type}|{content_encoding}|{cache_control}'.encode('utf-8')):08x}"
+
+        # Hashed assets get new URLs on every change - nothing of them is ever stale at the edges
+        invalidate = distribution is not None and cache_control != CACHE_POLICIES["immutable"]
+
+        s3deploy.BucketDeployment(
+            scope, f"{business_unit}-deployment-{group_id}",
+            # Same folder = same asset for every group (uploaded once), include picks this group's files
+            sources=[s3deploy.Source.asset(files_dir)] + group["data"],
+            destination_bucket=bucket,
+            exclude=["*"],
+            include=group["keys"],
+            content_type=content_type,
+            content_encoding=content_encoding,
+            cache_control=[s3deploy.CacheControl.from_string(cache_control)],
+            # The groups share the bucket - and pages cached before a deploy still need their old assets
+            # (nothing is ever deleted here, see the docstring)
+            prune=False,
+            distribution=distribution if invalidate else None,
+            distribution_paths=sorted(path for key in group["keys"] for path in viewer_paths(key)) if invalidate else None
+        )
@@ -48,6 +48,9 @@ from aws_cdk import (
 from constructs import Construct
 from aws_cdk import aws_s3_deployment as s3deploy
 
+# Built asset names and which precompressed variants exist (see website_assets.py)
+from infrastructure.shared.managers.website_assets import ASSETS_DIR, available_encodings, encoding_function_code
+
 
 class RanjdarGroupWebsite(Construct):
     """
@@ -123,6 +126,31 @@ class RanjdarGroupWebsite(Construct):
         # - provide HTTPS (secure connection) for free
         # - protects against DDoS attacks
 
+        # ORIGIN = where CloudFront gets the files
+        # S3Origin = get files from an S3 bucket
+        # Tells CloudFront to get files from my bucket above
+        origin = origins.S3StaticWebsiteOrigin(self.bucket) # type: ignore
+
+        # HASHED ASSETS (/assets/*)
+        # The build stores every CSS/JS file precompressed next to the original (style.<hash>.css.br/.gz)
+        # This function picks the best variant the browser accepts before the cache lookup
+        # = CloudFront caches each variant once and never compresses on the fly
+        self.encoding_function = cloudfront.Function(
+            self, f"{business_unit}-asset-encoding",
+            code=cloudfront.FunctionCode.from_inline(encoding_function_code(available_encodings())),
+            comment=f"Serve precompressed {business_unit} assets"
+        )
+
+        # Same URL, different bytes per Accept-Encoding -> browsers and proxies must know
+        asset_headers = cloudfront.ResponseHeadersPolicy(
+            self, f"{business_unit}-asset-headers",
+            custom_headers_behavior=cloudfront.ResponseCustomHeadersBehavior(
+                custom_headers=[
+                    cloudfront.ResponseCustomHeader(header="Vary", value="Accept-Encoding", override=True)
+                ]
+            )
+        )
+
         self.distribution = cloudfront.Distribution(
             # CDK ID for this distribution
             self, f"{business_unit}-distribution",
@@ -130,13 +158,27 @@ class RanjdarGroupWebsite(Construct):
             # DEFAULT BEHAVIOR
             # "Behavior" = Rules for how CloudFront handles requests
             # "Default" = Rules for all requests (unless I add specific paths)
+            # HTML pages: Cache-Control from the build (short TTL), compressed by CloudFront
             default_behavior=cloudfront.BehaviorOptions(
-                # ORIGIN = where CloudFront gets the files
-                # S3Origin = get files from an S3 bucket
-                # Tells CloudFront to get files from my bucket above
-                origin=origins.S3StaticWebsiteOrigin(self.bucket) # type: ignore
+                origin=origin
             ),
 
+            # Content-hashed files: cached as long as their Cache-Control says (1 year, immutable)
+            additional_behaviors={
+                f"/{ASSETS_DIR}/*": cloudfront.BehaviorOptions(
+                    origin=origin,
+                    cache_policy=cloudfront.CachePolicy.CACHING_OPTIMIZED,
+                    compress=False, # already compressed by the build
+                    response_headers_policy=asset_headers,
+                    function_associations=[
+                        cloudfront.FunctionAssociation(
+                            function=self.encoding_function,
+                            event_type=cloudfront.FunctionEventType.VIEWER_REQUEST
+                        )
+                    ]
+                )
+            },
+
             # COMMENT = Description in my AWS Console
             # helps me identify this distribution later
             comment=f"CDN for {business_unit} business unit",
@@ -8,33 +8,149 @@ from aws_cdk import (
     aws_lambda as lambda_,
     aws_dynamodb as dynamodb,
     aws_apigateway as apigateway,
+    aws_apigatewayv2 as apigwv2,
+    aws_apigatewayv2_integrations as apigwv2_integrations,
+    aws_applicationautoscaling as appscaling,
     aws_iam as iam,
+    aws_sqs as sqs,
+    aws_s3 as s3,
+    aws_lambda_event_sources as lambda_event_sources,
     Duration,
-    RemovalPolicy
+    RemovalPolicy,
+    Size,
+    Stack,
+    TimeZone
 )
 from constructs import Construct
-from typing import Dict, Any
+import functools
+import os
+from typing import Dict, Any, List, Optional, Sequence
 
+from infrastructure.shared.config.constants import (
+    CONTACT_SHARD_COUNT, get_compute_profile, get_contact_table_name, get_retention_days, is_prod_environment
+)
+from infrastructure.shared.managers.lambda_bundles import (
+    BUILD_DIR, SHARED_PACKAGE, build_function, build_shared_layer, build_xray_layer, compiles_for_runtime
+)
+from lambdas.shared.cors import EXTRA_ORIGINS_PREFIX, preflight_options
+
+# GSI for the contacts query API - must match STATUS_INDEX_NAME in lambdas/shared/contacts_query.py
+STATUS_INDEX_NAME = "status-time-index"
+
+# Sender and recipient for the notification emails
+FROM_EMAIL = "system@ranjdar-group.com"  # Must verify in SES!
+TO_EMAIL = "ranjdar.group@gmail.com"  # CHANGE THIS to your email
+
+# Notification consumer settings (queued_notifications mode)
+NOTIFICATION_BATCH_SIZE = 10  # SQS max per batch for standard queues
+NOTIFICATION_CONSUMER_CONCURRENCY = 2  # minimum SQS allows - keeps the SES send rate split in two only
+NOTIFICATION_CONSUMER_TIMEOUT = Duration.seconds(60)
+NOTIFICATION_MAX_RECEIVE_COUNT = 5  # attempts before a message lands in the DLQ
+
+# Archive consumer settings (DynamoDB stream -> S3)
+ARCHIVE_BATCH_SIZE = 500  # expired items per file at most - fewer, bigger objects are cheaper in S3 and Athena
+ARCHIVE_BATCHING_WINDOW = Duration.minutes(5)  # TTL deletes trickle in - wait to fill a batch
+
+# Shared router: each registered unit is one UNIT_<UNIT> variable - must match UNIT_PREFIX in lambdas/shared/router.py
+ROUTER_UNIT_PREFIX = "UNIT_"
 
-def create_contact_form_infrastructure(scope: Construct, business_unit: str) -> Dict[str, Any]:
+# Alias API Gateway invokes when a compute profile has provisioned concurrency (see _add_live_alias)
+LIVE_ALIAS_NAME = "live"
+
+
+def create_contact_router(scope: Construct, environment: str = "dev", xray_tracing: bool = False) -> lambda_.Function:
+    """
+    Creates the shared contact router Lambda (one warm container pool for several business units).
+
+    The router starts with no units - pass it as router= to create_contact_form_infrastructure
+    for every unit it should serve. Units created without it keep their own Lambda (isolation).
+
+    Args:
+        scope: The CDK construct scope (usually the stack)
+        environment: dev or prod - also picks the router's compute profile (see get_compute_profile)
+        xray_tracing: True = X-Ray active tracing for the router (see _enable_xray)
+
+    Returns:
+        Router Lambda function
+    """
+    profile = get_compute_profile(environment, "router")
+    router = lambda_.Function(
+        scope, "contact-router-handler",
+        runtime=lambda_.Runtime.PYTHON_3_12,
+        handler="router.contact_handler_router.contact_handler_router",
+        code=_function_code("router.contact_handler_router"),
+        layers=[_shared_layer(scope)],
+        environment={
+            "ENVIRONMENT": environment  # client profile (see client_config.py), units carry their own too
+        },
+        timeout=Duration.seconds(30),
+        **_compute_options(profile)
+    )
+
+    if xray_tracing:
+        _enable_xray(router)
+    _add_live_alias("contact-router", router, profile)
+    return router
+
+
+def create_contact_form_infrastructure(
+        scope: Construct,
+        business_unit: str,
+        queued_notifications: bool = False,
+        concurrent_notifications: bool = False,
+        environment: str = "dev",
+        router: Optional[lambda_.Function] = None,
+        xray_tracing: bool = False,
+        extra_origins: Sequence[str] = (),
+        http_api: bool = False
+) -> Dict[str, Any]:
     """
     Creates complete contact form infrastructure for any business unit.
 
     This single function creates:
     - DynamoDB table for storing submissions
     - Lambda function for processing forms
-    - API Gateway REST API with /contact endpoint
+    - API Gateway REST API with /contact endpoint (or an HTTP API for it, see http_api)
+    - POST /contact/batch bulk ingestion endpoint (API key)
+    - GET /contacts query endpoint (API key) backed by a status/time GSI
     - All necessary IAM permissions
+    - S3 archive + stream consumer Lambda: submissions expire from DynamoDB by TTL and land in S3
+    - Optional: SQS queue + DLQ + consumer Lambda for sending emails off the request path
 
     Args:
         scope: The CDK construct scope (usually the stack)
         business_unit: The business unit (construction, cosmetics, retail, etc.)
+        queued_notifications: True = contact Lambda only queues the email job, consumer Lambda sends it
+        concurrent_notifications: True = SES send runs in parallel with the DynamoDB write
+                                  (ignored when queued_notifications is on)
+        environment: dev or prod - sets retention days, whether the archive survives stack deletion
+                     and the contact Lambda's compute profile (get_compute_profile in constants.py)
+        router: shared router Lambda (create_contact_router) - the unit is registered on it instead
+                of getting its own contact Lambda. None = own Lambda (isolated cold starts and limits)
+        xray_tracing: True = X-Ray active tracing on the API stage, the contact Lambda and the
+                      notification consumer (the router has its own flag in create_contact_router)
+        extra_origins: browser origins allowed on top of the CORS allowlist (lambdas/shared/data/cors_policy.json),
+                       ex. the website's CloudFront URL - tokens are fine
+        http_api: True = POST /api/v1/contact on an HTTP API (payload 2.0, built-in CORS) instead of the
+                  REST API - lower latency and price per request. The admin endpoints stay on the REST API
+                  (API keys are a REST API feature). HTTP APIs have no X-Ray tracing of their own
 
     Returns:
         Dict containing created resources: {
             'table': DynamoDB table,
-            'lambda': Lambda function,
-            'api': API Gateway REST API
+            'lambda': Lambda function handling the form (the router if one was passed),
+            'lambda_alias': live alias API Gateway invokes (None without provisioned concurrency),
+            'query_lambda': contacts query Lambda function,
+            'batch_lambda': bulk ingestion Lambda function,
+            'api_key': API key for the contacts query and bulk ingestion endpoints,
+            'api': API Gateway REST API,
+            'http_api': HTTP API of the contact endpoint (None if not http_api),
+            'contact_api_url': base URL the website calls /api/v1/contact on,
+            'archive_bucket': S3 bucket with expired submissions,
+            'archive_lambda': stream consumer Lambda function,
+            'notification_queue': SQS queue (None if not queued),
+            'notification_dlq': SQS dead-letter queue (None if not queued),
+            'notification_lambda': consumer Lambda function (None if not queued)
         }
     """
 
@@ -43,7 +159,7 @@ def create_contact_form_infrastructure(scope: Construct, business_unit: str) ->
     # NoSQL table to store contact form submissions
     table = dynamodb.Table(
         scope, f"{business_unit}-contact-table",
-        table_name=f"RanjdarGroup-{business_unit.title()}ContactForm",
+        table_name=get_contact_table_name(business_unit),
 
         # Primary key setup - need both pk and sk for DynamoDB
         partition_key=dynamodb.Attribute(
@@ -58,36 +174,84 @@ def create_contact_form_infrastructure(scope: Construct, business_unit: str) ->
         # Pay per request = no monthly fee, only pay when used
         billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
 
+        # Items with an expires_at epoch are deleted by DynamoDB for free
+        # Submissions get it at write time (RETENTION_DAYS), idempotency/rate-limit records too
+        time_to_live_attribute="expires_at",
+
+        # Old image of every change - the archive consumer only picks up the TTL deletes
+        stream=dynamodb.StreamViewType.OLD_IMAGE,
+
         # DESTROY = delete table when stack deleted (dev only!)
         removal_policy=RemovalPolicy.DESTROY
     )
 
+    # Status/time index for the contacts query API: "CONSTRUCTION#new" + timestamp
+    # Lets triage list e.g. all new inquiries of last week with a Query instead of a Scan
+    table.add_global_secondary_index(
+        index_name=STATUS_INDEX_NAME,
+        partition_key=dynamodb.Attribute(
+            name="bu_status",
+            type=dynamodb.AttributeType.STRING
+        ),
+        sort_key=dynamodb.Attribute(
+            name="timestamp",
+            type=dynamodb.AttributeType.STRING
+        ),
+        projection_type=dynamodb.ProjectionType.ALL  # any ?fields=... can be answered from the index
+    )
+
     # LAMBDA FUNCTION
     #-----------------
-    # Serverless function that processes contact forms
-    lambda_function = lambda_.Function(
-        scope, f"{business_unit}-contact-handler",
+    # Same settings for an own Lambda (environment variables) and the shared router (registry entry)
+    unit_variables = {
+        "TABLE_NAME": table.table_name,
+        "FROM_EMAIL": FROM_EMAIL,
+        "TO_EMAIL": TO_EMAIL,
+        "ENVIRONMENT": environment,
+        "NOTIFICATION_MODE": _notification_mode(queued_notifications, concurrent_notifications),
+        "RETENTION_DAYS": str(get_retention_days(environment)),
+        "SHARD_COUNT": str(CONTACT_SHARD_COUNT)
+    }
 
-        # Python 3.12 runtime
-        runtime=lambda_.Runtime.PYTHON_3_12,
+    # Deploy-time CORS origins for the Lambdas' responses (the preflight gets them below)
+    cors_variables = {EXTRA_ORIGINS_PREFIX: ",".join(extra_origins)} if extra_origins else {}
 
-        # Function to call in my Python file
-        handler="construction.contact_handler_construction.contact_handler_construction",
+    if router is None:
+        compute_profile = get_compute_profile(environment, business_unit)
 
-        # Where to find the code
-        code=lambda_.Code.from_asset("lambdas"),
+        # Serverless function that processes contact forms
+        lambda_function = lambda_.Function(
+            scope, f"{business_unit}-contact-handler",
 
-        # Environment variables Lambda can access
-        environment={
-            "TABLE_NAME": table.table_name,
-            "FROM_EMAIL": "system@ranjdar-group.com",  # Must verify in SES!
-            "TO_EMAIL": "ranjdar.group@gmail.com",  # CHANGE THIS to your email
-            "ENVIRONMENT": "dev"
-        },
+            # Python 3.12 runtime
+            runtime=lambda_.Runtime.PYTHON_3_12,
 
-        # 30 seconds should be enough for form processing
-        timeout=Duration.seconds(30)
-    )
+            # Function to call in my Python file
+            handler="construction.contact_handler_construction.contact_handler_construction",
+
+            # Where to find the code: the handler alone + the shared layer (see lambda_bundles.py)
+            code=_function_code("construction.contact_handler_construction"),
+            layers=[_shared_layer(scope)],
+
+            # Environment variables Lambda can access
+            environment={**unit_variables, **cors_variables},
+
+            # 30 seconds should be enough for form processing
+            timeout=Duration.seconds(30),
+
+            # Architecture, memory, /tmp and reserved concurrency for this environment and unit
+            **_compute_options(compute_profile)
+        )
+
+        if xray_tracing:
+            _enable_xray(lambda_function)
+        _add_live_alias(f"{business_unit}-contact", lambda_function, compute_profile)
+    else:
+        # Shared router - this unit's requests run on containers other units keep warm
+        lambda_function = router
+
+    # API Gateway calls the alias with provisioned concurrency if there is one - $LATEST never gets it
+    invoke_target = _live_alias(lambda_function) or lambda_function
 
     # PERMISSIONS
     #-------------
@@ -102,6 +266,42 @@ def create_contact_form_infrastructure(scope: Construct, business_unit: str) ->
         )
     )
 
+    # NOTIFICATION QUEUE (optional)
+    #-------------------------------
+    # Contact Lambda only puts a small job on SQS, a separate Lambda sends the SES emails in batches
+    notification_queue = None
+    notification_dlq = None
+    notification_lambda = None
+
+    if queued_notifications:
+        notification_queue, notification_dlq, notification_lambda = _create_notification_queue(
+            scope, business_unit
+        )
+        if xray_tracing:
+            _enable_xray(notification_lambda)
+
+        # Contact Lambda may only send jobs to the queue
+        notification_queue.grant_send_messages(lambda_function)
+        unit_variables["NOTIFICATION_QUEUE_URL"] = notification_queue.queue_url
+        if router is None:
+            lambda_function.add_environment("NOTIFICATION_QUEUE_URL", notification_queue.queue_url)
+
+    # Register the unit on the router: one JSON variable with the settings above (tokens resolved at deploy)
+    if router is not None:
+        router.add_environment(
+            f"{ROUTER_UNIT_PREFIX}{business_unit.upper()}", Stack.of(scope).to_json_string(unit_variables)
+        )
+        # The router answers for all units - one origins variable per unit (cors.py reads them all)
+        if extra_origins:
+            router.add_environment(
+                f"{EXTRA_ORIGINS_PREFIX}_{business_unit.upper()}", cors_variables[EXTRA_ORIGINS_PREFIX]
+            )
+
+    # ARCHIVE (hot/cold tiering)
+    #----------------------------
+    # DynamoDB keeps only recent submissions, expired ones are archived to S3 by a stream consumer
+    archive_bucket, archive_lambda = _create_archive(scope, business_unit, table, environment)
+
     # API GATEWAY
     #-------------
     # REST API that websites can call
@@ -109,11 +309,15 @@ def create_contact_form_infrastructure(scope: Construct, business_unit: str) ->
         scope, f"{business_unit}-api",
         rest_api_name=f"RanjdarGroup-{business_unit.title()}-API",
 
-        # CORS settings so browser allows cross-domain calls
-        default_cors_preflight_options=apigateway.CorsOptions(
-            allow_origins=["*"],  # Any website can call (change in production)
-            allow_methods=["POST", "OPTIONS"]  # POST for data, OPTIONS for CORS check
-        )
+        # Tells the shared router which unit a request came in for (callers can't change stage variables)
+        deploy_options=apigateway.StageOptions(
+            variables={"business_unit": business_unit},
+            tracing_enabled=xray_tracing  # X-Ray trace starts at API Gateway, the Lambda segments join it
+        ),
+
+        # CORS settings so browser allows cross-domain calls - only my websites (allowlist in cors.py)
+        # Same lists as the Lambda responses; Max-Age lets browsers reuse the answer instead of asking again
+        default_cors_preflight_options=_cors_options(extra_origins)
     )
 
     # Create endpoint structure: /api/v1/contact
@@ -121,15 +325,486 @@ def create_contact_form_infrastructure(scope: Construct, business_unit: str) ->
     v1_resource = api_resource.add_resource("v1")
     contact_resource = v1_resource.add_resource("contact")
 
-    # Connect POST requests to Lambda
-    contact_resource.add_method(
+    # Connect POST requests to Lambda - on the HTTP API instead in http_api mode (see below)
+    if not http_api:
+        contact_resource.add_method(
+            "POST",
+            apigateway.LambdaIntegration(invoke_target)
+        )
+
+    # BULK INGESTION (POST /api/v1/contact/batch)
+    #---------------------------------------------
+    # Offline leads (trade fairs, partner spreadsheets) in one call instead of one POST per lead
+    batch_lambda = lambda_.Function(
+        scope, f"{business_unit}-contact-batch-handler",
+        runtime=lambda_.Runtime.PYTHON_3_12,
+        handler="construction.contact_batch_handler_construction.contact_batch_handler_construction",
+        code=_function_code("construction.contact_batch_handler_construction"),
+        layers=[_shared_layer(scope)],
+        environment={
+            "TABLE_NAME": table.table_name,
+            "ENVIRONMENT": environment,
+            "RETENTION_DAYS": str(get_retention_days(environment)),
+            "SHARD_COUNT": str(CONTACT_SHARD_COUNT),
+            **cors_variables
+        },
+        timeout=Duration.seconds(30)
+    )
+
+    # Write only - BatchWriteItem is part of the write grant
+    table.grant_write_data(batch_lambda)
+
+    # Staff tool, not the public form - same API key as the contacts query endpoint
+    batch_resource = contact_resource.add_resource(
+        "batch",
+        default_cors_preflight_options=_cors_options(
+            extra_origins, allow_methods=["POST", "OPTIONS"], allow_headers=["Content-Type", "X-Api-Key"]
+        )
+    )
+    batch_resource.add_method(
         "POST",
-        apigateway.LambdaIntegration(lambda_function)
+        apigateway.LambdaIntegration(batch_lambda),
+        api_key_required=True
     )
 
+    # CONTACTS QUERY API (GET /api/v1/contacts)
+    #-------------------------------------------
+    # Read-only Lambda for triage/admin UI - lists submissions without console Scans
+    query_lambda = lambda_.Function(
+        scope, f"{business_unit}-contacts-query-handler",
+        runtime=lambda_.Runtime.PYTHON_3_12,
+        handler="construction.contacts_handler_construction.contacts_handler_construction",
+        code=_function_code("construction.contacts_handler_construction"),
+        layers=[_shared_layer(scope)],
+        environment={
+            "TABLE_NAME": table.table_name,
+            "ENVIRONMENT": environment,
+            "SHARD_COUNT": str(CONTACT_SHARD_COUNT),  # reads fan out over the shards the contact Lambda writes
+            **cors_variables
+        },
+        timeout=Duration.seconds(10)
+    )
+
+    # Read only - this Lambda never changes submissions
+    table.grant_read_data(query_lambda)
+
+    # Own CORS preflight: GET + API key header, the public contact endpoint stays POST only
+    contacts_resource = v1_resource.add_resource(
+        "contacts",
+        default_cors_preflight_options=_cors_options(
+            extra_origins, allow_methods=["GET", "OPTIONS"], allow_headers=["Content-Type", "X-Api-Key", "If-None-Match"]
+        )
+    )
+
+    # Submissions hold personal data - the endpoint requires an API key
+    contacts_resource.add_method(
+        "GET",
+        apigateway.LambdaIntegration(query_lambda),
+        api_key_required=True
+    )
+
+    api_key = api.add_api_key(
+        f"{business_unit}-admin-api-key",
+        api_key_name=f"RanjdarGroup-{business_unit.title()}-Admin"
+    )
+    usage_plan = api.add_usage_plan(
+        f"{business_unit}-admin-usage-plan",
+        name=f"RanjdarGroup-{business_unit.title()}-Admin",
+        throttle=apigateway.ThrottleSettings(rate_limit=5, burst_limit=10)  # admin UI, not public traffic
+    )
+    usage_plan.add_api_key(api_key)
+    usage_plan.add_api_stage(stage=api.deployment_stage)
+
+    # HTTP API (optional) for the public contact endpoint
+    #-----------------------------------------------------
+    contact_http_api = _create_contact_http_api(scope, business_unit, invoke_target, extra_origins) if http_api else None
+
     # Return all created resources in case stack needs references
     return {
         "table": table,
         "lambda": lambda_function,
-        "api": api
-    }
\ No newline at end of file
+        "lambda_alias": _live_alias(lambda_function),
+        "query_lambda": query_lambda,
+        "batch_lambda": batch_lambda,
+        "api_key": api_key,
+        "api": api,
+        "http_api": contact_http_api,
+        "contact_api_url": contact_http_api.url if contact_http_api else api.url,
+        "archive_bucket": archive_bucket,
+        "archive_lambda": archive_lambda,
+        "notification_queue": notification_queue,
+        "notification_dlq": notification_dlq,
+        "notification_lambda": notification_lambda
+    }
+
+
+def _enable_xray(function: lambda_.Function) -> None:
+    """
+    Turns on X-Ray active tracing for a Lambda, with the permission to send segments.
+
+    XRAY_TRACING tells lambdas/shared/tracing.py to patch botocore and mirror its spans as subsegments -
+    the aws-xray-sdk it needs comes with the X-Ray layer (_xray_layer).
+    """
+    function.add_layers(_xray_layer(function, function.architecture.name))
+    function.add_environment("XRAY_TRACING", "true")
+    # Escape hatch - Function has no setter for tracing after construction
+    function.node.default_child.tracing_config = lambda_.CfnFunction.TracingConfigProperty(mode="Active")
+    function.add_to_role_policy(iam.PolicyStatement(
+        actions=["xray:PutTraceSegments", "xray:PutTelemetryRecords"],
+        resources=["*"]
+    ))
+
+
+def _function_code(handler_module: str) -> lambda_.Code:
+    """Code of a Lambda function - its handler module only, the shared code comes from _shared_layer."""
+    return lambda_.Code.from_asset(_built_function(handler_module))
+
+
+@functools.lru_cache(maxsize=None)
+def _built_function(handler_module: str) -> str:
+    # Built once per synth process - units and stacks share the folder (Code objects are per stack)
+    return build_function(
+        handler_module, os.path.join(BUILD_DIR, handler_module), compile_bytecode=compiles_for_runtime()
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _built_shared_layer() -> str:
+    return build_shared_layer(os.path.join(BUILD_DIR, SHARED_PACKAGE), compile_bytecode=compiles_for_runtime())
+
+
+def _shared_layer(scope: Construct) -> lambda_.LayerVersion:
+    """
+    The stack's shared code layer (lambdas/shared) - created on first use, all business units get the same one.
+
+    Returns:
+        LayerVersion - a new version is published whenever the shared code changes
+    """
+    stack = Stack.of(scope)
+    layer = stack.node.try_find_child("contact-shared-layer")
+    if layer is None:
+        layer = lambda_.LayerVersion(
+            stack, "contact-shared-layer",
+            code=lambda_.Code.from_asset(_built_shared_layer()),
+            compatible_runtimes=[lambda_.Runtime.PYTHON_3_12],
+            compatible_architectures=[lambda_.Architecture.ARM_64, lambda_.Architecture.X86_64],  # pure Python
+            description="RanjdarGroup contact form shared code (lambdas/shared)"
+        )
+    return layer
+
+
+@functools.lru_cache(maxsize=None)
+def _built_xray_layer(architecture: str) -> str:
+    return build_xray_layer(os.path.join(BUILD_DIR, f"xray-{architecture}"), architecture)
+
+
+def _xray_layer(scope: Construct, architecture: str) -> lambda_.LayerVersion:
+    """
+    The stack's X-Ray SDK layer for one architecture (arm64, x86_64) - created on first use.
+
+    Returns:
+        LayerVersion with aws-xray-sdk (lambdas/requirements-xray.txt)
+    """
+    stack = Stack.of(scope)
+    layer_id = f"xray-sdk-layer-{architecture.replace('_', '-')}"
+    layer = stack.node.try_find_child(layer_id)
+    if layer is None:
+        layer = lambda_.LayerVersion(
+            stack, layer_id,
+            code=lambda_.Code.from_asset(_built_xray_layer(architecture)),
+            compatible_runtimes=[lambda_.Runtime.PYTHON_3_12],
+            compatible_architectures=[
+                lambda_.Architecture.ARM_64 if architecture == "arm64" else lambda_.Architecture.X86_64
+            ],
+            description=f"aws-xray-sdk for the contact form Lambdas ({architecture})"
+        )
+    return layer
+
+
+def _compute_options(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Maps a compute profile (get_compute_profile) to lambda_.Function arguments."""
+    return {
+        "architecture": lambda_.Architecture.ARM_64 if profile["architecture"] == "arm64" else lambda_.Architecture.X86_64,
+        "memory_size": profile["memory_mb"],
+        "ephemeral_storage_size": Size.mebibytes(profile["ephemeral_storage_mb"]),
+        "reserved_concurrent_executions": profile["reserved_concurrency"]
+    }
+
+
+def _add_live_alias(name: str, function: lambda_.Function, profile: Dict[str, Any]) -> Optional[lambda_.Alias]:
+    """
+    Creates the live alias with provisioned concurrency and its autoscaling, if the profile has any.
+
+    Provisioned concurrency only exists on versions/aliases - the alias points at a new version on
+    every code or configuration change, so API Gateway always reaches pre-initialized environments:
+    - target tracking on ProvisionedConcurrencyUtilization between provisioned_min and provisioned_max
+    - scheduled minimum business_hours_min on weekdays during business_hours (Europe/Berlin)
+
+    Args:
+        name: prefix of the scheduled actions' ids
+        function: contact Lambda or shared router
+        profile: compute profile
+
+    Returns:
+        The alias (None if provisioned_max is 0) - _live_alias finds it again
+    """
+    if profile["provisioned_max"] <= 0:
+        return None
+
+    # Child of the function, so units sharing the router find its alias (see _live_alias)
+    alias = lambda_.Alias(
+        function, "live-alias",
+        alias_name=LIVE_ALIAS_NAME,
+        version=function.current_version,
+        provisioned_concurrent_executions=profile["provisioned_min"] or None
+    )
+
+    scaling = alias.add_auto_scaling(min_capacity=profile["provisioned_min"], max_capacity=profile["provisioned_max"])
+    scaling.scale_on_utilization(utilization_target=profile["provisioned_utilization"])
+
+    if profile["business_hours_min"] > profile["provisioned_min"]:
+        (start_hour, start_minute), (end_hour, end_minute) = (
+            (str(int(part)) for part in time.split(":")) for time in profile["business_hours"]
+        )
+        scaling.scale_on_schedule(
+            f"{name}-business-hours-start",
+            schedule=appscaling.Schedule.cron(hour=start_hour, minute=start_minute, week_day="MON-FRI"),
+            min_capacity=profile["business_hours_min"],
+            time_zone=TimeZone.EUROPE_BERLIN
+        )
+        scaling.scale_on_schedule(
+            f"{name}-business-hours-end",
+            schedule=appscaling.Schedule.cron(hour=end_hour, minute=end_minute, week_day="MON-FRI"),
+            min_capacity=profile["provisioned_min"],
+            time_zone=TimeZone.EUROPE_BERLIN
+        )
+    return alias
+
+
+def _live_alias(function: lambda_.Function) -> Optional[lambda_.Alias]:
+    """The alias _add_live_alias created on this function (None if it has none)."""
+    return function.node.try_find_child("live-alias")
+
+
+def _cors_options(
+        extra_origins: Sequence[str],
+        allow_methods: Optional[List[str]] = None,
+        allow_headers: Optional[List[str]] = None
+) -> apigateway.CorsOptions:
+    """
+    API Gateway preflight options from the shared CORS policy (lambdas/shared/cors.py).
+
+    Args:
+        extra_origins: deploy-time origins on top of the allowlist
+        allow_methods, allow_headers: the resource's (None = the contact form's)
+
+    Returns:
+        CorsOptions - API Gateway answers OPTIONS itself (mock integration), no Lambda involved
+    """
+    options = preflight_options(allow_methods, allow_headers, extra_origins)
+    return apigateway.CorsOptions(
+        allow_origins=options["allow_origins"],
+        allow_methods=options["allow_methods"],
+        allow_headers=options["allow_headers"],
+        max_age=Duration.seconds(options["max_age_seconds"])
+    )
+
+
+def _create_contact_http_api(
+        scope: Construct, business_unit: str, lambda_function: lambda_.IFunction, extra_origins: Sequence[str]
+) -> apigwv2.HttpApi:
+    """
+    Creates an HTTP API with POST /api/v1/contact for the contact Lambda (or the shared router).
+
+    The Lambda gets payload format 2.0 events (see get_payload_version in lambdas/shared/utils.py).
+    API Gateway answers the CORS preflight and adds the CORS headers itself, from the same allowlist.
+
+    Args:
+        scope: The CDK construct scope (usually the stack)
+        business_unit: The business unit (construction, cosmetics, retail, etc.)
+        lambda_function: contact Lambda or shared router (its live alias, if it has one)
+        extra_origins: deploy-time origins on top of the allowlist
+
+    Returns:
+        HTTP API (auto-deployed $default stage)
+    """
+    options = preflight_options(["POST", "OPTIONS"], origins=extra_origins)
+    http_api = apigwv2.HttpApi(
+        scope, f"{business_unit}-http-api",
+        api_name=f"RanjdarGroup-{business_unit.title()}-HTTP-API",
+        cors_preflight=apigwv2.CorsPreflightOptions(
+            allow_origins=options["allow_origins"],
+            allow_methods=[getattr(apigwv2.CorsHttpMethod, method) for method in options["allow_methods"]],
+            allow_headers=options["allow_headers"],
+            expose_headers=options["expose_headers"],  # Retry-After of a 429, for the form's JavaScript
+            max_age=Duration.seconds(options["max_age_seconds"])
+        )
+    )
+
+    # Same stage variable as the REST API, so the shared router knows the unit
+    # Escape hatch - HttpStage has no stage variables prop
+    http_api.default_stage.node.default_child.stage_variables = {"business_unit": business_unit}
+
+    http_api.add_routes(
+        path="/api/v1/contact",
+        methods=[apigwv2.HttpMethod.POST],
+        integration=apigwv2_integrations.HttpLambdaIntegration(
+            f"{business_unit}-contact-integration", lambda_function,
+            payload_format_version=apigwv2.PayloadFormatVersion.VERSION_2_0
+        )
+    )
+    return http_api
+
+
+def _notification_mode(queued_notifications: bool, concurrent_notifications: bool) -> str:
+    """Maps the construct options to the Lambda's NOTIFICATION_MODE (see handlers_manager.py)."""
+    if queued_notifications:
+        return "queue"
+    if concurrent_notifications:
+        return "concurrent"
+    return "inline"
+
+
+def _create_archive(scope: Construct, business_unit: str, table: dynamodb.Table, environment: str) -> tuple:
+    """
+    Creates the S3 archive bucket and the stream consumer Lambda that fills it.
+
+    Args:
+        scope: The CDK construct scope (usually the stack)
+        business_unit: The business unit (construction, cosmetics, retail, etc.)
+        table: contact table (stream enabled)
+        environment: dev or prod
+
+    Returns:
+        (archive bucket, archive Lambda function)
+    """
+    prod = is_prod_environment(environment)
+
+    bucket = s3.Bucket(
+        scope, f"{business_unit}-contact-archive",
+        encryption=s3.BucketEncryption.S3_MANAGED,
+        block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+        enforce_ssl=True,
+
+        # Old inquiries are rarely read - move them to cheaper storage classes
+        lifecycle_rules=[s3.LifecycleRule(
+            transitions=[
+                s3.Transition(storage_class=s3.StorageClass.INFREQUENT_ACCESS, transition_after=Duration.days(30)),
+                s3.Transition(storage_class=s3.StorageClass.GLACIER_INSTANT_RETRIEVAL, transition_after=Duration.days(90))
+            ]
+        )],
+
+        # Archive is the only copy once TTL deleted the item - prod keeps it even if the stack goes
+        removal_policy=RemovalPolicy.RETAIN if prod else RemovalPolicy.DESTROY,
+        auto_delete_objects=not prod
+    )
+
+    consumer = lambda_.Function(
+        scope, f"{business_unit}-archive-handler",
+        runtime=lambda_.Runtime.PYTHON_3_12,
+        handler="construction.archive_handler_construction.archive_handler_construction",
+        code=_function_code("construction.archive_handler_construction"),
+        layers=[_shared_layer(scope)],
+        environment={
+            "ARCHIVE_BUCKET": bucket.bucket_name,
+            "ENVIRONMENT": environment
+        },
+        timeout=Duration.seconds(60)
+    )
+
+    # Only TTL deletes of submissions invoke the Lambda - inserts, updates and manual deletes are
+    # filtered out by the event source mapping and cost nothing
+    consumer.add_event_source(lambda_event_sources.DynamoEventSource(
+        table,
+        starting_position=lambda_.StartingPosition.TRIM_HORIZON,
+        batch_size=ARCHIVE_BATCH_SIZE,
+        max_batching_window=ARCHIVE_BATCHING_WINDOW,
+        report_batch_item_failures=True,
+
+        # Keep retrying while S3 is down - the stream holds records for 24h and they're the last copy
+        retry_attempts=10000,
+        filters=[lambda_.FilterCriteria.filter({
+            "eventName": lambda_.FilterRule.is_equal("REMOVE"),
+            "userIdentity": {
+                "type": lambda_.FilterRule.is_equal("Service"),
+                "principalId": lambda_.FilterRule.is_equal("dynamodb.amazonaws.com")
+            },
+            "dynamodb": {"Keys": {"pk": {"S": lambda_.FilterRule.begins_with("BU#")}}}
+        })]
+    ))
+
+    # Write only - the consumer never reads or deletes archive files
+    bucket.grant_put(consumer)
+
+    return bucket, consumer
+
+
+def _create_notification_queue(scope: Construct, business_unit: str) -> tuple:
+    """
+    Creates the SQS queue, its dead-letter queue and the consumer Lambda that sends the emails.
+
+    Args:
+        scope: The CDK construct scope (usually the stack)
+        business_unit: The business unit (construction, cosmetics, retail, etc.)
+
+    Returns:
+        (queue, dead-letter queue, consumer Lambda function)
+    """
+    # Poison messages and jobs that failed NOTIFICATION_MAX_RECEIVE_COUNT times end up here
+    # 14 days = SQS max, enough time to look at them and redrive
+    dlq = sqs.Queue(
+        scope, f"{business_unit}-notification-dlq",
+        queue_name=f"RanjdarGroup-{business_unit.title()}-Notifications-DLQ",
+        retention_period=Duration.days(14),
+        encryption=sqs.QueueEncryption.SQS_MANAGED
+    )
+
+    queue = sqs.Queue(
+        scope, f"{business_unit}-notification-queue",
+        queue_name=f"RanjdarGroup-{business_unit.title()}-Notifications",
+
+        # AWS recommends >= 6x the consumer timeout so in-flight batches aren't delivered twice
+        visibility_timeout=Duration.seconds(NOTIFICATION_CONSUMER_TIMEOUT.to_seconds() * 6),
+        encryption=sqs.QueueEncryption.SQS_MANAGED,
+        dead_letter_queue=sqs.DeadLetterQueue(
+            max_receive_count=NOTIFICATION_MAX_RECEIVE_COUNT,
+            queue=dlq
+        )
+    )
+
+    consumer = lambda_.Function(
+        scope, f"{business_unit}-notification-handler",
+        runtime=lambda_.Runtime.PYTHON_3_12,
+        handler="construction.notification_handler_construction.notification_handler_construction",
+        code=_function_code("construction.notification_handler_construction"),
+        layers=[_shared_layer(scope)],
+        environment={
+            "FROM_EMAIL": FROM_EMAIL,
+            "TO_EMAIL": TO_EMAIL,
+            "DEAD_LETTER_QUEUE_URL": dlq.queue_url,
+            "CONSUMER_CONCURRENCY": str(NOTIFICATION_CONSUMER_CONCURRENCY)
+        },
+        timeout=NOTIFICATION_CONSUMER_TIMEOUT
+    )
+
+    # Batches of up to 10 jobs, waiting max 5s to fill a batch
+    # report_batch_item_failures = only the failed messages are retried, not the whole batch
+    consumer.add_event_source(lambda_event_sources.SqsEventSource(
+        queue,
+        batch_size=NOTIFICATION_BATCH_SIZE,
+        max_batching_window=Duration.seconds(5),
+        report_batch_item_failures=True,
+        max_concurrency=NOTIFICATION_CONSUMER_CONCURRENCY
+    ))
+
+    dlq.grant_send_messages(consumer)
+
+    # SendEmail + GetSendQuota so the consumer can stay under the account's send rate
+    consumer.add_to_role_policy(
+        iam.PolicyStatement(
+            actions=["ses:SendEmail", "ses:GetSendQuota"],
+            resources=["*"]
+        )
+    )
+
+    return queue, dlq, consumer
\ No newline at end of file
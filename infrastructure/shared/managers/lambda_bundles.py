@@ -0,0 +1,241 @@
+"""
+Lambda bundling for the contact form Lambdas.
+
+Code.from_asset("lambdas") shipped the whole folder to every function: all handler packages,
+the container adapter, local __pycache__ folders and whatever else lay around. Lambda's file
+system is read-only, so every cold container also compiled each imported module again.
+
+Built at synth instead (plain copies, no Docker - contact_form_infrastructure.py uses the builds):
+- one artifact per function: only the handler module and its package __init__.py
+- one layer per stack (lambdas/shared, versioned by content - every change publishes a new version):
+  the shared modules the Lambda handlers import, directly or through each other, plus data/*.json
+  Container-only modules (asgi.py) stay out
+- both byte-compiled (unchecked-hash .pyc next to the sources, so zip mtimes don't matter),
+  as long as the synth runs on the runtime's Python version - other versions' .pyc would be ignored
+  by Lambda, so the sources ship alone then
+
+Functions with X-Ray tracing get one more layer: aws-xray-sdk (lambdas/requirements-xray.txt),
+installed with pip for the function's architecture - the only build step that needs the network.
+
+python -m infrastructure.tools.bundle_lambdas reports artifact sizes and cold import times
+before and after.
+"""
+
+import ast
+import compileall
+import glob
+import hashlib
+import os
+import py_compile
+import shutil
+import subprocess
+import sys
+from typing import Iterable, List, Set
+
+# Paths relative to the project root (cdk commands run there, like Code.from_asset("lambdas") did)
+LAMBDAS_DIR = "lambdas"
+BUILD_DIR = os.path.join("build", "lambda")
+
+SHARED_PACKAGE = "shared"
+
+# Python version of the Lambda runtime (lambda_.Runtime.PYTHON_3_12) - .pyc files only load on the version that wrote them
+RUNTIME_PYTHON_VERSION = (3, 12)
+
+# Pinned third-party packages of the X-Ray layer
+XRAY_REQUIREMENTS_FILE = os.path.join(LAMBDAS_DIR, "requirements-xray.txt")
+
+# Lambda architecture -> pip platform of its wheels (wrapt has a C extension)
+PIP_PLATFORMS = {
+    "arm64": "manylinux2014_aarch64",
+    "x86_64": "manylinux2014_x86_64"
+}
+
+# Every Lambda handler module - their shared imports decide what goes into the layer
+HANDLER_MODULES = (
+    "construction.contact_handler_construction",
+    "construction.contact_batch_handler_construction",
+    "construction.contacts_handler_construction",
+    "construction.archive_handler_construction",
+    "construction.notification_handler_construction",
+    "router.contact_handler_router"
+)
+
+
+# DEPENDENCIES
+#--------------
+
+def module_file(module: str, lambdas_dir: str = LAMBDAS_DIR) -> str:
+    """Source file of a module under lambdas_dir (package -> its __init__.py)."""
+    path = os.path.join(lambdas_dir, *module.split("."))
+    if os.path.isdir(path):
+        return os.path.join(path, "__init__.py")
+    return path + ".py"
+
+
+def shared_imports(path: str, lambdas_dir: str = LAMBDAS_DIR) -> Set[str]:
+    """
+    Shared modules a source file imports - at the top or inside functions (lazy imports count too).
+
+    Returns:
+        Module names, ex. {"shared.utils", "shared.form_schema"}
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names if alias.name.split(".")[0] == SHARED_PACKAGE)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            if node.module == SHARED_PACKAGE:
+                # from shared import form_schema - a submodule, or a name of shared/__init__.py
+                for alias in node.names:
+                    submodule = f"{SHARED_PACKAGE}.{alias.name}"
+                    modules.add(submodule if os.path.exists(module_file(submodule, lambdas_dir)) else SHARED_PACKAGE)
+            elif node.module.split(".")[0] == SHARED_PACKAGE:
+                modules.add(node.module)
+    return modules
+
+
+def shared_closure(handler_modules: Iterable[str], lambdas_dir: str = LAMBDAS_DIR) -> List[str]:
+    """
+    Shared modules the handlers need - their imports and everything those import in turn.
+
+    Raises:
+        FileNotFoundError: a handler imports a shared module that doesn't exist (fails the synth, not a cold start)
+    """
+    needed = {SHARED_PACKAGE}
+    pending = [module_file(module, lambdas_dir) for module in handler_modules]
+    while pending:
+        for module in shared_imports(pending.pop(), lambdas_dir) - needed:
+            needed.add(module)
+            path = module_file(module, lambdas_dir)
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"{module} is imported but {path} doesn't exist")
+            pending.append(path)
+    return sorted(needed)
+
+
+# BUILD
+#-------
+
+def build_function(handler_module: str, output_dir: str, lambdas_dir: str = LAMBDAS_DIR,
+                   compile_bytecode: bool = True) -> str:
+    """
+    Builds a function artifact: the handler module and its package's __init__.py, nothing else.
+
+    Args:
+        handler_module: ex. construction.contact_handler_construction
+        output_dir: replaced completely (no stray files of earlier builds)
+        lambdas_dir: source root
+        compile_bytecode: ship .pyc files (see module docstring)
+
+    Returns:
+        output_dir
+    """
+    package = handler_module.rsplit(".", 1)[0]
+    _copy_modules([package, handler_module], lambdas_dir, output_dir)
+    if compile_bytecode:
+        compile_tree(output_dir)
+    return output_dir
+
+
+def build_shared_layer(output_dir: str, handler_modules: Iterable[str] = HANDLER_MODULES,
+                       lambdas_dir: str = LAMBDAS_DIR, compile_bytecode: bool = True) -> str:
+    """
+    Builds the shared layer: python/shared/... with the handlers' shared modules and data files.
+
+    Lambda puts /opt/python (the layer's python/ folder) on sys.path, so `import shared.x` works unchanged.
+
+    Returns:
+        output_dir
+    """
+    python_dir = os.path.join(output_dir, "python")
+    _copy_modules(shared_closure(handler_modules, lambdas_dir), lambdas_dir, python_dir)
+
+    # Catalogs read at import (locales, form schemas, CORS policy)
+    for path in glob.glob(os.path.join(lambdas_dir, SHARED_PACKAGE, "data", "*.json")):
+        target = os.path.join(python_dir, os.path.relpath(path, lambdas_dir))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(path, target)
+
+    if compile_bytecode:
+        compile_tree(python_dir)
+    return output_dir
+
+
+def build_xray_layer(output_dir: str, architecture: str,
+                     requirements_file: str = XRAY_REQUIREMENTS_FILE) -> str:
+    """
+    Builds the X-Ray SDK layer: python/ with the pinned packages as wheels for the runtime and architecture.
+
+    pip only runs when the requirements or the architecture changed since the last build
+    (stamp file next to output_dir) - synths stay offline otherwise.
+
+    Args:
+        output_dir: replaced when rebuilt
+        architecture: arm64 or x86_64 (Lambda architecture name)
+        requirements_file: pinned requirements
+
+    Returns:
+        output_dir
+
+    Raises:
+        ValueError: unknown architecture
+        subprocess.CalledProcessError: pip failed (fails the synth, not a cold start)
+    """
+    if architecture not in PIP_PLATFORMS:
+        raise ValueError(f"No pip platform for architecture {architecture!r}")
+
+    with open(requirements_file, "rb") as f:
+        requirements = f.read()
+    python_version = "{}.{}".format(*RUNTIME_PYTHON_VERSION)
+    stamp = hashlib.sha256(requirements + f"|{architecture}|{python_version}".encode("utf-8")).hexdigest()
+    stamp_file = output_dir.rstrip(os.sep) + ".stamp"
+
+    if os.path.isdir(output_dir) and os.path.exists(stamp_file):
+        with open(stamp_file, encoding="utf-8") as f:
+            if f.read() == stamp:
+                return output_dir
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    subprocess.run([
+        sys.executable, "-m", "pip", "install", "--quiet", "--disable-pip-version-check",
+        "--requirement", requirements_file,
+        "--target", os.path.join(output_dir, "python"),
+        # Wheels for Lambda, not for the machine running the synth; dependencies are pinned in the file
+        "--platform", PIP_PLATFORMS[architecture], "--implementation", "cp",
+        "--python-version", python_version, "--only-binary=:all:", "--no-deps"
+    ], check=True)
+
+    with open(stamp_file, "w", encoding="utf-8") as f:
+        f.write(stamp)
+    return output_dir
+
+
+def compile_tree(root: str) -> None:
+    """
+    Writes __pycache__/*.pyc for every module under root with the running interpreter.
+
+    Unchecked hash = Python loads the .pyc without comparing it to the source's mtime or hash -
+    right for a read-only bundle whose sources never change after the build.
+    """
+    if not compileall.compile_dir(
+            root, quiet=1, invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH
+    ):
+        raise RuntimeError(f"Byte-compiling {root} failed")
+
+
+def _copy_modules(modules: Iterable[str], lambdas_dir: str, output_dir: str) -> None:
+    """Copies the modules' source files only - no tests, caches or neighbours."""
+    shutil.rmtree(output_dir, ignore_errors=True)
+    for module in modules:
+        source = module_file(module, lambdas_dir)
+        target = os.path.join(output_dir, os.path.relpath(source, lambdas_dir))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(source, target)
+
+
+def compiles_for_runtime() -> bool:
+    """True if the running Python writes .pyc files the Lambda runtime loads."""
+    return sys.version_info[:2] == RUNTIME_PYTHON_VERSION
@@ -0,0 +1,322 @@
+"""
+Static asset build for the business unit websites (runs at synth, before deploy_website uploads anything).
+
+website/<unit> holds hand-written pages with big inline <style> and <script> blocks. Built output:
+- HTML minified (comments and whitespace runs gone, <pre>/<textarea>/<script>/<style> untouched)
+- inline CSS/JS moved to assets/<style|script>.<content hash>.<ext>, minified - the URL changes
+  with the content, so browsers and CloudFront may keep them forever (immutable)
+- gzip and brotli variants of every asset (<key>.gz, <key>.br) - the CloudFront function of
+  RanjdarGroupWebsite serves the best one the browser accepts. Brotli needs the Brotli package;
+  without it only gzip variants are built (available_encodings tells the construct)
+- <script src="api-config.js"> becomes an inline placeholder: the API URL is a deploy-time token,
+  so deploy_website fills it into the (short-lived) HTML instead of a separate, uncacheable request
+- manifest.json: one entry per object with its key, type, encoding, cache policy and hash -
+  the deployment reads nothing else
+
+The minifiers are deliberately conservative (no renaming, JS keeps its line breaks) - the pages
+are small, the win is caching, not the last byte.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    # noinspection PyPackageRequirements
+    import brotli
+except ImportError:  # optional - gzip variants only
+    brotli = None
+
+MANIFEST_NAME = "manifest.json"
+FILES_DIR = "files"  # object tree under the build folder (keys = paths below it)
+ASSETS_DIR = "assets"
+
+# Written by deploy_website at deploy time - copies in the source folder are never shipped
+GENERATED_FILES = ("api-config.js",)
+API_CONFIG_PLACEHOLDER = "/*__API_CONFIG__*/"
+
+CACHE_POLICIES = {
+    # Content-hashed names: a change is a new URL, the old one can be cached for a year
+    "immutable": "public, max-age=31536000, immutable",
+    # Pages keep their URLs - browsers and CloudFront recheck them after 5 minutes
+    "html": "public, max-age=300, must-revalidate",
+    # Everything else (images, favicon) - not fingerprinted, so one day
+    "default": "public, max-age=86400"
+}
+
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".js": "application/javascript; charset=utf-8",
+    ".json": "application/json",
+    ".svg": "image/svg+xml",
+    ".txt": "text/plain; charset=utf-8",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+    ".ico": "image/x-icon"
+}
+
+# (Content-Encoding, key suffix) - best first
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+HASH_LENGTH = 12  # hex characters of the sha256 in asset names
+
+_STYLE_RE = re.compile(r"<style(?:\s[^>]*)?>(?P<body>.*?)</style>", re.S | re.I)
+_SCRIPT_RE = re.compile(r"<script(?P<attrs>[^>]*)>(?P<body>.*?)</script>", re.S | re.I)
+_SRC_RE = re.compile(r"""\bsrc\s*=\s*["']?([^"'\s>]+)""", re.I)
+_RAW_BLOCK_RE = re.compile(r"(<(pre|textarea|script|style)\b.*?</\2>)", re.S | re.I)
+_COMMENT_RE = re.compile(r"<!--(?!\[if).*?-->", re.S)
+_CSS_STRING_RE = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""")
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Content-Encodings this build produces variants for (br only with the Brotli package)."""
+    return tuple(encoding for encoding, _ in ENCODINGS if encoding != "br" or brotli is not None)
+
+
+def api_config_script(api_url: str, business_unit: str) -> str:
+    """window.API_CONFIG for the pages (API_CONFIG_PLACEHOLDER) - api_url ends with a slash."""
+    return (
+        f"window.API_CONFIG={{baseUrl:'{api_url}',"
+        f"contactEndpoint:'{api_url}api/v1/contact',businessUnit:'{business_unit}'}};"
+    )
+
+
+def viewer_paths(key: str) -> List[str]:
+    """URL paths CloudFront caches an object under - index.html also as its folder (/en/index.html, /en/)."""
+    paths = [f"/{key}"]
+    if key == "index.html" or key.endswith("/index.html"):
+        paths.append(f"/{key[:-len('index.html')]}")
+    return paths
+
+
+def encoding_function_code(encodings: Tuple[str, ...]) -> str:
+    """
+    CloudFront Function (viewer request) for the assets path: appends the suffix of the best
+    variant the browser accepts, before the cache lookup - each variant is cached on its own.
+    Only encodings the build produced are offered. Accept-Encoding is parsed per coding
+    ("br;q=0, gzip" refuses br) - a coding with q=0 is never served. ES5 only (cloudfront-js-1.0).
+    """
+    variants = ", ".join(f'["{encoding}", "{suffix}"]' for encoding, suffix in ENCODINGS if encoding in encodings)
+    return f"""var VARIANTS = [{variants}];
+
+function acceptedCodings(header) {{
+    var accepted = {{}};
+    var tokens = header.split(',');
+    for (var i = 0; i < tokens.length; i++) {{
+        var params = tokens[i].split(';');
+        var coding = params[0].trim().toLowerCase();
+        var refused = false;
+        for (var j = 1; j < params.length; j++) {{
+            var param = params[j].trim().toLowerCase();
+            if (param.indexOf('q=') === 0 && !(parseFloat(param.substring(2)) > 0)) {{
+                refused = true;
+            }}
+        }}
+        if (coding && !refused) {{
+            accepted[coding] = true;
+        }}
+    }}
+    return accepted;
+}}
+
+function handler(event) {{
+    var request = event.request;
+    var header = request.headers['accept-encoding'];
+    if (!header) {{
+        return request;
+    }}
+    var accepted = acceptedCodings(header.value);
+    for (var i = 0; i < VARIANTS.length; i++) {{
+        if (accepted[VARIANTS[i][0]]) {{
+            request.uri = request.uri + VARIANTS[i][1];
+            break;
+        }}
+    }}
+    return request;
+}}
+"""
+
+
+# MINIFIERS
+#-----------
+
+def minify_css(css: str) -> str:
+    """Drops comments and whitespace around punctuation - quoted strings stay as written."""
+    parts = _CSS_STRING_RE.split(css)
+    for i in range(0, len(parts), 2):  # odd indexes are the strings
+        part = re.sub(r"/\*.*?\*/", "", parts[i], flags=re.S)
+        part = re.sub(r"\s+", " ", part)
+        part = re.sub(r"\s*([{};,>])\s*", r"\1", part)
+        part = re.sub(r":\s+", ":", part)  # "color: red" - never "a :hover", the space before ':' stays
+        parts[i] = part.replace(";}", "}")
+    return "".join(parts).strip()
+
+
+def minify_js(js: str) -> str:
+    """
+    Strips indentation, blank lines and whole-line // comments - line breaks stay (no ASI surprises).
+    Scripts with template literals are only trimmed: their lines may be string content.
+    """
+    if "`" in js:
+        return js.strip()
+    lines = (line.strip() for line in js.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+def minify_html(html: str) -> str:
+    """Drops comments and collapses whitespace runs to one space outside <pre>/<textarea>/<script>/<style>."""
+    parts = _RAW_BLOCK_RE.split(html)
+    result = []
+    # re.split with two groups: [text, block, tag name, text, block, tag name, ...]
+    for i in range(0, len(parts), 3):
+        text = _COMMENT_RE.sub("", parts[i])
+        result.append(re.sub(r"\s+", " ", text))
+        if i + 1 < len(parts):
+            result.append(parts[i + 1])
+    return "".join(result).strip()
+
+
+# BUILD
+#-------
+
+def build_site(source_dir: str, output_dir: str) -> Dict[str, Any]:
+    """
+    Builds a website folder and writes its manifest.
+
+    Args:
+        source_dir: website/<unit>
+        output_dir: replaced completely - objects under files/, manifest.json next to it
+
+    Returns:
+        Manifest: {"files": [{"key", "content_type", "content_encoding", "cache_control",
+                             "sha256", "size", "api_config"}], "encodings": [...]}
+        api_config = HTML with the API_CONFIG_PLACEHOLDER deploy_website fills in
+    """
+    shutil.rmtree(output_dir, ignore_errors=True)
+    files_dir = os.path.join(output_dir, FILES_DIR)
+    entries: Dict[str, Dict[str, Any]] = {}
+
+    for folder, _, names in os.walk(source_dir):
+        for name in sorted(names):
+            if name in GENERATED_FILES:
+                continue
+            path = os.path.join(folder, name)
+            key = os.path.relpath(path, source_dir).replace(os.sep, "/")
+
+            if key.endswith(".html"):
+                with open(path, encoding="utf-8") as f:
+                    html, assets = _extract_assets(f.read())
+                for asset_key, content in assets:
+                    _add_asset(entries, files_dir, asset_key, content)
+                data = minify_html(html).encode("utf-8")
+                _write(files_dir, key, data)
+                entries[key] = _entry(key, data, "html", api_config=API_CONFIG_PLACEHOLDER in html)
+            else:
+                with open(path, "rb") as f:
+                    data = f.read()
+                _write(files_dir, key, data)
+                entries[key] = _entry(key, data, "default")
+
+    manifest = {
+        "files": [entries[key] for key in sorted(entries)],
+        "encodings": list(available_encodings())
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_manifest(output_dir: str) -> Dict[str, Any]:
+    with open(os.path.join(output_dir, MANIFEST_NAME), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _extract_assets(html: str) -> Tuple[str, List[Tuple[str, bytes]]]:
+    """Moves inline <style>/<script> blocks to hashed asset files - returns (new html, [(key, content)])."""
+    assets = []
+
+    def style(match: re.Match) -> str:
+        content = minify_css(match.group("body")).encode("utf-8")
+        if not content:
+            return ""
+        key = _hashed_key("style", ".css", content)
+        assets.append((key, content))
+        return f'<link rel="stylesheet" href="/{key}">'
+
+    def script(match: re.Match) -> str:
+        attrs = match.group("attrs")
+        src = _SRC_RE.search(attrs)
+        if src:
+            # The generated config goes inline, other scripts stay as they are
+            if os.path.basename(src.group(1)) in GENERATED_FILES:
+                return f"<script>{API_CONFIG_PLACEHOLDER}</script>"
+            return match.group(0)
+        if re.search(r"\btype\s*=\s*[\"']?(?!text/javascript|module)", attrs, re.I):
+            return match.group(0)  # JSON-LD, templates, ...
+
+        content = minify_js(match.group("body")).encode("utf-8")
+        if not content:
+            return ""
+        key = _hashed_key("script", ".js", content)
+        assets.append((key, content))
+        module = ' type="module"' if "module" in attrs else ""
+        return f'<script{module} src="/{key}"></script>'
+
+    html = _STYLE_RE.sub(style, html)
+    html = _SCRIPT_RE.sub(script, html)
+    return html, assets
+
+
+def _hashed_key(stem: str, extension: str, content: bytes) -> str:
+    return f"{ASSETS_DIR}/{stem}.{hashlib.sha256(content).hexdigest()[:HASH_LENGTH]}{extension}"
+
+
+def _add_asset(entries: Dict[str, Dict[str, Any]], files_dir: str, key: str, content: bytes) -> None:
+    """Writes an asset and its compressed variants (same content = same key, written once)."""
+    if key in entries:
+        return
+    _write(files_dir, key, content)
+    entries[key] = _entry(key, content, "immutable")
+
+    for encoding, suffix in ENCODINGS:
+        compressed = _compress(content, encoding)
+        if compressed is None:
+            continue
+        _write(files_dir, key + suffix, compressed)
+        # Type and hash of the decoded content - the variant is the same file for the browser
+        entries[key + suffix] = _entry(key, compressed, "immutable", encoding=encoding, object_key=key + suffix)
+
+
+def _compress(content: bytes, encoding: str) -> Optional[bytes]:
+    if encoding == "gzip":
+        return gzip.compress(content, compresslevel=9, mtime=0)  # mtime=0 = same bytes every build
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(content, quality=11)
+    return None
+
+
+def _entry(key: str, data: bytes, policy: str, encoding: Optional[str] = None,
+           object_key: Optional[str] = None, api_config: bool = False) -> Dict[str, Any]:
+    return {
+        "key": object_key or key,
+        "content_type": CONTENT_TYPES.get(os.path.splitext(key)[1].lower(), "application/octet-stream"),
+        "content_encoding": encoding,
+        "cache_control": CACHE_POLICIES[policy],
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "size": len(data),
+        "api_config": api_config
+    }
+
+
+def _write(files_dir: str, key: str, data: bytes) -> None:
+    path = os.path.join(files_dir, *key.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
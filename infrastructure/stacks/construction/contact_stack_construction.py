@@ -63,7 +63,16 @@ class ContactConstructionStack(Stack):
         #-----------------------------
         # Create all contact form resources with one function call
         # Returns dict with table, lambda, and api references
-        contact_infra = create_contact_form_infrastructure(self, "construction")
+        # Queued notifications = visitors only wait for the DynamoDB write, SES emails are sent by a queue consumer
+        # dev = submissions stay 7 days in DynamoDB before they move to the S3 archive (see get_retention_days)
+        # The website's CloudFront URL may call the API too (until the custom domains are in place)
+        # Environment from the CDK context (cdk deploy -c environment=prod) - dev if not given
+        # It picks retention days and the contact Lambda's compute profile (see constants.py)
+        environment = self.node.try_get_context("environment") or "dev"
+        contact_infra = create_contact_form_infrastructure(
+            self, "construction", queued_notifications=True, environment=environment,
+            extra_origins=[f"https://{self.website.distribution.distribution_domain_name}"]
+        )
 
         # Store references on stack for potential future use
         self.contact_table = contact_infra["table"]
@@ -71,11 +80,16 @@ class ContactConstructionStack(Stack):
         self.api = contact_infra["api"]
 
         # Generate config with resolved URL
-        deploy_website(self, "construction", self.website.bucket, self.api.url)
+        # Pages are invalidated on CloudFront after each upload (hashed assets never need it)
+        # -c website_deploy=incremental = the website is left to infrastructure/tools/deploy_website.py,
+        # which uploads only changed files after cdk deploy
+        if self.node.try_get_context("website_deploy") != "incremental":
+            deploy_website(self, "construction", self.website.bucket, contact_infra["contact_api_url"],
+                           distribution=self.website.distribution)
 
         # TAGS FOR COST TRACKING
         #------------------------
-        tags = get_mandatory_tags("construction", "EN", "dev")
+        tags = get_mandatory_tags("construction", "EN", environment)
         for key, value in tags.items():
             Tags.of(self).add(key, value)
 
@@ -86,9 +100,21 @@ class ContactConstructionStack(Stack):
             description="CloudFront URL for website")
 
         CfnOutput(self, "ApiURL",
-            value=self.api.url,
+            value=contact_infra["contact_api_url"],
             description="API Gateway URL for contact form")
 
+        CfnOutput(self, "AdminApiKeyId",
+            value=contact_infra["api_key"].key_id,
+            description="API key id for GET /api/v1/contacts (value: aws apigateway get-api-key --include-value)")
+
+        CfnOutput(self, "ArchiveBucketName",
+            value=contact_infra["archive_bucket"].bucket_name,
+            description="S3 bucket with expired contact submissions (gzip NDJSON)")
+
+        CfnOutput(self, "DistributionId",
+            value=self.website.distribution.distribution_id,
+            description="CloudFront distribution of the website (invalidations)")
+
         CfnOutput(self, "BucketName",
             value=self.website.bucket.bucket_name,
             description="S3 bucket name for uploading HTML")
\ No newline at end of file
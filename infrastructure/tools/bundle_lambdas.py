@@ -0,0 +1,129 @@
+"""
+Report tool for the Lambda bundles (see infrastructure/shared/managers/lambda_bundles.py).
+
+Builds every handler's bundle into a temporary folder and compares it with the old
+Code.from_asset("lambdas") package:
+- size: zipped bytes Lambda downloads for the function (artifact + shared layer vs the whole folder)
+- cold import: handler import in a fresh interpreter, best of --runs
+  before = the lambdas sources without any .pyc (Lambda can't write __pycache__ on its read-only disk)
+  after  = the bundle's .pyc files
+
+The bundles are compiled with the running Python here, so run it with the runtime's (3.12) for
+numbers that match Lambda.
+
+Usage (from the project root):
+    python -m infrastructure.tools.bundle_lambdas
+    python -m infrastructure.tools.bundle_lambdas --runs 10 --handler construction.contact_handler_construction
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipfile
+from typing import Dict, Any, List, Optional, Sequence
+
+from infrastructure.shared.managers.lambda_bundles import (
+    HANDLER_MODULES, LAMBDAS_DIR, build_function, build_shared_layer, compiles_for_runtime
+)
+
+DEFAULT_RUNS = 5
+
+PROBE = """
+import time
+start = time.perf_counter()
+import {module}
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def zipped_size(*roots: str) -> int:
+    """Bytes of one deflated zip of all files under roots (what Code.from_asset uploads)."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for root in roots:
+            for folder, _, files in os.walk(root):
+                for name in files:
+                    path = os.path.join(folder, name)
+                    archive.write(path, os.path.relpath(path, root))
+    return buffer.tell()
+
+
+def import_ms(module: str, path: Sequence[str], runs: int) -> float:
+    """
+    Best of runs cold imports of module in fresh interpreters with only path on sys.path (+ stdlib).
+
+    No .pyc is written, so every run sees the same files - the folders' own __pycache__ or none.
+    """
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(os.path.abspath(p) for p in path),
+        "PYTHONDONTWRITEBYTECODE": "1"
+    }
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module)],
+            cwd=path[0], env=env, capture_output=True, text=True, check=True
+        )
+        timings.append(float(result.stdout.strip()))
+    return min(timings)
+
+
+def report(handler_modules: Sequence[str], runs: int = DEFAULT_RUNS, lambdas_dir: str = LAMBDAS_DIR) -> List[Dict[str, Any]]:
+    """
+    Builds the bundles and measures them against the plain lambdas folder.
+
+    Returns:
+        One row per handler: {"handler", "before_bytes", "after_bytes", "before_import_ms", "after_import_ms"}
+    """
+    rows = []
+    before_bytes = zipped_size(lambdas_dir)
+
+    with tempfile.TemporaryDirectory() as build_dir:
+        # The old package as Lambda ran it: sources only (local __pycache__ folders don't count)
+        sources_dir = os.path.join(build_dir, "sources")
+        shutil.copytree(lambdas_dir, sources_dir, ignore=shutil.ignore_patterns("__pycache__", "*.pyc"))
+
+        layer_dir = build_shared_layer(os.path.join(build_dir, "shared"), lambdas_dir=lambdas_dir)
+        layer_python = os.path.join(layer_dir, "python")
+
+        for module in handler_modules:
+            function_dir = build_function(module, os.path.join(build_dir, module), lambdas_dir)
+            rows.append({
+                "handler": module,
+                "before_bytes": before_bytes,
+                "after_bytes": zipped_size(function_dir, layer_dir),
+                "before_import_ms": round(import_ms(module, [sources_dir], runs), 2),
+                "after_import_ms": round(import_ms(module, [function_dir, layer_python], runs), 2)
+            })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare Lambda bundle sizes and cold import times")
+    parser.add_argument("--handler", action="append", help="handler module (default: all Lambda handlers)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="fresh interpreters per measurement")
+    parser.add_argument("--json", action="store_true", help="print the rows as JSON")
+    args = parser.parse_args(argv)
+
+    rows = report(args.handler or HANDLER_MODULES, args.runs)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    if not compiles_for_runtime():
+        print(f"Note: Python {sys.version_info[0]}.{sys.version_info[1]} - a synth here ships no .pyc "
+              f"(runtime is 3.12), the 'after' imports use this interpreter's .pyc")
+    print(f"{'handler':<50} {'zip before':>11} {'zip after':>10} {'import before':>14} {'import after':>13}")
+    for row in rows:
+        print(f"{row['handler']:<50} {row['before_bytes']:>11} {row['after_bytes']:>10} "
+              f"{row['before_import_ms']:>11.1f} ms {row['after_import_ms']:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
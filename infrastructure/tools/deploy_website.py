@@ -0,0 +1,269 @@
+"""
+Incremental website deployment: uploads only what changed since the last deploy.
+
+BucketDeployment re-syncs the whole site whenever any file changes and never touches CloudFront.
+This tool works from the build manifest (see website_assets.py) instead:
+- the manifest of the last deploy lives in the bucket (STATE_KEY) - a diff against it, per file
+  (content hash + metadata), decides what is uploaded, deleted or left alone
+- hashed assets first, pages last - a page never goes live before the assets it references
+- removed pages/files are deleted; removed hashed assets are kept for one more deploy, since pages
+  cached before this deploy (HTML TTL) still reference them
+- one CloudFront invalidation with exactly the added, changed and removed paths that aren't
+  content-hashed (/en/index.html also as /en/) - everything else keeps its edge cache. Added counts
+  too: the first run overwrites pages a BucketDeployment uploaded, and CloudFront has them cached
+- --dry-run prints the diff and the invalidation paths, nothing is written
+
+Files the tool never uploaded (ex. from a BucketDeployment) are left alone.
+Deploy the stack with -c website_deploy=incremental, so cdk deploy doesn't sync the website itself.
+
+Usage (AWS credentials from the usual profile/env, after cdk deploy):
+    python -m infrastructure.tools.deploy_website construction --dry-run
+    python -m infrastructure.tools.deploy_website construction --stack RanjdarGroup-Portfolio-Stack
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+from infrastructure.shared.config.constants import WEBSITE_BUILD_DIR
+from infrastructure.shared.managers.website_assets import (
+    API_CONFIG_PLACEHOLDER, CACHE_POLICIES, FILES_DIR, api_config_script, build_site, viewer_paths
+)
+
+# Manifest of the last deploy, in the website bucket next to the files
+STATE_KEY = "_deploy/website-manifest.json"
+
+DEFAULT_STACK = "RanjdarGroup-Portfolio-Stack"
+DEFAULT_WORKERS = 8
+
+# Object metadata that makes an upload necessary besides the content
+COMPARED_FIELDS = ("sha256", "content_type", "content_encoding", "cache_control")
+
+DELETE_BATCH = 1000  # DeleteObjects limit
+
+
+class DeployError(Exception):
+    """Raised when the stack doesn't have the outputs the deployment needs."""
+
+
+def desired_files(manifest: Dict[str, Any], build_dir: str, config_script: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Manifest entries by key, as they will be in the bucket.
+
+    Pages with the API config get the hash of the filled-in page - a new API URL is a change too.
+    """
+    files = {}
+    for entry in manifest["files"]:
+        entry = dict(entry)
+        if entry["api_config"]:
+            entry["sha256"] = hashlib.sha256(read_body(build_dir, entry, config_script)).hexdigest()
+        files[entry["key"]] = entry
+    return files
+
+
+def read_body(build_dir: str, entry: Dict[str, Any], config_script: str) -> bytes:
+    with open(os.path.join(build_dir, FILES_DIR, *entry["key"].split("/")), "rb") as f:
+        body = f.read()
+    if entry["api_config"]:
+        body = body.replace(API_CONFIG_PLACEHOLDER.encode("utf-8"), config_script.encode("utf-8"))
+    return body
+
+
+def plan_deploy(desired: Dict[str, Dict[str, Any]], previous: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Diff between the build and the last deploy's state.
+
+    Args:
+        desired: desired_files(...)
+        previous: state of the last deploy ({"files": {key: entry}, "retired": [keys]}), {} for none
+
+    Returns:
+        {"upload": [keys, hashed assets first], "added": [...], "changed": [...], "removed": [...],
+         "delete": [...], "retired": [...], "unchanged": n, "invalidate": [paths]}
+    """
+    previous_files = previous.get("files", {})
+    added = sorted(key for key in desired if key not in previous_files)
+    changed = sorted(
+        key for key in desired
+        if key in previous_files
+        and any(desired[key].get(field) != previous_files[key].get(field) for field in COMPARED_FIELDS)
+    )
+    removed = sorted(key for key in previous_files if key not in desired)
+
+    def immutable(entry: Dict[str, Any]) -> bool:
+        return entry.get("cache_control") == CACHE_POLICIES["immutable"]
+
+    # Assets dropped now stay until the next deploy, the ones dropped last time go now
+    retired = [key for key in removed if immutable(previous_files[key])]
+    delete = sorted(
+        [key for key in removed if not immutable(previous_files[key])]
+        + [key for key in previous.get("retired", []) if key not in desired and key not in retired]
+    )
+
+    # Hashed names are new URLs - only the others can be stale at the edges. Added keys included:
+    # "added" only means not uploaded by this tool, the edges may still hold an older copy
+    invalidate = sorted({
+        path
+        for key, entry in [(key, desired[key]) for key in added + changed]
+        + [(key, previous_files[key]) for key in removed]
+        if not immutable(entry)
+        for path in viewer_paths(key)
+    })
+
+    return {
+        "upload": sorted(added + changed, key=lambda key: (not immutable(desired[key]), key)),
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+        "delete": delete,
+        "retired": sorted(retired),
+        "unchanged": len(desired) - len(added) - len(changed),
+        "invalidate": invalidate
+    }
+
+
+def load_state(s3: Any, bucket: str) -> Dict[str, Any]:
+    """State of the last deploy - {} before the first one."""
+    try:
+        response = s3.get_object(Bucket=bucket, Key=STATE_KEY)
+    except Exception as e:
+        code = getattr(e, "response", {}).get("Error", {}).get("Code", "")
+        if code not in ("NoSuchKey", "404"):
+            raise
+        return {}
+    return json.loads(response["Body"].read())
+
+
+def deploy_website(
+        s3: Any,
+        cloudfront: Any,
+        bucket: str,
+        distribution_id: Optional[str],
+        build_dir: str,
+        manifest: Dict[str, Any],
+        config_script: str,
+        dry_run: bool = False,
+        workers: int = DEFAULT_WORKERS
+) -> Dict[str, Any]:
+    """
+    Brings the bucket to the build's state and invalidates the changed paths.
+
+    Args:
+        s3: S3 client
+        cloudfront: CloudFront client (not called without distribution_id or invalidation paths)
+        bucket: website bucket
+        distribution_id: the website's distribution, None = no invalidation
+        build_dir: build_site output folder
+        manifest: build_site result
+        config_script: api_config_script(...) for the pages that load the API config
+        dry_run: only plan
+        workers: parallel uploads
+
+    Returns:
+        plan_deploy(...) result + {"dry_run": bool, "invalidation_id": str or None}
+    """
+    desired = desired_files(manifest, build_dir, config_script)
+    plan = plan_deploy(desired, load_state(s3, bucket))
+    summary = dict(plan, dry_run=dry_run, invalidation_id=None)
+    if dry_run:
+        return summary
+
+    def upload(key: str) -> None:
+        entry = desired[key]
+        extra = {"ContentEncoding": entry["content_encoding"]} if entry["content_encoding"] else {}
+        s3.put_object(
+            Bucket=bucket, Key=key, Body=read_body(build_dir, entry, config_script),
+            ContentType=entry["content_type"], CacheControl=entry["cache_control"], **extra
+        )
+
+    # Assets before pages: the pages go up only after every asset upload finished
+    assets = [key for key in plan["upload"] if desired[key]["cache_control"] == CACHE_POLICIES["immutable"]]
+    pages = [key for key in plan["upload"] if key not in assets]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch in (assets, pages):
+            list(executor.map(upload, batch))  # list() re-raises the first failed upload
+
+    for start in range(0, len(plan["delete"]), DELETE_BATCH):
+        s3.delete_objects(Bucket=bucket, Delete={
+            "Objects": [{"Key": key} for key in plan["delete"][start:start + DELETE_BATCH]],
+            "Quiet": True
+        })
+
+    if distribution_id and plan["invalidate"]:
+        response = cloudfront.create_invalidation(
+            DistributionId=distribution_id,
+            InvalidationBatch={
+                "Paths": {"Quantity": len(plan["invalidate"]), "Items": plan["invalidate"]},
+                # Unique per run - a rollback to an earlier state must invalidate again, not get the old batch back
+                "CallerReference": str(uuid.uuid4())
+            }
+        )
+        summary["invalidation_id"] = response["Invalidation"]["Id"]
+
+    # Written last, after the invalidation - an interrupted or failed deploy is simply run again
+    # and redoes what's missing, invalidation included
+    state = {"files": desired, "retired": plan["retired"]}
+    s3.put_object(Bucket=bucket, Key=STATE_KEY, Body=json.dumps(state, sort_keys=True).encode("utf-8"),
+                  ContentType="application/json", CacheControl="no-store")
+    return summary
+
+
+def stack_outputs(cloudformation: Any, stack_name: str) -> Dict[str, str]:
+    """Outputs of the deployed stack - BucketName, ApiURL and DistributionId are needed."""
+    stack = cloudformation.describe_stacks(StackName=stack_name)["Stacks"][0]
+    outputs = {output["OutputKey"]: output["OutputValue"] for output in stack.get("Outputs", [])}
+    missing = [name for name in ("BucketName", "ApiURL", "DistributionId") if name not in outputs]
+    if missing:
+        raise DeployError(f"{stack_name} has no {', '.join(missing)} output - deploy the stack first")
+    return outputs
+
+
+def format_plan(summary: Dict[str, Any]) -> str:
+    lines = [f"+ {key}" for key in summary["added"]]
+    lines += [f"~ {key}" for key in summary["changed"]]
+    lines += [f"- {key}" for key in summary["delete"]]
+    lines += [f"  {key} (kept one more deploy)" for key in summary["retired"]]
+    lines.append(f"{len(summary['upload'])} to upload, {len(summary['delete'])} to delete, "
+                 f"{summary['unchanged']} unchanged")
+    lines += [f"invalidate {path}" for path in summary["invalidate"]] or ["nothing to invalidate"]
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Upload the changed website files and invalidate their paths")
+    parser.add_argument("business_unit", help="construction, retail, etc.")
+    parser.add_argument("--stack", default=DEFAULT_STACK, help="deployed stack with the website outputs")
+    parser.add_argument("--dry-run", action="store_true", help="print the diff, change nothing")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--region", default=os.environ.get("CDK_DEFAULT_REGION", "eu-central-1"))
+    args = parser.parse_args(argv)
+
+    # Local tool, not Lambda - plain boto3 is fine here
+    import boto3
+
+    outputs = stack_outputs(boto3.client("cloudformation", region_name=args.region), args.stack)
+    build_dir = os.path.join(WEBSITE_BUILD_DIR, args.business_unit)
+    manifest = build_site(os.path.join("website", args.business_unit), build_dir)
+
+    summary = deploy_website(
+        s3=boto3.client("s3", region_name=args.region),
+        cloudfront=boto3.client("cloudfront"),
+        bucket=outputs["BucketName"],
+        distribution_id=outputs["DistributionId"],
+        build_dir=build_dir,
+        manifest=manifest,
+        config_script=api_config_script(outputs["ApiURL"], args.business_unit),
+        dry_run=args.dry_run,
+        workers=args.workers
+    )
+    print(format_plan(summary))
+    if summary["invalidation_id"]:
+        print(f"invalidation {summary['invalidation_id']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+Export tool for contact form submissions (CRM imports, backups).
+
+Streams a business unit's submissions into gzip compressed CSV or NDJSON part files:
+- full export  -> parallel Scan, N segments on a thread pool
+- time window  -> Query on the sk prefix (CONTACT#<iso timestamp>) of every shard, in parallel - no Scan at all
+
+Only one page per segment is in memory at a time. Part files are closed every --part-rows rows,
+and each close writes a checkpoint, so a crashed export continues where the last part ended:
+re-run the same command and it skips everything already in a closed part.
+
+Usage (AWS credentials from the usual profile/env):
+    python -m infrastructure.tools.export_contacts construction --segments 8
+    python -m infrastructure.tools.export_contacts construction --format csv --from 2025-06-01 --to 2025-06-30
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+from infrastructure.shared.config.constants import (
+    CONTACT_SHARD_COUNT, get_contact_partition_keys, get_contact_table_name, get_resource_names
+)
+# Pure modules of the Lambda package (no shared.* imports) - items are decoded exactly like the API does
+from lambdas.shared.codec import VERSION_ATTRIBUTE, decode_item, physical_names
+from lambdas.shared.dynamo import deserialize_item
+from lambdas.shared.form_schema import all_field_names
+
+# Columns of an export (same order in CSV) - keys, GSI and TTL attributes stay internal
+# Form fields come from the form schemas, so a new unit's fields are exported without a code change
+EXPORT_FIELDS = (
+    ("contact_id", "business_unit", "timestamp", "status", "environment")
+    + all_field_names()
+    + ("source_domain",)
+)
+
+FORMATS = ("ndjson", "csv")
+
+DEFAULT_SEGMENTS = 4
+DEFAULT_PAGE_SIZE = 500  # items per Scan/Query page (DynamoDB also stops at 1 MB)
+DEFAULT_PART_ROWS = 50000  # rows per part file = how much work a crash can cost
+
+# Attributes read per item - old and codec names of the fields, pk for the submission check
+PROJECTION = ("pk", VERSION_ATTRIBUTE) + physical_names(EXPORT_FIELDS)
+
+# Only submissions - idempotency and rate-limit records live in the same table
+SUBMISSION_PREFIX = "BU#"
+
+
+class ExportError(Exception):
+    """Raised when a checkpoint doesn't belong to the requested export."""
+
+
+def to_row(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converts a low-level DynamoDB item (any codec version) into an export row (only EXPORT_FIELDS).
+    """
+    plain = decode_item(deserialize_item(item))
+    return {field: plain[field] for field in EXPORT_FIELDS if field in plain}
+
+
+class PartWriter:
+    """
+    Thread-safe writer for gzip part files with checkpointing.
+
+    Workers hand in one page at a time together with the key to continue from.
+    Positions are only persisted when a part file is closed, so the checkpoint never
+    points past rows that aren't safely on disk.
+    """
+
+    def __init__(self, output_prefix: str, fmt: str, part_rows: int, checkpoint_path: str,
+                 checkpoint: Dict[str, Any]):
+        self.output_prefix = output_prefix
+        self.fmt = fmt
+        self.part_rows = part_rows
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint = checkpoint
+
+        # Positions as of the rows written so far (persisted copy is in self.checkpoint)
+        self.positions: Dict[str, Any] = json.loads(json.dumps(checkpoint["positions"]))
+        self.rows = checkpoint["rows"]
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._csv = None
+        self._rows_in_part = 0
+
+    def part_path(self, index: int) -> str:
+        return f"{self.output_prefix}-{index:05d}.{self.fmt}.gz"
+
+    def _open_part(self) -> None:
+        # newline="" - the csv module writes its own line endings
+        self._file = gzip.open(self.part_path(self.checkpoint["parts"]), "wt", encoding="utf-8", newline="")
+        if self.fmt == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=EXPORT_FIELDS, restval="")
+            self._csv.writeheader()
+
+    def _close_part(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        self._rows_in_part = 0
+
+        self.checkpoint["parts"] += 1
+        self.checkpoint["rows"] = self.rows
+        self.checkpoint["positions"] = json.loads(json.dumps(self.positions))
+        save_checkpoint(self.checkpoint_path, self.checkpoint)
+
+    def write_page(self, segment: str, items: List[Dict[str, Any]], next_key: Optional[Dict[str, Any]]) -> None:
+        """
+        Writes one page and moves the segment's position.
+
+        Args:
+            segment: segment id ("0".."N-1", or the partition key in time-window mode)
+            items: low-level DynamoDB items of the page
+            next_key: LastEvaluatedKey (None = segment finished)
+        """
+        with self._lock:
+            rows = [to_row(item) for item in items if item["pk"]["S"].startswith(SUBMISSION_PREFIX)]
+            if rows:
+                if self._file is None:
+                    self._open_part()
+                for row in rows:
+                    if self._csv is not None:
+                        self._csv.writerow(row)
+                    else:
+                        self._file.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n")
+                self._rows_in_part += len(rows)
+                self.rows += len(rows)
+
+            self.positions[segment] = {"start_key": next_key, "done": next_key is None}
+
+            if self._rows_in_part >= self.part_rows:
+                self._close_part()
+
+    def finish(self) -> None:
+        """Closes the last part and marks the export complete."""
+        with self._lock:
+            self._close_part()
+            self.checkpoint["positions"] = json.loads(json.dumps(self.positions))
+            self.checkpoint["complete"] = True
+            save_checkpoint(self.checkpoint_path, self.checkpoint)
+
+
+def save_checkpoint(path: str, checkpoint: Dict[str, Any]) -> None:
+    """Writes the checkpoint atomically - a crash mid-write leaves the previous one intact."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(checkpoint, file)
+    os.replace(temp_path, path)
+
+
+def load_checkpoint(path: str, settings: Dict[str, Any], segment_ids: List[str]) -> Dict[str, Any]:
+    """
+    Loads the checkpoint of an earlier run, or starts a new one.
+
+    Raises:
+        ExportError: if the checkpoint was written for different settings
+    """
+    if not os.path.exists(path):
+        return {
+            "settings": settings,
+            "parts": 0,
+            "rows": 0,
+            "complete": False,
+            "positions": {segment: {"start_key": None, "done": False} for segment in segment_ids}
+        }
+
+    with open(path, encoding="utf-8") as file:
+        checkpoint = json.load(file)
+
+    if checkpoint.get("settings") != settings:
+        raise ExportError(f"{path} belongs to another export ({checkpoint.get('settings')}) - "
+                          f"delete it or use the same options")
+    return checkpoint
+
+
+def _scan_segment(client: Any, table_name: str, segment: int, total_segments: int, page_size: int,
+                  writer: PartWriter) -> None:
+    segment_id = str(segment)
+    position = writer.positions[segment_id]
+    if position["done"]:
+        return
+
+    names = {f"#f{i}": field for i, field in enumerate(PROJECTION)}
+    request = {
+        "TableName": table_name,
+        "Segment": segment,
+        "TotalSegments": total_segments,
+        "Limit": page_size,
+        "FilterExpression": "begins_with(pk, :prefix)",
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+        "ExpressionAttributeValues": {":prefix": {"S": SUBMISSION_PREFIX}}
+    }
+    start_key = position["start_key"]
+
+    while True:
+        if start_key:
+            request["ExclusiveStartKey"] = start_key
+        page = client.scan(**request)
+        start_key = page.get("LastEvaluatedKey")
+        writer.write_page(segment_id, page.get("Items", []), start_key)
+        if not start_key:
+            return
+
+
+def _query_window(client: Any, table_name: str, partition: str, time_from: str, time_to: str, page_size: int,
+                  writer: PartWriter) -> None:
+    position = writer.positions[partition]
+    if position["done"]:
+        return
+
+    names = {f"#f{i}": field for i, field in enumerate(PROJECTION)}
+    request = {
+        "TableName": table_name,
+        "Limit": page_size,
+        "KeyConditionExpression": "pk = :p AND sk BETWEEN :from AND :to",
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+        # "~" sorts after every timestamp character - --to 2025-06-30 includes the whole day
+        "ExpressionAttributeValues": {
+            ":p": {"S": partition},
+            ":from": {"S": f"CONTACT#{time_from}"},
+            ":to": {"S": f"CONTACT#{time_to}~"}
+        }
+    }
+    start_key = position["start_key"]
+
+    while True:
+        if start_key:
+            request["ExclusiveStartKey"] = start_key
+        page = client.query(**request)
+        start_key = page.get("LastEvaluatedKey")
+        writer.write_page(partition, page.get("Items", []), start_key)
+        if not start_key:
+            return
+
+
+def export_contacts(
+        client: Any,
+        business_unit: str,
+        output_prefix: str,
+        fmt: str = "ndjson",
+        segments: int = DEFAULT_SEGMENTS,
+        time_from: str = "",
+        time_to: str = "",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        part_rows: int = DEFAULT_PART_ROWS,
+        checkpoint_path: str = "",
+        shard_count: int = CONTACT_SHARD_COUNT
+) -> Dict[str, Any]:
+    """
+    Exports a business unit's submissions (resumes automatically from the checkpoint).
+
+    Args:
+        client: low-level DynamoDB client
+        business_unit: construction, retail, etc.
+        output_prefix: part files are <prefix>-00000.<fmt>.gz, <prefix>-00001.<fmt>.gz, ...
+        fmt: ndjson or csv (every CSV part has its own header)
+        segments: parallel Scan segments/threads (ignored in time-window mode)
+        time_from, time_to: ISO date/timestamp bounds - either one set = Query instead of Scan
+        page_size: items per request
+        part_rows: rows per part file
+        checkpoint_path: defaults to <prefix>.checkpoint.json
+        shard_count: write shards - time-window mode queries each of them (and the unsharded key)
+
+    Returns:
+        {"rows": n, "parts": n, "mode": "scan" or "query", "checkpoint": path}
+    """
+    if fmt not in FORMATS:
+        raise ExportError(f"format must be one of {', '.join(FORMATS)}")
+
+    table_name = get_contact_table_name(business_unit)
+    checkpoint_path = checkpoint_path or f"{output_prefix}.checkpoint.json"
+    window_mode = bool(time_from or time_to)
+
+    partitions = get_contact_partition_keys(business_unit, shard_count)
+    settings = {
+        "table": table_name,
+        "format": fmt,
+        "mode": "query" if window_mode else "scan",
+        "segments": len(partitions) if window_mode else segments,
+        "from": time_from,
+        "to": time_to
+    }
+    segment_ids = partitions if window_mode else [str(segment) for segment in range(segments)]
+
+    checkpoint = load_checkpoint(checkpoint_path, settings, segment_ids)
+    if not checkpoint["complete"]:
+        writer = PartWriter(output_prefix, fmt, part_rows, checkpoint_path, checkpoint)
+
+        with ThreadPoolExecutor(max_workers=len(segment_ids), thread_name_prefix="export") as pool:
+            if window_mode:
+                futures = [
+                    pool.submit(_query_window, client, table_name, partition, time_from or "0", time_to or "~",
+                                page_size, writer)
+                    for partition in partitions
+                ]
+            else:
+                futures = [
+                    pool.submit(_scan_segment, client, table_name, segment, segments, page_size, writer)
+                    for segment in range(segments)
+                ]
+            # result() re-raises a worker's error - the checkpoint keeps what's done
+            for future in futures:
+                future.result()
+
+        writer.finish()
+
+    return {
+        "rows": checkpoint["rows"],
+        "parts": checkpoint["parts"],
+        "mode": settings["mode"],
+        "checkpoint": checkpoint_path
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export contact form submissions to gzip CSV/NDJSON part files")
+    parser.add_argument("business_unit", help="construction, retail, etc.")
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--segments", type=int, default=DEFAULT_SEGMENTS, help="parallel Scan segments/threads")
+    parser.add_argument("--from", dest="time_from", default="", help="ISO date/timestamp, Query mode")
+    parser.add_argument("--to", dest="time_to", default="", help="ISO date/timestamp (inclusive), Query mode")
+    parser.add_argument("--output", default="", help="part file prefix (default: ranjdargroup-<unit>-contacts-export)")
+    parser.add_argument("--part-rows", type=int, default=DEFAULT_PART_ROWS)
+    parser.add_argument("--shards", type=int, default=CONTACT_SHARD_COUNT, help="write shards (time-window mode)")
+    parser.add_argument("--region", default=os.environ.get("CDK_DEFAULT_REGION", "eu-central-1"))
+    args = parser.parse_args(argv)
+
+    # Local tool, not Lambda - plain boto3 is fine here
+    import boto3
+    from botocore.config import Config
+
+    client = boto3.client(
+        "dynamodb",
+        region_name=args.region,
+        # One connection per segment thread, adaptive retries back off when the Scan gets throttled
+        config=Config(max_pool_connections=max(args.segments, 10), retries={"mode": "adaptive"})
+    )
+
+    summary = export_contacts(
+        client=client,
+        business_unit=args.business_unit,
+        output_prefix=args.output or get_resource_names(args.business_unit, "contacts-export"),
+        fmt=args.format,
+        segments=args.segments,
+        time_from=args.time_from,
+        time_to=args.time_to,
+        part_rows=args.part_rows,
+        shard_count=args.shards
+    )
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
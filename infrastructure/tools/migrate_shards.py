@@ -0,0 +1,135 @@
+"""
+Migration tool for write sharding: moves submissions from the unsharded BU#<UNIT> key to their shard.
+
+Readers already include the unsharded key, so the migration can run any time after the sharded
+Lambdas are deployed - it only gets rid of the extra Query per page. Each item is moved in its own
+transaction (put under the new key + delete of the old one), so no item is ever lost or doubled,
+and an interrupted run is simply started again.
+
+Usage (AWS credentials from the usual profile/env):
+    python -m infrastructure.tools.migrate_shards construction --dry-run
+    python -m infrastructure.tools.migrate_shards construction
+"""
+
+import argparse
+import json
+import os
+from typing import Dict, Any, List, Optional
+
+from infrastructure.shared.config.constants import (
+    CONTACT_SHARD_COUNT, get_contact_partition_key, get_contact_table_name
+)
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def sharded_item(item: Dict[str, Any], business_unit: str, shard_count: int) -> Dict[str, Any]:
+    """
+    Copy of a low-level item under its shard's keys (pk and the status GSI key).
+
+    Returns:
+        New item - sk, TTL and all other attributes unchanged
+    """
+    # sk = CONTACT#<timestamp>#<contact_id> - same for every item codec version
+    contact_id = item["sk"]["S"].rsplit("#", 1)[1]
+    new_pk = get_contact_partition_key(business_unit, contact_id, shard_count)
+    suffix = new_pk[len(item["pk"]["S"]):]  # "#03"
+
+    moved = dict(item, pk={"S": new_pk})
+    if "bu_status" in item:
+        moved["bu_status"] = {"S": item["bu_status"]["S"] + suffix}
+    return moved
+
+
+def migrate_shards(
+        client: Any,
+        business_unit: str,
+        shard_count: int = CONTACT_SHARD_COUNT,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Moves every submission under the unsharded key to its shard.
+
+    Args:
+        client: low-level DynamoDB client
+        business_unit: construction, retail, etc.
+        shard_count: must match the Lambdas' SHARD_COUNT
+        page_size: items per Query page
+        dry_run: only count what would be moved
+
+    Returns:
+        {"moved": n, "skipped": n, "dry_run": bool}
+    """
+    table_name = get_contact_table_name(business_unit)
+    legacy_key = get_contact_partition_key(business_unit, "", 1)
+    summary = {"moved": 0, "skipped": 0, "dry_run": dry_run}
+
+    if shard_count <= 1:
+        return summary
+
+    request = {
+        "TableName": table_name,
+        "KeyConditionExpression": "pk = :p",
+        "ExpressionAttributeValues": {":p": {"S": legacy_key}},
+        "Limit": page_size,
+        # Strongly consistent - items just written by a Lambda still running the old code are seen
+        "ConsistentRead": True
+    }
+
+    while True:
+        page = client.query(**request)
+
+        for item in page.get("Items", []):
+            if dry_run:
+                summary["moved"] += 1
+                continue
+
+            try:
+                client.transact_write_items(TransactItems=[
+                    {"Put": {
+                        "TableName": table_name,
+                        "Item": sharded_item(item, business_unit, shard_count),
+                        "ConditionExpression": "attribute_not_exists(pk)"
+                    }},
+                    {"Delete": {
+                        "TableName": table_name,
+                        "Key": {"pk": item["pk"], "sk": item["sk"]},
+                        "ConditionExpression": "attribute_exists(pk)"
+                    }}
+                ])
+                summary["moved"] += 1
+            except Exception as e:
+                # Cancelled = another run moved it in the meantime (both conditions protect the data)
+                code = getattr(e, "response", {}).get("Error", {}).get("Code", "")
+                if code != "TransactionCanceledException":
+                    raise
+                summary["skipped"] += 1
+
+        if "LastEvaluatedKey" not in page:
+            return summary
+        request["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Move unsharded contact submissions to their write shard")
+    parser.add_argument("business_unit", help="construction, retail, etc.")
+    parser.add_argument("--shards", type=int, default=CONTACT_SHARD_COUNT)
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--region", default=os.environ.get("CDK_DEFAULT_REGION", "eu-central-1"))
+    args = parser.parse_args(argv)
+
+    # Local tool, not Lambda - plain boto3 is fine here
+    import boto3
+
+    summary = migrate_shards(
+        client=boto3.client("dynamodb", region_name=args.region),
+        business_unit=args.business_unit,
+        shard_count=args.shards,
+        dry_run=args.dry_run
+    )
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Lambda handler for the construction contact table's stream.
+Single wrapper around the shared retention manager - archives submissions deleted by TTL to S3.
+"""
+
+import os
+from typing import Dict, Any
+
+from shared.retention import process_stream_batch
+from shared.client_config import prime
+
+#-----------------------------------------------------------
+# Environment variables from CDK - static: - CDK sets them
+#                                          - Lambda reads them
+
+# S3 bucket for the gzip NDJSON archive
+ARCHIVE_BUCKET = os.environ.get("ARCHIVE_BUCKET")
+
+
+def archive_handler_construction(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Archives expired construction contact form submissions.
+
+    Args:
+        event: DynamoDB stream event (TTL deletes only, filtered by the event source)
+        context: AWS Lambda context - remaining time sizes the AWS client timeouts
+
+    Returns:
+        Partial batch response so the stream is retried from the first failed record
+    """
+    prime(context)
+    return process_stream_batch(event=event, bucket_name=ARCHIVE_BUCKET)
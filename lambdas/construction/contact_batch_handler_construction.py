@@ -0,0 +1,49 @@
+"""
+Lambda handler for bulk construction contact submissions (trade fair leads, partner spreadsheets).
+Single wrapper around the shared batch ingestion manager.
+"""
+
+import os
+from typing import Dict, Any
+
+from shared.batch_ingest import process_contact_batch_submission
+from shared.client_config import prime
+
+#-----------------------------------------------------------
+# Environment variables from CDK - static: - CDK sets them
+#                                          - Lambda reads them
+
+# DynamoDB table name - CDK creates the table and tells Lambda it's name
+TABLE_NAME = os.environ.get("TABLE_NAME")
+
+# Deployment environment - CDK passes dev or prod to control behavior
+ENVIRONMENT = os.environ.get("ENVIRONMENT")
+
+# Days a submission stays in DynamoDB before TTL hands it to the S3 archive (0 = forever)
+RETENTION_DAYS = int(os.environ.get("RETENTION_DAYS", "0"))
+
+# Write shards per business unit - same value as the contact handler
+SHARD_COUNT = int(os.environ.get("SHARD_COUNT", "1"))
+
+
+def contact_batch_handler_construction(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Stores a batch of construction contact submissions.
+
+    Args:
+        event: API Gateway event with {"submissions": [...]}
+        context: AWS Lambda context - remaining time bounds the write retries
+
+    Returns:
+        HTTPS response for API Gateway with one result per submission
+    """
+    prime(context)
+    return process_contact_batch_submission(
+        event=event,
+        business_unit="construction",
+        table_name=TABLE_NAME,
+        environment=ENVIRONMENT,
+        retention_days=RETENTION_DAYS,
+        shard_count=SHARD_COUNT,
+        remaining_time_ms=context.get_remaining_time_in_millis() if context else None
+    )
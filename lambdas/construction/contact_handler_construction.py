@@ -5,13 +5,11 @@ Single wrapper around the shared contact form manager.
 
 import os
 from typing import Dict, Any
-# noinspection PyPackageRequirements
-import boto3
 
 from shared.handlers_manager import process_contact_form_submission
+from shared.client_config import prime
 
-# AWS client for DynamoDB
-dynamodb = boto3.resource("dynamodb")
+# No AWS clients here - shared.clients creates them on first use (faster cold start)
 
 #-----------------------------------------------------------
 # Environment variables from CDK - static: - CDK sets them
@@ -29,6 +27,18 @@ TO_EMAIL = os.environ.get("TO_EMAIL")
 # Deployment environment - CDK passes dev or prod to control behavior
 ENVIRONMENT = os.environ.get("ENVIRONMENT")
 
+# inline/concurrent = send SES email during the request, queue = hand it to the notification consumer via SQS
+NOTIFICATION_MODE = os.environ.get("NOTIFICATION_MODE", "inline")
+
+# SQS queue for queue mode - only set when CDK creates the queue
+NOTIFICATION_QUEUE_URL = os.environ.get("NOTIFICATION_QUEUE_URL", "")
+
+# Days a submission stays in DynamoDB before TTL hands it to the S3 archive (0 = forever)
+RETENTION_DAYS = int(os.environ.get("RETENTION_DAYS", "0"))
+
+# Write shards per business unit (1 = unsharded) - the contacts query Lambda gets the same value
+SHARD_COUNT = int(os.environ.get("SHARD_COUNT", "1"))
+
 
 # event + context = Lambda required signature param (like __init__(self))
 def contact_handler_construction(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -36,18 +46,22 @@ def contact_handler_construction(event: Dict[str, Any], context: Any) -> Dict[st
     Processes construction contact form submission.
 
     Args:
-        event: API Gateway event with form data (dict)
-        context: AWS Lambda context - rarely used
+        event: API Gateway event with form data (dict) - REST API (payload 1.0) or HTTP API (payload 2.0)
+        context: AWS Lambda context - remaining time sizes the AWS client timeouts
 
     Returns:
         HTTPS response for API Gateway
     """
-    _ = context # Lambda requires this parameter
+    prime(context)
     return process_contact_form_submission(
         event=event,
         business_unit="construction",
         table_name=TABLE_NAME,
         from_email=FROM_EMAIL,
         to_email=TO_EMAIL,
-        environment=ENVIRONMENT
+        environment=ENVIRONMENT,
+        notification_mode=NOTIFICATION_MODE,
+        notification_queue_url=NOTIFICATION_QUEUE_URL,
+        retention_days=RETENTION_DAYS,
+        shard_count=SHARD_COUNT
     )
\ No newline at end of file
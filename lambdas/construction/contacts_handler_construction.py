@@ -0,0 +1,40 @@
+"""
+Lambda handler for the construction business contacts query API (GET /api/v1/contacts).
+Single wrapper around the shared contacts query - read-only access for triage/admin UI.
+"""
+
+import os
+from typing import Dict, Any
+
+from shared.contacts_query import process_contacts_query
+from shared.client_config import prime
+
+#-----------------------------------------------------------
+# Environment variables from CDK - static: - CDK sets them
+#                                          - Lambda reads them
+
+# DynamoDB table name - CDK creates the table and tells Lambda it's name
+TABLE_NAME = os.environ.get("TABLE_NAME")
+
+# Write shards per business unit - must match the contact handler's SHARD_COUNT
+SHARD_COUNT = int(os.environ.get("SHARD_COUNT", "1"))
+
+
+def contacts_handler_construction(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lists construction contact form submissions.
+
+    Args:
+        event: API Gateway event with query string parameters
+        context: AWS Lambda context - remaining time sizes the AWS client timeouts
+
+    Returns:
+        HTTPS response for API Gateway
+    """
+    prime(context)
+    return process_contacts_query(
+        event=event,
+        business_unit="construction",
+        table_name=TABLE_NAME,
+        shard_count=SHARD_COUNT
+    )
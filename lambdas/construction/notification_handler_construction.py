@@ -0,0 +1,48 @@
+"""
+Lambda handler for construction contact form email notifications.
+Single wrapper around the shared notification consumer - drains the SQS queue the contact handler writes to.
+"""
+
+import os
+from typing import Dict, Any
+
+from shared.notifications import process_notification_batch
+from shared.client_config import prime
+
+#-----------------------------------------------------------
+# Environment variables from CDK - static: - CDK sets them
+#                                          - Lambda reads them
+
+# Email Lambda will send from (CDK passes this, no default provided to bypass potential silent failing)
+FROM_EMAIL = os.environ.get("FROM_EMAIL")
+
+# Recipient for form notifications - my email until other further decisions
+TO_EMAIL = os.environ.get("TO_EMAIL")
+
+# Where malformed or permanently rejected jobs are moved
+DEAD_LETTER_QUEUE_URL = os.environ.get("DEAD_LETTER_QUEUE_URL", "")
+
+# Max parallel consumers (matches the SQS event source max_concurrency) - used to split the SES send rate
+CONSUMER_CONCURRENCY = int(os.environ.get("CONSUMER_CONCURRENCY", "1"))
+
+
+def notification_handler_construction(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Sends the queued construction contact form emails.
+
+    Args:
+        event: SQS event with a batch of notification jobs
+        context: AWS Lambda context - used for the remaining time
+
+    Returns:
+        Partial batch response so only failed messages are retried
+    """
+    prime(context)
+    return process_notification_batch(
+        event=event,
+        from_email=FROM_EMAIL,
+        to_email=TO_EMAIL,
+        dead_letter_queue_url=DEAD_LETTER_QUEUE_URL,
+        consumer_concurrency=CONSUMER_CONCURRENCY,
+        remaining_time_ms=context.get_remaining_time_in_millis() if context else None
+    )
@@ -0,0 +1,25 @@
+"""
+ASGI entry point of the contact API for container deployments (ECS/Fargate, App Runner, ...) and local runs.
+Same business logic as the Lambda handlers, many submissions per process (see shared/asgi.py).
+
+Run from the project root with any ASGI server, ex.:
+    uvicorn container.contact_app:app --app-dir lambdas --port 8080
+"""
+
+import os
+
+from shared.asgi import ContactApp, DEFAULT_WORKERS
+
+# Units come from the UNIT_<UNIT> environment variables, like for the router Lambda (shared/router.py)
+# Also needs AWS_REGION and credentials (task role) - the Lambda runtime isn't there to set them
+
+# Unit of a single-unit container (empty = unit from the path or ?business_unit=)
+DEFAULT_BUSINESS_UNIT = os.environ.get("DEFAULT_BUSINESS_UNIT") or None
+
+# Threads for the AWS calls = submissions waiting for AWS at the same time
+WORKERS = int(os.environ.get("WORKERS", str(DEFAULT_WORKERS)))
+
+# Load balancers in front that append to X-Forwarded-For (0 = clients connect directly)
+TRUSTED_PROXY_HOPS = int(os.environ.get("TRUSTED_PROXY_HOPS", "0"))
+
+app = ContactApp(default_unit=DEFAULT_BUSINESS_UNIT, workers=WORKERS, trusted_proxy_hops=TRUSTED_PROXY_HOPS)
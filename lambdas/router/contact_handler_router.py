@@ -0,0 +1,27 @@
+"""
+Lambda handler for the shared contact form router.
+One function for the contact forms of all registered business units (see shared/router.py).
+"""
+
+from typing import Dict, Any
+
+from shared.router import route_contact_submission
+from shared.client_config import prime
+
+# No AWS clients here - shared.clients creates them on first use (faster cold start)
+# Per-unit settings come from the UNIT_<UNIT> environment variables CDK sets (read by shared.router)
+
+
+def contact_handler_router(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Processes a contact form submission of any registered business unit.
+
+    Args:
+        event: API Gateway event with form data (dict) - REST API (payload 1.0) or HTTP API (payload 2.0)
+        context: AWS Lambda context - remaining time sizes the AWS client timeouts
+
+    Returns:
+        HTTPS response for API Gateway
+    """
+    prime(context)
+    return route_contact_submission(event)
@@ -0,0 +1,279 @@
+"""
+Shared ASGI adapter: the contact API as a long-lived container process (or locally for development).
+
+A Lambda container handles one request at a time. Behind any ASGI server (uvicorn, hypercorn, ...)
+one process serves many submissions at once, with the same business logic as the Lambdas:
+    HTTP request -> API Gateway (REST proxy) event -> route_contact_submission_async
+                 -> create_cors_response dict -> HTTP response
+
+Routes (the contact API's, see contact_form_infrastructure.py):
+    POST    /api/v1/contact                  unit = the app's default unit, or ?business_unit=...
+    POST    /api/v1/{business_unit}/contact  unit from the path (like the router Lambda)
+    OPTIONS both of them                     CORS preflight (API Gateway answers it without Lambda)
+    GET     /health                          for the container platform's health checks
+The admin APIs (batch ingestion, contacts query) stay Lambda-only - they sit behind API keys.
+
+Units come from the same UNIT_<UNIT> registry as the router Lambda (router.py).
+No ASGI framework or server is needed here - the app speaks the ASGI protocol directly.
+"""
+
+import base64
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Awaitable, Callable, Mapping, Optional
+from urllib.parse import parse_qsl
+
+from shared import form_schema, router
+from shared.client_config import size_pool
+from shared.utils import create_cors_response
+
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+CONTACT_PATH = re.compile(r"/api/v1(?:/(?P<business_unit>[A-Za-z0-9_-]+))?/contact")
+HEALTH_PATH = "/health"
+
+# Threads for the blocking AWS part of submissions = submissions waiting for AWS at the same time
+DEFAULT_WORKERS = 32
+
+# Bodies are read up to one byte over the limit - enough for form_schema to answer 413
+MAX_REQUEST_BYTES = form_schema.MAX_BODY_BYTES + 1
+
+
+class ContactApp:
+    """
+    ASGI application of the contact API.
+
+    Executors are created on lifespan startup (or the first request, for servers without lifespan)
+    and drained on shutdown, so submissions in flight still get stored when the container stops.
+    """
+
+    def __init__(
+            self,
+            units: Optional[Mapping[str, Mapping[str, Any]]] = None,
+            default_unit: Optional[str] = None,
+            workers: int = DEFAULT_WORKERS,
+            trusted_proxy_hops: int = 0
+    ):
+        """
+        Args:
+            units: unit registry (None = the process's UNIT_<UNIT> variables, see router.py)
+            default_unit: unit of single-unit containers - plays API Gateway's stage variable, so it wins
+                          over path and query string like there
+            workers: threads for the AWS calls (also sizes the botocore connection pools)
+            trusted_proxy_hops: load balancers in front that append to X-Forwarded-For (0 = direct clients)
+        """
+        self.units = router.UNITS if units is None else units
+        self.default_unit = default_unit
+        self.workers = workers
+        self.trusted_proxy_hops = trusted_proxy_hops
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._notification_executor: Optional[ThreadPoolExecutor] = None
+
+    def start(self) -> None:
+        """Creates the worker threads (idempotent)."""
+        if self._executor is None:
+            # Clients are created later, by the first submissions - pools must fit all workers
+            size_pool(self.workers)
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="submission")
+            # Own threads for concurrent mode emails - a submission thread waits for its email,
+            # so sharing one pool could deadlock when all threads are busy waiting
+            self._notification_executor = ThreadPoolExecutor(self.workers, thread_name_prefix="notification")
+
+    def close(self) -> None:
+        """Waits for submissions in flight, then stops the threads."""
+        for executor in (self._executor, self._notification_executor):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self._executor = self._notification_executor = None
+
+    async def __call__(self, scope: Dict[str, Any], receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            self.start()
+            response = await self._handle(scope, receive)
+            if response is not None:
+                await send_response(send, response)
+        # websocket scopes aren't served - returning closes them
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _handle(self, scope: Dict[str, Any], receive: Receive) -> Optional[Dict[str, Any]]:
+        """
+        Routes one HTTP request.
+
+        Returns:
+            Response dict (create_cors_response format), None if the client disconnected
+        """
+        path = scope["path"].rstrip("/") or "/"
+        method = scope["method"]
+        origin = _origin(scope)
+
+        if path == HEALTH_PATH:
+            if method not in ("GET", "HEAD"):
+                return _method_not_allowed("GET, HEAD", origin)
+            return create_cors_response(200, {"status": "ok"}, origin=origin)
+
+        match = CONTACT_PATH.fullmatch(path)
+        if match is None:
+            return create_cors_response(404, {"error": "Not found"}, origin=origin)
+        if method == "OPTIONS":
+            return preflight_response(origin)
+        if method != "POST":
+            return _method_not_allowed("OPTIONS, POST", origin)
+
+        body = await read_body(receive, MAX_REQUEST_BYTES)
+        if body is None:
+            return None
+
+        event = build_event(
+            scope, body, match.group("business_unit"), self.default_unit, self.trusted_proxy_hops
+        )
+        try:
+            return await router.route_contact_submission_async(
+                event, self.units, self._executor, self._notification_executor
+            )
+        except Exception as e:
+            # The manager answers 500 itself for AWS errors - this is for anything that escapes it
+            print(f"Unhandled error in contact request {event['requestContext']['requestId']}: {str(e)}")
+            return create_cors_response(500, {"error": "Internal server error"}, origin=origin)
+
+
+# TRANSLATION
+#-------------
+
+async def read_body(receive: Receive, limit: int) -> Optional[bytes]:
+    """
+    Reads the request body, stopping once limit bytes are in - the rest is never buffered.
+
+    Returns:
+        At most limit bytes (pass one more than allowed, so too large bodies stay recognizable),
+        None if the client disconnected
+    """
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+
+        chunk = message.get("body", b"")
+        chunks.append(chunk[:max(limit - size, 0)])
+        size += len(chunk)
+        if size >= limit or not message.get("more_body", False):
+            return b"".join(chunks)[:limit]
+
+
+def build_event(
+        scope: Dict[str, Any],
+        body: bytes,
+        path_unit: Optional[str] = None,
+        default_unit: Optional[str] = None,
+        trusted_proxy_hops: int = 0
+) -> Dict[str, Any]:
+    """
+    Turns an ASGI HTTP request into the API Gateway (REST proxy) event the Lambda code reads.
+
+    Args:
+        scope: ASGI http scope
+        body: request body
+        path_unit: {business_unit} of the path (None for /api/v1/contact)
+        default_unit: the container's unit (becomes the business_unit stage variable)
+        trusted_proxy_hops: see ContactApp
+
+    Returns:
+        Event with headers, query string, path/stage variables, requestContext and body
+    """
+    headers: Dict[str, str] = {}
+    for name, value in scope.get("headers", []):
+        name, value = name.decode("latin-1").lower(), value.decode("latin-1")
+        # Repeated headers are joined like HTTP allows (API Gateway keeps the last one)
+        headers[name] = f"{headers[name]},{value}" if name in headers else value
+
+    query = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+
+    # Bodies are text (JSON) - anything that isn't UTF-8 goes on base64 encoded, like API Gateway does
+    try:
+        text, encoded = body.decode("utf-8"), False
+    except UnicodeDecodeError:
+        text, encoded = base64.b64encode(body).decode("ascii"), True
+
+    return {
+        "resource": "/api/v1/{business_unit}/contact" if path_unit else "/api/v1/contact",
+        "path": scope["path"],
+        "httpMethod": scope["method"],
+        "headers": headers,
+        "queryStringParameters": query or None,
+        "pathParameters": {"business_unit": path_unit} if path_unit else None,
+        "stageVariables": {"business_unit": default_unit} if default_unit else None,
+        "requestContext": {
+            "requestId": headers.get("x-request-id") or str(uuid.uuid4()),
+            "identity": {"sourceIp": source_ip(scope, headers, trusted_proxy_hops)},
+            "stage": "container"
+        },
+        "body": text,
+        "isBase64Encoded": encoded
+    }
+
+
+def source_ip(scope: Dict[str, Any], headers: Dict[str, str], trusted_proxy_hops: int = 0) -> str:
+    """
+    Client IP for rate limiting.
+
+    Behind load balancers the socket peer is the last balancer - the client is the address the
+    first trusted one appended to X-Forwarded-For. Entries before it are whatever the client sent.
+    """
+    if trusted_proxy_hops > 0:
+        forwarded = [part.strip() for part in headers.get("x-forwarded-for", "").split(",") if part.strip()]
+        if len(forwarded) >= trusted_proxy_hops:
+            return forwarded[-trusted_proxy_hops]
+
+    client = scope.get("client")
+    return client[0] if client else ""
+
+
+def preflight_response(origin: str = "") -> Dict[str, Any]:
+    """
+    CORS preflight answer - the origin's precomputed headers (incl. Max-Age), no body.
+    Origins outside the allowlist get no Access-Control-Allow-Origin, so the browser stops there.
+    """
+    response = create_cors_response(204, {}, origin=origin)
+    response["body"] = ""
+    return response
+
+
+def _origin(scope: Dict[str, Any]) -> str:
+    for name, value in scope.get("headers", []):
+        if name.lower() == b"origin":
+            return value.decode("latin-1")
+    return ""
+
+
+def _method_not_allowed(allowed: str, origin: str) -> Dict[str, Any]:
+    return create_cors_response(405, {"error": "Method not allowed"}, {"Allow": allowed}, origin)
+
+
+async def send_response(send: Send, response: Dict[str, Any]) -> None:
+    """Sends a create_cors_response dict as the HTTP response."""
+    body = response.get("body") or ""
+    payload = base64.b64decode(body) if response.get("isBase64Encoded") else body.encode("utf-8")
+
+    headers = [
+        (name.lower().encode("latin-1"), str(value).encode("latin-1"))
+        for name, value in (response.get("headers") or {}).items()
+    ]
+    headers.append((b"content-length", str(len(payload)).encode("latin-1")))
+
+    await send({"type": "http.response.start", "status": response["statusCode"], "headers": headers})
+    await send({"type": "http.response.body", "body": payload})
@@ -0,0 +1,290 @@
+"""
+Shared bulk ingestion of contact form submissions (POST /api/v1/contact/batch).
+
+Leads collected offline (trade fairs, partner spreadsheets) are sent as one array instead of one
+POST per lead: every entry is validated with the unit's form schema like the website form, turned into the
+same item (handlers_manager.build_contact_item), and written with BatchWriteItem in chunks of 25.
+UnprocessedItems are retried with exponential backoff; the response has one result per entry.
+
+Entries may carry their capture time ("timestamp"). With it, the contact_id is derived from the
+content, so importing the same spreadsheet twice finds the same items instead of doubling them -
+leads already stored are left as they are (a triaged status is never reset to "new").
+No notification emails are sent - bulk imports are entered by staff, not by the customers.
+"""
+
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+from shared import form_schema
+from shared.clients import get_client, error_code
+from shared.codec import encode_item
+from shared.dynamo import serialize_item
+from shared.handlers_manager import build_contact_item
+from shared.i18n import get_messages
+from shared.retention import expires_at
+from shared.utils import create_cors_response, determine_language_from_domain, get_header
+
+# Entries per request - keeps the request well under Lambda's 6 MB payload and 30s timeout
+MAX_BATCH_SIZE = 500
+
+# BatchWriteItem maximum
+CHUNK_SIZE = 25
+
+# Retries of UnprocessedItems (throttling) - base * 2^attempt with full jitter, capped
+MAX_WRITE_ATTEMPTS = 6
+BASE_BACKOFF_SECONDS = 0.05
+MAX_BACKOFF_SECONDS = 1.0
+
+# BatchGetItem maximum
+GET_CHUNK_SIZE = 100
+
+# Errors that make DynamoDB reject a whole chunk but are worth retrying
+RETRYABLE_ERRORS = {
+    "ProvisionedThroughputExceededException", "ThrottlingException", "RequestLimitExceeded",
+    "InternalServerError", "ServiceUnavailable"
+}
+
+# uuid5 namespace for content-derived contact ids (fixed - changing it breaks re-import dedupe)
+BATCH_NAMESPACE = uuid.UUID("6f0c1e52-3c1b-4b8e-9a51-2a4f3d7c9e10")
+
+
+def parse_capture_time(value: Any) -> Optional[str]:
+    """
+    Normalizes an entry's capture time to the ISO UTC format of website submissions.
+
+    Returns:
+        ISO timestamp, or None if the entry has none
+
+    Raises:
+        ValueError: for values that aren't ISO dates/timestamps
+    """
+    if value in (None, ""):
+        return None
+    if not isinstance(value, str):
+        raise ValueError("timestamp must be an ISO date")
+
+    parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def content_contact_id(business_unit: str, fields: Dict[str, Any], timestamp: str) -> str:
+    """Same lead, same capture time -> same contact_id (and so the same item key)."""
+    content = "\x1f".join((
+        business_unit, fields["email"], fields["phone"], fields["message"], timestamp
+    ))
+    return str(uuid.uuid5(BATCH_NAMESPACE, content))
+
+
+def write_items(table_name: str, items: List[Dict[str, Any]], deadline: Optional[float] = None) -> set:
+    """
+    Writes items with BatchWriteItem in chunks of CHUNK_SIZE, retrying what DynamoDB didn't process.
+
+    Args:
+        table_name: contact table
+        items: plain items (unique keys - BatchWriteItem rejects duplicates in one request)
+        deadline: time.monotonic() value after which no more retries are started
+
+    Returns:
+        contact_ids that could not be written
+    """
+    client = get_client("dynamodb")
+    failed = set()
+
+    for start in range(0, len(items), CHUNK_SIZE):
+        pending = [
+            {"PutRequest": {"Item": serialize_item(encode_item(item))}} for item in items[start:start + CHUNK_SIZE]
+        ]
+
+        for attempt in range(MAX_WRITE_ATTEMPTS):
+            if attempt:
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                time.sleep(random.uniform(0, min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2 ** attempt)))
+
+            try:
+                response = client.batch_write_item(RequestItems={table_name: pending})
+            except Exception as e:
+                if error_code(e) not in RETRYABLE_ERRORS:
+                    print(f"Batch write failed: {str(e)}")
+                    break
+                continue
+
+            pending = response.get("UnprocessedItems", {}).get(table_name, [])
+            if not pending:
+                break
+
+        # sk = CONTACT#<timestamp>#<contact_id> - no need to decode the item
+        failed.update(request["PutRequest"]["Item"]["sk"]["S"].rsplit("#", 1)[1] for request in pending)
+
+    return failed
+
+
+def stored_contact_ids(table_name: str, items: List[Dict[str, Any]],
+                       deadline: Optional[float] = None) -> Tuple[set, set]:
+    """
+    Checks which items already exist (BatchGetItem on their keys, nothing else projected).
+
+    BatchWriteItem can't put conditionally, so re-imported leads are found before the write.
+
+    Returns:
+        (contact_ids already stored, contact_ids that couldn't be checked - never written blind)
+    """
+    client = get_client("dynamodb")
+    stored, unchecked = set(), set()
+
+    for start in range(0, len(items), GET_CHUNK_SIZE):
+        pending = {
+            "Keys": [{"pk": {"S": item["pk"]}, "sk": {"S": item["sk"]}} for item in items[start:start + GET_CHUNK_SIZE]],
+            "ProjectionExpression": "sk"
+        }
+
+        for attempt in range(MAX_WRITE_ATTEMPTS):
+            if attempt:
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                time.sleep(random.uniform(0, min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2 ** attempt)))
+
+            try:
+                response = client.batch_get_item(RequestItems={table_name: pending})
+            except Exception as e:
+                if error_code(e) not in RETRYABLE_ERRORS:
+                    print(f"Batch read failed: {str(e)}")
+                    break
+                continue
+
+            # sk = CONTACT#<timestamp>#<contact_id>
+            stored.update(item["sk"]["S"].rsplit("#", 1)[1] for item in response.get("Responses", {}).get(table_name, []))
+            pending = response.get("UnprocessedKeys", {}).get(table_name)
+            if not pending:
+                break
+
+        if pending:
+            unchecked.update(key["sk"]["S"].rsplit("#", 1)[1] for key in pending["Keys"])
+
+    return stored, unchecked
+
+
+def process_contact_batch_submission(
+        event: Dict[str, Any],
+        business_unit: str,
+        table_name: str,
+        environment: str = "dev",
+        retention_days: int = 0,
+        shard_count: int = 1,
+        remaining_time_ms: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Complete bulk submission processing for any business unit.
+
+    Body: {"submissions": [{contact_person, email, phone, message, ..., timestamp?}, ...]}
+
+    Args:
+        event: API Gateway event
+        business_unit: construction, retail, etc.
+        table_name: DynamoDB table name
+        environment: dev or prod
+        retention_days: days the submissions stay in DynamoDB before TTL moves them to the archive
+        shard_count: write shards (see sharding.py)
+        remaining_time_ms: context.get_remaining_time_in_millis() - stops retrying before Lambda times out
+
+    Returns:
+        API Gateway response: {"results": [{"index", "status", "contact_id"?, "error"?}],
+                               "created": n, "duplicate": n, "invalid": n, "failed": n}
+        status per entry: created, duplicate (same lead earlier in this batch or already stored),
+        invalid (+ "fields"), failed (not written - worth retrying)
+    """
+    origin = get_header(event, "origin")
+    language = determine_language_from_domain(origin, get_header(event, "accept-language"))
+    response_msg = get_messages(language)
+
+    # Size check before decoding - the batch limit is higher than a single form's
+    try:
+        body = form_schema.decode_body(event, form_schema.MAX_BATCH_BODY_BYTES)
+    except form_schema.FormError as e:
+        if e.reason == "too_large":
+            return create_cors_response(413, {"error": response_msg["request_too_large"]}, origin=origin)
+        return create_cors_response(400, {"error": "Body must be a JSON object"}, origin=origin)
+
+    submissions = body.get("submissions")
+    if not isinstance(submissions, list) or not submissions:
+        return create_cors_response(400, {"error": "submissions must be a non-empty array"}, origin=origin)
+    if len(submissions) > MAX_BATCH_SIZE:
+        return create_cors_response(413, {"error": f"At most {MAX_BATCH_SIZE} submissions per request"}, origin=origin)
+
+    deadline = None
+    if remaining_time_ms is not None:
+        deadline = time.monotonic() + max(remaining_time_ms - 2000, 0) / 1000
+
+    now = time.time()
+    import_time = datetime.fromtimestamp(now, timezone.utc).isoformat()
+    expires = expires_at(now, retention_days)
+
+    results: List[Dict[str, Any]] = []
+    items: Dict[str, Dict[str, Any]] = {}  # contact_id -> item, dedupes repeated leads within the batch
+    content_ids = set()  # contact_ids derived from content - may be stored by an earlier import
+
+    for index, entry in enumerate(submissions):
+        # No language - the staff's site says nothing about a lead's country, national numbers stay as entered
+        fields, errors = form_schema.validate(business_unit, entry)
+        if errors:
+            results.append({
+                "index": index,
+                "status": "invalid",
+                "error": response_msg[form_schema.error_message_key(errors)],
+                "fields": sorted(errors)
+            })
+            continue
+
+        try:
+            capture_time = parse_capture_time(entry.get("timestamp"))
+        except ValueError:
+            results.append({"index": index, "status": "invalid", "error": "timestamp must be an ISO date"})
+            continue
+
+        if capture_time:
+            contact_id = content_contact_id(business_unit, fields, capture_time)
+            content_ids.add(contact_id)
+        else:
+            contact_id = str(uuid.uuid4())
+
+        if contact_id in items:
+            results.append({"index": index, "status": "duplicate", "contact_id": contact_id})
+            continue
+
+        items[contact_id] = build_contact_item(
+            business_unit, contact_id, capture_time or import_time, fields,
+            environment=environment,
+            expires=expires,
+            shard_count=shard_count
+        )
+        results.append({"index": index, "status": "created", "contact_id": contact_id})
+
+    try:
+        # Only content-derived ids can exist already - random ones are new by construction
+        stored, failed = stored_contact_ids(
+            table_name, [items[contact_id] for contact_id in items if contact_id in content_ids], deadline
+        )
+        failed |= write_items(
+            table_name, [item for contact_id, item in items.items() if contact_id not in stored | failed], deadline
+        )
+    except Exception as e:
+        print(f"Error processing contact batch: {str(e)}")
+        return create_cors_response(500, {"error": response_msg["server_error"]}, origin=origin)
+
+    for result in results:
+        if result.get("contact_id") in stored:
+            result["status"] = "duplicate"
+        elif result.get("contact_id") in failed:
+            result["status"] = "failed"
+            result["error"] = response_msg["server_error"]
+
+    return create_cors_response(200, {
+        "results": results,
+        **{status: sum(1 for result in results if result["status"] == status)
+           for status in ("created", "duplicate", "invalid", "failed")}
+    }, origin=origin)
@@ -0,0 +1,148 @@
+"""
+Shared AWS client configuration profiles for the Lambda package.
+
+botocore defaults are 60s connect + 60s read timeouts with legacy retries - longer than the whole
+30s Lambda timeout, so one stalled SES call could burn the invocation. Each ENVIRONMENT gets a
+profile with tight timeouts, adaptive retries and a kept-alive connection pool instead.
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+# Profile per ENVIRONMENT (CDK passes dev or prod)
+# connect/read timeouts are upper limits - they shrink further if the Lambda has less time left
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "dev": {
+        "connect_timeout": 2.0,
+        "read_timeout": 5.0,
+        "max_attempts": 3,           # total attempts incl. the first one
+        "max_pool_connections": 10,  # per client - enough for the worker threads of one invocation
+        "tcp_keepalive": True        # keeps idle TLS connections alive between warm invocations
+    },
+    "prod": {
+        "connect_timeout": 1.0,
+        "read_timeout": 3.0,
+        "max_attempts": 3,
+        "max_pool_connections": 10,
+        "tcp_keepalive": True
+    }
+}
+
+DEFAULT_PROFILE = "dev"
+
+# Adaptive = standard retries + client-side rate limiting when AWS starts throttling
+RETRY_MODE = "adaptive"
+
+# Time kept free at the end of the invocation to build the response
+SAFETY_MARGIN_MS = 1000
+
+# Never go below these, even when the Lambda is almost out of time
+MIN_CONNECT_TIMEOUT = 0.25
+MIN_READ_TIMEOUT = 0.5
+
+# Remaining time of the first invocation (set by prime) - clients are created after it
+_remaining_ms: Optional[int] = None
+
+# Connection pool size for long-lived container processes (set by size_pool) - None = the profile's
+_pool_connections: Optional[int] = None
+
+
+def get_profile(environment: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Selects the profile for an environment.
+
+    Args:
+        environment: dev, prod (None = ENVIRONMENT env var)
+
+    Returns:
+        Profile dict (unknown environments get the dev profile)
+    """
+    environment = (environment or os.environ.get("ENVIRONMENT") or DEFAULT_PROFILE).lower()
+    return PROFILES.get(environment, PROFILES[DEFAULT_PROFILE])
+
+
+def derive_timeouts(profile: Dict[str, Any], remaining_ms: Optional[int] = None) -> Dict[str, float]:
+    """
+    Fits connect/read timeouts into the time the Lambda has left.
+
+    All attempts (first call + retries) must finish before the Lambda times out,
+    so every attempt gets an equal share of the remaining time minus the safety margin.
+
+    Args:
+        profile: output of get_profile
+        remaining_ms: context.get_remaining_time_in_millis(), None = profile values as they are
+
+    Returns:
+        {"connect_timeout": seconds, "read_timeout": seconds}
+    """
+    connect_timeout = profile["connect_timeout"]
+    read_timeout = profile["read_timeout"]
+
+    if remaining_ms is not None:
+        per_attempt = max(remaining_ms - SAFETY_MARGIN_MS, 0) / 1000 / profile["max_attempts"]
+
+        # Connecting should take a fraction of a call - give it at most a quarter of the attempt
+        connect_timeout = min(connect_timeout, per_attempt / 4)
+        read_timeout = min(read_timeout, per_attempt - connect_timeout)
+
+    return {
+        "connect_timeout": max(connect_timeout, MIN_CONNECT_TIMEOUT),
+        "read_timeout": max(read_timeout, MIN_READ_TIMEOUT)
+    }
+
+
+def prime(context: Any) -> None:
+    """
+    Records the Lambda's remaining time so clients created afterwards fit their timeouts into it.
+
+    Called at the start of each handler. Only the first call counts: clients live for the whole
+    container, and every invocation of a function starts with the same configured timeout.
+
+    Args:
+        context: AWS Lambda context (None outside Lambda)
+    """
+    global _remaining_ms
+
+    if _remaining_ms is None and context is not None:
+        _remaining_ms = context.get_remaining_time_in_millis()
+
+
+def size_pool(connections: int) -> None:
+    """
+    Sizes the connection pool of clients created afterwards for a container process.
+
+    A Lambda container has one request in flight, a container process (asgi.py) has as many as
+    its worker threads - with fewer pooled connections than threads, urllib3 opens and drops
+    extra TLS connections on every burst.
+
+    Args:
+        connections: AWS calls that can run at the same time (= worker threads)
+    """
+    global _pool_connections
+    _pool_connections = connections
+
+
+def build_config(environment: Optional[str] = None, remaining_ms: Optional[int] = None) -> Any:
+    """
+    Builds the botocore Config for new clients.
+
+    Args:
+        environment: dev, prod (None = ENVIRONMENT env var)
+        remaining_ms: Lambda time left (None = value recorded by prime)
+
+    Returns:
+        botocore.config.Config
+    """
+    # noinspection PyPackageRequirements
+    from botocore.config import Config
+
+    profile = get_profile(environment)
+    timeouts = derive_timeouts(profile, remaining_ms if remaining_ms is not None else _remaining_ms)
+
+    return Config(
+        connect_timeout=timeouts["connect_timeout"],
+        read_timeout=timeouts["read_timeout"],
+        retries={"mode": RETRY_MODE, "total_max_attempts": profile["max_attempts"]},
+        max_pool_connections=max(profile["max_pool_connections"], _pool_connections or 0),
+        tcp_keepalive=profile["tcp_keepalive"]
+    )
@@ -0,0 +1,94 @@
+"""
+Shared AWS client registry for all Lambda functions.
+
+Every client is a low-level botocore client (no boto3 resource layer) created on first use and
+reused by all later invocations of the same container. botocore itself is only imported when
+the first client is needed, so requests that fail validation never pay for it.
+Timeouts, retries and connection pooling come from the ENVIRONMENT profile in client_config.py.
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from shared.client_config import build_config
+from shared.tracing import instrument_botocore
+
+# One botocore session per container = credentials and endpoint data are resolved once
+_session = None
+
+# (service, region) -> client
+_clients: Dict[Tuple[str, Optional[str]], Any] = {}
+
+# Clients may be requested from worker threads - creation must happen only once
+_lock = threading.Lock()
+
+
+def _get_session() -> Any:
+    """Creates the botocore session on first use (imports botocore lazily)."""
+    global _session
+
+    if _session is None:
+        # X-Ray patches botocore itself - must happen before the first client exists
+        instrument_botocore()
+
+        # noinspection PyPackageRequirements
+        import botocore.session
+        _session = botocore.session.get_session()
+
+    return _session
+
+
+def get_client(service: str, region_name: Optional[str] = None) -> Any:
+    """
+    Returns the container's client for a service, creating it on first use.
+
+    Args:
+        service: AWS service name (dynamodb, ses, sqs, ...)
+        region_name: explicit region (ex. SES in eu-central-1 for GDPR), None = Lambda's region
+
+    Returns:
+        botocore client
+    """
+    key = (service, region_name)
+
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _get_session().create_client(service, region_name=region_name, config=build_config())
+                _clients[key] = client
+
+    return client
+
+
+def set_client(service: str, client: Any, region_name: Optional[str] = None) -> None:
+    """
+    Registers a ready-made client (local stand-ins for tests, benchmarks and local runs).
+
+    Args:
+        service: AWS service name
+        client: object with the same methods as the botocore client
+        region_name: must match the region the code asks for
+    """
+    with _lock:
+        _clients[(service, region_name)] = client
+
+
+def reset_clients() -> None:
+    """Forgets all clients - the next get_client call creates new ones."""
+    with _lock:
+        _clients.clear()
+
+
+def error_code(error: Exception) -> str:
+    """
+    Reads the AWS error code of a botocore ClientError without importing botocore.
+
+    Returns:
+        Error code (ex. "ConditionalCheckFailedException"), empty string for other exceptions
+    """
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return ""
+    return response.get("Error", {}).get("Code", "")
@@ -0,0 +1,145 @@
+"""
+Shared item codec for contact submissions - sits between the handlers and DynamoDB.
+
+DynamoDB bills attribute names as item bytes, and a write unit covers only 1 KB. Version 1 items:
+- use short physical attribute names (contact_person -> cp, source_domain -> src, ...)
+- store long text (message) zlib-compressed as a Binary attribute
+- carry their version in "v"
+
+Key, GSI and TTL attributes (pk, sk, bu_status, timestamp, expires_at) keep their names -
+the table, the index, the TTL setting and the stream filter depend on them.
+Readers decode every version: items without "v" (written before the codec) are returned as they are.
+
+No shared.* imports - the infrastructure tools (export, shard migration) import this module too.
+"""
+
+import zlib
+from typing import Dict, Any
+
+# Version written by encode_item (0 = plain items, as before the codec)
+CODEC_VERSION = 1
+
+# Attribute holding the version
+VERSION_ATTRIBUTE = "v"
+
+# Logical -> physical names of version 1 (never reuse or change a short name - old items keep it)
+FIELD_NAMES = {
+    "contact_id": "id",
+    "business_unit": "bu",
+    "environment": "env",
+    "status": "st",
+    "contact_person": "cp",
+    "email": "em",
+    "phone": "ph",
+    "message": "msg",
+    "company": "co",
+    "project_type": "pt",
+    "timeline": "tl",
+    "units_needed": "un",
+    "source_domain": "src"
+}
+PHYSICAL_NAMES = {physical: logical for logical, physical in FIELD_NAMES.items()}
+
+# Text fields worth compressing, and the size (UTF-8 bytes) from which it pays off
+# Below ~200 bytes zlib's header and the lack of repetition make the text bigger, not smaller
+COMPRESSIBLE_FIELDS = ("message",)
+COMPRESS_THRESHOLD = 200
+
+
+def encode_item(item: Dict[str, Any], version: int = CODEC_VERSION) -> Dict[str, Any]:
+    """
+    Encodes a plain submission item for storage.
+
+    Args:
+        item: plain item (logical names), ex. output of handlers_manager.build_contact_item
+        version: 0 = store as is (rollback), 1 = short names + compression
+
+    Returns:
+        Plain item to pass to dynamo.serialize_item
+    """
+    if version == 0:
+        return dict(item)
+
+    encoded: Dict[str, Any] = {VERSION_ATTRIBUTE: version}
+    for name, value in item.items():
+        if name in COMPRESSIBLE_FIELDS and isinstance(value, str):
+            raw = value.encode("utf-8")
+            if len(raw) >= COMPRESS_THRESHOLD:
+                compressed = zlib.compress(raw, 9)
+                # Keep incompressible text (ex. random strings) as it is
+                if len(compressed) < len(raw):
+                    value = compressed
+        encoded[FIELD_NAMES.get(name, name)] = value
+    return encoded
+
+
+def decode_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Decodes a stored item of any version back to logical names and plain text.
+
+    Args:
+        item: plain item from dynamo.deserialize_item
+
+    Returns:
+        Plain item (logical names, no version attribute)
+
+    Raises:
+        ValueError: for items of a newer codec version than this code knows
+    """
+    version = item.get(VERSION_ATTRIBUTE, 0)
+    if version == 0:
+        return item
+    if version > CODEC_VERSION:
+        raise ValueError(f"Item codec version {version} is newer than {CODEC_VERSION}")
+
+    decoded = {}
+    for name, value in item.items():
+        if name == VERSION_ATTRIBUTE:
+            continue
+        logical = PHYSICAL_NAMES.get(name, name)
+        if logical in COMPRESSIBLE_FIELDS and isinstance(value, (bytes, bytearray)):
+            value = zlib.decompress(value).decode("utf-8")
+        decoded[logical] = value
+    return decoded
+
+
+def physical_names(fields: tuple) -> tuple:
+    """
+    Attribute names to project for logical fields - old and new names, so every version is covered.
+
+    Returns:
+        ex. ("email", "em", "timestamp") for ("email", "timestamp")
+    """
+    names = []
+    for field in fields:
+        names.append(field)
+        if field in FIELD_NAMES:
+            names.append(FIELD_NAMES[field])
+    return tuple(names)
+
+
+def item_size(item: Dict[str, Any]) -> int:
+    """
+    Approximate DynamoDB size of a plain item in bytes (what write/read units are billed on).
+
+    Names + values: strings/binary by length, numbers ~1 byte per 2 digits + 1, booleans/null 1 byte.
+    """
+    size = 0
+    for name, value in item.items():
+        size += len(name.encode("utf-8"))
+        if isinstance(value, str):
+            size += len(value.encode("utf-8"))
+        elif isinstance(value, (bytes, bytearray)):
+            size += len(value)
+        elif isinstance(value, bool) or value is None:
+            size += 1
+        elif isinstance(value, (int, float)):
+            size += (len(str(value).lstrip("-").replace(".", "")) + 1) // 2 + 1
+        else:
+            size += len(str(value))
+    return size
+
+
+def write_units(item: Dict[str, Any]) -> int:
+    """Write capacity units for one standard write of the item (1 per started KB)."""
+    return max(1, -(-item_size(item) // 1024))
@@ -0,0 +1,339 @@
+"""
+Shared read path for contact form submissions (GET /api/v1/contacts).
+
+Lists submissions of a business unit, newest first, without Scans:
+- no status filter -> Query on the table keys (pk = BU#<UNIT>[#shard], sk = CONTACT#<iso>#<uuid>)
+- status filter    -> Query on the status/time GSI (bu_status = <UNIT>#<status>[#shard], timestamp)
+Sharded keys are read scatter-gather (see sharding.py), the cursor keeps one position per shard.
+Pages are fetched with an opaque cursor, and ETag/Cache-Control let the admin UI cache them.
+"""
+
+import base64
+import hashlib
+import json
+from typing import Dict, Any, List, Optional
+
+from shared import form_schema
+from shared.codec import VERSION_ATTRIBUTE, decode_item, physical_names
+from shared.dynamo import deserialize_item
+from shared.shard_keys import SUBMISSION_PREFIX, all_shard_keys
+from shared.sharding import query_partitions, merge_by_sort_key
+from shared.utils import create_cors_response, get_header
+
+# GSI on (bu_status, timestamp) - name must match the CDK table definition
+STATUS_INDEX_NAME = "status-time-index"
+
+# Page size limits
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+# Statuses a submission can have (written as "new", changed by triage later)
+STATUSES = ("new", "in_progress", "answered", "closed")
+
+# Attributes every submission has on top of its form fields (form fields come from form_schema)
+SUBMISSION_FIELDS = ("contact_id", "business_unit", "timestamp", "status", "environment", "source_domain")
+
+# Never returned unless asked for - the long message
+ON_REQUEST_FIELDS = ("message",)
+
+# Key attributes a cursor position may contain (base table + GSI keys)
+CURSOR_KEYS = {"pk", "sk", "bu_status", "timestamp"}
+
+# Cursor position of a shard that has nothing left
+DONE = "done"
+
+# Admin pages hold personal data - only the browser may cache them, and only briefly
+CACHE_CONTROL = "private, max-age=30"
+
+
+class QueryParameterError(ValueError):
+    """Raised for invalid query string parameters (answered with 400)."""
+
+
+def allowed_fields(business_unit: str) -> tuple:
+    """Attributes a caller may ask for via ?fields=... - the unit's form fields from its schema."""
+    return SUBMISSION_FIELDS + form_schema.field_names(business_unit)
+
+
+def default_fields(business_unit: str) -> tuple:
+    """Returned when no fields are requested - everything except the long message."""
+    return tuple(field for field in allowed_fields(business_unit) if field not in ON_REQUEST_FIELDS)
+
+
+def build_status_key(business_unit: str, status: str) -> str:
+    """GSI partition key of a submission: "CONSTRUCTION#new"."""
+    return f"{business_unit.upper()}#{status}"
+
+
+def encode_cursor(positions: Dict[str, Any]) -> Optional[str]:
+    """
+    Turns the per-partition positions into an opaque URL-safe string.
+
+    Args:
+        positions: partition key -> last returned item's key (low-level), DONE, or None (not started yet)
+
+    Returns:
+        Cursor, or None when every partition is done (last page)
+    """
+    if all(position == DONE for position in positions.values()):
+        return None
+
+    plain = {
+        partition: position if position == DONE else {key: value["S"] for key, value in position.items()}
+        for partition, position in positions.items()
+        if position is not None
+    }
+    raw = json.dumps(plain, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, partition_attribute: str, partitions: List[str]) -> Dict[str, Any]:
+    """
+    Turns a cursor back into per-partition positions (ExclusiveStartKeys).
+
+    Partitions missing from the cursor start from the beginning.
+
+    Raises:
+        QueryParameterError: for tampered cursors or cursors of a different query
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        plain = json.loads(raw)
+    except (ValueError, TypeError):
+        raise QueryParameterError("Invalid cursor")
+
+    if not isinstance(plain, dict) or not set(plain) <= set(partitions):
+        raise QueryParameterError("Invalid cursor")
+
+    positions = {}
+    for partition, position in plain.items():
+        if position == DONE:
+            positions[partition] = DONE
+            continue
+
+        valid = (
+            isinstance(position, dict)
+            and set(position) <= CURSOR_KEYS
+            and all(isinstance(value, str) for value in position.values())
+            and position.get(partition_attribute) == partition
+        )
+        if not valid:
+            raise QueryParameterError("Invalid cursor")
+        positions[partition] = {key: {"S": value} for key, value in position.items()}
+
+    return positions
+
+
+def parse_query_parameters(event: Dict[str, Any], business_unit: str) -> Dict[str, Any]:
+    """
+    Validates the query string.
+
+    Supported: business_unit, status, from, to (ISO timestamps), limit, cursor, fields, order (asc/desc)
+
+    Raises:
+        QueryParameterError: for invalid values
+    """
+    params = event.get("queryStringParameters") or {}
+
+    unit = params.get("business_unit", business_unit).strip().lower()
+    if unit != business_unit:
+        raise QueryParameterError(f"This endpoint serves business_unit={business_unit}")
+
+    status = params.get("status", "").strip()
+    if status and status not in STATUSES:
+        raise QueryParameterError(f"status must be one of {', '.join(STATUSES)}")
+
+    try:
+        limit = int(params.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise QueryParameterError("limit must be a number")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise QueryParameterError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    fields = tuple(f.strip() for f in params.get("fields", "").split(",") if f.strip()) or default_fields(unit)
+    allowed = allowed_fields(unit)
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise QueryParameterError(f"Unknown fields: {', '.join(unknown)}")
+
+    order = params.get("order", "desc").lower()
+    if order not in ("asc", "desc"):
+        raise QueryParameterError("order must be asc or desc")
+
+    # ISO timestamps sort as text, so plain string bounds work on both sk and timestamp
+    # "0" sorts before and "~" after every ISO timestamp (key values can't be empty strings)
+    # "~" after `to` makes it inclusive like the export tool's --to: 2025-06-30 includes the whole day
+    return {
+        "business_unit": unit,
+        "status": status,
+        "time_from": params.get("from", "").strip() or "0",
+        "time_to": params.get("to", "").strip() + "~",
+        "limit": limit,
+        "cursor": params.get("cursor", ""),
+        "fields": fields,
+        "ascending": order == "asc"
+    }
+
+
+def build_query(table_name: str, query: Dict[str, Any], partition: str) -> Dict[str, Any]:
+    """
+    Builds the DynamoDB Query request of one partition (shard) for validated parameters.
+
+    Key attributes are always projected - the next page's cursor is built from them.
+    Fields are projected under their logical and codec names, so items of every codec version are read.
+
+    Returns:
+        kwargs for the low-level client's query()
+    """
+    attributes = tuple(dict.fromkeys(
+        physical_names(query["fields"]) + _key_attributes(query) + (VERSION_ATTRIBUTE,)
+    ))
+    names = {f"#f{i}": field for i, field in enumerate(attributes)}
+
+    request = {
+        "TableName": table_name,
+        "Limit": query["limit"],
+        "ScanIndexForward": query["ascending"],
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names
+    }
+
+    if query["status"]:
+        request["IndexName"] = STATUS_INDEX_NAME
+        names["#ts"] = "timestamp"  # reserved word in DynamoDB
+        request["KeyConditionExpression"] = "bu_status = :p AND #ts BETWEEN :from AND :to"
+        bounds = (query["time_from"], query["time_to"])
+    else:
+        request["KeyConditionExpression"] = "pk = :p AND sk BETWEEN :from AND :to"
+        bounds = (f"CONTACT#{query['time_from']}", f"CONTACT#{query['time_to']}")
+
+    request["ExpressionAttributeValues"] = {
+        ":p": {"S": partition},
+        ":from": {"S": bounds[0]},
+        ":to": {"S": bounds[1]}
+    }
+
+    return request
+
+
+def _key_attributes(query: Dict[str, Any]) -> tuple:
+    """Attributes of an ExclusiveStartKey - GSI queries need the index keys on top of the table keys."""
+    return ("pk", "sk", "bu_status", "timestamp") if query["status"] else ("pk", "sk")
+
+
+def query_partitions_of(query: Dict[str, Any], shard_count: int) -> tuple:
+    """
+    Partitions a query has to read.
+
+    Returns:
+        (partition attribute, [partition keys], sort attributes for merging)
+    """
+    if query["status"]:
+        base_key = build_status_key(query["business_unit"], query["status"])
+        return "bu_status", all_shard_keys(base_key, shard_count), ("timestamp", "sk")
+
+    base_key = f"{SUBMISSION_PREFIX}{query['business_unit'].upper()}"
+    return "pk", all_shard_keys(base_key, shard_count), ("sk",)
+
+
+def query_contacts(table_name: str, query: Dict[str, Any], shard_count: int = 1) -> Dict[str, Any]:
+    """
+    Runs one page of the query - scatter-gather over all shards, merged in sort order.
+
+    Each shard returns up to `limit` items, the merge keeps the first `limit` of all of them.
+    Shards remember the last item they contributed, so the next page continues right after it.
+
+    Returns:
+        {"items": [...], "count": n, "next_cursor": str or None}
+    """
+    partition_attribute, partitions, sort_attributes = query_partitions_of(query, shard_count)
+    positions: Dict[str, Any] = {partition: None for partition in partitions}
+    if query["cursor"]:
+        positions.update(decode_cursor(query["cursor"], partition_attribute, partitions))
+
+    requests = {}
+    for partition, position in positions.items():
+        if position == DONE:
+            continue
+        requests[partition] = build_query(table_name, query, partition)
+        if position:
+            requests[partition]["ExclusiveStartKey"] = position
+
+    responses = query_partitions(requests)
+    merged = merge_by_sort_key(
+        {partition: response.get("Items", []) for partition, response in responses.items()},
+        sort_attributes,
+        descending=not query["ascending"]
+    )
+
+    key_attributes = _key_attributes(query)
+    items: List[Dict[str, Any]] = []
+    consumed = {partition: 0 for partition in responses}
+    for partition, item in merged:
+        if len(items) == query["limit"]:
+            break
+        items.append(item)
+        consumed[partition] += 1
+        positions[partition] = {key: item[key] for key in key_attributes}
+
+    # A shard is done once it has nothing left in DynamoDB and everything it returned was used
+    for partition, response in responses.items():
+        if "LastEvaluatedKey" not in response and consumed[partition] == len(response.get("Items", [])):
+            positions[partition] = DONE
+
+    fields = set(query["fields"])
+    plain_items = [
+        {key: value for key, value in decode_item(deserialize_item(item)).items() if key in fields}
+        for item in items
+    ]
+
+    return {
+        "items": plain_items,
+        "count": len(plain_items),
+        "next_cursor": encode_cursor(positions)
+    }
+
+
+def process_contacts_query(
+        event: Dict[str, Any], business_unit: str, table_name: str, shard_count: int = 1
+) -> Dict[str, Any]:
+    """
+    Complete GET /api/v1/contacts processing for any business unit.
+
+    Args:
+        event: API Gateway event with query string parameters
+        business_unit: construction, retail, etc.
+        table_name: DynamoDB table name
+        shard_count: SHARD_COUNT the submissions are written with (see sharding.py)
+
+    Returns:
+        API Gateway response with CORS, ETag and Cache-Control headers (304 if the ETag still matches)
+    """
+    origin = get_header(event, "origin")
+    headers = {
+        "Access-Control-Allow-Methods": "OPTIONS, GET",
+        "Access-Control-Expose-Headers": "ETag",
+        "Cache-Control": CACHE_CONTROL
+    }
+
+    try:
+        query = parse_query_parameters(event, business_unit)
+        page = query_contacts(table_name, query, shard_count)
+    except QueryParameterError as e:
+        return create_cors_response(400, {"error": str(e)}, headers, origin)
+    except Exception as e:
+        print(f"Error querying contacts: {str(e)}")
+        return create_cors_response(500, {"error": "Internal server error"}, headers, origin)
+
+    response = create_cors_response(200, page, headers, origin)
+
+    # Same page content = same ETag, so the admin UI can revalidate with If-None-Match
+    etag = '"' + hashlib.sha256(response["body"].encode("utf-8")).hexdigest()[:32] + '"'
+    response["headers"]["ETag"] = etag
+
+    if etag in (tag.strip() for tag in get_header(event, "if-none-match").split(",")):
+        response["statusCode"] = 304
+        response["body"] = ""
+
+    return response
+
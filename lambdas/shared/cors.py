@@ -0,0 +1,140 @@
+"""
+Shared CORS policy for the contact APIs.
+
+Only our own websites may call the API from a browser. The allowlist (data/cors_policy.json) holds
+the real subdomains - construction., bau., constructii. - and is the single source for both sides:
+- Lambda/container responses: headers_for(origin) returns the header set precomputed at import
+  for that origin (read-only - responses copy it), with Vary: Origin so caches keep origins apart
+- API Gateway preflight: CDK builds its CorsOptions from preflight_options(), same list
+  (HTTP APIs add the CORS headers to responses themselves - the Lambda's are dropped there, see utils.py)
+
+Access-Control-Max-Age lets browsers cache the preflight answer (Chromium caps it at 2 hours,
+Firefox at 24). The websites also send the form as a CORS "simple" request (text/plain body,
+idempotency key in the body), which needs no preflight at all - so visitors never pay for one.
+
+Origins only known at deploy time (ex. the CloudFront URL of a website without custom domain)
+come from CORS_EXTRA_ORIGINS* environment variables - comma separated, set by CDK.
+The router Lambda gets one per unit (CORS_EXTRA_ORIGINS_<UNIT>).
+"""
+
+import json
+import os
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Default policy location (next to this module) - CORS_POLICY_FILE env var can point somewhere else
+DEFAULT_POLICY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cors_policy.json")
+
+EXTRA_ORIGINS_PREFIX = "CORS_EXTRA_ORIGINS"
+
+
+def load_policy(path: str = DEFAULT_POLICY_FILE) -> Dict[str, Any]:
+    """
+    Reads a CORS policy file.
+
+    Args:
+        path: JSON file with allowed_origins, allow_methods, allow_headers, expose_headers, max_age_seconds
+
+    Returns:
+        Policy dict (origins normalized: lowercase, no trailing slash)
+    """
+    with open(path, encoding="utf-8") as f:
+        policy = json.load(f)
+
+    policy["allowed_origins"] = [normalize_origin(origin) for origin in policy["allowed_origins"]]
+    return policy
+
+
+def normalize_origin(origin: str) -> str:
+    """Origins compare as scheme://host[:port] - browsers send them lowercase without a path."""
+    return origin.strip().rstrip("/").lower()
+
+
+def extra_origins(environ: Mapping[str, str]) -> List[str]:
+    """Origins from all CORS_EXTRA_ORIGINS* variables (deploy-time origins, see module docstring)."""
+    origins = []
+    for name, value in environ.items():
+        if name.startswith(EXTRA_ORIGINS_PREFIX):
+            origins.extend(normalize_origin(origin) for origin in value.split(",") if origin.strip())
+    return origins
+
+
+def build_header_sets(policy: Dict[str, Any], origins: Sequence[str]) -> Mapping[str, Mapping[str, str]]:
+    """
+    Precomputes the response headers of every allowed origin.
+
+    Returns:
+        origin -> read-only header mapping
+    """
+    shared = {
+        # The form sends JSON - Content-Type and Idempotency-Key for callers that still use them
+        "Access-Control-Allow-Headers": ", ".join(policy["allow_headers"]),
+        "Access-Control-Allow-Methods": ", ".join(policy["allow_methods"]),
+        # Lets the form's JavaScript read them (ex. Retry-After of a 429)
+        "Access-Control-Expose-Headers": ", ".join(policy["expose_headers"]),
+        # Browsers cache the preflight answer this long instead of asking before every POST
+        "Access-Control-Max-Age": str(policy["max_age_seconds"]),
+        # The answer depends on the Origin header - shared caches must not mix origins
+        "Vary": "Origin"
+    }
+    return MappingProxyType({
+        origin: MappingProxyType({"Access-Control-Allow-Origin": origin, **shared}) for origin in origins
+    })
+
+
+# Built at import = once per Lambda container
+POLICY = load_policy(os.environ.get("CORS_POLICY_FILE", DEFAULT_POLICY_FILE))
+ALLOWED_ORIGINS: Tuple[str, ...] = tuple(dict.fromkeys(POLICY["allowed_origins"] + extra_origins(os.environ)))
+HEADER_SETS = build_header_sets(POLICY, ALLOWED_ORIGINS)
+
+# Other origins get no Access-Control-Allow-Origin - the browser keeps the response from their scripts
+DISALLOWED_HEADERS: Mapping[str, str] = MappingProxyType({"Vary": "Origin"})
+
+
+def headers_for(origin: Optional[str]) -> Mapping[str, str]:
+    """
+    CORS headers of a response to this Origin header.
+
+    Returns:
+        Precomputed read-only mapping - copy it before adding headers
+    """
+    if not origin:
+        return DISALLOWED_HEADERS
+
+    headers = HEADER_SETS.get(origin)
+    if headers is None:
+        headers = HEADER_SETS.get(normalize_origin(origin), DISALLOWED_HEADERS)
+    return headers
+
+
+def is_allowed(origin: Optional[str]) -> bool:
+    return headers_for(origin) is not DISALLOWED_HEADERS
+
+
+def preflight_options(
+        allow_methods: Optional[Sequence[str]] = None,
+        allow_headers: Optional[Sequence[str]] = None,
+        origins: Sequence[str] = (),
+        policy: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    API Gateway preflight settings from the policy (for apigateway.CorsOptions in CDK).
+
+    Args:
+        allow_methods: methods of the resource (None = the contact form's)
+        allow_headers: request headers of the resource (None = the contact form's)
+        origins: deploy-time origins on top of the allowlist (CDK tokens are fine)
+        policy: defaults to the loaded policy
+
+    Returns:
+        {"allow_origins", "allow_methods", "allow_headers", "expose_headers", "max_age_seconds"}
+        (expose_headers matter where API Gateway adds the CORS headers itself - HTTP APIs)
+    """
+    policy = policy or POLICY
+    return {
+        "allow_origins": list(policy["allowed_origins"]) + list(origins),
+        "allow_methods": list(allow_methods or policy["allow_methods"]),
+        "allow_headers": list(allow_headers or policy["allow_headers"]),
+        "expose_headers": list(policy["expose_headers"]),
+        "max_age_seconds": policy["max_age_seconds"]
+    }
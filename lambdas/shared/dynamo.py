@@ -0,0 +1,76 @@
+"""
+Shared conversion between plain Python items and DynamoDB's low-level attribute values.
+
+The Lambda uses the low-level client (see clients.py) instead of boto3's Table resource,
+so items are converted here: {"email": "a@b.c"} <-> {"email": {"S": "a@b.c"}}.
+"""
+
+from decimal import Decimal
+from typing import Any, Dict
+
+
+def serialize_value(value: Any) -> Dict[str, Any]:
+    """
+    Converts one Python value into a DynamoDB attribute value.
+
+    Args:
+        value: str, int, float, Decimal, bool, None, bytes, dict, list/tuple
+
+    Returns:
+        Attribute value (ex. {"S": "text"}, {"N": "4"})
+    """
+    # bool before int - bool is a subclass of int in Python
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, str):
+        return {"S": value}
+    if isinstance(value, (int, float, Decimal)):
+        return {"N": str(value)}
+    if value is None:
+        return {"NULL": True}
+    if isinstance(value, (bytes, bytearray)):
+        return {"B": bytes(value)}
+    if isinstance(value, dict):
+        return {"M": serialize_item(value)}
+    if isinstance(value, (list, tuple)):
+        return {"L": [serialize_value(item) for item in value]}
+
+    raise TypeError(f"Unsupported DynamoDB type: {type(value).__name__}")
+
+
+def deserialize_value(attribute: Dict[str, Any]) -> Any:
+    """
+    Converts one DynamoDB attribute value back into Python.
+
+    Numbers come back as int when they have no decimals, Decimal otherwise.
+    """
+    (kind, value), = attribute.items()
+
+    if kind == "S":
+        return value
+    if kind == "N":
+        return int(value) if value.lstrip("-").isdigit() else Decimal(value)
+    if kind == "BOOL":
+        return value
+    if kind == "NULL":
+        return None
+    if kind == "B":
+        return value
+    if kind == "M":
+        return deserialize_item(value)
+    if kind == "L":
+        return [deserialize_value(item) for item in value]
+    if kind == "SS":
+        return set(value)
+
+    raise TypeError(f"Unsupported DynamoDB attribute type: {kind}")
+
+
+def serialize_item(item: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Converts a whole item (dict of attributes)."""
+    return {key: serialize_value(value) for key, value in item.items()}
+
+
+def deserialize_item(item: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Converts a whole item back into a plain dict."""
+    return {key: deserialize_value(value) for key, value in item.items()}
@@ -0,0 +1,370 @@
+"""
+Shared form schemas - which fields a business unit's contact form has and how they are checked.
+
+Declared in data/form_schemas.json (common fields + per-unit fields, types, limits), compiled once
+per container into one validator per unit: a tuple of (name, required, check) closures that
+normalizes and validates a body in a single pass. New business unit = new entry in the JSON file.
+
+Field types:
+- text    NFC, control characters removed, whitespace collapsed (multiline keeps line breaks)
+- email   lowercased, basic address shape
+- phone   E.164 (+4915112345678) for numbers with +/00. National numbers (0151 ...) get the country
+          code of the site's language (unit's country_codes, ex. RO -> 40); without one (EN site,
+          bulk imports) they are kept as entered - a guessed country would turn a Romanian 0721 ...
+          into a German number
+- enum    one of "values" (the website's <select> options)
+- integer whole number within min/max (accepts "12" from form posts)
+
+Bodies are size-checked before they are decoded (base64) or parsed (JSON), so oversized or
+garbage requests cost neither a JSON parse nor an AWS call.
+"""
+
+import base64
+import binascii
+import json
+import os
+import re
+import unicodedata
+from typing import Dict, Any, Callable, List, Mapping, Tuple
+
+# Default schema location (next to this module) - FORM_SCHEMAS_FILE env var can point somewhere else
+DEFAULT_SCHEMAS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "form_schemas.json")
+
+# Results of a field check
+MISSING = "missing"
+INVALID = "invalid"
+
+# Control characters (C0, DEL, C1) - tab/newline are kept in multiline fields
+_CONTROL_CHARACTERS = re.compile(r"[\x00-\x1f\x7f-\x9f]")
+_CONTROL_CHARACTERS_MULTILINE = re.compile(r"[\x00-\x08\x0b-\x1f\x7f-\x9f]")
+_HORIZONTAL_WHITESPACE = re.compile(r"[^\S\n]+")
+
+# Deliberately loose - SES tells us about addresses that don't exist, this only stops obvious junk
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s.]+$")
+
+# Characters people type between phone digits
+_PHONE_SEPARATORS = re.compile(r"[\s\-().\/]")
+
+# E.164: at most 15 digits, real numbers have at least 7
+PHONE_MIN_DIGITS = 7
+PHONE_MAX_DIGITS = 15
+
+
+class FormError(ValueError):
+    """
+    Raised for request bodies that are rejected before validation.
+
+    reason: "too_large" (413) or "malformed" (400)
+    """
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class _Invalid(Exception):
+    """Internal - a field value that fails its check."""
+
+
+# FIELD CHECKS (compiled from the schema)
+#-----------------------------------------
+
+def _clean_text(value: str, multiline: bool) -> str:
+    value = unicodedata.normalize("NFC", value)
+    if multiline:
+        value = value.replace("\r\n", "\n").replace("\r", "\n")
+        value = _CONTROL_CHARACTERS_MULTILINE.sub("", value)
+        # Trailing spaces of lines and runs of blank lines carry nothing
+        value = "\n".join(_HORIZONTAL_WHITESPACE.sub(" ", line).strip() for line in value.split("\n"))
+        return re.sub(r"\n{3,}", "\n\n", value).strip()
+    return " ".join(_CONTROL_CHARACTERS.sub(" ", value).split())
+
+
+def _text_check(spec: Mapping[str, Any], unit: Mapping[str, Any]) -> Callable[[Any], Any]:
+    max_length = spec.get("max_length", 2000)
+    truncate = spec.get("truncate", False)
+    multiline = spec.get("multiline", False)
+
+    def check(value: Any) -> str:
+        if not isinstance(value, str):
+            raise _Invalid()
+        value = _clean_text(value, multiline)
+        if len(value) > max_length:
+            if not truncate:
+                raise _Invalid()
+            # "truncate": true in the schema - cut and mark, don't reject a long message
+            value = value[:max_length] + "..."
+        return value
+
+    return check
+
+
+def _email_check(spec: Mapping[str, Any], unit: Mapping[str, Any]) -> Callable[[Any], Any]:
+    max_length = spec.get("max_length", 254)
+
+    def check(value: Any) -> str:
+        if not isinstance(value, str):
+            raise _Invalid()
+        value = value.strip().lower()
+        if len(value) > max_length or not _EMAIL.match(value):
+            raise _Invalid()
+        return value
+
+    return check
+
+
+def _phone_check(spec: Mapping[str, Any], unit: Mapping[str, Any]) -> Callable[[Any], Any]:
+    # Set by compile_unit for one language - empty = country unknown
+    country_code = str(unit.get("country_code", ""))
+
+    def check(value: Any) -> str:
+        if not isinstance(value, str):
+            raise _Invalid()
+        number = _PHONE_SEPARATORS.sub("", value)
+
+        if number.startswith("+"):
+            digits = number[1:]
+        elif number.startswith("00"):
+            digits = number[2:]
+        elif number.startswith("0") and country_code:
+            # National format (0151 ...) -> country code without the trunk 0
+            digits = country_code + number[1:]
+        else:
+            # Country unknown - stored as the visitor typed it (still only digits and separators)
+            if not number.isdigit() or not PHONE_MIN_DIGITS <= len(number) <= PHONE_MAX_DIGITS:
+                raise _Invalid()
+            return " ".join(value.split())
+
+        if not digits.isdigit() or not PHONE_MIN_DIGITS <= len(digits) <= PHONE_MAX_DIGITS:
+            raise _Invalid()
+        return f"+{digits}"
+
+    return check
+
+
+def _enum_check(spec: Mapping[str, Any], unit: Mapping[str, Any]) -> Callable[[Any], Any]:
+    values = frozenset(spec["values"])
+
+    def check(value: Any) -> str:
+        if not isinstance(value, str) or value.strip() not in values:
+            raise _Invalid()
+        return value.strip()
+
+    return check
+
+
+def _integer_check(spec: Mapping[str, Any], unit: Mapping[str, Any]) -> Callable[[Any], Any]:
+    minimum = spec.get("min")
+    maximum = spec.get("max")
+
+    def check(value: Any) -> int:
+        # bool is a subclass of int - true isn't a quantity
+        if isinstance(value, bool):
+            raise _Invalid()
+        if isinstance(value, str):
+            value = value.strip()
+            if not value.isdigit():
+                raise _Invalid()
+            value = int(value)
+        elif not isinstance(value, int):
+            raise _Invalid()
+
+        if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+            raise _Invalid()
+        return value
+
+    return check
+
+
+FIELD_TYPES = {
+    "text": _text_check,
+    "email": _email_check,
+    "phone": _phone_check,
+    "enum": _enum_check,
+    "integer": _integer_check
+}
+
+
+# COMPILING
+#-----------
+
+def compile_unit(fields: Mapping[str, Any], unit: Mapping[str, Any], language: str = "") -> Tuple[tuple, ...]:
+    """
+    Compiles the field declarations of one business unit for one site language.
+
+    Args:
+        fields: field name -> {"type", "required"?, limits...} (common + unit fields)
+        unit: unit entry (country_codes, ...)
+        language: EN, DE, RO - picks the country code of national phone numbers ("" = none)
+
+    Returns:
+        ((name, required, check), ...) in declaration order
+
+    Raises:
+        ValueError: for unknown field types (a broken schema fails the cold start, not a request)
+    """
+    unit = {**unit, "country_code": unit.get("country_codes", {}).get(language, "")}
+    compiled = []
+    for name, spec in fields.items():
+        if spec["type"] not in FIELD_TYPES:
+            raise ValueError(f"Unknown type {spec['type']!r} of form field {name!r}")
+        compiled.append((name, bool(spec.get("required", False)), FIELD_TYPES[spec["type"]](spec, unit)))
+    return tuple(compiled)
+
+
+def load_schemas(path: str = DEFAULT_SCHEMAS_FILE) -> Dict[str, Any]:
+    """
+    Reads and compiles a schema file.
+
+    Args:
+        path: JSON file with max_body_bytes, max_batch_body_bytes, fields (common) and units
+
+    Returns:
+        {"max_body_bytes", "max_batch_body_bytes", "validators": {unit: compiled},
+         "localized": {(unit, language): compiled}, "default": compiled}
+        "validators" = no language (national phone numbers kept as entered)
+        "localized" = one per language with a country code in the unit's country_codes
+        "default" = common fields only, for units without an entry
+    """
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+
+    common = raw["fields"]
+    validators, localized = {}, {}
+    for unit, entry in raw.get("units", {}).items():
+        fields = {**common, **entry.get("fields", {})}
+        validators[unit.lower()] = compile_unit(fields, entry)
+        for language in entry.get("country_codes", {}):
+            localized[(unit.lower(), language.upper())] = compile_unit(fields, entry, language)
+
+    return {
+        "max_body_bytes": raw["max_body_bytes"],
+        "max_batch_body_bytes": raw["max_batch_body_bytes"],
+        "validators": validators,
+        "localized": localized,
+        "default": compile_unit(common, {})
+    }
+
+
+# Built at import = once per Lambda container
+SCHEMAS = load_schemas(os.environ.get("FORM_SCHEMAS_FILE", DEFAULT_SCHEMAS_FILE))
+MAX_BODY_BYTES = SCHEMAS["max_body_bytes"]
+MAX_BATCH_BODY_BYTES = SCHEMAS["max_batch_body_bytes"]
+
+
+# REQUEST PATH
+#--------------
+
+def decode_body(event: Dict[str, Any], max_bytes: int = MAX_BODY_BYTES) -> Dict[str, Any]:
+    """
+    Size-checks, decodes and parses the JSON body of an API Gateway event.
+
+    The size is checked on the raw string first, so an oversized body is never decoded or parsed.
+
+    Args:
+        event: API Gateway event (isBase64Encoded bodies are decoded)
+        max_bytes: largest accepted body (decoded UTF-8 bytes)
+
+    Returns:
+        Parsed body (empty dict for a missing body - reported as missing fields)
+
+    Raises:
+        FormError: too_large or malformed (not base64/UTF-8/JSON, or not a JSON object)
+    """
+    body = event.get("body") or ""
+    if not body:
+        return {}
+    if not isinstance(body, str):
+        raise FormError("malformed")
+
+    if event.get("isBase64Encoded"):
+        # 4 base64 characters per 3 bytes
+        if len(body) > (max_bytes + 2) // 3 * 4:
+            raise FormError("too_large")
+        try:
+            raw = base64.b64decode(body, validate=True)
+        except (binascii.Error, ValueError):
+            raise FormError("malformed")
+    else:
+        # Characters <= bytes, so this rejects most oversized bodies without encoding them
+        if len(body) > max_bytes:
+            raise FormError("too_large")
+        raw = body.encode("utf-8", errors="surrogatepass")
+
+    if len(raw) > max_bytes:
+        raise FormError("too_large")
+
+    try:
+        parsed = json.loads(raw.decode("utf-8"))
+    except ValueError:  # UnicodeDecodeError and JSONDecodeError are both ValueErrors
+        raise FormError("malformed")
+
+    if not isinstance(parsed, dict):
+        raise FormError("malformed")
+    return parsed
+
+
+def validate(business_unit: str, body: Any, language: str = "") -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Normalizes and validates one submission in a single pass over the unit's fields.
+
+    Args:
+        business_unit: construction, retail, etc. (unknown units get the common fields)
+        body: parsed submission (single POST or one batch entry)
+        language: site language the submission came from (EN, DE, RO) - "" = unknown
+
+    Returns:
+        (fields, errors)
+        fields: {name: normalized value} of the non-empty fields
+        errors: {name: "missing" or "invalid"} - empty when the submission is valid
+    """
+    validator = SCHEMAS["localized"].get((business_unit.lower(), language.upper())) or SCHEMAS["validators"].get(
+        business_unit.lower(), SCHEMAS["default"]
+    )
+    if not isinstance(body, dict):
+        return {}, {name: MISSING for name, required, _ in validator if required}
+
+    fields: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+
+    for name, required, check in validator:
+        value = body.get(name)
+        if value is None or value == "":
+            if required:
+                errors[name] = MISSING
+            continue
+
+        try:
+            value = check(value)
+        except _Invalid:
+            errors[name] = INVALID
+            continue
+
+        # Whitespace-only text ends up empty
+        if value == "":
+            if required:
+                errors[name] = MISSING
+            continue
+        fields[name] = value
+
+    return fields, errors
+
+
+def error_message_key(errors: Dict[str, str]) -> str:
+    """Locale message for validation errors: missing_fields wins over invalid_fields."""
+    return "missing_fields" if MISSING in errors.values() else "invalid_fields"
+
+
+def field_names(business_unit: str) -> Tuple[str, ...]:
+    """Form fields of a business unit in declaration order."""
+    validator = SCHEMAS["validators"].get(business_unit.lower(), SCHEMAS["default"])
+    return tuple(name for name, _, _ in validator)
+
+
+def all_field_names() -> Tuple[str, ...]:
+    """Form fields of every business unit (common fields first)."""
+    names: List[str] = [name for name, _, _ in SCHEMAS["default"]]
+    for validator in SCHEMAS["validators"].values():
+        names.extend(name for name, _, _ in validator if name not in names)
+    return tuple(names)
+
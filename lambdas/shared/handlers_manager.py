@@ -3,246 +3,423 @@ Shared handler manager functions for all business units.
 Single entry point for processing any contact form submissions.
 """
 
-import json
+import contextvars
+import functools
+import time
 from datetime import datetime, timezone
 import uuid
-from typing import Dict, Any
-
-# noinspection PyPackageRequirements
-import boto3
-
-from shared.utils import sanitize_input, determine_language_from_domain, create_cors_response
-
-dynamodb = boto3.resource("dynamodb")
-
-# Simple Email Service client
-# Handles all email operations through the Frankfurt region for GDPR (= General Data Protection Regulation)
-# EU laws require businesses to protect EU citizens' personal data and keep it within EU borders
-# .client = low-lvl, direct API mapping, more control
-ses = boto3.client("ses", region_name="eu-central-1")
-
-
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple
+
+from shared.utils import (
+    determine_language_from_domain, create_cors_response, format_response, get_header, get_payload_version,
+    get_source_ip
+)
+from shared.i18n import get_messages
+from shared.clients import get_client
+from shared.dynamo import serialize_item
+from shared.codec import encode_item
+from shared import form_schema, idempotency, metrics, rate_limit, tracing
+from shared.retention import expires_at
+from shared.shard_keys import partition_key, shard_suffix
+from shared.contacts_query import build_status_key
+from shared.notifications import send_notification_email, build_notification_job, enqueue_notification
+
+# How the SES notification is sent:
+# inline     = SES call on the request path after the DynamoDB write (visitor waits for both)
+# concurrent = SES call on a worker thread during the DynamoDB write (visitor waits for the slower one)
+# queue      = compact job on SQS, the notification consumer Lambda sends it later
+NOTIFICATION_MODES = ("inline", "concurrent", "queue")
+
+# Small pool shared by all warm invocations - one email per invocation, 2 threads leave headroom
+_notification_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="notification")
+
+
+@metrics.instrument
+@tracing.traced("contact_form_submission")
 def process_contact_form_submission(
         event: Dict[str, Any],
         business_unit: str,
         table_name: str,
         from_email: str,
         to_email: str,
-        environment: str = "dev"
+        environment: str = "dev",
+        notification_mode: str = "inline",
+        notification_queue_url: str = "",
+        retention_days: int = 0,
+        shard_count: int = 1
 ) -> Dict[str, Any]:
     """
     Complete contact form processing for any business unit.
     Handles:
-    - validation
+    - body size/format checks and validation against the unit's form schema (before any AWS call)
+    - rate limiting (source IP, email)
+    - duplicate submissions (Idempotency-Key header or content hash)
     - storage
     - email
     - multi-language responses
+    - per-phase latency and outcome metrics (one EMF log line, see metrics.py)
+    - a trace with the request's correlation ids (see tracing.py)
 
     Args:
-        event: API Gateway event with form data
+        event: API Gateway event with form data - REST API (payload 1.0) or HTTP API (payload 2.0)
         business_unit: construction, retail, etc.
         table_name: DynamoDB table name
         from_email: verified SES sender
         to_email: recipient email
         environment: dev or prod
+        notification_mode: inline, concurrent or queue (see NOTIFICATION_MODES)
+        notification_queue_url: SQS queue for queue mode
+        retention_days: days the submission stays in DynamoDB before TTL moves it to the archive (0 = forever)
+        shard_count: write shards per business unit (1 = unsharded BU#<UNIT> key, see sharding.py)
 
     Returns:
-        API Gateway response with CORS headers
+        API Gateway response with CORS headers, in the event's payload format
     """
-    # Determine language from subdomain origin
-    origin = event.get("headers", {}).get("origin", "")
-    language = determine_language_from_domain(origin)
-
-    # Response message in all languages
-    messages = {
-        "EN": {
-            "success": "Contact form submitted successfully!",
-            "missing_fields": "Missing mandatory fields",
-            "server_error": "Internal server error"
-        },
-
-        "DE": {
-            "success": "Das Kontaktformular wurde erfolgreich abgeschickt!",
-            "missing_fields": "Pflichtfelder fehlen",
-            "server_error": "Serverfehler"
-        },
-
-        "RO": {
-            "success": "Formularul de contact a fost trimis cu succes!",
-            "missing_fields": "Câmpuri obligatorii lipsă",
-            "server_error": "Eroare internă"
-        }
-    }
+    payload_version = get_payload_version(event)
+
+    checked, rejection = _check_submission(event, business_unit)
+    if rejection is not None:
+        return format_response(rejection, payload_version)
+
+    return format_response(_store_submission(
+        event, business_unit, checked, table_name, from_email, to_email, environment,
+        notification_mode, notification_queue_url, retention_days, shard_count
+    ), payload_version)
+
+
+@metrics.instrument_async
+@tracing.traced_async("contact_form_submission")
+async def process_contact_form_submission_async(
+        event: Dict[str, Any],
+        business_unit: str,
+        table_name: str,
+        from_email: str,
+        to_email: str,
+        environment: str = "dev",
+        notification_mode: str = "inline",
+        notification_queue_url: str = "",
+        retention_days: int = 0,
+        shard_count: int = 1,
+        executor: Optional[Executor] = None,
+        notification_executor: Optional[Executor] = None
+) -> Dict[str, Any]:
+    """
+    Async version of process_contact_form_submission for long-lived containers (see asgi.py).
 
-    response_msg = messages.get(language, messages["EN"]) # default to english
+    Lambda runs one request per container at a time, a container process serves many at once:
+    - the checks (size, decode, schema) are pure CPU and run right on the event loop,
+      so rejected requests never wait for a thread
+    - everything after them (rate limits, DynamoDB, SES) is the same blocking code Lambda runs,
+      on an executor thread - the loop keeps accepting requests while it waits for AWS
 
+    Args:
+        event ... shard_count: same as process_contact_form_submission
+        executor: threads for the AWS part (None = the loop's default executor)
+        notification_executor: threads for concurrent mode emails (None = the small Lambda pool)
+
+    Returns:
+        API Gateway response with CORS headers (same as the Lambda version)
+    """
+    # Imported here - asyncio costs a Lambda cold start ~50 ms and only container processes need it
+    import asyncio
+
+    payload_version = get_payload_version(event)
+
+    checked, rejection = _check_submission(event, business_unit)
+    if rejection is not None:
+        return format_response(rejection, payload_version)
+
+    # The copied context carries this request's metrics recorder and trace into the thread
+    store = functools.partial(
+        contextvars.copy_context().run, _store_submission,
+        event, business_unit, checked, table_name, from_email, to_email, environment,
+        notification_mode, notification_queue_url, retention_days, shard_count,
+        notification_executor or _notification_pool
+    )
+    return format_response(await asyncio.get_running_loop().run_in_executor(executor, store), payload_version)
+
+
+def _check_submission(
+        event: Dict[str, Any], business_unit: str
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Language, size/format checks and validation - no AWS call, no blocking.
+
+    Returns:
+        (checked request: origin, language, messages, fields, idempotency_key - None rejection) or ({}, 4xx response)
+    """
+    # Determine language from subdomain origin (or the browser's language for unknown origins)
+    origin = get_header(event, "origin")
+    language = determine_language_from_domain(origin, get_header(event, "accept-language"))
+
+    # Response messages come from the locale catalog built once per container
+    response_msg = get_messages(language)
+
+    metrics.set_dimension("BusinessUnit", business_unit)
+    metrics.set_dimension("Language", language)
+    tracing.set_attribute("business_unit", business_unit)
+    tracing.set_attribute("request_id", tracing.request_id(event))
+
+    # Size check, decode and validation first - they are pure CPU, so junk never costs an AWS call
     try:
-        # Parse form data
-        body = json.loads(event.get("body", "{}"))
+        with metrics.phase("parse"):
+            body = form_schema.decode_body(event, form_schema.MAX_BODY_BYTES)
+    except form_schema.FormError as e:
+        metrics.set_outcome(e.reason)
+        if e.reason == "too_large":
+            return {}, create_cors_response(413, {"error": response_msg["request_too_large"]}, origin=origin)
+        return {}, create_cors_response(400, {"error": response_msg["malformed_request"]}, origin=origin)
+
+    # Fields, types and normalizers come from the unit's compiled schema (data/form_schemas.json)
+    with metrics.phase("parse"):
+        # The site's language decides the country of national phone numbers (bau. = DE, constructii. = RO)
+        fields, errors = form_schema.validate(business_unit, body, language)
+    if errors:
+        metrics.set_outcome("invalid")
+        return {}, create_cors_response(400, {
+            "error": response_msg[form_schema.error_message_key(errors)],
+            "fields": sorted(errors)
+        }, origin=origin)
+
+    # Idempotency-Key header, or the same key in the body - the websites send it there, so the
+    # form stays a CORS simple request (no preflight round trip, see cors.py)
+    idempotency_key = get_header(event, "idempotency-key") or body.get("idempotency_key")
+
+    return {
+        "origin": origin,
+        "language": language,
+        "messages": response_msg,
+        "fields": fields,
+        "idempotency_key": idempotency_key if isinstance(idempotency_key, str) else ""
+    }, None
+
+
+def _store_submission(
+        event: Dict[str, Any],
+        business_unit: str,
+        checked: Dict[str, Any],
+        table_name: str,
+        from_email: str,
+        to_email: str,
+        environment: str,
+        notification_mode: str,
+        notification_queue_url: str,
+        retention_days: int,
+        shard_count: int,
+        notification_pool: Executor = _notification_pool
+) -> Dict[str, Any]:
+    """
+    Rate limits, duplicate check, DynamoDB write and email of a checked submission (blocking AWS calls).
 
-        # Extract mandatory fields
-        contact_person = body.get("contact_person", "").strip()
-        email = body.get("email", "").strip()
-        phone = body.get("phone", "").strip()
-        message = sanitize_input(body.get("message", "").strip())
+    Args:
+        checked: output of _check_submission
+        notification_pool: threads for concurrent mode emails
+        (the rest: see process_contact_form_submission)
 
-        # Validate required fields
-        if not all([contact_person, email, phone, message]):
-            return create_cors_response(400, {"error": response_msg["missing_fields"]})
+    Returns:
+        API Gateway response with CORS headers
+    """
+    origin, language, response_msg, fields = (
+        checked["origin"], checked["language"], checked["messages"], checked["fields"]
+    )
+    email, phone, message = fields["email"], fields["phone"], fields["message"]
+
+    # Rate limit by source IP before anything is stored - hammering clients never reach the write
+    source_ip = get_source_ip(event)
+    with metrics.phase("rate_limit"):
+        allowed = rate_limit.take_token(table_name, "ip", source_ip)
+    if not allowed:
+        return _rate_limited_response(response_msg, "ip", source_ip, origin)
 
-        # Extract optional fields
-        company = body.get("company", "").strip()
-        project_type = body.get("project_type", "").strip()
-        timeline = body.get("timeline", "").strip()
-        units_needed = body.get("units_needed", "").strip()
+    try:
+        # Same limit per sender address (an IP change doesn't reset it)
+        normalized_email = rate_limit.normalize_email(email)
+        with metrics.phase("rate_limit"):
+            allowed = rate_limit.take_token(table_name, "email", normalized_email)
+        if not allowed:
+            return _rate_limited_response(response_msg, "email", normalized_email, origin)
 
         # Generate IDs
         contact_id = str(uuid.uuid4())
-        timestamp = datetime.now(timezone.utc).isoformat()
+        tracing.set_attribute("contact_id", contact_id)
+        now = time.time()
+        timestamp = datetime.fromtimestamp(now, timezone.utc).isoformat()
+
+        # Double clicks/browser retries get the original contact_id back - no new item, no new email
+        # Checked in the warm container's LRU first, then with a conditional put in DynamoDB
+        idempotency_key = idempotency.build_idempotency_key(
+            checked["idempotency_key"], email, phone, message
+        )
+        with metrics.phase("idempotency"):
+            original_id = idempotency.lookup_recent(idempotency_key, table_name=table_name)
+            if original_id is None:
+                original_id = idempotency.claim(table_name, idempotency_key, contact_id)
+                if original_id == "":
+                    # The original record vanished between the failed put and the read - claim it once more
+                    original_id = idempotency.claim(table_name, idempotency_key, contact_id)
+        if original_id == "":
+            # Still not ours - never write without owning the key (500 = the browser may retry)
+            raise RuntimeError(f"Could not claim idempotency key {idempotency_key}")
+        if original_id:
+            idempotency.remember(idempotency_key, original_id, table_name=table_name)
+            tracing.set_attribute("contact_id", original_id)
+            metrics.set_outcome("duplicate")
+            return create_cors_response(200, {
+                "message": response_msg["success"],
+                "contact_id": original_id
+            }, origin=origin)
 
         # Create DynamoDB item
-        item = {
-            "pk": f"BU#{business_unit.upper()}",
-            "sk": f"CONTACT#{timestamp}#{contact_id}",
-            "contact_id": contact_id,
-            "business_unit": business_unit,
-            "timestamp": timestamp,
-            "environment": environment,
-            "status": "new",
-            "contact_person": contact_person,
-            "email": email,
-            "phone": phone,
-            "message": message,
-            "company": company,
-            "project_type": project_type,
-            "timeline": timeline,
-            "units_needed": units_needed,
-            "source_domain": origin
-        }
-
-        # Remove empty strings to save storage
-        item = {k: v for k, v in item.items() if v}
-
-        # Save to DynamoDB
-        table = dynamodb.Table(table_name)
-        table.put_item(Item=item)
-
-        # Format email based on language
-        email_subject, email_body = format_email_content(
-            business_unit, company, contact_person, email, phone,
-            message, project_type, timeline, units_needed,
-            timestamp, language
+        item = build_contact_item(
+            business_unit, contact_id, timestamp, fields,
+            environment=environment,
+            source_domain=origin,
+            expires=expires_at(now, retention_days),  # TTL - the stream archives it to S3 on expiry
+            shard_count=shard_count
         )
 
-        # Try to send email but don't fail if it doesn't work
-        try:
-            ses.send_email(
-                Source=from_email,
-                Destination={"ToAddresses": [to_email]},
-                Message={
-                    "Subject": {"Data": email_subject, "Charset": "UTF-8"},
-                    "Body": {"Text": {"Data": email_body, "Charset": "UTF-8"}}
-                }
+        # Concurrent mode: SES send starts on a worker thread while this thread writes to DynamoDB
+        email_future = None
+        if notification_mode == "concurrent":
+            # Runs in a copy of this context, so its metrics and spans belong to this invocation
+            email_future = notification_pool.submit(
+                contextvars.copy_context().run,
+                _send_email_logged, contact_id, from_email, to_email, business_unit, fields, timestamp, language
             )
-        except Exception as e:
-            print(f"Email failed for {contact_id}: {str(e)}")
-            print("Data saved successfully to DynamoDB")
+
+        try:
+            # Save to DynamoDB (low-level client, created on first use - not for requests rejected above)
+            # Compact encoding (short names, compressed message) - see codec.py
+            with metrics.phase("write"), tracing.span("dynamodb.put_item", table=table_name):
+                get_client("dynamodb").put_item(TableName=table_name, Item=serialize_item(encode_item(item)))
+        except Exception:
+            # Let the retry through - this submission was never stored
+            idempotency.release(table_name, idempotency_key)
+            if email_future is not None:
+                print(f"DynamoDB write failed for {contact_id} while its email was sent concurrently")
+            raise
+        finally:
+            # Wait for the email either way - Lambda freezes the container (and the thread) once we return
+            if email_future is not None:
+                email_future.result()
+
+        idempotency.remember(idempotency_key, contact_id, table_name=table_name)
+
+        # Queue mode: hand the email to the consumer Lambda and return right after the DynamoDB write
+        if notification_mode == "queue" and notification_queue_url:
+            try:
+                with metrics.phase("enqueue"):
+                    enqueue_notification(
+                        notification_queue_url,
+                        build_notification_job(contact_id, business_unit, timestamp, language, fields)
+                    )
+                metrics.set_outcome("success")
+                return create_cors_response(200, {
+                    "message": response_msg["success"],
+                    "contact_id": contact_id
+                }, origin=origin)
+            except Exception as e:
+                # Queue unavailable - fall back to sending inline so the email isn't lost
+                print(f"Queueing email failed for {contact_id}, sending inline: {str(e)}")
+                metrics.count("enqueue_failures")
+
+        # Inline mode (and queue fallback): try to send email but don't fail if it doesn't work
+        if email_future is None:
+            _send_email_logged(contact_id, from_email, to_email, business_unit, fields, timestamp, language)
 
         # Success response
+        metrics.set_outcome("success")
         return create_cors_response(200, {
             "message": response_msg["success"],
             "contact_id": contact_id
-        })
+        }, origin=origin)
 
     except Exception as e:
         print(f"Error processing contact form: {str(e)}")
-        return create_cors_response(500, {"error": messages["server_error"]})
+        return create_cors_response(500, {"error": response_msg["server_error"]}, origin=origin)
 
 
-def format_email_content(
-        business_unit: str, company: str, contact_person: str,
-        email: str, phone: str, message: str, project_type: str,
-        timeline: str, units_needed: str, timestamp: str, language: str
-) -> tuple[str, str]:
+def build_contact_item(
+        business_unit: str,
+        contact_id: str,
+        timestamp: str,
+        fields: Dict[str, Any],
+        environment: str = "dev",
+        source_domain: str = "",
+        expires: Optional[int] = None,
+        shard_count: int = 1
+) -> Dict[str, Any]:
     """
-    Format email notification in appropriate language.
+    Builds the DynamoDB item of a submission (plain values - serialize_item converts them).
+
+    Single and bulk submissions both go through here, so they are stored identically.
+
+    Args:
+        business_unit: construction, retail, etc.
+        contact_id: uuid of the submission
+        timestamp: ISO submission time (UTC)
+        fields: normalized fields (form_schema.validate)
+        environment: dev or prod
+        source_domain: Origin header of the website (empty for bulk imports)
+        expires: expires_at epoch for the TTL (None = keep forever)
+        shard_count: write shards (see sharding.py)
+
+    Returns:
+        Item without empty values
     """
-    templates = {
-        "DE": {
-            "subject": f"Neue Anfrage: {business_unit}",
-            "greeting": f"Neue Anfrage eingegangen:",
-            "labels": {
-                "company": "Firma",
-                "contact": "Kontakt Person",
-                "email": "Email",
-                "phone": "Tel.",
-                "project": "Projekttyp",
-                "timeline": "Zeitplan",
-                "units": "Benötigte Einheiten",
-                "message": "Nachricht",
-                "timestamp": "Zeitstempel",
-                "not_specified": "Nicht angegeben"
-            }
-        },
-        "EN": {
-            "subject": f"New inquiry: {business_unit}",
-            "greeting": f"New inquiry received:",
-            "labels": {
-                "company": "Company",
-                "contact": "Contact Person",
-                "email": "Email",
-                "phone": "Phone",
-                "project": "Project Type",
-                "timeline": "Timeline",
-                "units": "Units Needed",
-                "message": "Message",
-                "timestamp": "Timestamp",
-                "not_specified": "Not specified"
-            }
-        },
-        "RO": {
-            "subject": f"Cerere nouă: {business_unit}",
-            "greeting": f"Cerere nouă primită:",
-            "labels": {
-                "company": "Companie",
-                "contact": "Persoană de contact",
-                "email": "Email",
-                "phone": "Telefon",
-                "project": "Tip proiect",
-                "timeline": "Termen",
-                "units": "Unități necesare",
-                "message": "Mesaj",
-                "timestamp": "Marcaj temporal",
-                "not_specified": "Nespecificat"
-            }
-        }
+    item = {
+        "pk": partition_key(business_unit, contact_id, shard_count),  # spreads spikes over shards
+        "sk": f"CONTACT#{timestamp}#{contact_id}",
+        "contact_id": contact_id,
+        "business_unit": business_unit,
+        "timestamp": timestamp,
+        "environment": environment,
+        "status": "new",
+        # GSI key for the contacts query API - sharded like pk so GSI writes are spread too
+        "bu_status": build_status_key(business_unit, "new") + shard_suffix(contact_id, shard_count),
+        **fields,
+        "source_domain": source_domain,
+        "expires_at": expires
     }
 
-    t = templates.get(language, templates["DE"])
-    l = t["labels"]
-
-    body_parts = [
-        t["greeting"],
-        "",
-        f"{l['company']}: {company}",
-        f"{l['contact']}: {contact_person}",
-        f"{l['email']}: {email}",
-        f"{l['phone']}: {phone}",
-        "",
-        f"{l['project']}: {project_type or l['not_specified']}",
-        f"{l['timeline']}: {timeline or l['not_specified']}",
-    ]
-
-    if units_needed:
-        body_parts.append(f"{l['units']}: {units_needed}")
-
-    body_parts.extend([
-        "",
-        f"{l['message']}:",
-        message,
-        "",
-        "---",
-        f"{l['timestamp']}: {timestamp}"
-    ])
-
-    return t["subject"], "\n".join(body_parts)
\ No newline at end of file
+    # Remove empty strings to save storage
+    return {k: v for k, v in item.items() if v}
+
+
+def _send_email_logged(
+        contact_id: str, from_email: str, to_email: str, business_unit: str,
+        fields: Dict[str, str], timestamp: str, language: str
+) -> bool:
+    """
+    Sends the notification email, logging failures against the contact_id instead of raising.
+
+    The response never depends on the email - only on the DynamoDB write.
+    Note for concurrent mode: the email may already be out when the write fails.
+
+    Returns:
+        True if SES accepted the email
+    """
+    try:
+        with metrics.phase("email"):
+            send_notification_email(from_email, to_email, business_unit, fields, timestamp, language)
+        metrics.count("email_failures", 0)  # 0 as well, so the failure rate has a denominator
+        return True
+    except Exception as e:
+        print(f"Email failed for {contact_id}: {str(e)}")
+        metrics.count("email_failures", 1)
+        return False
+
+
+def _rate_limited_response(response_msg: Dict[str, str], kind: str, value: str, origin: str) -> Dict[str, Any]:
+    """
+    Localized 429 with Retry-After = seconds until the client's window ends.
+    The CORS policy exposes Retry-After, so the form's JavaScript can read it.
+    """
+    metrics.set_outcome("rate_limited")
+    return create_cors_response(
+        429,
+        {"error": response_msg["rate_limited"]},
+        {"Retry-After": str(rate_limit.seconds_until_allowed(kind, value))},
+        origin=origin
+    )
@@ -0,0 +1,159 @@
+"""
+Shared locale catalog and language resolution for all business units.
+
+The catalog (response messages, email templates, hostname -> language table) is loaded from
+data/locales.json once per container and frozen, so requests only do dictionary lookups.
+New business units (hostnames) or languages = edit the JSON file, no code change.
+"""
+
+import json
+import os
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+from urllib.parse import urlsplit
+
+# Default catalog location (next to this module) - LOCALES_FILE env var can point somewhere else
+DEFAULT_LOCALES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "locales.json")
+
+# Bounded caches - origins are a handful of real subdomains, anything beyond that is noise
+ORIGIN_CACHE_SIZE = 256
+ACCEPT_LANGUAGE_CACHE_SIZE = 128
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turns dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def load_catalog(path: str = DEFAULT_LOCALES_FILE) -> Mapping[str, Any]:
+    """
+    Reads and freezes a locale catalog file.
+
+    Args:
+        path: JSON file with default_language, default_email_language, hosts and languages
+
+    Returns:
+        Read-only catalog (MappingProxyType all the way down)
+    """
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+
+    # Normalize once here so lookups never need .lower()/.upper() on catalog data
+    raw["hosts"] = {host.lower(): language.upper() for host, language in raw.get("hosts", {}).items()}
+    raw["languages"] = {language.upper(): entry for language, entry in raw["languages"].items()}
+
+    return _freeze(raw)
+
+
+# Built at import = once per Lambda container
+CATALOG = load_catalog(os.environ.get("LOCALES_FILE", DEFAULT_LOCALES_FILE))
+LANGUAGES = CATALOG["languages"]
+DEFAULT_LANGUAGE = CATALOG["default_language"]
+DEFAULT_EMAIL_LANGUAGE = CATALOG.get("default_email_language", DEFAULT_LANGUAGE)
+HOSTS = CATALOG["hosts"]
+
+
+def get_messages(language: str) -> Mapping[str, str]:
+    """
+    Response messages (success, missing_fields, ...) for a language.
+
+    Returns:
+        Frozen message mapping, default language if unknown
+    """
+    entry = LANGUAGES.get(language) or LANGUAGES[DEFAULT_LANGUAGE]
+    return entry["responses"]
+
+
+def get_email_template(language: str) -> Mapping[str, Any]:
+    """
+    Email template (subject, greeting, labels) for a language.
+
+    Returns:
+        Frozen template mapping, default email language if unknown
+    """
+    entry = LANGUAGES.get(language) or LANGUAGES[DEFAULT_EMAIL_LANGUAGE]
+    return entry["email"]
+
+
+@lru_cache(maxsize=ORIGIN_CACHE_SIZE)
+def language_for_origin(origin: str) -> Optional[str]:
+    """
+    Looks up the language of an Origin header by its exact hostname.
+
+    Parsing the hostname (instead of searching for "bau." in the string) means unrelated hosts
+    such as "https://bau.example.com" no longer match.
+
+    Args:
+        origin: Origin header (ex. "https://bau.ranjdar-group.com")
+
+    Returns:
+        Language code, or None for unknown hosts
+    """
+    if not origin:
+        return None
+
+    try:
+        hostname = urlsplit(origin if "//" in origin else f"//{origin}").hostname
+    except ValueError:
+        return None
+
+    return HOSTS.get(hostname or "")
+
+
+@lru_cache(maxsize=ACCEPT_LANGUAGE_CACHE_SIZE)
+def language_from_accept_language(accept_language: str) -> Optional[str]:
+    """
+    Picks the best supported language from an Accept-Language header by q-value.
+
+    Args:
+        accept_language: ex. "ro-RO,ro;q=0.9,en;q=0.8"
+
+    Returns:
+        Language code, or None if no supported language is accepted
+    """
+    best_language, best_quality = None, 0.0
+
+    for position, part in enumerate(accept_language.split(",")):
+        tag, _, params = part.strip().partition(";")
+        language = tag.split("-")[0].strip().upper()
+        if language not in LANGUAGES:
+            continue
+
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+
+        # Strictly greater = on equal q-values the first one listed wins
+        if quality > best_quality:
+            best_language, best_quality = language, quality
+
+    return best_language
+
+
+def resolve_language(origin: str, accept_language: str = "") -> str:
+    """
+    Resolves the response language of a request.
+
+    Order: known hostname of the Origin -> Accept-Language q-values -> default language.
+
+    Args:
+        origin: Origin header
+        accept_language: Accept-Language header
+
+    Returns:
+        Language code: EN, DE, RO
+    """
+    return (
+        language_for_origin(origin)
+        or (accept_language and language_from_accept_language(accept_language))
+        or DEFAULT_LANGUAGE
+    )
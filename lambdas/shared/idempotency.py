@@ -0,0 +1,158 @@
+"""
+Shared idempotency support for contact form submissions.
+
+Double clicks and browser retries must not create a second item or a second email.
+Each submission gets a key (Idempotency-Key header, or a hash of email + phone + message within
+a time window). The key is checked in two steps:
+    1. bounded in-memory LRU of the warm container (no AWS call at all)
+    2. conditional put of an idempotency record in the contact table (TTL'd, shared by all containers)
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from shared.clients import get_client, error_code
+
+# Identical content within this window counts as the same submission
+CONTENT_WINDOW_SECONDS = 600
+
+# How long a key is remembered in DynamoDB (expires_at = TTL attribute of the table)
+RECORD_TTL_SECONDS = 24 * 60 * 60
+
+# Per-container cache size - a few KB of memory
+LRU_SIZE = 1024
+
+# Client keys longer than this are hashed (keeps the DynamoDB key small)
+MAX_CLIENT_KEY_LENGTH = 128
+
+# Item key prefix - keeps idempotency records apart from BU#<UNIT> submissions
+RECORD_PREFIX = "IDEMPOTENCY#"
+
+# (table, key) -> (contact_id, expires_at)
+# Keyed by table too - the shared router Lambda serves several units (tables) from one container
+_recent: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+# A container process (asgi.py) runs many submissions on threads - LRU updates must not interleave
+_lock = threading.Lock()
+
+
+def build_idempotency_key(
+        client_key: str, email: str, phone: str, message: str, now: Optional[float] = None
+) -> str:
+    """
+    Builds the idempotency key of a submission.
+
+    Args:
+        client_key: Idempotency-Key header (empty = derive from content)
+        email, phone, message: form fields used for the content hash
+        now: current epoch seconds (for the content window)
+
+    Returns:
+        "client:<key>" or "content:<sha256>"
+    """
+    client_key = client_key.strip()
+    if client_key:
+        if len(client_key) > MAX_CLIENT_KEY_LENGTH:
+            client_key = hashlib.sha256(client_key.encode("utf-8")).hexdigest()
+        return f"client:{client_key}"
+
+    window = int((time.time() if now is None else now) // CONTENT_WINDOW_SECONDS)
+    content = "\x1f".join((email.strip().lower(), phone.strip(), message.strip(), str(window)))
+    return f"content:{hashlib.sha256(content.encode('utf-8')).hexdigest()}"
+
+
+def lookup_recent(key: str, now: Optional[float] = None, table_name: str = "") -> Optional[str]:
+    """
+    Checks the warm container's LRU.
+
+    Args:
+        key: idempotency key
+        now: current epoch seconds
+        table_name: contact table the key belongs to
+
+    Returns:
+        Original contact_id, or None if the key isn't cached (or expired)
+    """
+    with _lock:
+        entry = _recent.get((table_name, key))
+        if entry is None:
+            return None
+
+        contact_id, expires_at = entry
+        if expires_at <= (time.time() if now is None else now):
+            del _recent[(table_name, key)]
+            return None
+
+        _recent.move_to_end((table_name, key))
+        return contact_id
+
+
+def remember(key: str, contact_id: str, now: Optional[float] = None, table_name: str = "") -> None:
+    """Puts a key of a table in the LRU, dropping the least recently used one when full."""
+    with _lock:
+        _recent[(table_name, key)] = (contact_id, (time.time() if now is None else now) + RECORD_TTL_SECONDS)
+        _recent.move_to_end((table_name, key))
+        while len(_recent) > LRU_SIZE:
+            _recent.popitem(last=False)
+
+
+def claim(table_name: str, key: str, contact_id: str, now: Optional[float] = None) -> Optional[str]:
+    """
+    Claims a key with a conditional put - only the first submission succeeds.
+
+    Expired records still waiting for TTL deletion (can take up to 48h) count as free.
+
+    Args:
+        table_name: contact table (has expires_at as TTL attribute)
+        key: output of build_idempotency_key
+        contact_id: id the new submission will get
+        now: current epoch seconds
+
+    Returns:
+        None if the key was claimed for contact_id, otherwise the contact_id of the original submission
+        (empty string if the original record vanished in between)
+    """
+    now = int(time.time() if now is None else now)
+
+    try:
+        get_client("dynamodb").put_item(
+            TableName=table_name,
+            Item={
+                "pk": {"S": f"{RECORD_PREFIX}{key}"},
+                "sk": {"S": "IDEMPOTENCY"},
+                "contact_id": {"S": contact_id},
+                "expires_at": {"N": str(now + RECORD_TTL_SECONDS)}
+            },
+            ConditionExpression="attribute_not_exists(pk) OR expires_at < :now",
+            ExpressionAttributeValues={":now": {"N": str(now)}},
+            ReturnValuesOnConditionCheckFailure="ALL_OLD"
+        )
+        return None
+
+    except Exception as e:
+        if error_code(e) != "ConditionalCheckFailedException":
+            raise
+
+        # ALL_OLD puts the existing record in the error - older SDKs don't, so read it then
+        record = getattr(e, "response", {}).get("Item")
+        if record is None:
+            record = get_client("dynamodb").get_item(
+                TableName=table_name,
+                Key={"pk": {"S": f"{RECORD_PREFIX}{key}"}, "sk": {"S": "IDEMPOTENCY"}},
+                ConsistentRead=True
+            ).get("Item", {})
+        return record.get("contact_id", {}).get("S", "")
+
+
+def release(table_name: str, key: str) -> None:
+    """Deletes a claimed key (the contact write failed, so a retry must be allowed through)."""
+    try:
+        get_client("dynamodb").delete_item(
+            TableName=table_name,
+            Key={"pk": {"S": f"{RECORD_PREFIX}{key}"}, "sk": {"S": "IDEMPOTENCY"}}
+        )
+    except Exception as e:
+        print(f"Could not release idempotency key {key}: {str(e)}")
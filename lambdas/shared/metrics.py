@@ -0,0 +1,223 @@
+"""
+Shared request metrics in CloudWatch Embedded Metric Format (EMF).
+
+One JSON log line per invocation: CloudWatch Logs extracts the metrics from it asynchronously,
+so there is no PutMetricData call (and no extra latency or IAM permission) on the request path.
+
+Usage inside a handler function:
+    @metrics.instrument
+    def process_...(...):
+        metrics.set_dimension("BusinessUnit", business_unit)
+        with metrics.phase("write"):
+            ...
+        metrics.set_outcome("success")
+
+Every phase becomes a <phase>_ms metric; dimensions are business unit, language, outcome and
+cold/warm start. Without an active recorder (ex. a function called from a test) everything here
+is a no-op.
+
+Settings (environment variables, read once per container):
+- METRICS_ENABLED      "false" turns the line off completely
+- METRICS_SAMPLE_RATE  0..1 share of successful invocations that are logged - failures are always
+                       logged, the line carries the rate so counts can be scaled back up
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, Any, Callable, Iterator, List, Optional
+
+NAMESPACE = "RanjdarGroup/ContactForm"
+
+# Every set creates its own metrics in CloudWatch (= cost) - outcome per unit, and cold/warm per language
+DIMENSION_SETS = (
+    ("BusinessUnit", "Outcome"),
+    ("BusinessUnit", "Language", "Start")
+)
+DIMENSIONS = ("BusinessUnit", "Language", "Outcome", "Start")
+
+# Outcomes that are sampled - anything else (rejections, errors) is always logged
+SAMPLED_OUTCOMES = ("success", "duplicate")
+
+ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() != "false"
+SAMPLE_RATE = min(max(float(os.environ.get("METRICS_SAMPLE_RATE", "1")), 0.0), 1.0)
+
+# First invocation of this container - flipped by the first recorder
+_cold_start = True
+
+_current: ContextVar[Optional["Recorder"]] = ContextVar("metrics_recorder", default=None)
+
+
+def _stdout_sink(document: Dict[str, Any]) -> None:
+    # Lambda ships stdout to CloudWatch Logs, where the EMF line becomes metrics
+    print(json.dumps(document, separators=(",", ":")))
+
+
+_sink: Callable[[Dict[str, Any]], None] = _stdout_sink
+
+
+class MemorySink:
+    """Local sink for tests: keeps the EMF documents instead of printing them."""
+
+    def __init__(self):
+        self.documents: List[Dict[str, Any]] = []
+
+    def __call__(self, document: Dict[str, Any]) -> None:
+        self.documents.append(document)
+
+
+def set_sink(sink: Callable[[Dict[str, Any]], None]) -> None:
+    """Replaces where documents go (ex. a MemorySink in tests)."""
+    global _sink
+    _sink = sink
+
+
+def reset_sink() -> None:
+    """Back to stdout."""
+    global _sink
+    _sink = _stdout_sink
+
+
+class Recorder:
+    """Collects the metrics of one invocation."""
+
+    def __init__(self):
+        global _cold_start
+        self.start = "cold" if _cold_start else "warm"
+        _cold_start = False
+
+        self.dimensions: Dict[str, str] = {}
+        self.values: Dict[str, float] = {}
+        self.units: Dict[str, str] = {}
+        self.outcome = "error"  # until the function says otherwise - an exception stays "error"
+        self._lock = threading.Lock()  # phases may run on worker threads (concurrent email)
+
+    def add(self, name: str, value: float, unit: str = "Count") -> None:
+        with self._lock:
+            self.values[name] = self.values.get(name, 0) + value
+            self.units[name] = unit
+
+    def document(self, sample_rate: float = 1.0) -> Dict[str, Any]:
+        """The EMF document of this invocation."""
+        dimensions = {name: "unknown" for name in DIMENSIONS}
+        dimensions.update(self.dimensions)
+        dimensions["Outcome"] = self.outcome
+        dimensions["Start"] = self.start
+
+        return {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [{
+                    "Namespace": NAMESPACE,
+                    "Dimensions": [list(dimension_set) for dimension_set in DIMENSION_SETS],
+                    "Metrics": [{"Name": name, "Unit": self.units[name]} for name in self.values]
+                }]
+            },
+            **dimensions,
+            **{name: round(value, 3) for name, value in self.values.items()},
+            "SampleRate": sample_rate  # plain property, not a metric
+        }
+
+    def should_emit(self, enabled: bool, sample_rate: float) -> bool:
+        if not enabled:
+            return False
+        if self.outcome not in SAMPLED_OUTCOMES:
+            return True
+        return sample_rate >= 1.0 or random.random() < sample_rate
+
+
+def current() -> Optional[Recorder]:
+    """Recorder of the running invocation (None outside instrumented functions)."""
+    return _current.get()
+
+
+def instrument(function: Callable) -> Callable:
+    """
+    Records the decorated function's invocation: total time + whatever it records, one EMF line at the end.
+    """
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        recorder, token, started = _begin()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _end(recorder, token, started)
+    return wrapper
+
+
+def instrument_async(function: Callable) -> Callable:
+    """
+    instrument for async functions - every asyncio task has its own context, so concurrent
+    requests of a container process (see asgi.py) each get their own recorder.
+    """
+    @wraps(function)
+    async def wrapper(*args, **kwargs):
+        recorder, token, started = _begin()
+        try:
+            return await function(*args, **kwargs)
+        finally:
+            _end(recorder, token, started)
+    return wrapper
+
+
+def _begin() -> tuple:
+    recorder = Recorder()
+    return recorder, _current.set(recorder), time.perf_counter()
+
+
+def _end(recorder: Recorder, token: Any, started: float) -> None:
+    _current.reset(token)
+    recorder.add("total_ms", (time.perf_counter() - started) * 1000, "Milliseconds")
+    if recorder.should_emit(ENABLED, SAMPLE_RATE):
+        try:
+            _sink(recorder.document(SAMPLE_RATE))
+        except Exception as e:
+            # Metrics never break a submission
+            print(f"Metrics emit failed: {str(e)}")
+
+
+@contextmanager
+def phase(name: str, recorder: Optional[Recorder] = None) -> Iterator[None]:
+    """
+    Times a block as <name>_ms (also when it raises).
+
+    Args:
+        name: parse, rate_limit, idempotency, write, email, enqueue, ...
+        recorder: pass current() explicitly on worker threads - context variables don't follow submit()
+    """
+    recorder = recorder or current()
+    if recorder is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add(f"{name}_ms", (time.perf_counter() - started) * 1000, "Milliseconds")
+
+
+def set_dimension(name: str, value: str) -> None:
+    """Sets BusinessUnit or Language of the running invocation."""
+    recorder = current()
+    if recorder is not None:
+        recorder.dimensions[name] = value or "unknown"
+
+
+def set_outcome(outcome: str) -> None:
+    """success, duplicate, invalid, malformed, too_large, rate_limited, error, ..."""
+    recorder = current()
+    if recorder is not None:
+        recorder.outcome = outcome
+
+
+def count(name: str, value: float = 1, recorder: Optional[Recorder] = None) -> None:
+    """Adds to a Count metric (ex. email_failures)."""
+    recorder = recorder or current()
+    if recorder is not None:
+        recorder.add(name, value)
@@ -0,0 +1,346 @@
+"""
+Shared email notification functions for all business units.
+Sends the SES notification either inline (on the request path) or through an SQS queue
+that a separate consumer Lambda drains in batches.
+"""
+
+import json
+import random
+import time
+from typing import Dict, Any, Optional
+
+from shared import tracing
+from shared.i18n import get_email_template
+from shared.clients import get_client, error_code
+
+# Simple Email Service region
+# Handles all email operations through the Frankfurt region for GDPR (= General Data Protection Regulation)
+# EU laws require businesses to protect EU citizens' personal data and keep it within EU borders
+# Clients come from the shared registry (created on first use, reused while the container is warm)
+# SQS uses the Lambda's own region (queue is created by the same stack)
+SES_REGION = "eu-central-1"
+
+# Version of the job format - bump if the fields below change so old messages can still be read
+JOB_VERSION = 1
+
+# Form fields copied into the notification job (only non-empty ones are sent)
+JOB_FIELDS = ("company", "contact_person", "email", "phone", "message", "project_type", "timeline", "units_needed")
+
+# SES errors worth retrying - everything else (ex. MessageRejected for an unverified sender) won't fix itself
+RETRYABLE_SES_ERRORS = {"Throttling", "ThrottlingException", "ServiceUnavailable", "InternalFailure", "RequestTimeout"}
+
+# Backoff settings for the consumer: 0.2s, 0.4s, 0.8s (+ jitter)
+MAX_SEND_ATTEMPTS = 4
+BASE_BACKOFF_SECONDS = 0.2
+
+# Fallback when SES GetSendQuota is not allowed or fails (sandbox accounts start at 1 email/second)
+DEFAULT_MAX_SEND_RATE = 1.0
+
+# Cached between warm invocations of the consumer
+_send_rate: Optional[float] = None
+_last_send_at = 0.0
+
+
+class PoisonMessageError(Exception):
+    """Raised for queue messages that can never be sent (malformed job or permanently rejected by SES)."""
+
+
+@tracing.traced("format_email_content")
+def format_email_content(
+        business_unit: str, company: str, contact_person: str,
+        email: str, phone: str, message: str, project_type: str,
+        timeline: str, units_needed: str, timestamp: str, language: str
+) -> tuple[str, str]:
+    """
+    Format email notification in appropriate language.
+    Templates come from the locale catalog (built once per container, see i18n.py).
+    """
+    t = get_email_template(language)
+    l = t["labels"]
+
+    body_parts = [
+        t["greeting"],
+        "",
+        f"{l['company']}: {company}",
+        f"{l['contact']}: {contact_person}",
+        f"{l['email']}: {email}",
+        f"{l['phone']}: {phone}",
+        "",
+        f"{l['project']}: {project_type or l['not_specified']}",
+        f"{l['timeline']}: {timeline or l['not_specified']}",
+    ]
+
+    if units_needed:
+        body_parts.append(f"{l['units']}: {units_needed}")
+
+    body_parts.extend([
+        "",
+        f"{l['message']}:",
+        message,
+        "",
+        "---",
+        f"{l['timestamp']}: {timestamp}"
+    ])
+
+    return t["subject"].format(business_unit=business_unit), "\n".join(body_parts)
+
+
+def send_notification_email(
+        from_email: str, to_email: str, business_unit: str, fields: Dict[str, str],
+        timestamp: str, language: str
+) -> Dict[str, Any]:
+    """
+    Formats and sends one notification email through SES.
+
+    Args:
+        from_email: verified SES sender
+        to_email: recipient email
+        business_unit: construction, retail, etc.
+        fields: form fields (see JOB_FIELDS), missing ones count as empty
+        timestamp: submission time (ISO format)
+        language: EN, DE, RO
+
+    Returns:
+        SES SendEmail response (contains the MessageId)
+    """
+    email_subject, email_body = format_email_content(
+        business_unit,
+        *(fields.get(name, "") for name in JOB_FIELDS),
+        timestamp, language
+    )
+
+    with tracing.span("ses.send_email", region=SES_REGION) as span:
+        response = get_client("ses", SES_REGION).send_email(
+            Source=from_email,
+            Destination={"ToAddresses": [to_email]},
+            Message={
+                "Subject": {"Data": email_subject, "Charset": "UTF-8"},
+                "Body": {"Text": {"Data": email_body, "Charset": "UTF-8"}}
+            }
+        )
+        # Ties the email in SES (bounces, complaints) to the submission's trace
+        if span is not None:
+            span.set_attribute("ses_message_id", response.get("MessageId", ""))
+    return response
+
+
+# PRODUCER SIDE (contact form Lambda)
+#-------------------------------------
+
+def build_notification_job(
+        contact_id: str, business_unit: str, timestamp: str, language: str, fields: Dict[str, str]
+) -> Dict[str, Any]:
+    """
+    Builds the compact job the queue consumer needs to send the email later.
+
+    Only the data is queued, not the formatted email - formatting happens off the request path.
+
+    Returns:
+        JSON-serializable job dict
+    """
+    return {
+        "v": JOB_VERSION,
+        "contact_id": contact_id,
+        "business_unit": business_unit,
+        "timestamp": timestamp,
+        "language": language,
+        "fields": {name: fields[name] for name in JOB_FIELDS if fields.get(name)}
+    }
+
+
+def enqueue_notification(queue_url: str, job: Dict[str, Any]) -> None:
+    """
+    Puts a notification job on the SQS queue (one fast API call instead of waiting for SES).
+
+    Args:
+        queue_url: URL of the notification queue (CDK passes it as NOTIFICATION_QUEUE_URL)
+        job: output of build_notification_job
+    """
+    get_client("sqs").send_message(
+        QueueUrl=queue_url,
+        MessageBody=json.dumps(job, separators=(",", ":"), ensure_ascii=False)
+    )
+
+
+# CONSUMER SIDE (notification Lambda)
+#-------------------------------------
+
+def get_max_send_rate() -> float:
+    """
+    Reads the account's SES send-rate quota once per container.
+
+    Returns:
+        Max emails per second allowed by SES (falls back to DEFAULT_MAX_SEND_RATE)
+    """
+    global _send_rate
+
+    if _send_rate is None:
+        try:
+            quota = get_client("ses", SES_REGION).get_send_quota()
+            _send_rate = float(quota["MaxSendRate"]) or DEFAULT_MAX_SEND_RATE
+        except Exception as e:
+            print(f"Could not read SES send quota, using {DEFAULT_MAX_SEND_RATE}/s: {str(e)}")
+            _send_rate = DEFAULT_MAX_SEND_RATE
+
+    return _send_rate
+
+
+def _wait_for_send_slot(rate_per_second: float) -> None:
+    """Sleeps just long enough to keep this container under its share of the SES send rate."""
+    global _last_send_at
+
+    interval = 1.0 / rate_per_second
+    wait = _last_send_at + interval - time.monotonic()
+    if wait > 0:
+        time.sleep(wait)
+    _last_send_at = time.monotonic()
+
+
+def parse_notification_job(raw_body: str) -> Dict[str, Any]:
+    """
+    Parses and checks a queued job.
+
+    Raises:
+        PoisonMessageError: if the body is not a job this consumer understands
+    """
+    try:
+        job = json.loads(raw_body)
+    except (TypeError, ValueError) as e:
+        raise PoisonMessageError(f"Invalid JSON: {str(e)}")
+
+    if not isinstance(job, dict) or job.get("v") != JOB_VERSION:
+        raise PoisonMessageError("Unknown job version")
+
+    if not all(job.get(key) for key in ("contact_id", "business_unit", "timestamp", "language")):
+        raise PoisonMessageError("Missing job keys")
+
+    if not isinstance(job.get("fields"), dict):
+        raise PoisonMessageError("Missing job fields")
+
+    return job
+
+
+def send_with_backoff(
+        job: Dict[str, Any], from_email: str, to_email: str, rate_per_second: float,
+        deadline: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Sends one job's email, retrying throttling/transient SES errors with exponential backoff + jitter.
+
+    Args:
+        job: parsed notification job
+        from_email: verified SES sender
+        to_email: recipient email
+        rate_per_second: this container's share of the SES quota
+        deadline: time.monotonic() value after which no new retry starts
+
+    Returns:
+        SES SendEmail response
+
+    Raises:
+        PoisonMessageError: SES rejected the email permanently
+        botocore ClientError: still failing after all retries (message goes back to the queue)
+    """
+    for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+        _wait_for_send_slot(rate_per_second)
+        try:
+            return send_notification_email(
+                from_email, to_email, job["business_unit"], job["fields"], job["timestamp"], job["language"]
+            )
+        except Exception as e:
+            # No error code = connection error/timeout, always worth another try
+            code = error_code(e)
+            if code and code not in RETRYABLE_SES_ERRORS:
+                raise PoisonMessageError(f"SES rejected email: {code}")
+
+            backoff = BASE_BACKOFF_SECONDS * (2 ** (attempt - 1))
+            backoff += random.uniform(0, backoff) # jitter spreads retries of parallel consumers
+            out_of_time = deadline is not None and time.monotonic() + backoff > deadline
+            if attempt == MAX_SEND_ATTEMPTS or out_of_time:
+                raise
+            time.sleep(backoff)
+
+    raise RuntimeError("unreachable")
+
+
+def process_notification_batch(
+        event: Dict[str, Any],
+        from_email: str,
+        to_email: str,
+        dead_letter_queue_url: str = "",
+        consumer_concurrency: int = 1,
+        remaining_time_ms: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Drains one SQS batch of notification jobs.
+    Handles:
+    - pacing under the SES send-rate quota
+    - retries with backoff
+    - partial batch failures (only failed messages go back to the queue)
+    - poison messages (forwarded straight to the dead-letter queue)
+
+    Args:
+        event: SQS event with up to batch_size records
+        from_email: verified SES sender
+        to_email: recipient email
+        dead_letter_queue_url: where poison messages are moved (empty = leave them to the redrive policy)
+        consumer_concurrency: max parallel consumers - each one gets an equal share of the send rate
+        remaining_time_ms: context.get_remaining_time_in_millis() - stops retrying before Lambda times out
+
+    Returns:
+        SQS partial batch response: {"batchItemFailures": [{"itemIdentifier": messageId}, ...]}
+    """
+    rate = get_max_send_rate() / max(consumer_concurrency, 1)
+
+    # Keep a safety margin so the function can still return its partial batch response
+    deadline = None
+    if remaining_time_ms is not None:
+        deadline = time.monotonic() + max(remaining_time_ms - 2000, 0) / 1000
+
+    failures = []
+    for record in event.get("Records", []):
+        message_id = record.get("messageId", "")
+
+        # Once out of time, hand the rest back untouched
+        if deadline is not None and time.monotonic() >= deadline:
+            failures.append({"itemIdentifier": message_id})
+            continue
+
+        try:
+            job = parse_notification_job(record.get("body", ""))
+            send_with_backoff(job, from_email, to_email, rate, deadline)
+
+        except PoisonMessageError as e:
+            print(f"Poison notification {message_id}: {str(e)}")
+            if not _move_to_dead_letter_queue(dead_letter_queue_url, record, str(e)):
+                failures.append({"itemIdentifier": message_id})
+
+        except Exception as e:
+            print(f"Notification {message_id} failed, returning it to the queue: {str(e)}")
+            failures.append({"itemIdentifier": message_id})
+
+    return {"batchItemFailures": failures}
+
+
+def _move_to_dead_letter_queue(dead_letter_queue_url: str, record: Dict[str, Any], reason: str) -> bool:
+    """
+    Forwards a poison message to the DLQ so it doesn't block the queue with useless retries.
+
+    Returns:
+        True if the message was moved (safe to delete from the source queue)
+    """
+    if not dead_letter_queue_url:
+        return False
+
+    try:
+        get_client("sqs").send_message(
+            QueueUrl=dead_letter_queue_url,
+            MessageBody=record.get("body", ""),
+            MessageAttributes={
+                "failure_reason": {"DataType": "String", "StringValue": reason[:256]}
+            }
+        )
+        return True
+    except Exception as e:
+        print(f"Could not move {record.get('messageId', '')} to DLQ: {str(e)}")
+        return False
@@ -0,0 +1,145 @@
+"""
+Shared rate limiting for contact form submissions.
+
+Every client (source IP, normalized email) gets a bucket of `limit` tokens per window.
+Buckets are atomic counters in the contact table: one conditional UpdateItem takes a token,
+and expires_at lets DynamoDB's TTL delete old windows for free.
+Clients already known to be over their limit are answered from a per-container cache,
+without another DynamoDB call until their window ends.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from shared.clients import get_client, error_code
+
+# kind -> tokens per window
+# ip:    shared offices/NAT can send a few inquiries, scripts can't
+# email: one person rarely needs more than a handful of inquiries per hour
+RATE_LIMITS = {
+    "ip": {"limit": 10, "window_seconds": 600},
+    "email": {"limit": 5, "window_seconds": 3600}
+}
+
+# Item key prefix - keeps counters apart from BU#<UNIT> submissions
+RECORD_PREFIX = "RATE#"
+
+# Max clients remembered as blocked per container
+BLOCKED_CACHE_SIZE = 4096
+
+# bucket key -> epoch seconds when its window ends
+_blocked: "OrderedDict[str, float]" = OrderedDict()
+
+# A container process (asgi.py) runs many submissions on threads - cache updates must not interleave
+_lock = threading.Lock()
+
+
+def normalize_email(email: str) -> str:
+    """Same address, same bucket: "Max@Example.com " -> "max@example.com"."""
+    return email.strip().lower()
+
+
+def bucket_key(kind: str, value: str) -> str:
+    """
+    Builds the counter's partition key.
+
+    IPs and emails are hashed - no personal data in the rate-limit records.
+    """
+    digest = hashlib.sha256(value.encode("utf-8")).hexdigest()[:32]
+    return f"{RECORD_PREFIX}{kind}#{digest}"
+
+
+def _window(kind: str, now: float) -> tuple:
+    """Returns (window start, window end) in epoch seconds."""
+    window_seconds = RATE_LIMITS[kind]["window_seconds"]
+    start = int(now // window_seconds) * window_seconds
+    return start, start + window_seconds
+
+
+def is_blocked(kind: str, value: str, now: Optional[float] = None) -> bool:
+    """
+    Checks the per-container cache only (no AWS call).
+
+    Returns:
+        True if this client already hit its limit in the current window
+    """
+    if not value:
+        return False
+
+    key = bucket_key(kind, value)
+    with _lock:
+        until = _blocked.get(key)
+        if until is None:
+            return False
+
+        if until <= (time.time() if now is None else now):
+            del _blocked[key]
+            return False
+
+    return True
+
+
+def seconds_until_allowed(kind: str, value: str, now: Optional[float] = None) -> int:
+    """Seconds until a blocked client's window ends (for the Retry-After header)."""
+    until = _blocked.get(bucket_key(kind, value), 0)
+    return max(int(until - (time.time() if now is None else now)), 1)
+
+
+def _block(key: str, until: float) -> None:
+    with _lock:
+        _blocked[key] = until
+        _blocked.move_to_end(key)
+        while len(_blocked) > BLOCKED_CACHE_SIZE:
+            _blocked.popitem(last=False)
+
+
+def take_token(table_name: str, kind: str, value: str, now: Optional[float] = None) -> bool:
+    """
+    Takes one token from the client's bucket.
+
+    Fails open: if DynamoDB itself has a problem the submission goes through -
+    better an extra email than a lost customer inquiry.
+
+    Args:
+        table_name: contact table (has expires_at as TTL attribute)
+        kind: ip or email (see RATE_LIMITS)
+        value: source IP or normalized email (empty = not limited)
+        now: current epoch seconds
+
+    Returns:
+        True if allowed, False if over the limit
+    """
+    if not value:
+        return True
+
+    now = time.time() if now is None else now
+    if is_blocked(kind, value, now):
+        return False
+
+    key = bucket_key(kind, value)
+    window_start, window_end = _window(kind, now)
+
+    try:
+        get_client("dynamodb").update_item(
+            TableName=table_name,
+            Key={"pk": {"S": key}, "sk": {"S": f"WINDOW#{window_start}"}},
+            UpdateExpression="ADD hits :one SET expires_at = if_not_exists(expires_at, :expires_at)",
+            ConditionExpression="attribute_not_exists(hits) OR hits < :limit",
+            ExpressionAttributeValues={
+                ":one": {"N": "1"},
+                ":limit": {"N": str(RATE_LIMITS[kind]["limit"])},
+                ":expires_at": {"N": str(window_end)}
+            }
+        )
+        return True
+
+    except Exception as e:
+        if error_code(e) == "ConditionalCheckFailedException":
+            _block(key, window_end)
+            return False
+
+        print(f"Rate limit check failed for {kind}, allowing request: {str(e)}")
+        return True
@@ -0,0 +1,138 @@
+"""
+Shared hot/cold tiering for contact form submissions.
+
+Hot:  DynamoDB keeps a submission for RETENTION_DAYS (expires_at = TTL attribute, set at write time)
+Cold: when DynamoDB's TTL deletes it, the table's stream hands the old image to the archive consumer,
+      which writes it to S3 as gzip NDJSON, partitioned for Athena/replays:
+          contacts/business_unit=construction/date=2025-06-01/<first sequence number>.ndjson.gz
+
+Only submissions (BU#<UNIT>) are archived - idempotency and rate-limit records just expire.
+Delivery is at-least-once (stream retries), so replays dedupe on contact_id.
+"""
+
+import gzip
+import json
+from collections import defaultdict
+from typing import Dict, Any, List, Optional
+
+from shared.clients import get_client
+from shared.codec import decode_item
+from shared.dynamo import deserialize_item
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Archive key prefix inside the bucket
+ARCHIVE_PREFIX = "contacts"
+
+# Only items of this partition prefix are submissions
+SUBMISSION_PREFIX = "BU#"
+
+# TTL deletes are REMOVE records done by the DynamoDB service itself (manual deletes are not archived)
+TTL_PRINCIPAL = "dynamodb.amazonaws.com"
+
+
+def expires_at(now: float, retention_days: int) -> Optional[int]:
+    """
+    TTL value of a new submission.
+
+    Args:
+        now: current epoch seconds
+        retention_days: days to keep the item in DynamoDB (0 = keep forever)
+
+    Returns:
+        Epoch seconds for the expires_at attribute, or None for no TTL
+    """
+    if retention_days <= 0:
+        return None
+    return int(now) + retention_days * SECONDS_PER_DAY
+
+
+def is_expired_submission(record: Dict[str, Any]) -> bool:
+    """True for stream records of submissions deleted by TTL."""
+    identity = record.get("userIdentity") or {}
+    keys = record.get("dynamodb", {}).get("Keys", {})
+
+    return (
+        record.get("eventName") == "REMOVE"
+        and identity.get("type") == "Service"
+        and identity.get("principalId") == TTL_PRINCIPAL
+        and keys.get("pk", {}).get("S", "").startswith(SUBMISSION_PREFIX)
+    )
+
+
+def archive_key(business_unit: str, date: str, first_sequence_number: str) -> str:
+    """
+    S3 key of one archive file.
+
+    Named after the file's first stream sequence number - a retried batch overwrites its own files.
+    """
+    return f"{ARCHIVE_PREFIX}/business_unit={business_unit}/date={date}/{first_sequence_number}.ndjson.gz"
+
+
+def encode_ndjson_gzip(items: List[Dict[str, Any]]) -> bytes:
+    """
+    One JSON document per line, gzip compressed.
+
+    mtime=0 keeps the output byte-identical for identical items (stable ETags on retries).
+    """
+    lines = "".join(json.dumps(item, separators=(",", ":"), ensure_ascii=False, default=str) + "\n" for item in items)
+    return gzip.compress(lines.encode("utf-8"), mtime=0)
+
+
+def group_by_partition(records: List[Dict[str, Any]]) -> Dict[tuple, List[tuple]]:
+    """
+    Groups expired submissions by (business_unit, submission date).
+
+    Returns:
+        {(business_unit, "YYYY-MM-DD"): [(sequence number, item), ...]} in stream order
+    """
+    partitions: Dict[tuple, List[tuple]] = defaultdict(list)
+    for record in records:
+        stream = record["dynamodb"]
+        # Archive files hold logical items - readable without the codec
+        item = decode_item(deserialize_item(stream.get("OldImage", {})))
+
+        # pk = BU#<UNIT> or BU#<UNIT>#<shard>
+        business_unit = item.get("business_unit") or stream["Keys"]["pk"]["S"].split("#")[1].lower()
+        date = str(item.get("timestamp", ""))[:10] or "unknown"
+        partitions[(business_unit, date)].append((stream["SequenceNumber"], item))
+    return partitions
+
+
+def process_stream_batch(event: Dict[str, Any], bucket_name: str) -> Dict[str, Any]:
+    """
+    Archives one DynamoDB stream batch to S3.
+
+    Args:
+        event: DynamoDB stream event (OLD_IMAGE view)
+        bucket_name: archive bucket
+
+    Returns:
+        Stream partial batch response: on a failed upload the earliest sequence number of the
+        failed partitions is reported, so Lambda retries from there and nothing expired is lost
+    """
+    expired = [record for record in event.get("Records", []) if is_expired_submission(record)]
+    if not expired:
+        return {"batchItemFailures": []}
+
+    failed_sequence_numbers = []
+    for (business_unit, date), entries in group_by_partition(expired).items():
+        sequence_numbers = [sequence_number for sequence_number, _ in entries]
+        items = [item for _, item in entries]
+
+        try:
+            get_client("s3").put_object(
+                Bucket=bucket_name,
+                Key=archive_key(business_unit, date, sequence_numbers[0]),
+                Body=encode_ndjson_gzip(items),
+                ContentType="application/gzip"
+            )
+        except Exception as e:
+            print(f"Archiving {len(items)} {business_unit} submissions of {date} failed: {str(e)}")
+            failed_sequence_numbers.append(sequence_numbers[0])
+
+    if not failed_sequence_numbers:
+        return {"batchItemFailures": []}
+
+    # Sequence numbers are numeric strings of varying length - compare them as numbers
+    return {"batchItemFailures": [{"itemIdentifier": min(failed_sequence_numbers, key=int)}]}
@@ -0,0 +1,148 @@
+"""
+Shared router for the multi-business-unit contact Lambda.
+
+Optional deployment (create_contact_router in CDK): one Lambda serves the contact forms of all
+business units, so low-traffic units ride on containers that the busy ones keep warm.
+Per-unit Lambdas (contact_handler_construction, ...) stay available for units that need isolation.
+
+Registry: CDK registers every unit as one environment variable, UNIT_<UNIT> = JSON object with the
+same keys a per-unit Lambda gets as separate variables (TABLE_NAME, FROM_EMAIL, TO_EMAIL, ...).
+It is read once per container. Requests are dispatched on, in this order:
+1. stage variable business_unit - set by CDK on each unit's API, can't be changed by the caller
+2. path parameter {business_unit} - ex. a shared /api/v1/{business_unit}/contact resource
+3. query string ?business_unit=...
+Only registered units are served, everything else gets a 404.
+
+route_contact_submission_async does the same for the ASGI adapter (asgi.py) of container deployments.
+
+Container caches are shared by the units: the idempotency LRU is keyed by table, the rate-limit
+block list isn't - a client over its limit on one unit's form is turned away by all units in
+that container until its window ends.
+"""
+
+import json
+import os
+from concurrent.futures import Executor
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
+
+from shared.handlers_manager import process_contact_form_submission, process_contact_form_submission_async
+from shared.utils import create_cors_response, get_header, get_payload_version
+
+# Environment variable prefix of registered units (UNIT_CONSTRUCTION, UNIT_RETAIL, ...)
+UNIT_PREFIX = "UNIT_"
+
+
+def unit_settings(variables: Mapping[str, str]) -> Dict[str, Any]:
+    """
+    Turns a unit's variables into the keyword arguments of process_contact_form_submission.
+
+    Args:
+        variables: TABLE_NAME, FROM_EMAIL, TO_EMAIL, ENVIRONMENT, NOTIFICATION_MODE,
+                   NOTIFICATION_QUEUE_URL, RETENTION_DAYS, SHARD_COUNT (same as a per-unit Lambda's env)
+
+    Returns:
+        Keyword arguments (without event and business_unit)
+    """
+    return {
+        "table_name": variables["TABLE_NAME"],
+        "from_email": variables["FROM_EMAIL"],
+        "to_email": variables["TO_EMAIL"],
+        "environment": variables.get("ENVIRONMENT", "dev"),
+        "notification_mode": variables.get("NOTIFICATION_MODE", "inline"),
+        "notification_queue_url": variables.get("NOTIFICATION_QUEUE_URL", ""),
+        "retention_days": int(variables.get("RETENTION_DAYS", "0")),
+        "shard_count": int(variables.get("SHARD_COUNT", "1"))
+    }
+
+
+def load_registry(environ: Mapping[str, str]) -> Mapping[str, Mapping[str, Any]]:
+    """
+    Builds the unit registry from UNIT_<UNIT> variables.
+
+    Raises:
+        ValueError/KeyError: for a broken entry - the cold start fails instead of one unit's requests
+    """
+    registry = {}
+    for name, value in environ.items():
+        if name.startswith(UNIT_PREFIX):
+            registry[name[len(UNIT_PREFIX):].lower()] = MappingProxyType(unit_settings(json.loads(value)))
+    return MappingProxyType(registry)
+
+
+# Built at import = once per Lambda container
+UNITS = load_registry(os.environ)
+
+
+def resolve_business_unit(event: Dict[str, Any]) -> Optional[str]:
+    """
+    Finds the business unit a request is for (see the module docstring for the order).
+
+    Returns:
+        Lowercase unit name, or None if the request doesn't name one
+    """
+    for source in ("stageVariables", "pathParameters", "queryStringParameters"):
+        unit = (event.get(source) or {}).get("business_unit")
+        if unit:
+            return unit.strip().lower()
+    return None
+
+
+def route_contact_submission(
+        event: Dict[str, Any], units: Mapping[str, Mapping[str, Any]] = UNITS
+) -> Dict[str, Any]:
+    """
+    Dispatches a contact form submission to the shared manager with its unit's configuration.
+
+    Args:
+        event: API Gateway event
+        units: registry (defaults to the container's)
+
+    Returns:
+        API Gateway response (404 for unknown or unregistered units)
+    """
+    business_unit, settings = _find_unit(event, units)
+    if settings is None:
+        return create_cors_response(
+            404, {"error": "Unknown business unit"},
+            origin=get_header(event, "origin"), payload_version=get_payload_version(event)
+        )
+
+    return process_contact_form_submission(event=event, business_unit=business_unit, **settings)
+
+
+async def route_contact_submission_async(
+        event: Dict[str, Any],
+        units: Mapping[str, Mapping[str, Any]] = UNITS,
+        executor: Optional[Executor] = None,
+        notification_executor: Optional[Executor] = None
+) -> Dict[str, Any]:
+    """
+    Async version of route_contact_submission for container processes (see asgi.py).
+
+    Args:
+        event: API Gateway event (built by the ASGI adapter)
+        units: registry (defaults to the container's)
+        executor, notification_executor: see process_contact_form_submission_async
+
+    Returns:
+        API Gateway response (404 for unknown or unregistered units)
+    """
+    business_unit, settings = _find_unit(event, units)
+    if settings is None:
+        return create_cors_response(
+            404, {"error": "Unknown business unit"},
+            origin=get_header(event, "origin"), payload_version=get_payload_version(event)
+        )
+
+    return await process_contact_form_submission_async(
+        event=event, business_unit=business_unit,
+        executor=executor, notification_executor=notification_executor, **settings
+    )
+
+
+def _find_unit(
+        event: Dict[str, Any], units: Mapping[str, Mapping[str, Any]]
+) -> Tuple[Optional[str], Optional[Mapping[str, Any]]]:
+    business_unit = resolve_business_unit(event)
+    return business_unit, units.get(business_unit) if business_unit else None
@@ -0,0 +1,54 @@
+"""
+Shared key layout of sharded contact submissions (see sharding.py).
+
+One definition for both sides: the Lambdas write and read with these keys, the infrastructure
+tools (export, shard migration) query and move items with them.
+
+No shared.* imports - the infrastructure tools import this module too.
+"""
+
+import zlib
+from typing import List
+
+# Partition key prefix of submissions
+SUBMISSION_PREFIX = "BU#"
+
+
+def shard_for(contact_id: str, shard_count: int) -> int:
+    """
+    Shard of a submission - stable for its whole life, evenly spread for random uuids.
+
+    Returns:
+        0..shard_count-1 (always 0 when unsharded)
+    """
+    if shard_count <= 1:
+        return 0
+    return zlib.crc32(contact_id.encode("utf-8")) % shard_count
+
+
+def shard_suffix(contact_id: str, shard_count: int) -> str:
+    """Suffix appended to sharded keys: "#03" (empty when unsharded - the legacy key format)."""
+    if shard_count <= 1:
+        return ""
+    return f"#{shard_for(contact_id, shard_count):02d}"
+
+
+def partition_key(business_unit: str, contact_id: str, shard_count: int) -> str:
+    """Table partition key of a submission: BU#CONSTRUCTION#03 (BU#CONSTRUCTION when unsharded)."""
+    return f"{SUBMISSION_PREFIX}{business_unit.upper()}{shard_suffix(contact_id, shard_count)}"
+
+
+def all_shard_keys(base_key: str, shard_count: int) -> List[str]:
+    """
+    Every key a reader has to query for one logical partition.
+
+    Args:
+        base_key: unsharded key (BU#CONSTRUCTION or CONSTRUCTION#new)
+        shard_count: current SHARD_COUNT
+
+    Returns:
+        [base_key#00, ..., base_key#NN, base_key] - the unsharded key for not yet migrated items
+    """
+    if shard_count <= 1:
+        return [base_key]
+    return [f"{base_key}#{shard:02d}" for shard in range(shard_count)] + [base_key]
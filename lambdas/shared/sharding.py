@@ -0,0 +1,67 @@
+"""
+Shared write sharding for the contact table.
+
+All submissions of a business unit used to go to one partition key (BU#<UNIT>), so a form spike
+hit a single DynamoDB partition. With SHARD_COUNT > 1 the key carries a shard suffix derived
+from the contact id:
+    BU#CONSTRUCTION#00 ... BU#CONSTRUCTION#<SHARD_COUNT - 1>
+and so does the status GSI key (CONSTRUCTION#new#00 ...), so GSI writes are spread as well.
+
+Readers fan out over all shards concurrently (scatter-gather) and merge the pages by sort key.
+Items written before sharding stay readable under the unsharded key (always included in reads)
+until infrastructure/tools/migrate_shards.py moves them.
+SHARD_COUNT may only grow - lowering it hides the items of the dropped shards.
+
+The key layout itself is in shard_keys.py (import-free, shared with the infrastructure tools).
+"""
+
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List
+
+from shared.clients import get_client
+
+# Fan-out pool shared by warm invocations - one query per shard runs at the same time
+_query_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="shard-query")
+
+
+def query_partitions(requests: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Scatter: runs one Query per partition concurrently.
+
+    Args:
+        requests: partition key -> kwargs for the low-level client's query()
+
+    Returns:
+        partition key -> Query response
+    """
+    client = get_client("dynamodb")
+    if len(requests) == 1:
+        (partition, request), = requests.items()
+        return {partition: client.query(**request)}
+
+    futures = {partition: _query_pool.submit(client.query, **request) for partition, request in requests.items()}
+    return {partition: future.result() for partition, future in futures.items()}
+
+
+def merge_by_sort_key(pages: Dict[str, List[Dict[str, Any]]], sort_attributes: tuple,
+                      descending: bool) -> Iterator[tuple]:
+    """
+    Gather: merges already sorted pages of several partitions into one sorted stream.
+
+    Args:
+        pages: partition key -> low-level items in Query order
+        sort_attributes: attributes compared in order (ex. ("timestamp", "sk") - sk breaks ties)
+        descending: True when the pages were queried with ScanIndexForward=False
+
+    Returns:
+        Iterator of (partition key, item), lazily - only what the caller consumes is compared
+    """
+    def sort_key(item: Dict[str, Any]) -> tuple:
+        return tuple(item.get(attribute, {}).get("S", "") for attribute in sort_attributes)
+
+    streams = [
+        [(partition, item) for item in items]
+        for partition, items in pages.items()
+    ]
+    return heapq.merge(*streams, key=lambda entry: sort_key(entry[1]), reverse=descending)
@@ -0,0 +1,262 @@
+"""
+Shared lightweight span tracing for the contact pipeline.
+
+A trace is one invocation, spans are the steps inside it:
+    with tracing.span("dynamodb.put_item", table=table_name) as span:
+        ...
+        span.set_attribute("consumed_wcu", ...)
+
+Every trace carries the correlation ids of the request - API Gateway request id, X-Ray trace id,
+contact_id, SES message id - so one log line ties a slow submission to all of them.
+Finished traces go to the collector: a compact JSON log line by default, an InMemoryCollector in tests.
+
+X-Ray (optional): CDK sets XRAY_TRACING=true when active tracing is on. The botocore clients are then
+patched (a subsegment per AWS call) and every span is mirrored as a subsegment with the correlation ids
+as annotations. aws-xray-sdk comes with the X-Ray layer CDK adds to traced functions
+(lambdas/requirements-xray.txt) - without it, tracing stays local.
+
+Settings (environment variables, read once per container):
+- TRACING_ENABLED  "false" turns the spans (and the log line) off
+- XRAY_TRACING     "true" = patch botocore and mirror spans to X-Ray
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, Any, Callable, Iterator, List, Optional
+
+ENABLED = os.environ.get("TRACING_ENABLED", "true").lower() != "false"
+XRAY_ENABLED = os.environ.get("XRAY_TRACING", "false").lower() == "true"
+
+# Span attributes copied to the trace (and to X-Ray annotations, which are searchable)
+CORRELATION_IDS = ("request_id", "contact_id", "ses_message_id", "business_unit")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("tracing_span", default=None)
+
+# aws_xray_sdk's recorder once botocore is patched (None = X-Ray off or SDK missing)
+_xray_recorder = None
+_xray_lock = threading.Lock()
+_xray_checked = False
+
+
+class Span:
+    """One timed step: name, start/end (epoch seconds), attributes, parent."""
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str]):
+        self.trace = trace
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes: Dict[str, Any] = {}
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.error: Optional[str] = None
+        self._subsegment = None
+
+    def set_attribute(self, name: str, value: Any) -> None:
+        self.attributes[name] = value
+        if name in CORRELATION_IDS:
+            self.trace.correlation[name] = value
+            if self._subsegment is not None:
+                self._subsegment.put_annotation(name, str(value))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": round(self.start, 6),
+            "end": round(self.end, 6) if self.end is not None else None,
+            "duration_ms": round(((self.end or time.time()) - self.start) * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+
+class Trace:
+    """All spans of one invocation plus its correlation ids."""
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.correlation: Dict[str, Any] = {}
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()  # spans may finish on worker threads (concurrent email)
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+        return {"trace_id": self.trace_id, **self.correlation, "spans": [span.to_dict() for span in spans]}
+
+
+# COLLECTORS
+#------------
+
+def _log_collector(trace: Trace) -> None:
+    # One line per invocation - searchable in CloudWatch Logs Insights by any of the correlation ids
+    print(json.dumps({"trace": trace.to_dict()}, separators=(",", ":"), default=str))
+
+
+class InMemoryCollector:
+    """Local collector for tests: keeps finished traces."""
+
+    def __init__(self):
+        self.traces: List[Dict[str, Any]] = []
+
+    def __call__(self, trace: Trace) -> None:
+        self.traces.append(trace.to_dict())
+
+    def spans(self, trace_index: int = -1) -> Dict[str, Dict[str, Any]]:
+        """Spans of a trace by name (last trace by default)."""
+        return {span["name"]: span for span in self.traces[trace_index]["spans"]}
+
+
+_collector: Callable[[Trace], None] = _log_collector
+
+
+def set_collector(collector: Callable[[Trace], None]) -> None:
+    """Replaces where finished traces go (ex. an InMemoryCollector in tests)."""
+    global _collector
+    _collector = collector
+
+
+def reset_collector() -> None:
+    """Back to the log line."""
+    global _collector
+    _collector = _log_collector
+
+
+# X-RAY
+#-------
+
+def instrument_botocore() -> None:
+    """
+    Patches botocore for X-Ray once per container (no-op unless XRAY_TRACING=true).
+
+    Called by shared.clients right before the first client is created.
+    """
+    global _xray_recorder, _xray_checked
+    if _xray_checked or not XRAY_ENABLED:
+        return
+
+    with _xray_lock:
+        if _xray_checked:
+            return
+        _xray_checked = True
+        try:
+            # noinspection PyPackageRequirements
+            from aws_xray_sdk.core import patch, xray_recorder
+        except ImportError:
+            print("XRAY_TRACING is on but the X-Ray layer is missing - AWS calls are not traced")
+            return
+        patch(["botocore"])
+        _xray_recorder = xray_recorder
+
+
+def _xray_trace_id() -> Optional[str]:
+    # Lambda sets _X_AMZN_TRACE_ID per invocation: "Root=1-5e1b4151-...;Parent=...;Sampled=1"
+    header = os.environ.get("_X_AMZN_TRACE_ID", "")
+    for part in header.split(";"):
+        if part.startswith("Root="):
+            return part[5:]
+    return None
+
+
+# SPANS
+#-------
+
+def current_span() -> Optional[Span]:
+    """Innermost open span of this context (None outside traces)."""
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Times a block as a span of the current trace - or starts a new trace if there is none.
+
+    Yields:
+        The span (None when tracing is off) - use span.set_attribute for ids known only inside the block
+    """
+    if not ENABLED:
+        yield None
+        return
+
+    parent = _current_span.get()
+    is_root = parent is None
+    trace = Trace(_xray_trace_id() or uuid.uuid4().hex) if is_root else parent.trace
+    current = Span(trace, name, None if is_root else parent.span_id)
+
+    if _xray_recorder is not None:
+        try:
+            current._subsegment = _xray_recorder.begin_subsegment(name)
+        except Exception:
+            current._subsegment = None  # no active segment (ex. local runs)
+
+    for key, value in attributes.items():
+        current.set_attribute(key, value)
+
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as e:
+        current.error = f"{type(e).__name__}: {str(e)}"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end = time.time()
+        trace.add(current)
+        if current._subsegment is not None:
+            try:
+                _xray_recorder.end_subsegment()
+            except Exception:
+                pass  # subsegment context lost (ex. span ended on another thread)
+
+        if is_root:
+            try:
+                _collector(trace)
+            except Exception as e:
+                # Tracing never breaks a submission
+                print(f"Trace export failed: {str(e)}")
+
+
+def traced(name: str) -> Callable:
+    """Decorator: runs the function inside a span."""
+    def decorator(function: Callable) -> Callable:
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def traced_async(name: str) -> Callable:
+    """Decorator: runs an async function inside a span (each asyncio task has its own current span)."""
+    def decorator(function: Callable) -> Callable:
+        @wraps(function)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def set_attribute(name: str, value: Any) -> None:
+    """Sets an attribute (ex. contact_id) on the innermost open span."""
+    current = _current_span.get()
+    if current is not None:
+        current.set_attribute(name, value)
+
+
+def request_id(event: Dict[str, Any]) -> str:
+    """API Gateway's id of the request (empty for test events)."""
+    return (event.get("requestContext") or {}).get("requestId", "")
@@ -1,46 +1,39 @@
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-def sanitize_input(text: str, max_length: int = 2000) -> str:
-    """
-    Clean and limit contact forms' inputs (prevents spam/abuse).
-
-    Args:
-        text: user input from contact forms
-        max_length: max allowed characters (set to 2000 ~ 300-400 words)
-
-    Returns:
-        Cleaned text, truncated with "..." if msg exceeds 2k char.
-    """
-    cleaned = text.strip()
-
-    if len(cleaned) > max_length:
-        cleaned = cleaned[:max_length] + "..."
+from shared.cors import headers_for
+from shared.i18n import resolve_language
 
-    # Removing null bytes that could cause issues
-    cleaned = cleaned.replace("\x00", "")
+# Lambda proxy payload formats: REST APIs send 1.0 (no "version" key), HTTP APIs send 2.0 by default
+PAYLOAD_V1 = "1.0"
+PAYLOAD_V2 = "2.0"
 
-    return cleaned
 
-
-def create_cors_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
+def create_cors_response(
+        status_code: int,
+        body: Dict[str, Any],
+        extra_headers: Optional[Dict[str, str]] = None,
+        origin: Optional[str] = None,
+        payload_version: str = PAYLOAD_V1
+) -> Dict[str, Any]:
     """
     Creates properly formatted API Gateway response with CORS headers.
 
     CORS = Cross-Origin Resource Sharing
     Same-origin Policy: browsers block requests between different domains for security.
-    These headers tell the browser it's oki for any website to call my API.
-
-    !!! In PROD replace * with actual domain for security !!!
+    These headers tell the browser which of my websites may call my API (allowlist in cors.py).
 
     Args:
         status_code: HTTP code (200=success, 400=bad request, 500=server error)
         body: response data as Python dict (will be converted to JSON)
+        extra_headers: additional response headers (ex. Retry-After)
+        origin: Origin header of the request - only allowlisted origins get Access-Control-Allow-Origin
+        payload_version: the event's (see get_payload_version) - 2.0 answers are shaped by format_response
 
     Returns:
         Dictionary formatted in the way AWS API Gateway expects.
     """
-    return {
+    response = {
         # Required struct for API Gateway response
         "statusCode": status_code, # HTTP response code
 
@@ -48,46 +41,114 @@ def create_cors_response(status_code: int, body: Dict[str, Any]) -> Dict[str, An
             # Tells the browser what type of data I'm sending back
             "Content-Type": "application/json", # always JSON for APIs
 
-            # The most important line - without this, the browser blocks everything!
-            # * means any website can call me (change to https://bau.ranjdar-group.com)
-            "Access-Control-Allow-Origin": "*",
-
-            # Allow the browser to send certain headers in its request
-            # Here Content-Type so the browser can tell it's sending JSON
-            "Access-Control-Allow-Headers": "Content-Type",
-
-            # Allow only specific HTTP methods
-            # OPTIONS = browser check if it can call the API
-            # POST = actual request - my contact form data submission
-            "Access-Control-Allow-Methods": "OPTIONS, POST" # Don't need GET for project, will add later
+            # The most important part - without Access-Control-Allow-Origin, the browser blocks everything!
+            # Precomputed per allowed origin at import (+ Vary: Origin, Max-Age, allowed headers/methods)
+            **headers_for(origin)
         },
 
         # Convert Py dict to JSON str that browsers understand
         "body": json.dumps(body)
     }
 
+    if extra_headers:
+        response["headers"].update(extra_headers)
+
+    return format_response(response, payload_version)
+
 
-def determine_language_from_domain(origin: str) -> str:
+def get_payload_version(event: Dict[str, Any]) -> str:
     """
-    Determines which language to use based on subdomain.
+    Payload format of an API Gateway event.
+
+    Returns:
+        "2.0" for HTTP API events (requestContext.http, lowercase headers), "1.0" for REST API events
+    """
+    return event.get("version") or PAYLOAD_V1
+
+
+def format_response(response: Dict[str, Any], payload_version: str) -> Dict[str, Any]:
+    """
+    Shapes a create_cors_response dict for the API that sent the event.
+
+    1.0 responses go back unchanged. For 2.0 the CORS headers are dropped - an HTTP API with a CORS
+    configuration answers them itself and ignores the integration's - and isBase64Encoded is explicit
+    (a 2.0 response without it is guessed by API Gateway).
 
     Args:
-        origin: The origin header from API Gateway (ex. "https://bau.ranjdar-group.com")
+        response: statusCode/headers/body dict
+        payload_version: "1.0" or "2.0" (see get_payload_version)
 
     Returns:
-        Language code: EN, DE, RO
+        Response in that payload format
+    """
+    if payload_version != PAYLOAD_V2:
+        return response
+
+    return {
+        "statusCode": response["statusCode"],
+        "headers": {
+            name: value for name, value in response["headers"].items()
+            if not name.startswith("Access-Control-") and name != "Vary"
+        },
+        "body": response["body"],
+        "isBase64Encoded": False
+    }
+
+
+def get_header(event: Dict[str, Any], name: str, default: str = "") -> str:
+    """
+    Reads a request header without caring about its case.
+
+    Browsers/proxies send "Origin", "origin" or "ORIGIN" - REST APIs (payload 1.0) pass them as received,
+    HTTP APIs (payload 2.0) lowercase them, so lowercase names are found without the scan.
+    Also survives "headers": null, which API Gateway sends when a request has no headers.
+
+    Args:
+        event: API Gateway event
+        name: header name (any case)
+        default: returned if the header is missing
+
+    Returns:
+        Header value or default
+    """
+    headers = event.get("headers") or {}
+
+    value = headers.get(name)
+    if value is None:
+        name_lower = name.lower()
+        value = next((v for k, v in headers.items() if k.lower() == name_lower), None)
+
+    return default if value is None else value
+
+
+def get_source_ip(event: Dict[str, Any]) -> str:
     """
-    # Extract subdomain from origin
-    origin_lower = origin.lower()
+    Reads the client IP API Gateway saw (not spoofable like X-Forwarded-For).
+
+    Args:
+        event: API Gateway event - requestContext.identity (1.0) or requestContext.http (2.0)
+
+    Returns:
+        Source IP or empty string (ex. local test events)
+    """
+    request_context = event.get("requestContext") or {}
+    source = request_context.get("identity") or request_context.get("http") or {}
+    return source.get("sourceIp", "")
+
 
-    if "construction." in origin_lower: # can add or "retail" etc. in the future
-        return "EN"
+def determine_language_from_domain(origin: str, accept_language: str = "") -> str:
+    """
+    Determines which language to use based on subdomain.
 
-    elif "bau." in origin_lower:
-        return "DE"
+    Looks up the exact hostname in the locale catalog (data/locales.json),
+    then falls back to the browser's Accept-Language header.
 
-    elif "constructii." in origin_lower:
-        return "RO"
+    Args:
+        origin: The origin header from API Gateway (ex. "https://bau.ranjdar-group.com")
+        accept_language: The Accept-Language header (ex. "de-DE,de;q=0.9,en;q=0.8")
 
-    # Default to english for main domain or unknown subdomains
-    return "EN"
+    Returns:
+        Language code: EN, DE, RO
+    """
+    # Default to english for main domain or unknown subdomains (see default_language in the catalog)
+    return resolve_language(origin, accept_language)
@@ -0,0 +1,20 @@
+"""
+Micro-benchmarks and load tests for the Lambda code.
+
+Not collected by pytest (no test_ prefix) - run them as modules from the project root, ex.:
+    python -m tests.benchmarks.bench_i18n
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LAMBDAS_DIR = os.path.join(ROOT, "lambdas")
+
+# Same import root as the Lambda runtime (see tests/conftest.py)
+if LAMBDAS_DIR not in sys.path:
+    sys.path.insert(0, LAMBDAS_DIR)
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "eu-central-1")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
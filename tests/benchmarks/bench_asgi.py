@@ -0,0 +1,129 @@
+"""
+Benchmark: one Lambda-style container vs one ASGI container process (shared/asgi.py).
+
+Same synthetic events and stand-in latencies as bench_load. A Lambda container handles one request
+at a time, so its throughput is 1 / latency. The ASGI app keeps `concurrency` requests in flight;
+throughput should grow with it until the worker threads (or the GIL, for the CPU part) are saturated.
+
+Run from the project root:
+    python -m tests.benchmarks.bench_asgi
+    python -m tests.benchmarks.bench_asgi --requests 1000 --concurrency 1 16 64 --workers 64
+"""
+
+import argparse
+import asyncio
+import base64
+import time
+from typing import Dict, Any, List, Optional
+
+from tests import benchmarks  # noqa: F401 - puts lambdas/ on sys.path
+from tests.benchmarks.bench_load import (
+    HANDLER_ENVIRONMENT, LambdaContext, generate_events, summarize, _install_stand_ins, _load_handler
+)
+
+
+def run_lambda_style(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """One warm Lambda container: requests one after the other."""
+    handler = _load_handler()
+    context = LambdaContext()
+
+    timings = []
+    started = time.perf_counter()
+    for event in events:
+        start = time.perf_counter()
+        handler(event, context)
+        timings.append((time.perf_counter() - start) * 1000)
+    wall_seconds = time.perf_counter() - started
+
+    return {"throughput_rps": len(events) / wall_seconds, **summarize(timings)}
+
+
+def _scope(event: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "type": "http",
+        "method": event["httpMethod"],
+        "path": event["path"],
+        "query_string": b"",
+        "client": (event["requestContext"]["identity"]["sourceIp"], 50000),
+        "headers": [(name.lower().encode(), value.encode()) for name, value in event["headers"].items()]
+    }
+
+
+def _body(event: Dict[str, Any]) -> bytes:
+    if event["isBase64Encoded"]:
+        return base64.b64decode(event["body"])
+    return event["body"].encode("utf-8")
+
+
+async def _asgi_request(app: Any, event: Dict[str, Any]) -> float:
+    """One request through the ASGI protocol, like a server would send it - returns milliseconds."""
+    messages = [{"type": "http.request", "body": _body(event), "more_body": False}]
+
+    async def receive() -> Dict[str, Any]:
+        return messages.pop() if messages else {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        pass
+
+    start = time.perf_counter()
+    await app(_scope(event), receive, send)
+    return (time.perf_counter() - start) * 1000
+
+
+async def _run_asgi(app: Any, events: List[Dict[str, Any]], concurrency: int) -> Dict[str, Any]:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def limited(event: Dict[str, Any]) -> float:
+        async with limit:
+            return await _asgi_request(app, event)
+
+    started = time.perf_counter()
+    timings = await asyncio.gather(*(limited(event) for event in events))
+    wall_seconds = time.perf_counter() - started
+
+    return {"throughput_rps": len(events) / wall_seconds, **summarize(list(timings))}
+
+
+def run_asgi(events: List[Dict[str, Any]], concurrency: int, workers: int) -> Dict[str, Any]:
+    """One container process with `concurrency` requests in flight."""
+    from shared.asgi import ContactApp
+    from shared.router import unit_settings
+
+    app = ContactApp({"construction": unit_settings(HANDLER_ENVIRONMENT)}, default_unit="construction", workers=workers)
+    app.start()
+    try:
+        return asyncio.run(_run_asgi(app, events, concurrency))
+    finally:
+        app.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Lambda-style vs ASGI container throughput")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--workers", type=int, default=32, help="ASGI worker threads")
+    parser.add_argument("--dynamodb-ms", type=float, default=8.0)
+    parser.add_argument("--ses-ms", type=float, default=40.0)
+    parser.add_argument("--invalid-share", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    _load_handler()
+    _install_stand_ins(args.dynamodb_ms, args.ses_ms)
+    print(f"stand-in latency: DynamoDB {args.dynamodb_ms:.0f} ms, SES {args.ses_ms:.0f} ms, "
+          f"{args.requests} requests, {args.invalid_share:.0%} invalid")
+
+    # New seed per run - every run sends fresh submissions (no duplicates of the previous one)
+    rows = [("lambda", 1, run_lambda_style(generate_events(args.requests, 1, args.invalid_share)))]
+    for run, concurrency in enumerate(args.concurrency, start=2):
+        events = generate_events(args.requests, run, args.invalid_share)
+        rows.append(("asgi", concurrency, run_asgi(events, concurrency, args.workers)))
+
+    baseline = rows[0][2]["throughput_rps"]
+    print(f"{'mode':8s} {'in flight':>9s} {'req/s':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}")
+    for mode, concurrency, result in rows:
+        print(f"{mode:8s} {concurrency:9d} {result['throughput_rps']:8.1f} {result['p50_ms']:8.1f} "
+              f"{result['p95_ms']:8.1f} {result['p99_ms']:8.1f}  ({result['throughput_rps'] / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: inline vs concurrent notification mode of process_contact_form_submission.
+
+Local stand-ins replace DynamoDB and SES with a fixed latency each. Inline mode should take
+about the sum of both, concurrent mode about the slower of the two.
+
+Run from the project root:
+    python -m tests.benchmarks.bench_concurrent
+"""
+
+import json
+import statistics
+import time
+
+from tests import benchmarks  # noqa: F401 - puts lambdas/ on sys.path
+from tests.stand_ins import FakeDynamoDB, FakeSES, install
+from shared.handlers_manager import process_contact_form_submission
+
+DYNAMODB_LATENCY = 0.030
+SES_LATENCY = 0.080
+SUBMISSIONS = 30
+
+EVENT = {
+    "headers": {"origin": "https://construction.ranjdar-group.com"},
+    "body": json.dumps({
+        "contact_person": "Max Mustermann",
+        "email": "max@example.com",
+        "phone": "+49 151 1234567",
+        "message": "Need 4 transformer housings in Q3"
+    })
+}
+
+
+def run(mode: str) -> float:
+    """Median wall-clock milliseconds per submission."""
+    install(dynamodb=FakeDynamoDB(DYNAMODB_LATENCY), ses=FakeSES(SES_LATENCY))
+
+    timings = []
+    for _ in range(SUBMISSIONS):
+        start = time.perf_counter()
+        response = process_contact_form_submission(
+            EVENT, "construction", "table", "from@example.com", "to@example.com", notification_mode=mode
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response["statusCode"] == 200
+
+    return statistics.median(timings)
+
+
+def main() -> None:
+    print(f"stand-in latency: DynamoDB {DYNAMODB_LATENCY * 1000:.0f} ms, SES {SES_LATENCY * 1000:.0f} ms")
+    inline = run("inline")
+    concurrent = run("concurrent")
+    print(f"inline     {inline:7.1f} ms/submission")
+    print(f"concurrent {concurrent:7.1f} ms/submission ({inline / concurrent:.2f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
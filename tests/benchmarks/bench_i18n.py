@@ -0,0 +1,112 @@
+"""
+Micro-benchmark: per-request cost of language resolution, response messages and email templates.
+
+Compares the old approach (dicts rebuilt on every call, substring scan of the origin)
+with the catalog built once per container (shared/i18n.py).
+
+Run from the project root:
+    python -m tests.benchmarks.bench_i18n
+"""
+
+import timeit
+import tracemalloc
+from typing import Callable, Dict
+
+from tests import benchmarks  # noqa: F401 - puts lambdas/ on sys.path
+from shared.i18n import resolve_language, get_messages, get_email_template
+
+ITERATIONS = 20000
+
+ORIGINS = [
+    "https://construction.ranjdar-group.com",
+    "https://bau.ranjdar-group.com",
+    "https://constructii.ranjdar-group.com"
+]
+
+
+# OLD IMPLEMENTATION (copied from before the catalog)
+#-----------------------------------------------------
+
+def legacy_language(origin: str) -> str:
+    origin_lower = origin.lower()
+    if "construction." in origin_lower:
+        return "EN"
+    elif "bau." in origin_lower:
+        return "DE"
+    elif "constructii." in origin_lower:
+        return "RO"
+    return "EN"
+
+
+def legacy_messages(language: str) -> Dict[str, str]:
+    messages = {
+        "EN": {"success": "Contact form submitted successfully!", "missing_fields": "Missing mandatory fields",
+               "server_error": "Internal server error"},
+        "DE": {"success": "Das Kontaktformular wurde erfolgreich abgeschickt!",
+               "missing_fields": "Pflichtfelder fehlen", "server_error": "Serverfehler"},
+        "RO": {"success": "Formularul de contact a fost trimis cu succes!",
+               "missing_fields": "Câmpuri obligatorii lipsă", "server_error": "Eroare internă"}
+    }
+    return messages.get(language, messages["EN"])
+
+
+def legacy_templates(business_unit: str, language: str) -> Dict:
+    labels = ("company", "contact", "email", "phone", "project", "timeline", "units", "message", "timestamp",
+              "not_specified")
+    templates = {
+        "DE": {"subject": f"Neue Anfrage: {business_unit}", "greeting": "Neue Anfrage eingegangen:",
+               "labels": dict(zip(labels, ("Firma", "Kontakt Person", "Email", "Tel.", "Projekttyp", "Zeitplan",
+                                           "Benötigte Einheiten", "Nachricht", "Zeitstempel", "Nicht angegeben")))},
+        "EN": {"subject": f"New inquiry: {business_unit}", "greeting": "New inquiry received:",
+               "labels": dict(zip(labels, ("Company", "Contact Person", "Email", "Phone", "Project Type", "Timeline",
+                                           "Units Needed", "Message", "Timestamp", "Not specified")))},
+        "RO": {"subject": f"Cerere nouă: {business_unit}", "greeting": "Cerere nouă primită:",
+               "labels": dict(zip(labels, ("Companie", "Persoană de contact", "Email", "Telefon", "Tip proiect",
+                                           "Termen", "Unități necesare", "Mesaj", "Marcaj temporal",
+                                           "Nespecificat")))}
+    }
+    return templates.get(language, templates["DE"])
+
+
+def legacy_request(origin: str) -> None:
+    language = legacy_language(origin)
+    legacy_messages(language)["success"]
+    legacy_templates("construction", language)["subject"]
+
+
+def catalog_request(origin: str) -> None:
+    language = resolve_language(origin, "de-DE,de;q=0.9,en;q=0.8")
+    get_messages(language)["success"]
+    get_email_template(language)["subject"].format(business_unit="construction")
+
+
+# MEASURING
+#-----------
+
+def measure(name: str, request: Callable[[str], None]) -> Dict[str, float]:
+    """Times ITERATIONS requests and traces the peak memory allocated by one request."""
+    seconds = timeit.timeit(lambda: [request(origin) for origin in ORIGINS], number=ITERATIONS // len(ORIGINS))
+
+    tracemalloc.start()
+    request(ORIGINS[1])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {"us_per_request": seconds / ITERATIONS * 1e6, "peak_bytes_per_request": peak}
+    print(f"{name:<10} {result['us_per_request']:8.2f} us/request {peak:8d} B peak/request")
+    return result
+
+
+def main() -> None:
+    # Warm up the catalog caches once, like a warm Lambda container
+    catalog_request(ORIGINS[0])
+
+    legacy = measure("legacy", legacy_request)
+    catalog = measure("catalog", catalog_request)
+
+    print(f"time saved: {legacy['us_per_request'] - catalog['us_per_request']:.2f} us/request, "
+          f"allocation saved: {legacy['peak_bytes_per_request'] - catalog['peak_bytes_per_request']} B/request")
+
+
+if __name__ == "__main__":
+    main()
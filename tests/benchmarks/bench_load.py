@@ -0,0 +1,419 @@
+"""
+Load test: throughput, latency percentiles and memory of contact_handler_construction.
+
+Drives the real Lambda entry point with synthetic API Gateway events:
+- all three language origins (construction. / bau. / constructii.) and Accept-Language headers
+- message sizes from one line to over the 2000 character limit, some base64 encoded bodies
+- a share of invalid requests (missing fields, bad email/phone, broken JSON, oversized bodies)
+DynamoDB and SES are local stand-ins with configurable latency (tests/stand_ins.py).
+
+Reported separately for
+- cold containers: fresh Python process per sample - init (imports, catalogs, schemas) + first request
+- warm containers: one process, many requests after a warm-up
+as p50/p95/p99, throughput (requests/s of one container) and peak memory.
+
+Results are written as JSON (default tests/benchmarks/results/bench_load-<commit>.json), so two commits
+can be compared:
+    python -m tests.benchmarks.bench_load
+    python -m tests.benchmarks.bench_load --dynamodb-ms 10 --ses-ms 60 --requests 2000 --cold-samples 10
+    python -m tests.benchmarks.bench_load --compare tests/benchmarks/results/bench_load-<old>.json --max-regression 20
+
+Note: the stand-ins don't load botocore sessions or credentials - a real cold start pays for those on
+the first AWS call on top of what is measured here.
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, Any, List, Optional
+
+from tests import benchmarks  # noqa: F401 - puts lambdas/ on sys.path
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# What CDK sets on the construction contact Lambda
+HANDLER_ENVIRONMENT = {
+    "TABLE_NAME": "RanjdarGroup-ConstructionContactForm",
+    "FROM_EMAIL": "system@ranjdar-group.com",
+    "TO_EMAIL": "owner@example.com",
+    "ENVIRONMENT": "dev",
+    "NOTIFICATION_MODE": "inline",
+    "RETENTION_DAYS": "7",
+    "SHARD_COUNT": "4"
+}
+
+ORIGINS = {
+    "EN": ("https://construction.ranjdar-group.com", "en-GB,en;q=0.9"),
+    "DE": ("https://bau.ranjdar-group.com", "de-DE,de;q=0.9,en;q=0.8"),
+    "RO": ("https://constructii.ranjdar-group.com", "ro-RO,ro;q=0.9,en;q=0.8")
+}
+
+SENTENCES = {
+    "EN": "We need a quote for two compact transformer stations including delivery and installation.",
+    "DE": "Wir benötigen ein Angebot für zwei Kompaktstationen inklusive Lieferung und Montage.",
+    "RO": "Avem nevoie de o ofertă pentru două posturi de transformare compacte, cu livrare și montaj."
+}
+
+# Sentences per message: one line, a paragraph, a detailed inquiry, around and over the 2000 limit
+MESSAGE_SIZES = (1, 4, 12, 22, 30)
+MESSAGE_SIZE_WEIGHTS = (40, 30, 18, 8, 4)
+
+INVALID_KINDS = ("missing_fields", "invalid_email", "invalid_phone", "malformed_json", "too_large")
+
+# Share of valid requests that API Gateway hands over base64 encoded
+BASE64_SHARE = 0.1
+
+WARMUP_REQUESTS = 20
+
+
+class LambdaContext:
+    """Minimal stand-in for the Lambda context (30s function timeout)."""
+
+    function_name = "construction-contact-handler"
+    aws_request_id = "bench"
+
+    @staticmethod
+    def get_remaining_time_in_millis() -> int:
+        return 30000
+
+
+# EVENTS
+#--------
+
+def generate_events(count: int, seed: int = 42, invalid_share: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    Builds realistic API Gateway (REST, proxy) events for POST /api/v1/contact.
+
+    Every event has its own source IP and email, so the rate limiter never kicks in
+    (rate limiting is a per-client feature, not a load property).
+
+    Returns:
+        Events, the expected kind in event["_kind"] (valid or one of INVALID_KINDS)
+    """
+    rng = random.Random(seed)
+    events = []
+
+    for i in range(count):
+        language = rng.choice(tuple(ORIGINS))
+        origin, accept_language = ORIGINS[language]
+        sentences = rng.choices(MESSAGE_SIZES, MESSAGE_SIZE_WEIGHTS)[0]
+
+        body: Dict[str, Any] = {
+            "contact_person": rng.choice(("Max Mustermann", "Ioana Popescu", "John Smith", "Anna Becker")),
+            "email": f"lead{i}@example-mail.com",
+            "phone": rng.choice((f"+49 151 {1000000 + i}", f"0151 {2000000 + i}", f"+40 721 {300000 + i}")),
+            "message": " ".join([SENTENCES[language]] * sentences),
+            "company": rng.choice(("", "Becker Bau GmbH", "Popescu Constructii SRL")),
+            "project_type": rng.choice(("", "transformer_station", "infrastructure", "other")),
+            "units_needed": rng.choice(("", "2", "12"))
+        }
+
+        kind = rng.choice(INVALID_KINDS) if rng.random() < invalid_share else "valid"
+        if kind == "missing_fields":
+            del body["email"]
+        elif kind == "invalid_email":
+            body["email"] = "not-an-address"
+        elif kind == "invalid_phone":
+            body["phone"] = "call me"
+        elif kind == "too_large":
+            body["message"] = "x" * 20000
+
+        raw = json.dumps(body, ensure_ascii=False)
+        if kind == "malformed_json":
+            raw = raw[:len(raw) // 2]
+
+        encoded = kind == "valid" and rng.random() < BASE64_SHARE
+        if encoded:
+            raw = base64.b64encode(raw.encode("utf-8")).decode("ascii")
+
+        events.append({
+            "_kind": kind,
+            "resource": "/api/v1/contact",
+            "path": "/api/v1/contact",
+            "httpMethod": "POST",
+            "headers": {
+                "origin": origin,
+                "accept-language": accept_language,
+                "content-type": "application/json",
+                "Idempotency-Key": f"bench-{seed}-{i}"
+            },
+            "requestContext": {
+                "requestId": f"bench-{seed}-{i}",
+                "identity": {"sourceIp": f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"}
+            },
+            "body": raw,
+            "isBase64Encoded": encoded
+        })
+
+    return events
+
+
+# STATISTICS
+#------------
+
+def percentile(values: List[float], share: float) -> float:
+    """Nearest-rank percentile (share 0..1) of unsorted values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(share * len(ordered))) - 1))]
+
+
+def summarize(timings_ms: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(timings_ms),
+        "p50_ms": round(percentile(timings_ms, 0.50), 3),
+        "p95_ms": round(percentile(timings_ms, 0.95), 3),
+        "p99_ms": round(percentile(timings_ms, 0.99), 3),
+        "mean_ms": round(statistics.fmean(timings_ms), 3) if timings_ms else 0.0
+    }
+
+
+def _peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    # ru_maxrss is KB on Linux, bytes on macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor, 1)
+
+
+# RUNS
+#------
+
+def _load_handler():
+    """Imports the Lambda entry point with the environment CDK would set (= container init)."""
+    for name, value in HANDLER_ENVIRONMENT.items():
+        os.environ.setdefault(name, value)
+    from construction.contact_handler_construction import contact_handler_construction
+    return contact_handler_construction
+
+
+def _install_stand_ins(dynamodb_ms: float, ses_ms: float) -> None:
+    from shared import metrics, tracing
+    from tests.stand_ins import FakeDynamoDB, FakeSES, install
+
+    install(dynamodb=FakeDynamoDB(dynamodb_ms / 1000), ses=FakeSES(ses_ms / 1000))
+
+    # Keep the cost of building the log lines, not the terminal output
+    metrics.set_sink(lambda document: json.dumps(document))
+    tracing.set_collector(lambda trace: json.dumps(trace.to_dict(), default=str))
+
+
+def run_cold_sample(dynamodb_ms: float, ses_ms: float, seed: int) -> Dict[str, Any]:
+    """One cold container: init + first (valid) request. Runs in a fresh process (see run_cold)."""
+    event = next(event for event in generate_events(50, seed) if event["_kind"] == "valid")
+
+    start = time.perf_counter()
+    handler = _load_handler()
+    init_ms = (time.perf_counter() - start) * 1000
+
+    _install_stand_ins(dynamodb_ms, ses_ms)
+
+    start = time.perf_counter()
+    response = handler(event, LambdaContext())
+    first_request_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "init_ms": init_ms,
+        "first_request_ms": first_request_ms,
+        "status": response["statusCode"],
+        "peak_rss_mb": _peak_rss_mb()
+    }
+
+
+def run_cold(samples: int, dynamodb_ms: float, ses_ms: float) -> Dict[str, Any]:
+    """Starts one fresh interpreter per sample - the closest local equivalent of a new container."""
+    results = []
+    for sample in range(samples):
+        output = subprocess.run(
+            [sys.executable, "-m", "tests.benchmarks.bench_load", "--cold-sample",
+             "--dynamodb-ms", str(dynamodb_ms), "--ses-ms", str(ses_ms), "--seed", str(sample)],
+            capture_output=True, text=True, check=True, cwd=benchmarks.ROOT
+        )
+        results.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    totals = [result["init_ms"] + result["first_request_ms"] for result in results]
+    return {
+        "samples": samples,
+        "init": summarize([result["init_ms"] for result in results]),
+        "first_request": summarize([result["first_request_ms"] for result in results]),
+        "total": summarize(totals),
+        "statuses": dict(Counter(str(result["status"]) for result in results)),
+        "peak_rss_mb": max(result["peak_rss_mb"] for result in results) if results else 0.0
+    }
+
+
+def run_warm(requests: int, dynamodb_ms: float, ses_ms: float, seed: int, invalid_share: float) -> Dict[str, Any]:
+    """Many requests through one warm container."""
+    handler = _load_handler()
+    _install_stand_ins(dynamodb_ms, ses_ms)
+    context = LambdaContext()
+
+    for event in generate_events(WARMUP_REQUESTS, seed + 1000, invalid_share):
+        handler(event, context)
+
+    events = generate_events(requests, seed, invalid_share)
+    timings: Dict[str, List[float]] = {"accepted": [], "rejected": []}
+    statuses: Counter = Counter()
+    mismatches = 0
+
+    started = time.perf_counter()
+    for event in events:
+        start = time.perf_counter()
+        response = handler(event, context)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        status = response["statusCode"]
+        statuses[str(status)] += 1
+        timings["accepted" if status == 200 else "rejected"].append(elapsed)
+        mismatches += (status == 200) != (event["_kind"] == "valid")
+    wall_seconds = time.perf_counter() - started
+
+    # Separate pass for memory - tracemalloc slows every allocation, so it's kept out of the timings
+    tracemalloc.start()
+    for event in events[:min(len(events), 200)]:
+        handler(event, context)
+    _, peak_traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "requests": requests,
+        "invalid_share": invalid_share,
+        "throughput_rps": round(requests / wall_seconds, 1) if wall_seconds else 0.0,
+        "all": summarize(timings["accepted"] + timings["rejected"]),
+        "accepted": summarize(timings["accepted"]),
+        "rejected": summarize(timings["rejected"]),
+        "statuses": dict(statuses),
+        "unexpected_statuses": mismatches,
+        "peak_traced_kb": round(peak_traced / 1024, 1),
+        "peak_rss_mb": _peak_rss_mb()
+    }
+
+
+# RESULTS
+#---------
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=benchmarks.ROOT
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# (path in the results, True = higher is better)
+COMPARED = (
+    (("cold", "total", "p50_ms"), False),
+    (("cold", "total", "p95_ms"), False),
+    (("warm", "accepted", "p50_ms"), False),
+    (("warm", "accepted", "p95_ms"), False),
+    (("warm", "accepted", "p99_ms"), False),
+    (("warm", "rejected", "p95_ms"), False),
+    (("warm", "throughput_rps"), True),
+    (("warm", "peak_traced_kb"), False)
+)
+
+# Latency changes below this are scheduler noise, never a regression (rejections take well under 1 ms)
+NOISE_FLOOR_MS = 1.0
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], max_regression: Optional[float]) -> bool:
+    """
+    Prints the change of every compared value.
+
+    Returns:
+        False if a value got worse by more than max_regression percent
+    """
+    print(f"\ncompared with {baseline.get('commit', '?')} ({baseline.get('created', '?')})")
+    ok = True
+    for path, higher_is_better in COMPARED:
+        old, new = baseline, current
+        for key in path:
+            old, new = (old or {}).get(key), (new or {}).get(key)
+        if not old or new is None:
+            continue
+
+        change = (new - old) / old * 100
+        worse = -change if higher_is_better else change
+        flag = ""
+        noise = path[-1].endswith("_ms") and abs(new - old) < NOISE_FLOOR_MS
+        if max_regression is not None and worse > max_regression and not noise:
+            flag = "  REGRESSION"
+            ok = False
+        print(f"  {'.'.join(path):28s} {old:10.2f} -> {new:10.2f}  {change:+6.1f}%{flag}")
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local load test of the construction contact handler")
+    parser.add_argument("--requests", type=int, default=1000, help="warm requests")
+    parser.add_argument("--cold-samples", type=int, default=5, help="fresh processes for cold starts (0 = skip)")
+    parser.add_argument("--dynamodb-ms", type=float, default=8.0, help="stand-in latency per DynamoDB call")
+    parser.add_argument("--ses-ms", type=float, default=40.0, help="stand-in latency per SES call")
+    parser.add_argument("--invalid-share", type=float, default=0.1, help="share of invalid requests")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="", help="results JSON (default: results/bench_load-<commit>.json)")
+    parser.add_argument("--compare", default="", help="earlier results JSON to compare with")
+    parser.add_argument("--max-regression", type=float, default=None, help="percent - exit 1 if worse")
+    parser.add_argument("--cold-sample", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.cold_sample:
+        print(json.dumps(run_cold_sample(args.dynamodb_ms, args.ses_ms, args.seed)))
+        return
+
+    # Cold samples first - they run in their own processes, this one stays untouched until warm
+    cold = run_cold(args.cold_samples, args.dynamodb_ms, args.ses_ms) if args.cold_samples else None
+    warm = run_warm(args.requests, args.dynamodb_ms, args.ses_ms, args.seed, args.invalid_share)
+
+    commit = _git_commit()
+    results = {
+        "benchmark": "bench_load",
+        "commit": commit,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": sys.version.split()[0],
+        "settings": {
+            "dynamodb_ms": args.dynamodb_ms,
+            "ses_ms": args.ses_ms,
+            "notification_mode": HANDLER_ENVIRONMENT["NOTIFICATION_MODE"],
+            "seed": args.seed
+        },
+        "cold": cold,
+        "warm": warm
+    }
+
+    if cold:
+        print(f"cold  init p50 {cold['init']['p50_ms']:8.1f} ms | first request p50 "
+              f"{cold['first_request']['p50_ms']:8.1f} ms | peak RSS {cold['peak_rss_mb']} MB")
+    for group in ("accepted", "rejected"):
+        summary = warm[group]
+        print(f"warm  {group:8s} n={summary['count']:5d} | p50 {summary['p50_ms']:7.2f} | "
+              f"p95 {summary['p95_ms']:7.2f} | p99 {summary['p99_ms']:7.2f} ms")
+    print(f"warm  throughput {warm['throughput_rps']} req/s per container | "
+          f"peak traced {warm['peak_traced_kb']} KB | statuses {warm['statuses']}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench_load-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"results: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            if not compare(json.load(file), results, args.max_regression):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
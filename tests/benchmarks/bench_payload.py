@@ -0,0 +1,110 @@
+"""
+Micro-benchmark: per-request cost of serving both API Gateway payload formats (1.0 REST, 2.0 HTTP API).
+
+The Lambda code reads both formats in place (shared/utils.py) and only reshapes the response for 2.0.
+Compared with converting every 2.0 event into a 1.0 event first - the usual adapter approach.
+
+Run from the project root:
+    python -m tests.benchmarks.bench_payload
+"""
+
+import json
+import timeit
+from typing import Any, Callable, Dict
+
+from tests import benchmarks  # noqa: F401 - puts lambdas/ on sys.path
+from shared import tracing
+from shared.utils import create_cors_response, get_header, get_payload_version, get_source_ip
+
+ITERATIONS = 100000
+
+BODY = json.dumps({"contact_person": "Max", "email": "max@example.com", "phone": "+49 151 1234567",
+                   "message": "Hallo"})
+
+REST_EVENT = {
+    "resource": "/api/v1/contact",
+    "path": "/api/v1/contact",
+    "httpMethod": "POST",
+    "headers": {"Origin": "https://bau.ranjdar-group.com", "Accept-Language": "de-DE,de;q=0.9",
+                "Content-Type": "text/plain;charset=UTF-8"},
+    "requestContext": {"requestId": "rest-1", "identity": {"sourceIp": "203.0.113.7"}, "stage": "prod"},
+    "body": BODY,
+    "isBase64Encoded": False
+}
+
+HTTP_API_EVENT = {
+    "version": "2.0",
+    "routeKey": "POST /api/v1/contact",
+    "rawPath": "/api/v1/contact",
+    "rawQueryString": "",
+    "headers": {"origin": "https://bau.ranjdar-group.com", "accept-language": "de-DE,de;q=0.9",
+                "content-type": "text/plain;charset=UTF-8"},
+    "stageVariables": {"business_unit": "construction"},
+    "requestContext": {
+        "requestId": "http-1", "routeKey": "POST /api/v1/contact", "stage": "$default",
+        "http": {"method": "POST", "path": "/api/v1/contact", "sourceIp": "198.51.100.9"}
+    },
+    "body": BODY,
+    "isBase64Encoded": False
+}
+
+
+def to_rest_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Full 2.0 -> 1.0 conversion (what a generic adapter does before the handler runs)."""
+    request_context = event["requestContext"]
+    http = request_context["http"]
+    return {
+        "resource": event["routeKey"].split(" ", 1)[1],
+        "path": http["path"],
+        "httpMethod": http["method"],
+        "headers": dict(event.get("headers") or {}),
+        "queryStringParameters": event.get("queryStringParameters"),
+        "pathParameters": event.get("pathParameters"),
+        "stageVariables": event.get("stageVariables"),
+        "requestContext": {
+            "requestId": request_context["requestId"],
+            "identity": {"sourceIp": http["sourceIp"]},
+            "stage": request_context["stage"]
+        },
+        "body": event.get("body"),
+        "isBase64Encoded": event.get("isBase64Encoded", False)
+    }
+
+
+def handle(event: Dict[str, Any], payload_version: str) -> None:
+    """The event reads and the response of one submission, as the handler does them."""
+    origin = get_header(event, "origin")
+    get_header(event, "accept-language")
+    get_header(event, "idempotency-key")
+    get_source_ip(event)
+    tracing.request_id(event)
+    create_cors_response(200, {"message": "ok"}, origin=origin, payload_version=payload_version)
+
+
+def in_place(event: Dict[str, Any]) -> None:
+    handle(event, get_payload_version(event))
+
+
+def converted(event: Dict[str, Any]) -> None:
+    # The answer still has to go back in the caller's format
+    payload_version = get_payload_version(event)
+    handle(to_rest_event(event) if payload_version == "2.0" else event, payload_version)
+
+
+def measure(name: str, request: Callable[[Dict[str, Any]], None], event: Dict[str, Any]) -> float:
+    seconds = timeit.timeit(lambda: request(event), number=ITERATIONS)
+    us_per_request = seconds / ITERATIONS * 1e6
+    print(f"{name:<22} {us_per_request:8.3f} us/request")
+    return us_per_request
+
+
+def main() -> None:
+    rest = measure("1.0 (REST)", in_place, REST_EVENT)
+    http_api = measure("2.0 read in place", in_place, HTTP_API_EVENT)
+    adapter = measure("2.0 converted to 1.0", converted, HTTP_API_EVENT)
+
+    print(f"2.0 overhead vs 1.0: {http_api - rest:+.3f} us/request in place, {adapter - rest:+.3f} us/request converted")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""
+Shared pytest setup.
+
+Lambda code imports its modules as `shared.*` (the lambdas folder is the Lambda root),
+so the folder is put on sys.path here, the same way Lambda does it.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAMBDAS_DIR = os.path.join(ROOT, "lambdas")
+
+if LAMBDAS_DIR not in sys.path:
+    sys.path.insert(0, LAMBDAS_DIR)
+
+# boto3 clients are created at import - they need a region, never real credentials
+os.environ.setdefault("AWS_DEFAULT_REGION", "eu-central-1")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("JSII_SILENCE_WARNING_DEPRECATED_NODE_VERSION", "1")
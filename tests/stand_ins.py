@@ -0,0 +1,381 @@
+"""
+Local stand-ins for the AWS services the Lambda code talks to.
+Record every call and can inject latency/errors, so tests and benchmarks run without AWS.
+"""
+
+import io
+import re
+import time
+from decimal import Decimal
+from typing import Dict, Any, List, Optional
+
+# noinspection PyPackageRequirements
+from botocore.exceptions import ClientError
+
+from shared import clients
+from shared.codec import decode_item
+from shared.dynamo import deserialize_item
+from shared.notifications import SES_REGION
+
+
+def client_error(code: str, operation: str) -> ClientError:
+    """Builds a botocore ClientError the way AWS returns it."""
+    return ClientError({"Error": {"Code": code, "Message": code}}, operation)
+
+
+class FakeDynamoDB:
+    """
+    Stand-in for the low-level DynamoDB client.
+
+    Items are kept per table in attribute-value format, keyed by (pk, sk).
+    Condition expressions support what the Lambda code uses: attribute_(not_)exists(x),
+    comparisons with :values, joined by AND/OR (no parentheses).
+    """
+
+    # GSI name -> (partition attribute, sort attribute)
+    INDEXES = {"status-time-index": ("bu_status", "timestamp")}
+
+    def __init__(self, latency: float = 0.0, errors: Optional[List[Exception]] = None):
+        self.latency = latency
+        self.errors = list(errors or [])
+        self.tables: Dict[str, Dict[tuple, Dict[str, Any]]] = {}
+        self.calls: List[str] = []
+        self.put_errors: Dict[str, List[Exception]] = {}
+        self.unprocessed: List[int] = []  # per BatchWriteItem call: how many requests to leave unprocessed
+
+    def _call(self, operation: str) -> None:
+        self.calls.append(operation)
+        time.sleep(self.latency)
+        # None entries let a call through, so a later call can be made to fail
+        if self.errors:
+            error = self.errors.pop(0)
+            if error is not None:
+                raise error
+
+    @staticmethod
+    def _key(item: Dict[str, Any]) -> tuple:
+        return item["pk"]["S"], item.get("sk", {}).get("S", "")
+
+    def _check(self, operation: str, existing: Optional[Dict[str, Any]], kwargs: Dict[str, Any]) -> None:
+        expression = kwargs.get("ConditionExpression")
+        if expression and not evaluate_condition(expression, existing or {}, kwargs):
+            error = client_error("ConditionalCheckFailedException", operation)
+            if existing is not None and kwargs.get("ReturnValuesOnConditionCheckFailure") == "ALL_OLD":
+                error.response["Item"] = existing
+            raise error
+
+    def fail_puts(self, pk_prefix: str, error: Exception, times: int = 1) -> None:
+        """Makes the next `times` puts of items whose pk starts with pk_prefix raise error."""
+        self.put_errors.setdefault(pk_prefix, []).extend([error] * times)
+
+    def put_item(self, TableName: str, Item: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        self._call("PutItem")
+        for prefix, errors in self.put_errors.items():
+            if errors and Item["pk"]["S"].startswith(prefix):
+                raise errors.pop(0)
+        table = self.tables.setdefault(TableName, {})
+        self._check("PutItem", table.get(self._key(Item)), kwargs)
+        table[self._key(Item)] = Item
+        return {}
+
+    def get_item(self, TableName: str, Key: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        self._call("GetItem")
+        item = self.tables.get(TableName, {}).get(self._key(Key))
+        return {"Item": item} if item is not None else {}
+
+    def delete_item(self, TableName: str, Key: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        self._call("DeleteItem")
+        self.tables.get(TableName, {}).pop(self._key(Key), None)
+        return {}
+
+    def update_item(self, TableName: str, Key: Dict[str, Any], UpdateExpression: str, **kwargs) -> Dict[str, Any]:
+        self._call("UpdateItem")
+        table = self.tables.setdefault(TableName, {})
+        existing = table.get(self._key(Key))
+        self._check("UpdateItem", existing, kwargs)
+
+        item = dict(existing or Key)
+        values = kwargs.get("ExpressionAttributeValues", {})
+        for clause in re.split(r"\b(?=ADD |SET )", UpdateExpression.strip()):
+            action, _, body = clause.strip().partition(" ")
+            for part in filter(None, (p.strip() for p in re.split(r",(?![^(]*\))", body))):
+                if action == "ADD":
+                    name, value = part.split()
+                    current = Decimal(item[name]["N"]) if name in item else Decimal(0)
+                    item[name] = {"N": str(current + Decimal(values[value]["N"]))}
+                else:
+                    name, expression = (x.strip() for x in part.split("=", 1))
+                    match = re.match(r"if_not_exists\((\w+),\s*(:\w+)\)", expression)
+                    if match:
+                        item[name] = item.get(match.group(1), values[match.group(2)])
+                    else:
+                        item[name] = values[expression]
+
+        table[self._key(Key)] = item
+        return {"Attributes": item} if kwargs.get("ReturnValues") == "ALL_NEW" else {}
+
+    def query(self, TableName: str, KeyConditionExpression: str, **kwargs) -> Dict[str, Any]:
+        """Query on the table or a GSI (see INDEXES), with Limit/ExclusiveStartKey paging."""
+        self._call("Query")
+        partition_attr, sort_attr = self.INDEXES.get(kwargs.get("IndexName"), ("pk", "sk"))
+
+        matches = [
+            item for item in self.tables.get(TableName, {}).values()
+            if partition_attr in item and evaluate_key_condition(KeyConditionExpression, item, kwargs)
+        ]
+        # sk breaks ties of GSI sort keys, so paging is deterministic
+        def order(item: Dict[str, Any]) -> tuple:
+            return item[sort_attr]["S"], item["sk"]["S"]
+
+        forward = kwargs.get("ScanIndexForward", True)
+        matches.sort(key=order, reverse=not forward)
+
+        # Everything after the start key - works even if that item was deleted in the meantime
+        start = kwargs.get("ExclusiveStartKey")
+        if start:
+            matches = [item for item in matches if (order(item) > order(start)) == forward and order(item) != order(start)]
+
+        limit = kwargs.get("Limit", len(matches))
+        page, more = matches[:limit], len(matches) > limit
+
+        names = kwargs.get("ExpressionAttributeNames", {})
+        if "ProjectionExpression" in kwargs:
+            wanted = [names.get(n.strip(), n.strip()) for n in kwargs["ProjectionExpression"].split(",")]
+            page_items = [{k: v for k, v in item.items() if k in wanted} for item in page]
+        else:
+            page_items = page
+
+        result = {"Items": page_items, "Count": len(page_items)}
+        if more:
+            last = page[-1]
+            result["LastEvaluatedKey"] = {k: last[k] for k in {"pk", "sk", partition_attr, sort_attr}}
+        return result
+
+    def batch_write_item(self, RequestItems: Dict[str, List[Dict[str, Any]]], **kwargs) -> Dict[str, Any]:
+        """Puts of one or more tables - the last `unprocessed.pop(0)` requests come back unprocessed."""
+        self._call("BatchWriteItem")
+        unprocessed: Dict[str, List[Dict[str, Any]]] = {}
+        for table_name, requests in RequestItems.items():
+            assert len(requests) <= 25, "BatchWriteItem takes at most 25 requests"
+            keys = [self._key(request["PutRequest"]["Item"]) for request in requests]
+            if len(set(keys)) != len(keys):
+                raise client_error("ValidationException", "BatchWriteItem")
+
+            skipped = self.unprocessed.pop(0) if self.unprocessed else 0
+            done, rest = requests[:len(requests) - skipped], requests[len(requests) - skipped:]
+            table = self.tables.setdefault(table_name, {})
+            for request in done:
+                table[self._key(request["PutRequest"]["Item"])] = request["PutRequest"]["Item"]
+            if rest:
+                unprocessed[table_name] = rest
+        return {"UnprocessedItems": unprocessed}
+
+    def batch_get_item(self, RequestItems: Dict[str, Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+        """Gets of one or more tables - every key is processed (no UnprocessedKeys)."""
+        self._call("BatchGetItem")
+        responses: Dict[str, List[Dict[str, Any]]] = {}
+        for table_name, request in RequestItems.items():
+            assert len(request["Keys"]) <= 100, "BatchGetItem takes at most 100 keys"
+            table = self.tables.get(table_name, {})
+            responses[table_name] = [table[self._key(key)] for key in request["Keys"] if self._key(key) in table]
+        return {"Responses": responses, "UnprocessedKeys": {}}
+
+    def transact_write_items(self, TransactItems: List[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+        """All-or-nothing Put/Delete with conditions - any failed condition cancels the whole transaction."""
+        self._call("TransactWriteItems")
+        for action in TransactItems:
+            (kind, request), = action.items()
+            table = self.tables.get(request["TableName"], {})
+            key = self._key(request["Item"] if kind == "Put" else request["Key"])
+            expression = request.get("ConditionExpression")
+            if expression and not evaluate_condition(expression, table.get(key) or {}, request):
+                raise client_error("TransactionCanceledException", "TransactWriteItems")
+
+        for action in TransactItems:
+            (kind, request), = action.items()
+            table = self.tables.setdefault(request["TableName"], {})
+            if kind == "Put":
+                table[self._key(request["Item"])] = request["Item"]
+            else:
+                table.pop(self._key(request["Key"]), None)
+        return {}
+
+    def scan(self, TableName: str, **kwargs) -> Dict[str, Any]:
+        """Scan with Segment/TotalSegments, Limit/ExclusiveStartKey paging and begins_with filters."""
+        self._call("Scan")
+        segment, total = kwargs.get("Segment", 0), kwargs.get("TotalSegments", 1)
+
+        # Stable spread of items over segments, like DynamoDB's hash ranges
+        keys = sorted(key for key in self.tables.get(TableName, {}) if sum(key[0].encode()) % total == segment)
+
+        start = kwargs.get("ExclusiveStartKey")
+        if start:
+            keys = [key for key in keys if key > self._key(start)]
+
+        # Limit counts evaluated items, before the filter - like DynamoDB
+        limit = kwargs.get("Limit", len(keys))
+        page, more = keys[:limit], len(keys) > limit
+
+        items = [self.tables[TableName][key] for key in page]
+        match = re.match(r"begins_with\((\w+),\s*(:\w+)\)", kwargs.get("FilterExpression", ""))
+        if match:
+            prefix = kwargs["ExpressionAttributeValues"][match.group(2)]["S"]
+            items = [item for item in items if item.get(match.group(1), {}).get("S", "").startswith(prefix)]
+
+        result = {"Items": items, "Count": len(items)}
+        if more:
+            last = self.tables[TableName][page[-1]]
+            result["LastEvaluatedKey"] = {"pk": last["pk"], "sk": last["sk"]}
+        return result
+
+    def items(self, table_name: str, prefix: str = "BU#", raw: bool = False) -> List[Dict[str, Any]]:
+        """Stored items of a table (whose pk starts with prefix) as plain dicts, decoded unless raw."""
+        items = [
+            deserialize_item(item) for (pk, _), item in self.tables.get(table_name, {}).items()
+            if pk.startswith(prefix)
+        ]
+        return items if raw else [decode_item(item) for item in items]
+
+
+def _operand(token: str, item: Dict[str, Any], kwargs: Dict[str, Any]) -> Any:
+    token = token.strip()
+    if token.startswith(":"):
+        value = kwargs["ExpressionAttributeValues"][token]
+    else:
+        token = kwargs.get("ExpressionAttributeNames", {}).get(token, token)
+        value = item.get(token)
+    if value is None:
+        return None
+    (kind, raw), = value.items()
+    return Decimal(raw) if kind == "N" else raw
+
+
+def evaluate_condition(expression: str, item: Dict[str, Any], kwargs: Dict[str, Any]) -> bool:
+    """Evaluates a simple DynamoDB condition expression against an item (attribute-value format)."""
+    for alternative in expression.split(" OR "):
+        if all(_evaluate_term(term, item, kwargs) for term in alternative.split(" AND ")):
+            return True
+    return False
+
+
+def evaluate_key_condition(expression: str, item: Dict[str, Any], kwargs: Dict[str, Any]) -> bool:
+    """Evaluates "<partition> = :p [AND <sort> BETWEEN :a AND :b | begins_with(<sort>, :x) | <sort> op :v]"."""
+    partition, _, rest = expression.partition(" AND ")
+    if not _evaluate_term(partition, item, kwargs):
+        return False
+    if not rest:
+        return True
+
+    match = re.match(r"(\S+) BETWEEN (:\w+) AND (:\w+)", rest.strip())
+    if match:
+        value = _operand(match.group(1), item, kwargs)
+        return value is not None and _operand(match.group(2), item, kwargs) <= value <= _operand(match.group(3), item, kwargs)
+
+    match = re.match(r"begins_with\((\S+),\s*(:\w+)\)", rest.strip())
+    if match:
+        value = _operand(match.group(1), item, kwargs)
+        return value is not None and value.startswith(_operand(match.group(2), item, kwargs))
+
+    return _evaluate_term(rest, item, kwargs)
+
+
+def _evaluate_term(term: str, item: Dict[str, Any], kwargs: Dict[str, Any]) -> bool:
+    term = term.strip()
+    for function, expected in (("attribute_not_exists", False), ("attribute_exists", True)):
+        if term.startswith(function + "("):
+            name = term[len(function) + 1:-1]
+            return (_operand(name, item, kwargs) is not None) == expected
+
+    for operator, compare in (("<=", lambda a, b: a <= b), (">=", lambda a, b: a >= b),
+                              ("<", lambda a, b: a < b), (">", lambda a, b: a > b), ("=", lambda a, b: a == b)):
+        if f" {operator} " in term:
+            left, right = term.split(f" {operator} ")
+            a, b = _operand(left, item, kwargs), _operand(right, item, kwargs)
+            return a is not None and b is not None and compare(a, b)
+
+    raise ValueError(f"Unsupported condition: {term}")
+
+
+class FakeSES:
+    """Stand-in for the SES client. `errors` are raised in order before sends start succeeding."""
+
+    def __init__(self, latency: float = 0.0, errors: Optional[List[Exception]] = None, max_send_rate: float = 14.0):
+        self.latency = latency
+        self.errors = list(errors or [])
+        self.max_send_rate = max_send_rate
+        self.sent: List[Dict[str, Any]] = []
+
+    def send_email(self, **kwargs) -> Dict[str, Any]:
+        time.sleep(self.latency)
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent.append(kwargs)
+        return {"MessageId": f"ses-{len(self.sent)}"}
+
+    def get_send_quota(self) -> Dict[str, Any]:
+        return {"MaxSendRate": self.max_send_rate, "Max24HourSend": 200.0, "SentLast24Hours": 0.0}
+
+
+class FakeSQS:
+    """Stand-in for the SQS client - keeps messages per queue URL."""
+
+    def __init__(self, latency: float = 0.0, fail: bool = False):
+        self.latency = latency
+        self.fail = fail
+        self.messages: Dict[str, List[Dict[str, Any]]] = {}
+
+    def send_message(self, QueueUrl: str, MessageBody: str, **kwargs) -> Dict[str, Any]:
+        time.sleep(self.latency)
+        if self.fail:
+            raise client_error("AWS.SimpleQueueService.NonExistentQueue", "SendMessage")
+        self.messages.setdefault(QueueUrl, []).append({"Body": MessageBody, **kwargs})
+        return {"MessageId": f"sqs-{sum(len(m) for m in self.messages.values())}"}
+
+
+class FakeS3:
+    """Stand-in for the S3 client - keeps objects per (bucket, key), fails the first `failures` puts."""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.objects: Dict[tuple, Dict[str, Any]] = {}
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, **kwargs) -> Dict[str, Any]:
+        if self.failures > 0:
+            self.failures -= 1
+            raise client_error("SlowDown", "PutObject")
+        self.objects[(Bucket, Key)] = {"Body": Body, **kwargs}
+        return {"ETag": f'"{len(self.objects)}"'}
+
+    def get_object(self, Bucket: str, Key: str) -> Dict[str, Any]:
+        if (Bucket, Key) not in self.objects:
+            raise client_error("NoSuchKey", "GetObject")
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)]["Body"])}
+
+    def delete_objects(self, Bucket: str, Delete: Dict[str, Any]) -> Dict[str, Any]:
+        for item in Delete["Objects"]:
+            self.objects.pop((Bucket, item["Key"]), None)
+        return {"Deleted": [] if Delete.get("Quiet") else Delete["Objects"]}
+
+
+class FakeCloudFront:
+    """Stand-in for the CloudFront client - records invalidation batches."""
+
+    def __init__(self):
+        self.invalidations: List[Dict[str, Any]] = []
+
+    def create_invalidation(self, DistributionId: str, InvalidationBatch: Dict[str, Any]) -> Dict[str, Any]:
+        self.invalidations.append({"DistributionId": DistributionId, **InvalidationBatch})
+        return {"Invalidation": {"Id": f"I{len(self.invalidations)}", "Status": "InProgress"}}
+
+
+def install(dynamodb: Any = None, ses: Any = None, sqs: Any = None, s3: Any = None) -> None:
+    """Registers stand-ins in the shared client registry (replaces any real clients)."""
+    clients.reset_clients()
+    if dynamodb is not None:
+        clients.set_client("dynamodb", dynamodb)
+    if ses is not None:
+        clients.set_client("ses", ses, SES_REGION)
+    if sqs is not None:
+        clients.set_client("sqs", sqs)
+    if s3 is not None:
+        clients.set_client("s3", s3)
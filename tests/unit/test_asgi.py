@@ -0,0 +1,185 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from shared import asgi, client_config, clients, idempotency, metrics, rate_limit, router, tracing
+from shared.i18n import get_messages
+from shared.utils import create_cors_response
+from tests.stand_ins import FakeDynamoDB, FakeSES, install
+
+UNITS = router.load_registry({
+    "UNIT_CONSTRUCTION": json.dumps({
+        "TABLE_NAME": "construction-table", "FROM_EMAIL": "system@ranjdar-group.com", "TO_EMAIL": "bau@example.com"
+    }),
+    "UNIT_RETAIL": json.dumps({
+        "TABLE_NAME": "retail-table", "FROM_EMAIL": "system@ranjdar-group.com", "TO_EMAIL": "shop@example.com"
+    })
+})
+
+FORM = {"contact_person": "Max", "email": "max@example.com", "phone": "+49 151 1234567", "message": "Hallo"}
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    dynamodb = FakeDynamoDB()
+    install(dynamodb=dynamodb, ses=FakeSES())
+    monkeypatch.setattr(idempotency, "_recent", idempotency.OrderedDict())
+    monkeypatch.setattr(rate_limit, "_blocked", rate_limit.OrderedDict())
+    monkeypatch.setattr(client_config, "_pool_connections", None)
+    yield dynamodb
+    clients.reset_clients()
+
+
+async def request(
+        app, method="POST", path="/api/v1/contact", body=b"", headers=(), query=b"", chunks=None, client="203.0.113.7"
+):
+    """Drives the app like an ASGI server - returns (status, headers, body, receive calls)."""
+    chunks = chunks if chunks is not None else [body]
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1}
+        for index, chunk in enumerate(chunks)
+    ]
+    received, sent = [], []
+
+    async def receive():
+        received.append(1)
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "method": method, "path": path, "query_string": query, "client": (client, 51000),
+        "headers": [(b"origin", b"https://bau.ranjdar-group.com"), *headers]
+    }
+    await app(scope, receive, send)
+
+    start, body = sent
+    return start["status"], dict(start["headers"]), body["body"], len(received)
+
+
+def post(app, form=FORM, **kwargs):
+    return asyncio.run(request(app, body=json.dumps(form).encode(), **kwargs))
+
+
+def test_submission_gets_the_lambda_response(aws):
+    app = asgi.ContactApp(UNITS, default_unit="construction", workers=4)
+
+    status, headers, body, _ = post(app)
+    app.close()
+
+    assert status == 200
+    expected = create_cors_response(200, {}, origin="https://bau.ranjdar-group.com")["headers"]
+    assert {name.decode(): value.decode() for name, value in headers.items() if name != b"content-length"} == {
+        name.lower(): value for name, value in expected.items()
+    }
+    assert json.loads(body)["message"] == get_messages("DE")["success"]
+    (item,) = aws.items("construction-table")
+    assert item["contact_id"] == json.loads(body)["contact_id"]
+
+
+def test_unit_from_path_default_or_query(aws):
+    app = asgi.ContactApp(UNITS, workers=4)
+
+    assert post(app, path="/api/v1/retail/contact")[0] == 200
+    assert post(app, {**FORM, "message": "Hi"}, query=b"business_unit=construction")[0] == 200
+    assert post(app, {**FORM, "message": "Hej"}, path="/api/v1/cosmetics/contact")[0] == 404
+    app.close()
+
+    assert len(aws.items("retail-table")) == 1 and len(aws.items("construction-table")) == 1
+
+
+def test_preflight_health_and_unknown_routes_without_aws_calls(aws):
+    app = asgi.ContactApp(UNITS, workers=4)
+
+    status, headers, body, _ = asyncio.run(request(app, "OPTIONS"))
+    assert status == 204 and body == b""
+    assert headers[b"access-control-allow-methods"] == b"OPTIONS, POST"
+
+    status, headers, _, _ = asyncio.run(request(app, "GET"))
+    assert status == 405 and headers[b"allow"] == b"OPTIONS, POST"
+    assert asyncio.run(request(app, "GET", "/health"))[0] == 200
+    assert asyncio.run(request(app, "POST", "/api/v2/contact"))[0] == 404
+    app.close()
+
+    assert aws.calls == []
+
+
+def test_oversized_bodies_are_not_read_to_the_end(aws):
+    app = asgi.ContactApp(UNITS, default_unit="construction", workers=4)
+    chunk = b"x" * 4096
+
+    status, _, body, received = asyncio.run(request(app, chunks=[b"{\"message\": \""] + [chunk] * 100))
+    app.close()
+
+    assert status == 413 and json.loads(body)["error"] == "Anfrage zu groß"
+    assert received < 10
+    assert aws.calls == []
+
+
+def test_concurrent_submissions_share_one_process(aws):
+    aws.latency = 0.05  # 4 DynamoDB calls per submission = 0.2 s each, 4 s one after the other
+    sink, collector = metrics.MemorySink(), tracing.InMemoryCollector()
+    metrics.set_sink(sink)
+    tracing.set_collector(collector)
+    app = asgi.ContactApp(UNITS, default_unit="construction", workers=20)
+
+    async def burst():
+        return await asyncio.gather(*(
+            request(app, body=json.dumps({**FORM, "email": f"lead{i}@example.com"}).encode(),
+                    headers=[(b"x-request-id", f"req-{i}".encode())], client=f"203.0.113.{i}")
+            for i in range(20)
+        ))
+
+    started = time.perf_counter()
+    responses = asyncio.run(burst())
+    elapsed = time.perf_counter() - started
+    app.close()
+    metrics.reset_sink()
+    tracing.reset_collector()
+
+    assert [status for status, *_ in responses] == [200] * 20
+    assert elapsed < 1.5
+    # Every request kept its own metrics and trace
+    assert len(sink.documents) == 20 and {document["Outcome"] for document in sink.documents} == {"success"}
+    assert sorted(trace["request_id"] for trace in collector.traces) == sorted(f"req-{i}" for i in range(20))
+    assert len({trace["contact_id"] for trace in collector.traces}) == 20
+
+
+def test_event_translation():
+    scope = {
+        "type": "http", "method": "POST", "path": "/api/v1/retail/contact", "query_string": b"a=1",
+        "client": ("10.0.0.5", 443),
+        "headers": [(b"Origin", b"https://x"), (b"x-forwarded-for", b"1.2.3.4, 198.51.100.9, 10.0.0.1")]
+    }
+
+    event = asgi.build_event(scope, b"\xff\xfe", "retail", trusted_proxy_hops=2)
+
+    assert event["headers"]["origin"] == "https://x"
+    assert event["pathParameters"] == {"business_unit": "retail"} and event["stageVariables"] is None
+    assert event["queryStringParameters"] == {"a": "1"}
+    assert event["requestContext"]["identity"]["sourceIp"] == "198.51.100.9"
+    assert event["isBase64Encoded"] and event["body"] == "//4="
+    # Without trusted proxies X-Forwarded-For is ignored - the client could have written it
+    assert asgi.build_event(scope, b"")["requestContext"]["identity"]["sourceIp"] == "10.0.0.5"
+
+
+def test_lifespan_starts_and_drains_workers():
+    app = asgi.ContactApp(UNITS, workers=2)
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message["type"])
+        if message["type"] == "lifespan.startup.complete":
+            assert app._executor is not None
+
+    asyncio.run(app({"type": "lifespan"}, receive, send))
+
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    assert app._executor is None
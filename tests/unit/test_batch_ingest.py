@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from shared import batch_ingest, clients, codec, form_schema, handlers_manager, idempotency, rate_limit
+from shared.codec import decode_item
+from shared.dynamo import deserialize_item
+from tests.stand_ins import FakeDynamoDB, FakeSES, install
+
+
+@pytest.fixture
+def dynamodb(monkeypatch):
+    fake = FakeDynamoDB()
+    install(dynamodb=fake, ses=FakeSES())
+    monkeypatch.setattr(batch_ingest, "BASE_BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(idempotency, "_recent", idempotency.OrderedDict())
+    monkeypatch.setattr(rate_limit, "_blocked", rate_limit.OrderedDict())
+    yield fake
+    clients.reset_clients()
+
+
+def lead(i, **extra):
+    return {"contact_person": f"Lead {i}", "email": f"lead{i}@example.com", "phone": "+49 151 1234567", "message": f"Fair {i}",
+            **extra}
+
+
+def post(submissions):
+    response = batch_ingest.process_contact_batch_submission(
+        {"body": json.dumps({"submissions": submissions})}, "construction", "table", shard_count=4
+    )
+    return response["statusCode"], json.loads(response["body"])
+
+
+def test_writes_in_chunks_and_retries_unprocessed_items(dynamodb):
+    # Chunk 1: 5 throttled, retry writes them | chunk 2: 3 throttled, retry writes them | chunk 3: 10 items
+    dynamodb.unprocessed = [5, 0, 3]
+
+    status, body = post([lead(i) for i in range(60)])
+
+    assert status == 200
+    assert body["created"] == 60 and body["failed"] == 0
+    assert dynamodb.calls.count("BatchWriteItem") == 5
+    assert len(dynamodb.items("table")) == 60
+
+
+def test_items_still_unprocessed_after_all_attempts_are_reported(dynamodb):
+    dynamodb.unprocessed = [2] * batch_ingest.MAX_WRITE_ATTEMPTS
+
+    status, body = post([lead(i) for i in range(4)])
+
+    assert status == 200
+    assert [result["status"] for result in body["results"]] == ["created", "created", "failed", "failed"]
+    assert len(dynamodb.items("table")) == 2
+
+
+def test_per_item_results(dynamodb):
+    status, body = post([
+        lead(1, timestamp="2025-05-10T09:30:00Z"),
+        {"email": "missing@example.com"},
+        lead(1, timestamp="2025-05-10T09:30:00Z"),  # same lead twice in the spreadsheet
+        lead(2, timestamp="yesterday")
+    ])
+
+    assert status == 200
+    assert [result["status"] for result in body["results"]] == ["created", "invalid", "duplicate", "invalid"]
+    assert body["results"][2]["contact_id"] == body["results"][0]["contact_id"]
+    assert body["created"] == 1 and body["duplicate"] == 1 and body["invalid"] == 2 and body["failed"] == 0
+
+
+def test_reimport_neither_doubles_nor_resets_triaged_leads(dynamodb):
+    leads = [lead(i, timestamp="2025-05-10") for i in range(3)]
+    post(leads)
+
+    # Staff triaged one lead in the meantime
+    key, item = next(iter(dynamodb.tables["table"].items()))
+    item[codec.FIELD_NAMES["status"]] = {"S": "contacted"}
+
+    status, body = post(leads + [lead(3, timestamp="2025-05-10")])
+
+    assert status == 200
+    assert body["duplicate"] == 3 and body["created"] == 1
+    items = dynamodb.items("table")
+    assert len(items) == 4
+    assert {item["timestamp"] for item in items} == {"2025-05-10T00:00:00+00:00"}
+    assert decode_item(deserialize_item(dynamodb.tables["table"][key]))["status"] == "contacted"
+
+
+def test_bulk_and_single_items_are_identical(dynamodb):
+    fields, _ = form_schema.validate("construction", lead(7, company="ACME"))
+    single = handlers_manager.build_contact_item("construction", "id-1", "2025-01-01T00:00:00+00:00", fields,
+                                                 shard_count=4)
+
+    handlers_manager.process_contact_form_submission(
+        {"body": json.dumps(lead(7, company="ACME"))}, "construction", "table", "a@b.c", "d@e.f", shard_count=4
+    )
+    post([lead(7, company="ACME")])
+
+    stored = sorted(dynamodb.items("table"), key=lambda item: item["sk"])
+    assert len(stored) == 2
+    assert set(stored[0]) == set(stored[1]) == set(single)
+
+
+def test_rejects_oversized_and_malformed_batches(dynamodb):
+    assert post([lead(i) for i in range(batch_ingest.MAX_BATCH_SIZE + 1)])[0] == 413
+    assert post([])[0] == 400
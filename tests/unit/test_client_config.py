@@ -0,0 +1,54 @@
+import pytest
+
+from shared import client_config, clients
+
+
+def test_profile_selected_by_environment_variable(monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "PROD")
+    assert client_config.get_profile() is client_config.PROFILES["prod"]
+
+    monkeypatch.setenv("ENVIRONMENT", "staging")
+    assert client_config.get_profile() is client_config.PROFILES["dev"]
+
+
+def test_timeouts_fit_into_remaining_lambda_time():
+    profile = client_config.PROFILES["dev"]
+
+    # Plenty of time left: profile values stay
+    assert client_config.derive_timeouts(profile, 30000) == {"connect_timeout": 2.0, "read_timeout": 5.0}
+
+    # 4s left, 1s margin, 3 attempts = 1s per attempt
+    assert client_config.derive_timeouts(profile, 4000) == {"connect_timeout": 0.25, "read_timeout": 0.75}
+
+    # Never below the floors
+    timeouts = client_config.derive_timeouts(profile, 0)
+    assert timeouts == {"connect_timeout": client_config.MIN_CONNECT_TIMEOUT,
+                        "read_timeout": client_config.MIN_READ_TIMEOUT}
+
+
+def test_all_attempts_finish_before_lambda_timeout():
+    for profile in client_config.PROFILES.values():
+        timeouts = client_config.derive_timeouts(profile, 30000)
+        worst_case = (timeouts["connect_timeout"] + timeouts["read_timeout"]) * profile["max_attempts"]
+        assert worst_case < 30 - client_config.SAFETY_MARGIN_MS / 1000
+
+
+def test_registry_clients_use_profile_and_are_reused(monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "prod")
+    clients.reset_clients()
+    try:
+        client = clients.get_client("dynamodb")
+        config = client.meta.config
+
+        assert config.connect_timeout == 1.0
+        assert config.read_timeout == 3.0
+        assert config.retries == {"mode": "adaptive", "total_max_attempts": 3}
+        assert config.tcp_keepalive is True
+        assert clients.get_client("dynamodb") is client
+    finally:
+        clients.reset_clients()
+
+
+@pytest.fixture(autouse=True)
+def reset_prime(monkeypatch):
+    monkeypatch.setattr(client_config, "_remaining_ms", None)
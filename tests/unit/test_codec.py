@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from shared import codec, form_schema
+from shared.dynamo import serialize_item, deserialize_item
+from shared.handlers_manager import build_contact_item
+
+SENTENCES = [
+    "We are planning a new warehouse with a floor area of about 1200 square meters.",
+    "Could you send us an offer for precast concrete walls and the delivery to our site?",
+    "Wir planen ein Einfamilienhaus mit Keller und suchen einen Partner fuer die Betonarbeiten.",
+    "Bitte senden Sie uns ein Angebot fuer Fertigteilgaragen inklusive Lieferung und Montage.",
+    "Dorim o oferta pentru fundatia unei case P+1 si turnarea placii de beton.",
+    "The construction should start in spring, the permit has already been approved by the city.",
+    "Our architect can send the drawings and the static calculation as PDF if needed.",
+    "Wie lange ist die Lieferzeit aktuell und koennen Sie auch am Wochenende liefern?",
+]
+
+
+def corpus(size=300, seed=7):
+    """Realistic mix: many short inquiries, some detailed ones, a few at the 2000 character limit."""
+    rng = random.Random(seed)
+    items = []
+    for i in range(size):
+        sentences = rng.choice([1, 2, 3, 6, 12, 30])
+        body = {
+            "contact_person": rng.choice(["Max Mustermann", "Ioana Popescu", "John Smith", "Anna Becker"]),
+            "email": f"customer{i}@example-mail.com",
+            "phone": f"+49 151 {rng.randint(1000000, 9999999)}",
+            "message": " ".join(rng.choice(SENTENCES) for _ in range(sentences)),
+            "company": rng.choice(["", "Becker Bau GmbH", "Popescu Constructii SRL"]),
+            "project_type": rng.choice(["", "transformer_station", "infrastructure", "other"]),
+            "timeline": rng.choice(["", "3 months", "this year"]),
+            "units_needed": rng.choice(["", "4", "12"])
+        }
+        items.append(build_contact_item(
+            "construction", f"{i:08d}-0000-4000-8000-000000000000", "2025-06-01T10:00:00.123456+00:00",
+            form_schema.validate("construction", body)[0], environment="prod", source_domain="https://construction.ranjdar-group.com",
+            expires=1767225600, shard_count=4
+        ))
+    return items
+
+
+def test_round_trip_through_dynamodb_serialization():
+    for item in corpus(50):
+        stored = deserialize_item(serialize_item(codec.encode_item(item)))
+        assert codec.decode_item(stored) == item
+
+
+def test_old_items_are_read_unchanged_and_newer_versions_rejected():
+    item = corpus(1)[0]
+    assert codec.decode_item(dict(item)) == item
+    assert codec.decode_item(codec.encode_item(item, version=0)) == item
+    with pytest.raises(ValueError):
+        codec.decode_item({"v": codec.CODEC_VERSION + 1})
+
+
+def test_keys_gsi_and_ttl_attributes_keep_their_names():
+    encoded = codec.encode_item(corpus(1)[0])
+    assert {"pk", "sk", "bu_status", "timestamp", "expires_at"} <= set(encoded)
+
+
+def test_size_and_write_units_report():
+    items = corpus()
+    before = [codec.item_size(item) for item in items]
+    after = [codec.item_size(codec.encode_item(item)) for item in items]
+    wcu_before = sum(codec.write_units(item) for item in items)
+    wcu_after = sum(codec.write_units(codec.encode_item(item)) for item in items)
+
+    print(f"\n{len(items)} items: {sum(before) / len(items):.0f} -> {sum(after) / len(items):.0f} bytes/item, "
+          f"max {max(before)} -> {max(after)} bytes, {wcu_before} -> {wcu_after} WCU "
+          f"({wcu_before / len(items):.2f} -> {wcu_after / len(items):.2f} per write)")
+
+    assert sum(after) < 0.75 * sum(before)
+    assert wcu_after < wcu_before
+    # Short inquiries don't get bigger (no compression below the threshold)
+    assert all(a <= b for a, b in zip(after, before))
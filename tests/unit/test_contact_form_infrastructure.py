@@ -0,0 +1,303 @@
+import os
+
+import aws_cdk as core
+import aws_cdk.assertions as assertions
+import pytest
+
+from infrastructure.shared.config import constants
+from infrastructure.shared.managers import contact_form_infrastructure
+from infrastructure.shared.managers.contact_form_infrastructure import (
+    create_contact_form_infrastructure, create_contact_router
+)
+
+CONTACT_HANDLER = "construction.contact_handler_construction.contact_handler_construction"
+
+
+def synth(**kwargs) -> assertions.Template:
+    app = core.App()
+    stack = core.Stack(app, "contact-test-stack")
+    create_contact_form_infrastructure(stack, "construction", **kwargs)
+    return assertions.Template.from_stack(stack)
+
+
+def test_inline_notifications_create_no_queue():
+    template = synth()
+
+    template.resource_count_is("AWS::SQS::Queue", 0)
+    # contact, bulk ingestion, contacts query, archive consumer + the archive bucket's auto-delete provider
+    template.resource_count_is("AWS::Lambda::Function", 5)
+
+
+def test_queued_notifications_create_queue_dlq_and_consumer():
+    template = synth(queued_notifications=True)
+
+    template.resource_count_is("AWS::SQS::Queue", 2)
+    template.has_resource_properties("AWS::SQS::Queue", {
+        "VisibilityTimeout": 360,
+        "RedrivePolicy": assertions.Match.object_like({"maxReceiveCount": 5})
+    })
+    template.has_resource_properties("AWS::Lambda::EventSourceMapping", {
+        "BatchSize": 10,
+        "FunctionResponseTypes": ["ReportBatchItemFailures"],
+        "ScalingConfig": {"MaximumConcurrency": 2}
+    })
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "construction.contact_handler_construction.contact_handler_construction",
+        "Environment": {"Variables": assertions.Match.object_like({"NOTIFICATION_MODE": "queue"})}
+    })
+
+
+def test_table_has_ttl_and_cors_allows_idempotency_key():
+    template = synth()
+
+    template.has_resource_properties("AWS::DynamoDB::Table", {
+        "TimeToLiveSpecification": {"AttributeName": "expires_at", "Enabled": True}
+    })
+    template.has_resource_properties("AWS::ApiGateway::Method", {
+        "HttpMethod": "OPTIONS",
+        "Integration": assertions.Match.object_like({
+            "IntegrationResponses": [assertions.Match.object_like({
+                "ResponseParameters": assertions.Match.object_like({
+                    "method.response.header.Access-Control-Allow-Headers": "'Content-Type,Idempotency-Key'",
+                    # Browsers cache the preflight answer instead of asking before every POST
+                    "method.response.header.Access-Control-Max-Age": "'86400'"
+                })
+            })]
+        })
+    })
+
+
+def test_contacts_query_endpoint_uses_status_gsi_and_api_key():
+    template = synth()
+
+    template.has_resource_properties("AWS::DynamoDB::Table", {
+        "GlobalSecondaryIndexes": [assertions.Match.object_like({
+            "IndexName": "status-time-index",
+            "KeySchema": [
+                {"AttributeName": "bu_status", "KeyType": "HASH"},
+                {"AttributeName": "timestamp", "KeyType": "RANGE"}
+            ]
+        })]
+    })
+    template.has_resource_properties("AWS::ApiGateway::Method", {
+        "HttpMethod": "GET",
+        "ApiKeyRequired": True
+    })
+    # Bulk ingestion shares the key
+    template.has_resource_properties("AWS::ApiGateway::Method", {
+        "HttpMethod": "POST",
+        "ApiKeyRequired": True,
+        "Integration": assertions.Match.object_like({"Type": "AWS_PROXY"})
+    })
+    template.resource_count_is("AWS::ApiGateway::UsagePlan", 1)
+
+
+def test_submissions_expire_into_s3_archive():
+    template = synth(environment="prod")
+
+    template.has_resource_properties("AWS::DynamoDB::Table", {
+        "StreamSpecification": {"StreamViewType": "OLD_IMAGE"}
+    })
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "construction.contact_handler_construction.contact_handler_construction",
+        "Environment": {"Variables": assertions.Match.object_like({"RETENTION_DAYS": "90", "ENVIRONMENT": "prod"})}
+    })
+    template.has_resource_properties("AWS::Lambda::EventSourceMapping", {
+        "FunctionResponseTypes": ["ReportBatchItemFailures"],
+        "FilterCriteria": {"Filters": [{"Pattern": assertions.Match.string_like_regexp("dynamodb.amazonaws.com")}]}
+    })
+    template.has_resource("AWS::S3::Bucket", {"DeletionPolicy": "Retain"})
+
+
+def test_shared_router_serves_several_units_with_one_lambda():
+    app = core.App()
+    stack = core.Stack(app, "router-test-stack")
+    router = create_contact_router(stack)
+    create_contact_form_infrastructure(stack, "construction", queued_notifications=True, router=router)
+    create_contact_form_infrastructure(stack, "retail", router=router)
+    template = assertions.Template.from_stack(stack)
+
+    template.resource_count_is("AWS::Lambda::Function", len([
+        "router", "construction batch", "construction query", "construction archive", "construction notifications",
+        "retail batch", "retail query", "retail archive", "auto-delete provider"
+    ]))
+    functions = template.find_resources("AWS::Lambda::Function", {
+        "Properties": {"Handler": "router.contact_handler_router.contact_handler_router"}
+    })
+    (router_function,) = functions.values()
+    variables = router_function["Properties"]["Environment"]["Variables"]
+    assert {"UNIT_CONSTRUCTION", "UNIT_RETAIL"} <= set(variables)
+
+    template.has_resource_properties("AWS::ApiGateway::Stage", {"Variables": {"business_unit": "retail"}})
+
+
+def test_xray_tracing_is_opt_in(tmp_path, monkeypatch):
+    # No pip (and no network) in unit tests - an empty layer folder stands in for the SDK
+    def fake_build(output_dir, architecture):
+        os.makedirs(os.path.join(str(tmp_path), architecture, "python"), exist_ok=True)
+        return os.path.join(str(tmp_path), architecture)
+
+    monkeypatch.setattr(contact_form_infrastructure, "build_xray_layer", fake_build)
+    contact_form_infrastructure._built_xray_layer.cache_clear()
+
+    template = synth()
+    template.resource_properties_count_is("AWS::Lambda::Function", {"TracingConfig": {"Mode": "Active"}}, 0)
+    template.resource_count_is("AWS::Lambda::LayerVersion", 1)
+
+    template = synth(queued_notifications=True, xray_tracing=True)
+
+    # contact Lambda + notification consumer - both with the X-Ray SDK layer after the shared code layer
+    template.resource_properties_count_is("AWS::Lambda::Function", {
+        "TracingConfig": {"Mode": "Active"},
+        "Environment": {"Variables": assertions.Match.object_like({"XRAY_TRACING": "true"})},
+        "Layers": assertions.Match.array_with([{"Ref": assertions.Match.string_like_regexp("xraysdklayer")}])
+    }, 2)
+    template.has_resource_properties("AWS::Lambda::LayerVersion", {
+        "Description": assertions.Match.string_like_regexp("aws-xray-sdk")
+    })
+    template.has_resource_properties("AWS::ApiGateway::Stage", {"TracingEnabled": True})
+    contact_form_infrastructure._built_xray_layer.cache_clear()
+
+
+def test_rest_api_serves_the_contact_endpoint_by_default():
+    template = synth()
+
+    template.resource_count_is("AWS::ApiGatewayV2::Api", 0)
+    template.has_resource_properties("AWS::ApiGateway::Method", {
+        "HttpMethod": "POST",
+        "ApiKeyRequired": assertions.Match.absent(),
+        "Integration": assertions.Match.object_like({"Type": "AWS_PROXY"})
+    })
+
+
+def test_http_api_mode_serves_the_contact_endpoint_with_payload_v2_and_builtin_cors():
+    template = synth(http_api=True)
+
+    template.has_resource_properties("AWS::ApiGatewayV2::Api", {
+        "ProtocolType": "HTTP",
+        "CorsConfiguration": {
+            "AllowOrigins": assertions.Match.array_with(["https://bau.ranjdar-group.com"]),
+            "AllowMethods": ["POST", "OPTIONS"],
+            "AllowHeaders": ["Content-Type", "Idempotency-Key"],
+            "ExposeHeaders": ["Retry-After"],
+            "MaxAge": 86400
+        }
+    })
+    template.has_resource_properties("AWS::ApiGatewayV2::Integration", {
+        "IntegrationType": "AWS_PROXY",
+        "PayloadFormatVersion": "2.0"
+    })
+    template.has_resource_properties("AWS::ApiGatewayV2::Route", {"RouteKey": "POST /api/v1/contact"})
+    template.has_resource_properties("AWS::ApiGatewayV2::Stage", {
+        "StageName": "$default",
+        "StageVariables": {"business_unit": "construction"}
+    })
+
+    # The REST API keeps only the admin endpoints (API keys) - no public POST without a key
+    template.resource_properties_count_is("AWS::ApiGateway::Method", {
+        "HttpMethod": "POST", "ApiKeyRequired": assertions.Match.absent()
+    }, 0)
+
+
+def test_dev_profile_runs_on_arm64_without_provisioned_concurrency():
+    template = synth(environment="dev")
+
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": CONTACT_HANDLER,
+        "Architectures": ["arm64"],
+        "MemorySize": 512,
+        "EphemeralStorage": {"Size": 512},
+        "ReservedConcurrentExecutions": assertions.Match.absent()
+    })
+    template.resource_count_is("AWS::Lambda::Alias", 0)
+    template.resource_count_is("AWS::ApplicationAutoScaling::ScalableTarget", 0)
+
+
+def test_prod_profile_scales_provisioned_concurrency_on_the_alias_api_gateway_calls():
+    template = synth(environment="prod")
+
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": CONTACT_HANDLER,
+        "Architectures": ["arm64"],
+        "MemorySize": 1024,
+        "ReservedConcurrentExecutions": 50
+    })
+    template.has_resource_properties("AWS::Lambda::Alias", {
+        "Name": "live",
+        "ProvisionedConcurrencyConfig": {"ProvisionedConcurrentExecutions": 1}
+    })
+    template.has_resource_properties("AWS::ApplicationAutoScaling::ScalableTarget", {
+        "MinCapacity": 1,
+        "MaxCapacity": 10,
+        "ScalableDimension": "lambda:function:ProvisionedConcurrency",
+        "ScheduledActions": [
+            assertions.Match.object_like({
+                "Schedule": "cron(0 7 ? * MON-FRI *)",
+                "ScalableTargetAction": {"MinCapacity": 2},
+                "Timezone": "Europe/Berlin"
+            }),
+            assertions.Match.object_like({
+                "Schedule": "cron(0 19 ? * MON-FRI *)",
+                "ScalableTargetAction": {"MinCapacity": 1}
+            })
+        ]
+    })
+    template.has_resource_properties("AWS::ApplicationAutoScaling::ScalingPolicy", {
+        "TargetTrackingScalingPolicyConfiguration": assertions.Match.object_like({
+            "TargetValue": 0.7,
+            "PredefinedMetricSpecification": {"PredefinedMetricType": "LambdaProvisionedConcurrencyUtilization"}
+        })
+    })
+
+    # The public POST invokes the alias, not $LATEST
+    (alias_id,) = template.find_resources("AWS::Lambda::Alias")
+    template.has_resource_properties("AWS::ApiGateway::Method", {
+        "HttpMethod": "POST",
+        "ApiKeyRequired": assertions.Match.absent(),
+        "Integration": assertions.Match.object_like({
+            "Uri": assertions.Match.object_like({
+                "Fn::Join": ["", assertions.Match.array_with([{"Ref": alias_id}])]
+            })
+        })
+    })
+
+
+def test_router_profile_has_its_own_overrides():
+    app = core.App()
+    stack = core.Stack(app, "router-profile-stack")
+    router = create_contact_router(stack, environment="prod")
+    create_contact_form_infrastructure(stack, "construction", environment="prod", router=router, http_api=True)
+    template = assertions.Template.from_stack(stack)
+
+    template.resource_count_is("AWS::Lambda::Alias", 1)
+    template.has_resource_properties("AWS::ApplicationAutoScaling::ScalableTarget", {
+        "MinCapacity": 1,
+        "MaxCapacity": 20
+    })
+    (alias_id,) = template.find_resources("AWS::Lambda::Alias")
+    template.has_resource_properties("AWS::ApiGatewayV2::Integration", {
+        "IntegrationUri": {"Ref": alias_id}
+    })
+
+
+def test_compute_profiles_reject_impossible_concurrency(monkeypatch):
+    assert constants.get_compute_profile("PROD", "retail") == constants.LAMBDA_COMPUTE_PROFILES["prod"]
+    assert constants.get_compute_profile("staging", "retail") == constants.LAMBDA_COMPUTE_PROFILES["dev"]
+
+    monkeypatch.setitem(constants.LAMBDA_COMPUTE_OVERRIDES, "retail", {"prod": {"provisioned_max": 80}})
+    with pytest.raises(ValueError):
+        constants.get_compute_profile("prod", "retail")
+
+
+def test_functions_ship_their_handler_and_share_one_code_layer():
+    app = core.App()
+    stack = core.Stack(app, "layer-test-stack")
+    create_contact_form_infrastructure(stack, "construction")
+    create_contact_form_infrastructure(stack, "retail")
+    template = assertions.Template.from_stack(stack)
+
+    template.resource_count_is("AWS::Lambda::LayerVersion", 1)
+    template.has_resource_properties("AWS::Lambda::LayerVersion", {"CompatibleRuntimes": ["python3.12"]})
+    (layer_id,) = template.find_resources("AWS::Lambda::LayerVersion")
+    # contact, bulk ingestion, contacts query, archive consumer - per unit
+    template.resource_properties_count_is("AWS::Lambda::Function", {"Layers": [{"Ref": layer_id}]}, 8)
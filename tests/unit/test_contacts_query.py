@@ -0,0 +1,115 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from shared import clients, contacts_query, handlers_manager, idempotency, rate_limit
+from tests.stand_ins import FakeDynamoDB, FakeSES, install
+
+
+@pytest.fixture
+def table(monkeypatch):
+    dynamodb = FakeDynamoDB()
+    install(dynamodb=dynamodb, ses=FakeSES())
+    monkeypatch.setattr(idempotency, "_recent", idempotency.OrderedDict())
+    monkeypatch.setattr(rate_limit, "_blocked", rate_limit.OrderedDict())
+
+    for i in range(5):
+        submit(i)
+    yield dynamodb
+    clients.reset_clients()
+
+
+def submit(i, shard_count=1):
+    handlers_manager.process_contact_form_submission(
+        event={"body": json.dumps({"contact_person": f"Person {i}", "email": f"p{i}@example.com",
+                                   "phone": "+49 151 1234567", "message": f"Inquiry {i}"})},
+        business_unit="construction", table_name="table", from_email="a@b.c", to_email="d@e.f",
+        shard_count=shard_count
+    )
+
+
+def get(params=None, headers=None, shard_count=1):
+    response = contacts_query.process_contacts_query(
+        {"queryStringParameters": params, "headers": headers or {}}, "construction", "table", shard_count
+    )
+    body = json.loads(response["body"]) if response["body"] else None
+    return response, body
+
+
+def test_pages_through_all_submissions_newest_first(table):
+    seen = []
+    cursor = None
+    while True:
+        _, page = get({"limit": "2", **({"cursor": cursor} if cursor else {})})
+        seen += [item["contact_person"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == [f"Person {i}" for i in reversed(range(5))]
+
+
+@pytest.mark.parametrize("status", ["", "new"])
+def test_sharded_pages_merge_all_shards_in_order(table, status):
+    # 5 unsharded items from before sharding + 12 written over 4 shards
+    for i in range(5, 17):
+        submit(i, shard_count=4)
+    assert len({item["pk"] for item in table.items("table")}) > 2
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": "3", **({"status": status} if status else {}), **({"cursor": cursor} if cursor else {})}
+        _, page = get(params, shard_count=4)
+        seen += [item["contact_person"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == [f"Person {i}" for i in reversed(range(17))]
+
+
+def test_status_filter_uses_gsi_and_projects_requested_fields(table):
+    response, page = get({"status": "new", "fields": "contact_id,email", "order": "asc"})
+
+    assert response["statusCode"] == 200
+    assert page["count"] == 5
+    assert set(page["items"][0]) == {"contact_id", "email"}
+    assert page["items"][0]["email"] == "p0@example.com"
+
+    _, closed = get({"status": "closed"})
+    assert closed["count"] == 0
+
+
+@pytest.mark.parametrize("status", ["", "new"])
+def test_date_only_to_includes_the_whole_day(table, status):
+    today = datetime.now(timezone.utc).date().isoformat()
+
+    _, page = get({"from": today, "to": today, **({"status": status} if status else {})})
+    assert page["count"] == 5
+
+
+def test_etag_and_cache_headers(table):
+    response, _ = get()
+
+    assert response["headers"]["Cache-Control"] == "private, max-age=30"
+    not_modified, body = get(headers={"If-None-Match": response["headers"]["ETag"]})
+    assert not_modified["statusCode"] == 304
+    assert body is None
+
+
+@pytest.mark.parametrize("params", [
+    {"status": "deleted"},
+    {"limit": "1000"},
+    {"fields": "pk"},
+    {"business_unit": "retail"},
+    {"cursor": "not-a-cursor"},
+    # Cursor of another partition
+    {"cursor": contacts_query.encode_cursor({"BU#RETAIL": {"pk": {"S": "BU#RETAIL"}, "sk": {"S": "CONTACT#x"}}})},
+    # Position of another partition under this unit's key
+    {"cursor": contacts_query.encode_cursor({"BU#CONSTRUCTION": {"pk": {"S": "BU#RETAIL"}, "sk": {"S": "CONTACT#x"}}})}
+])
+def test_invalid_parameters_rejected(table, params):
+    response, _ = get(params)
+    assert response["statusCode"] == 400
@@ -0,0 +1,61 @@
+import pytest
+
+from shared import cors
+from shared.utils import create_cors_response
+
+
+@pytest.mark.parametrize("origin", [
+    "https://construction.ranjdar-group.com",
+    "https://bau.ranjdar-group.com",
+    "https://constructii.ranjdar-group.com",
+    "https://BAU.ranjdar-group.com/"
+])
+def test_allowed_origin_gets_its_own_headers(origin):
+    headers = cors.headers_for(origin)
+
+    assert headers["Access-Control-Allow-Origin"] == cors.normalize_origin(origin)
+    assert headers["Vary"] == "Origin"
+    assert int(headers["Access-Control-Max-Age"]) >= 3600
+    assert "Retry-After" in headers["Access-Control-Expose-Headers"]
+
+
+@pytest.mark.parametrize("origin", ["https://bau.example.com", "http://bau.ranjdar-group.com", "", None])
+def test_other_origins_get_no_allow_origin(origin):
+    assert cors.headers_for(origin) == {"Vary": "Origin"}
+    assert not cors.is_allowed(origin)
+
+
+def test_header_sets_are_precomputed_and_read_only():
+    origin = "https://bau.ranjdar-group.com"
+    assert cors.headers_for(origin) is cors.headers_for(origin)
+
+    with pytest.raises(TypeError):
+        cors.headers_for(origin)["Access-Control-Allow-Origin"] = "*"
+
+
+def test_response_copies_the_header_set():
+    origin = "https://bau.ranjdar-group.com"
+    response = create_cors_response(429, {}, {"Retry-After": "60"}, origin)
+
+    assert response["headers"]["Access-Control-Allow-Origin"] == origin
+    assert response["headers"]["Retry-After"] == "60"
+    assert "Retry-After" not in cors.headers_for(origin)
+
+
+def test_extra_origins_come_from_all_prefixed_variables():
+    environ = {
+        "CORS_EXTRA_ORIGINS": "https://d111.cloudfront.net/, ",
+        "CORS_EXTRA_ORIGINS_RETAIL": "https://D222.cloudfront.net",
+        "TABLE_NAME": "https://ignored.example.com"
+    }
+
+    assert sorted(cors.extra_origins(environ)) == ["https://d111.cloudfront.net", "https://d222.cloudfront.net"]
+
+
+def test_preflight_options_share_the_allowlist():
+    options = cors.preflight_options(["GET", "OPTIONS"], origins=["https://d111.cloudfront.net"])
+
+    assert options["allow_origins"] == list(cors.POLICY["allowed_origins"]) + ["https://d111.cloudfront.net"]
+    assert options["allow_methods"] == ["GET", "OPTIONS"]
+    assert options["allow_headers"] == cors.POLICY["allow_headers"]
+    assert options["max_age_seconds"] == cors.POLICY["max_age_seconds"]
@@ -0,0 +1,155 @@
+import json
+
+import pytest
+
+from infrastructure.shared.managers import website_assets
+from infrastructure.tools.deploy_website import STATE_KEY, deploy_website
+from tests.stand_ins import FakeCloudFront, FakeS3
+
+BUCKET = "ranjdargroup-construction-website"
+CONFIG = website_assets.api_config_script("https://api.example.com/", "construction")
+
+PAGE = """<html><head><style>body { color: red; }</style></head>
+<body><h1>Hello</h1><script src="api-config.js"></script></body></html>
+"""
+
+
+def write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+@pytest.fixture
+def site(tmp_path):
+    source = tmp_path / "site"
+    write(source / "index.html", "<html><body>redirect</body></html>")
+    write(source / "en" / "index.html", PAGE)
+    write(source / "en" / "error.html", "<html><body>error</body></html>")
+    return source
+
+
+def deploy(source, build_dir, s3, cloudfront, dry_run=False, config=CONFIG):
+    manifest = website_assets.build_site(str(source), str(build_dir))
+    return deploy_website(s3, cloudfront, BUCKET, "E123", str(build_dir), manifest, config, dry_run=dry_run)
+
+
+def test_first_deploy_uploads_everything_with_metadata(site, tmp_path):
+    s3, cloudfront = FakeS3(), FakeCloudFront()
+    summary = deploy(site, tmp_path / "build", s3, cloudfront)
+
+    assert summary["unchanged"] == 0 and summary["delete"] == []
+    page = s3.objects[(BUCKET, "en/index.html")]
+    assert CONFIG.encode("utf-8") in page["Body"]
+    assert page["CacheControl"] == website_assets.CACHE_POLICIES["html"]
+    css_key = next(key for key in summary["upload"] if key.endswith(".css"))
+    assert s3.objects[(BUCKET, css_key + ".gz")]["ContentEncoding"] == "gzip"
+    # Hashed assets go up before the pages that reference them
+    assert summary["upload"].index(css_key) < summary["upload"].index("en/index.html")
+    assert (BUCKET, STATE_KEY) in s3.objects
+    # Pages may be cached from an earlier BucketDeployment - invalidated; new hashed assets are not
+    assert cloudfront.invalidations[0]["Paths"]["Items"] == [
+        "/", "/en/", "/en/error.html", "/en/index.html", "/index.html"
+    ]
+
+
+def test_only_changed_files_are_uploaded_and_invalidated(site, tmp_path):
+    s3, cloudfront = FakeS3(), FakeCloudFront()
+    deploy(site, tmp_path / "first", s3, cloudfront)
+    uploaded = []
+    original_put = s3.put_object
+    s3.put_object = lambda **kwargs: uploaded.append(kwargs["Key"]) or original_put(**kwargs)
+
+    write(site / "en" / "error.html", "<html><body>new error</body></html>")
+    summary = deploy(site, tmp_path / "second", s3, cloudfront)
+
+    assert summary["changed"] == ["en/error.html"]
+    assert uploaded == ["en/error.html", STATE_KEY]
+    assert cloudfront.invalidations[-1]["Paths"] == {"Quantity": 1, "Items": ["/en/error.html"]}
+
+    # Nothing changed = nothing uploaded but the state, nothing invalidated
+    uploaded.clear()
+    summary = deploy(site, tmp_path / "third", s3, cloudfront)
+    assert summary["upload"] == [] and uploaded == [STATE_KEY]
+    assert len(cloudfront.invalidations) == 2
+
+
+def test_new_api_url_changes_the_pages_that_load_it(site, tmp_path):
+    s3, cloudfront = FakeS3(), FakeCloudFront()
+    deploy(site, tmp_path / "first", s3, cloudfront)
+
+    config = website_assets.api_config_script("https://new.example.com/", "construction")
+    summary = deploy(site, tmp_path / "second", s3, cloudfront, config=config)
+
+    assert summary["changed"] == ["en/index.html"]
+    assert cloudfront.invalidations[-1]["Paths"]["Items"] == ["/en/", "/en/index.html"]
+
+
+def test_removed_files_are_pruned_and_old_assets_kept_one_deploy(site, tmp_path):
+    s3, cloudfront = FakeS3(), FakeCloudFront()
+    first = deploy(site, tmp_path / "first", s3, cloudfront)
+    old_css = next(key for key in first["upload"] if key.endswith(".css"))
+
+    (site / "en" / "error.html").unlink()
+    write(site / "en" / "index.html", PAGE.replace("red", "blue"))
+    second = deploy(site, tmp_path / "second", s3, cloudfront)
+
+    assert second["delete"] == ["en/error.html"]
+    assert (BUCKET, "en/error.html") not in s3.objects
+    # Pages cached before this deploy still load the old stylesheet
+    assert old_css in second["retired"] and (BUCKET, old_css) in s3.objects
+    assert "/en/error.html" in cloudfront.invalidations[-1]["Paths"]["Items"]
+    assert not any(path.startswith("/assets/") for path in cloudfront.invalidations[-1]["Paths"]["Items"])
+
+    third = deploy(site, tmp_path / "third", s3, cloudfront)
+    assert old_css in third["delete"] and (BUCKET, old_css) not in s3.objects
+
+
+def test_dry_run_writes_nothing(site, tmp_path):
+    s3, cloudfront = FakeS3(), FakeCloudFront()
+    summary = deploy(site, tmp_path / "build", s3, cloudfront, dry_run=True)
+
+    assert summary["dry_run"] is True
+    assert "en/index.html" in summary["added"]
+    assert s3.objects == {} and cloudfront.invalidations == []
+
+
+def test_state_records_the_deployed_hashes(site, tmp_path):
+    s3 = FakeS3()
+    deploy(site, tmp_path / "build", s3, FakeCloudFront())
+
+    state = json.loads(s3.objects[(BUCKET, STATE_KEY)]["Body"])
+    assert set(state["files"]) == {key for (_, key) in s3.objects if key != STATE_KEY}
+
+
+def test_rollback_to_an_earlier_state_invalidates_again(site, tmp_path):
+    s3, cloudfront = FakeS3(), FakeCloudFront()
+    deploy(site, tmp_path / "first", s3, cloudfront)
+    write(site / "en" / "error.html", "<html><body>new error</body></html>")
+    deploy(site, tmp_path / "second", s3, cloudfront)
+    write(site / "en" / "error.html", "<html><body>error</body></html>")
+    deploy(site, tmp_path / "third", s3, cloudfront)
+
+    # Third state = first state, but a reused reference would hand back the old batch
+    references = [invalidation["CallerReference"] for invalidation in cloudfront.invalidations]
+    assert len(references) == 3 and len(set(references)) == 3
+
+
+def test_failed_invalidation_leaves_the_state_for_the_rerun(site, tmp_path):
+    s3, cloudfront = FakeS3(), FakeCloudFront()
+    deploy(site, tmp_path / "first", s3, cloudfront)
+    first_state = s3.objects[(BUCKET, STATE_KEY)]["Body"]
+    write(site / "en" / "error.html", "<html><body>new error</body></html>")
+
+    def throttled(**kwargs):
+        raise RuntimeError("Throttling")
+
+    original_invalidation = cloudfront.create_invalidation
+    cloudfront.create_invalidation = throttled
+    with pytest.raises(RuntimeError):
+        deploy(site, tmp_path / "second", s3, cloudfront)
+    assert s3.objects[(BUCKET, STATE_KEY)]["Body"] == first_state
+
+    cloudfront.create_invalidation = original_invalidation
+    summary = deploy(site, tmp_path / "third", s3, cloudfront)
+    assert summary["changed"] == ["en/error.html"]
+    assert cloudfront.invalidations[-1]["Paths"]["Items"] == ["/en/error.html"]
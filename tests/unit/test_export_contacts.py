@@ -0,0 +1,83 @@
+import csv
+import gzip
+import json
+
+import pytest
+
+from infrastructure.tools.export_contacts import export_contacts
+from shared import codec
+from shared.dynamo import serialize_item
+from tests.stand_ins import FakeDynamoDB, client_error
+
+TABLE = "RanjdarGroup-ConstructionContactForm"
+
+
+@pytest.fixture
+def dynamodb():
+    fake = FakeDynamoDB()
+    table = fake.tables.setdefault(TABLE, {})
+    for i in range(40):
+        timestamp = f"2025-06-{1 + i % 20:02d}T10:00:{i:02d}+00:00"
+        plain = {
+            "pk": "BU#CONSTRUCTION", "sk": f"CONTACT#{timestamp}#{i}", "contact_id": str(i),
+            "timestamp": timestamp, "email": f"p{i}@example.com", "message": "Hi, \"quoted\"\nsecond line",
+            "expires_at": 1
+        }
+        # Half of the items in the compact codec format, half as written before it
+        item = serialize_item(codec.encode_item(plain) if i % 2 else plain)
+        table[fake._key(item)] = item
+    # Not a submission - must never end up in an export
+    rate = serialize_item({"pk": "RATE#ip#abc", "sk": "WINDOW#0", "hits": 3})
+    table[fake._key(rate)] = rate
+    return fake
+
+
+def read_parts(prefix, fmt, parts):
+    rows = []
+    for index in range(parts):
+        with gzip.open(f"{prefix}-{index:05d}.{fmt}.gz", "rt", encoding="utf-8", newline="") as file:
+            rows += list(csv.DictReader(file)) if fmt == "csv" else [json.loads(line) for line in file]
+    return rows
+
+
+def test_parallel_scan_exports_only_submissions(dynamodb, tmp_path):
+    prefix = str(tmp_path / "export")
+    summary = export_contacts(dynamodb, "construction", prefix, fmt="csv", segments=4, page_size=3, part_rows=15)
+
+    rows = read_parts(prefix, "csv", summary["parts"])
+    assert summary["rows"] == 40
+    assert sorted(int(row["contact_id"]) for row in rows) == list(range(40))
+    assert rows[0]["message"] == "Hi, \"quoted\"\nsecond line"
+    assert "expires_at" not in rows[0]
+    assert {op for op in dynamodb.calls} == {"Scan"}
+
+
+def test_time_window_uses_query(dynamodb, tmp_path):
+    prefix = str(tmp_path / "window")
+    summary = export_contacts(dynamodb, "construction", prefix, time_from="2025-06-05", time_to="2025-06-06")
+
+    rows = read_parts(prefix, "ndjson", summary["parts"])
+    assert summary["mode"] == "query"
+    assert sorted(row["timestamp"][:10] for row in rows) == ["2025-06-05"] * 2 + ["2025-06-06"] * 2
+    assert set(dynamodb.calls) == {"Query"}
+
+
+def test_crashed_export_resumes_from_checkpoint(dynamodb, tmp_path):
+    prefix = str(tmp_path / "resume")
+
+    # Fail the 6th page request - after the first part (5 rows) is closed and checkpointed
+    dynamodb.errors = [None] * 5 + [client_error("ProvisionedThroughputExceededException", "Scan")]
+    with pytest.raises(Exception):
+        export_contacts(dynamodb, "construction", prefix, segments=1, page_size=1, part_rows=5)
+
+    checkpoint = json.loads(open(f"{prefix}.checkpoint.json").read())
+    assert checkpoint["parts"] == 1 and checkpoint["rows"] == 5
+
+    summary = export_contacts(dynamodb, "construction", prefix, segments=1, page_size=1, part_rows=5)
+    rows = read_parts(prefix, "ndjson", summary["parts"])
+    assert sorted(int(row["contact_id"]) for row in rows) == list(range(40))
+
+    # Completed exports aren't repeated
+    calls = len(dynamodb.calls)
+    export_contacts(dynamodb, "construction", prefix, segments=1, page_size=1, part_rows=5)
+    assert len(dynamodb.calls) == calls
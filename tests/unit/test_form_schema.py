@@ -0,0 +1,142 @@
+import base64
+import json
+
+import pytest
+
+from shared import clients, form_schema, handlers_manager, idempotency, rate_limit
+from tests.stand_ins import FakeDynamoDB, FakeSES, install
+
+FORM = {
+    "contact_person": "  Max\u0000  Mustermann ",
+    "email": " Max@Example.COM ",
+    "phone": "0151 / 123-4567",
+    "message": "Hallo,\r\n\r\n\r\n\r\nwir brauchen\t2 Stationen.\u0007  ",
+    "project_type": "transformer_station",
+    "units_needed": "2"
+}
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    dynamodb = FakeDynamoDB()
+    install(dynamodb=dynamodb, ses=FakeSES())
+    monkeypatch.setattr(idempotency, "_recent", idempotency.OrderedDict())
+    monkeypatch.setattr(rate_limit, "_blocked", rate_limit.OrderedDict())
+    yield dynamodb
+    clients.reset_clients()
+
+
+def submit(event):
+    return handlers_manager.process_contact_form_submission(
+        {"headers": {"origin": "https://bau.ranjdar-group.com"}, **event},
+        "construction", "table", "system@ranjdar-group.com", "owner@example.com"
+    )
+
+
+def test_normalizes_in_one_pass():
+    fields, errors = form_schema.validate("construction", FORM, "DE")
+
+    assert errors == {}
+    assert fields == {
+        "contact_person": "Max Mustermann",
+        "email": "max@example.com",
+        "phone": "+491511234567",
+        "message": "Hallo,\n\nwir brauchen 2 Stationen.",
+        "project_type": "transformer_station",
+        "units_needed": 2
+    }
+
+
+@pytest.mark.parametrize("field, value", [
+    ("email", "max@example"),
+    ("phone", "+49 12"),
+    ("phone", "0151 12"),
+    ("project_type", "garage"),
+    ("units_needed", "0"),
+    ("units_needed", True),
+    ("units_needed", "2.5"),
+    ("contact_person", "x" * 121),
+    ("company", ["ACME"])
+])
+def test_rejects_invalid_values(field, value):
+    assert form_schema.validate("construction", {**FORM, field: value})[1] == {field: "invalid"}
+
+
+def test_national_numbers_get_the_country_of_the_site_language():
+    assert form_schema.validate("construction", {**FORM, "phone": "0721 123 456"}, "RO")[0]["phone"] == "+40721123456"
+    assert form_schema.validate("construction", FORM, "DE")[0]["phone"] == "+491511234567"
+
+    # EN site, bulk imports: no country to assume - kept as entered, not turned into +49
+    for language in ("EN", ""):
+        fields, errors = form_schema.validate("construction", {**FORM, "phone": " 0721  123 456"}, language)
+        assert errors == {} and fields["phone"] == "0721 123 456"
+
+    # Without any prefix (accepted before the schemas) - kept as entered too
+    assert form_schema.validate("construction", {**FORM, "phone": "151 1234567"}, "DE")[0]["phone"] == "151 1234567"
+
+
+def test_missing_and_blank_required_fields():
+    _, errors = form_schema.validate("construction", {**FORM, "email": None, "contact_person": " \u0000 "})
+    assert errors == {"email": "missing", "contact_person": "missing"}
+    assert form_schema.error_message_key({"email": "missing", "phone": "invalid"}) == "missing_fields"
+
+
+def test_long_messages_are_truncated_not_rejected():
+    fields, errors = form_schema.validate("construction", {**FORM, "message": "a" * 2500})
+    assert errors == {}
+    assert fields["message"] == "a" * 2000 + "..."
+
+
+def test_units_have_their_own_fields_and_country_codes():
+    body = {**FORM, "treatment": "facial"}
+
+    cosmetics, errors = form_schema.validate("cosmetics", body, "RO")
+    assert errors == {}
+    assert cosmetics["phone"] == "+401511234567"
+    assert "project_type" not in cosmetics and cosmetics["treatment"] == "facial"
+
+    # Units without a schema entry get the common fields only
+    assert form_schema.field_names("unknown") == ("contact_person", "email", "phone", "message", "company")
+
+
+def test_decode_body_checks_size_before_parsing():
+    limit = 100
+    with pytest.raises(form_schema.FormError) as error:
+        form_schema.decode_body({"body": "{" * (limit + 1)}, limit)
+    assert error.value.reason == "too_large"
+
+    # Multi-byte characters: short in characters, too large in bytes
+    with pytest.raises(form_schema.FormError) as error:
+        form_schema.decode_body({"body": json.dumps({"m": "ü" * 60}, ensure_ascii=False)}, limit)
+    assert error.value.reason == "too_large"
+
+    encoded = base64.b64encode(json.dumps({"email": "a@b.de"}).encode()).decode()
+    assert form_schema.decode_body({"body": encoded, "isBase64Encoded": True}, limit) == {"email": "a@b.de"}
+
+    for event in ({"body": "not json"}, {"body": "[1, 2]"}, {"body": "%%%", "isBase64Encoded": True}):
+        with pytest.raises(form_schema.FormError) as error:
+            form_schema.decode_body(event, limit)
+        assert error.value.reason == "malformed"
+
+
+def test_handler_rejects_early_without_aws_calls(aws):
+    too_large = submit({"body": json.dumps({**FORM, "message": "x" * form_schema.MAX_BODY_BYTES})})
+    malformed = submit({"body": "{\"email\": "})
+    invalid = submit({"body": json.dumps({**FORM, "phone": "call me"})})
+
+    assert too_large["statusCode"] == 413
+    assert json.loads(too_large["body"])["error"] == "Anfrage zu groß"
+    assert malformed["statusCode"] == 400
+    assert json.loads(invalid["body"]) == {"error": "Einige Felder sind ungültig", "fields": ["phone"]}
+    assert aws.calls == []
+
+
+def test_handler_stores_normalized_fields_from_base64_bodies(aws):
+    body = base64.b64encode(json.dumps(FORM).encode()).decode()
+
+    response = submit({"body": body, "isBase64Encoded": True})
+
+    assert response["statusCode"] == 200
+    item, = aws.items("table")
+    assert item["email"] == "max@example.com" and item["phone"] == "+491511234567"
+    assert item["units_needed"] == 2
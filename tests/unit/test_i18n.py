@@ -0,0 +1,49 @@
+import pytest
+
+from shared import i18n
+from shared.utils import determine_language_from_domain, get_header
+
+
+@pytest.mark.parametrize("origin, language", [
+    ("https://construction.ranjdar-group.com", "EN"),
+    ("https://BAU.ranjdar-group.com", "DE"),
+    ("https://constructii.ranjdar-group.com:443", "RO"),
+    ("bau.ranjdar-group.com", "DE"),
+    # Substring matches used to pick DE/RO for unrelated hosts
+    ("https://bau.example.com", "EN"),
+    ("https://construction.evil.com", "EN"),
+    ("", "EN")
+])
+def test_language_from_origin_hostname(origin, language):
+    assert determine_language_from_domain(origin) == language
+
+
+def test_accept_language_fallback_uses_q_values():
+    assert i18n.resolve_language("", "en;q=0.5, ro-RO;q=0.9, de;q=0.7") == "RO"
+    assert i18n.resolve_language("", "fr-FR, de;q=0.1") == "DE"
+    assert i18n.resolve_language("", "fr-FR, de;q=0") == "EN"
+
+
+def test_known_origin_beats_accept_language():
+    assert i18n.resolve_language("https://bau.ranjdar-group.com", "ro") == "DE"
+
+
+def test_catalog_is_frozen():
+    with pytest.raises(TypeError):
+        i18n.get_messages("DE")["success"] = "changed"
+
+
+def test_catalog_loads_new_languages_from_file(tmp_path):
+    path = tmp_path / "locales.json"
+    path.write_text('{"default_language": "EN", "hosts": {"Retail.Ranjdar-Group.com": "it"}, "languages": '
+                    '{"IT": {"responses": {"success": "Grazie"}, "email": {}}, "EN": {}}}', encoding="utf-8")
+
+    catalog = i18n.load_catalog(str(path))
+
+    assert catalog["hosts"]["retail.ranjdar-group.com"] == "IT"
+    assert catalog["languages"]["IT"]["responses"]["success"] == "Grazie"
+
+
+def test_get_header_ignores_case_and_null_headers():
+    assert get_header({"headers": {"Origin": "https://bau.ranjdar-group.com"}}, "origin") == "https://bau.ranjdar-group.com"
+    assert get_header({"headers": None}, "origin") == ""
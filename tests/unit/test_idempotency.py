@@ -0,0 +1,121 @@
+import json
+
+import pytest
+
+from shared import clients, handlers_manager, idempotency
+from tests.stand_ins import FakeDynamoDB, FakeSES, client_error, install
+
+FORM = {
+    "contact_person": "Max Mustermann",
+    "email": "Max@Example.com",
+    "phone": "+49 151 1234567",
+    "message": "Need 4 housings"
+}
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    dynamodb, ses = FakeDynamoDB(), FakeSES()
+    install(dynamodb=dynamodb, ses=ses)
+    monkeypatch.setattr(idempotency, "_recent", idempotency.OrderedDict())
+    yield dynamodb, ses
+    clients.reset_clients()
+
+
+def submit(form=None, headers=None):
+    response = handlers_manager.process_contact_form_submission(
+        event={"headers": headers or {}, "body": json.dumps(form or FORM)},
+        business_unit="construction",
+        table_name="table",
+        from_email="system@ranjdar-group.com",
+        to_email="owner@example.com"
+    )
+    return response["statusCode"], json.loads(response["body"]).get("contact_id")
+
+
+def test_double_click_returns_original_contact_without_new_write_or_email(aws):
+    dynamodb, ses = aws
+
+    first = submit(headers={"Idempotency-Key": "form-1"})
+    second = submit(headers={"Idempotency-Key": "form-1"})
+
+    assert first == second
+    assert len(dynamodb.items("table")) == 1
+    assert len(ses.sent) == 1
+    # Second request answered from the LRU - no further DynamoDB write (only the rate-limit counter)
+    assert dynamodb.calls.count("PutItem") == 2
+
+
+def test_replay_from_other_container_uses_dynamodb_record(aws):
+    dynamodb, ses = aws
+
+    _, contact_id = submit(headers={"Idempotency-Key": "form-1"})
+    idempotency._recent.clear()  # new container
+
+    assert submit(headers={"Idempotency-Key": "form-1"}) == (200, contact_id)
+    assert len(dynamodb.items("table")) == 1
+    assert len(ses.sent) == 1
+
+
+def test_content_hash_used_without_header(aws):
+    dynamodb, _ = aws
+
+    _, contact_id = submit()
+    assert submit(dict(FORM, email="max@example.com")) == (200, contact_id)
+    assert submit(dict(FORM, message="Another inquiry"))[1] != contact_id
+    assert len(dynamodb.items("table")) == 2
+
+
+def test_content_hash_window():
+    key = idempotency.build_idempotency_key("", "a@b.c", "1", "hi", now=0)
+
+    assert idempotency.build_idempotency_key("", "A@B.C ", "1", "hi", now=599) == key
+    assert idempotency.build_idempotency_key("", "a@b.c", "1", "hi", now=600) != key
+
+
+def test_failed_write_releases_key(aws):
+    dynamodb, _ = aws
+
+    dynamodb.fail_puts("BU#", client_error("InternalServerError", "PutItem"))
+    assert submit(headers={"Idempotency-Key": "form-1"})[0] == 500
+
+    assert submit(headers={"Idempotency-Key": "form-1"})[0] == 200
+    assert len(dynamodb.items("table")) == 1
+
+
+def test_vanished_record_is_claimed_again_before_writing(aws, monkeypatch):
+    dynamodb, _ = aws
+    claim = idempotency.claim
+    calls = []
+
+    def vanished_once(*args, **kwargs):
+        calls.append(args)
+        return "" if len(calls) == 1 else claim(*args, **kwargs)
+
+    monkeypatch.setattr(idempotency, "claim", vanished_once)
+    assert submit(headers={"Idempotency-Key": "form-1"})[0] == 200
+    assert len(calls) == 2
+    assert len(dynamodb.items("table")) == 1
+    assert len(dynamodb.items("table", prefix=idempotency.RECORD_PREFIX)) == 1
+
+
+def test_unclaimable_key_writes_nothing_and_releases_nothing(aws, monkeypatch):
+    dynamodb, _ = aws
+    released = []
+    monkeypatch.setattr(idempotency, "claim", lambda *args, **kwargs: "")
+    monkeypatch.setattr(idempotency, "release", lambda *args: released.append(args))
+
+    assert submit(headers={"Idempotency-Key": "form-1"})[0] == 500
+    assert dynamodb.items("table") == []
+    assert released == []
+
+
+def test_lru_is_bounded(monkeypatch):
+    monkeypatch.setattr(idempotency, "_recent", idempotency.OrderedDict())
+    monkeypatch.setattr(idempotency, "LRU_SIZE", 2)
+
+    for i in range(3):
+        idempotency.remember(f"k{i}", f"c{i}", now=0)
+
+    assert idempotency.lookup_recent("k0", now=1) is None
+    assert idempotency.lookup_recent("k2", now=1) == "c2"
@@ -0,0 +1,85 @@
+"""
+Cold-start import budget for the Lambda handler modules.
+
+Imports each handler in a fresh interpreter (like a new Lambda container) with -X importtime,
+prints the slowest imports and fails when the total goes over the budget.
+For reference: importing boto3 alone takes ~250 ms, which is what this budget keeps out of init.
+Override the budget with HANDLER_IMPORT_BUDGET_MS (ex. on slow CI machines).
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from tests.conftest import LAMBDAS_DIR
+
+IMPORT_BUDGET_MS = float(os.environ.get("HANDLER_IMPORT_BUDGET_MS", "100"))
+
+# Best of N fresh interpreters, a short pause between them - filters out noise from other processes
+# (ex. the jsii node process of the CDK tests that ran just before)
+RUNS = 5
+PAUSE_SECONDS = 0.5
+
+# Modules that must not be loaded at init - they belong to the first AWS call, not the cold start
+HEAVY_MODULES = ("boto3", "botocore")
+
+HANDLER_MODULES = [
+    "construction.contact_handler_construction",
+    "construction.notification_handler_construction"
+]
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+print(f"elapsed_ms={{elapsed:.3f}}")
+print("heavy=" + ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def import_report(module: str) -> tuple:
+    """
+    Imports a module in a fresh interpreter.
+
+    Returns:
+        (elapsed ms, heavy modules loaded, -X importtime lines sorted by cumulative time)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=LAMBDAS_DIR, capture_output=True, text=True, check=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    )
+
+    values = dict(line.split("=", 1) for line in result.stdout.splitlines() if "=" in line)
+
+    # "import time: self [us] | cumulative | imported package"
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings.append((int(cumulative), name.rstrip()))
+    timings.sort(reverse=True)
+
+    heavy = [m for m in values.get("heavy", "").split(",") if m]
+    return float(values["elapsed_ms"]), heavy, timings
+
+
+@pytest.mark.parametrize("module", HANDLER_MODULES)
+def test_handler_cold_import_within_budget(module):
+    reports = []
+    for _ in range(RUNS):
+        reports.append(import_report(module))
+        time.sleep(PAUSE_SECONDS)
+    elapsed_ms, heavy, timings = min(reports)
+
+    print(f"\n{module}: {elapsed_ms:.1f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+    for cumulative, name in timings[:10]:
+        print(f"  {cumulative / 1000:8.2f} ms {name}")
+
+    assert not heavy, f"{module} imports {heavy} at init - create AWS clients through shared.clients"
+    assert elapsed_ms <= IMPORT_BUDGET_MS, f"{module} cold import took {elapsed_ms:.1f} ms"
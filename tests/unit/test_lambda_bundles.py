@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+
+from infrastructure.shared.managers import lambda_bundles
+from tests.conftest import LAMBDAS_DIR
+
+# Imports the handler and reports whether shared.utils came with its bundled .pyc
+PROBE = """
+import os
+import construction.contact_handler_construction
+import shared.utils
+print(os.path.exists(shared.utils.__cached__))
+"""
+
+
+def files_under(root):
+    return sorted(
+        os.path.relpath(os.path.join(folder, name), root).replace(os.sep, "/")
+        for folder, _, names in os.walk(root) for name in names
+    )
+
+
+def test_closure_follows_shared_imports_and_leaves_container_code_out():
+    modules = lambda_bundles.shared_closure(["construction.contact_handler_construction"], LAMBDAS_DIR)
+
+    # Direct, transitive (handlers_manager -> utils -> cors) and package imports (from shared import tracing)
+    assert {"shared", "shared.handlers_manager", "shared.utils", "shared.cors", "shared.tracing"} <= set(modules)
+    assert "shared.asgi" not in modules
+    assert "shared.batch_ingest" not in modules
+
+
+def test_function_artifact_holds_only_its_handler(tmp_path):
+    lambda_bundles.build_function(
+        "construction.contact_handler_construction", str(tmp_path), LAMBDAS_DIR, compile_bytecode=False
+    )
+
+    assert files_under(tmp_path) == ["construction/__init__.py", "construction/contact_handler_construction.py"]
+
+
+def test_bundle_imports_from_its_precompiled_files(tmp_path):
+    function_dir = lambda_bundles.build_function(
+        "construction.contact_handler_construction", str(tmp_path / "function"), LAMBDAS_DIR
+    )
+    layer_dir = lambda_bundles.build_shared_layer(str(tmp_path / "layer"), lambdas_dir=LAMBDAS_DIR)
+
+    layer_files = files_under(os.path.join(layer_dir, "python"))
+    assert "shared/data/locales.json" in layer_files
+    assert "shared/asgi.py" not in layer_files
+    assert any(name.startswith("shared/__pycache__/handlers_manager.") for name in layer_files)
+
+    # Like Lambda: the function folder and the layer's python/ on sys.path, nothing written
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=str(tmp_path), capture_output=True, text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join([function_dir, os.path.join(layer_dir, "python")]),
+             "PYTHONDONTWRITEBYTECODE": "1"}
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "True"
+
+
+def test_xray_layer_is_installed_for_the_architecture_once(tmp_path, monkeypatch):
+    requirements = tmp_path / "requirements-xray.txt"
+    requirements.write_text("aws-xray-sdk==2.14.0\n")
+    commands = []
+
+    def fake_pip(command, check):
+        commands.append(command)
+        os.makedirs(command[command.index("--target") + 1])
+
+    monkeypatch.setattr(lambda_bundles.subprocess, "run", fake_pip)
+    output_dir = str(tmp_path / "xray-arm64")
+
+    lambda_bundles.build_xray_layer(output_dir, "arm64", str(requirements))
+    lambda_bundles.build_xray_layer(output_dir, "arm64", str(requirements))
+
+    # Second build: same requirements, same architecture - no pip run
+    assert len(commands) == 1
+    assert commands[0][commands[0].index("--platform") + 1] == "manylinux2014_aarch64"
+    assert commands[0][commands[0].index("--python-version") + 1] == "3.12"
+    assert os.path.isdir(os.path.join(output_dir, "python"))
+
+    requirements.write_text("aws-xray-sdk==2.15.0\n")
+    lambda_bundles.build_xray_layer(output_dir, "arm64", str(requirements))
+    assert len(commands) == 2
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from shared import clients, handlers_manager, idempotency, metrics, rate_limit
+from tests.stand_ins import FakeDynamoDB, FakeSES, client_error, install
+
+FORM = {"contact_person": "Max", "email": "max@example.com", "phone": "+49 151 1234567", "message": "Hallo"}
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    install(dynamodb=FakeDynamoDB(), ses=FakeSES(errors=[client_error("MessageRejected", "SendEmail")]))
+    monkeypatch.setattr(idempotency, "_recent", idempotency.OrderedDict())
+    monkeypatch.setattr(rate_limit, "_blocked", rate_limit.OrderedDict())
+    monkeypatch.setattr(metrics, "_cold_start", True)
+    memory = metrics.MemorySink()
+    metrics.set_sink(memory)
+    yield memory
+    metrics.reset_sink()
+    clients.reset_clients()
+
+
+def submit(mode="inline", **form):
+    return handlers_manager.process_contact_form_submission(
+        event={"headers": {"origin": "https://bau.ranjdar-group.com"}, "body": json.dumps({**FORM, **form})},
+        business_unit="construction",
+        table_name="table",
+        from_email="system@ranjdar-group.com",
+        to_email="owner@example.com",
+        notification_mode=mode
+    )
+
+
+def test_one_emf_document_per_invocation_with_phase_timings(sink):
+    submit(message="first")  # the fake SES rejects this email
+    submit("concurrent", message="second")
+
+    first, second = sink.documents
+    definition, = first["_aws"]["CloudWatchMetrics"]
+    assert definition["Namespace"] == metrics.NAMESPACE
+    assert definition["Dimensions"] == [list(dimensions) for dimensions in metrics.DIMENSION_SETS]
+    assert {metric["Name"] for metric in definition["Metrics"]} == {
+        "parse_ms", "rate_limit_ms", "idempotency_ms", "write_ms", "email_ms", "email_failures", "total_ms"
+    }
+
+    assert (first["BusinessUnit"], first["Language"], first["Outcome"]) == ("construction", "DE", "success")
+    assert (first["Start"], second["Start"]) == ("cold", "warm")
+    assert (first["email_failures"], second["email_failures"]) == (1, 0)
+    # Concurrent mode: the email ran on a worker thread and still counts for this invocation
+    assert second["email_ms"] >= 0 and second["total_ms"] >= second["write_ms"]
+
+
+def test_rejections_are_recorded_with_their_outcome(sink):
+    submit(email="not-an-address")
+    handlers_manager.process_contact_form_submission({"body": "{"}, "construction", "table", "a@b.de", "c@d.de")
+
+    assert [document["Outcome"] for document in sink.documents] == ["invalid", "malformed"]
+    assert "write_ms" not in sink.documents[0] and "idempotency_ms" not in sink.documents[0]
+
+
+def test_sampling_keeps_failures_and_the_flag_disables_everything(sink, monkeypatch):
+    monkeypatch.setattr(metrics, "SAMPLE_RATE", 0.0)
+    submit()
+    submit(phone="nope")
+    assert [document["Outcome"] for document in sink.documents] == ["invalid"]
+    assert sink.documents[0]["SampleRate"] == 0.0
+
+    monkeypatch.setattr(metrics, "ENABLED", False)
+    submit(phone="nope")
+    assert len(sink.documents) == 1
+
+
+def test_helpers_are_no_ops_outside_instrumented_functions():
+    with metrics.phase("write"):
+        metrics.set_outcome("success")
+        metrics.count("email_failures")
+    assert metrics.current() is None
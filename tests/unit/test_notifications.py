@@ -0,0 +1,139 @@
+import json
+
+import pytest
+
+from shared import clients, handlers_manager, idempotency, notifications
+from tests.stand_ins import FakeDynamoDB, FakeSES, FakeSQS, client_error, install
+
+QUEUE_URL = "https://sqs.eu-central-1.amazonaws.com/123/notifications"
+DLQ_URL = "https://sqs.eu-central-1.amazonaws.com/123/notifications-dlq"
+
+FORM = {
+    "contact_person": "Max Mustermann",
+    "email": "max@example.com",
+    "phone": "+491511234567",
+    "message": "Need 4 housings",
+    "project_type": "transformer_station"
+}
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    dynamodb, ses, sqs = FakeDynamoDB(), FakeSES(), FakeSQS()
+    install(dynamodb=dynamodb, ses=ses, sqs=sqs)
+    monkeypatch.setattr(idempotency, "_recent", idempotency.OrderedDict())
+    monkeypatch.setattr(notifications, "_send_rate", None)
+    monkeypatch.setattr(notifications, "BASE_BACKOFF_SECONDS", 0.0)
+    yield dynamodb, ses, sqs
+    clients.reset_clients()
+
+
+def submit(mode, **form):
+    return handlers_manager.process_contact_form_submission(
+        event={"headers": {"origin": "https://bau.ranjdar-group.com"}, "body": json.dumps(dict(FORM, **form))},
+        business_unit="construction",
+        table_name="table",
+        from_email="system@ranjdar-group.com",
+        to_email="owner@example.com",
+        notification_mode=mode,
+        notification_queue_url=QUEUE_URL
+    )
+
+
+def sqs_event(*bodies):
+    return {"Records": [{"messageId": f"m{i}", "body": body} for i, body in enumerate(bodies)]}
+
+
+def test_queue_mode_enqueues_job_instead_of_sending(aws):
+    dynamodb, ses, sqs = aws
+
+    response = submit("queue")
+
+    assert response["statusCode"] == 200
+    assert len(dynamodb.items("table")) == 1
+    assert ses.sent == []
+
+    job = json.loads(sqs.messages[QUEUE_URL][0]["Body"])
+    assert job["contact_id"] == json.loads(response["body"])["contact_id"]
+    assert job["language"] == "DE"
+    assert job["fields"] == FORM
+
+
+def test_queue_mode_falls_back_to_inline_when_queue_fails(aws):
+    _, ses, sqs = aws
+    sqs.fail = True
+
+    assert submit("queue")["statusCode"] == 200
+    assert len(ses.sent) == 1
+
+
+def test_consumer_sends_queued_job(aws):
+    _, ses, sqs = aws
+    submit("queue")
+
+    result = notifications.process_notification_batch(
+        sqs_event(sqs.messages[QUEUE_URL][0]["Body"]), "from@example.com", "to@example.com"
+    )
+
+    assert result == {"batchItemFailures": []}
+    assert ses.sent[0]["Message"]["Subject"]["Data"] == "Neue Anfrage: construction"
+
+
+def test_consumer_retries_throttling(aws):
+    _, ses, sqs = aws
+    ses.errors = [client_error("Throttling", "SendEmail")] * 2
+    submit("queue")
+
+    result = notifications.process_notification_batch(
+        sqs_event(sqs.messages[QUEUE_URL][0]["Body"]), "from@example.com", "to@example.com"
+    )
+
+    assert result == {"batchItemFailures": []}
+    assert len(ses.sent) == 1
+
+
+def test_consumer_reports_partial_failures_and_moves_poison_to_dlq(aws):
+    _, ses, sqs = aws
+    submit("queue")
+    good = sqs.messages[QUEUE_URL][0]["Body"]
+    ses.errors = [client_error("ServiceUnavailable", "SendEmail")] * notifications.MAX_SEND_ATTEMPTS
+
+    result = notifications.process_notification_batch(
+        sqs_event(good, "not json", good), "from@example.com", "to@example.com", dead_letter_queue_url=DLQ_URL
+    )
+
+    # m0 ran out of retries, m1 is poison (moved, not retried), m2 went through
+    assert result == {"batchItemFailures": [{"itemIdentifier": "m0"}]}
+    assert sqs.messages[DLQ_URL][0]["Body"] == "not json"
+    assert len(ses.sent) == 1
+
+
+def test_consumer_paces_under_send_quota(aws):
+    _, ses, _ = aws
+    ses.max_send_rate = 2.0
+
+    assert notifications.get_max_send_rate() == 2.0
+
+
+def test_concurrent_mode_writes_and_sends(aws):
+    dynamodb, ses, _ = aws
+
+    response = submit("concurrent")
+
+    assert response["statusCode"] == 200
+    assert len(dynamodb.items("table")) == 1
+    assert len(ses.sent) == 1
+
+
+def test_concurrent_mode_success_depends_only_on_write(aws, capsys):
+    dynamodb, ses, _ = aws
+
+    ses.errors = [client_error("MessageRejected", "SendEmail")]
+    response = submit("concurrent")
+    contact_id = json.loads(response["body"])["contact_id"]
+    assert response["statusCode"] == 200
+    assert f"Email failed for {contact_id}" in capsys.readouterr().out
+
+    dynamodb.fail_puts("BU#", client_error("ProvisionedThroughputExceededException", "PutItem"))
+    assert submit("concurrent", message="Second inquiry")["statusCode"] == 500
+    assert "DynamoDB write failed" in capsys.readouterr().out
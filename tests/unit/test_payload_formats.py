@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from shared import clients, handlers_manager, idempotency, rate_limit
+from shared.utils import create_cors_response, get_header, get_payload_version, get_source_ip
+from tests.stand_ins import FakeDynamoDB, FakeSES, install
+
+FORM = {"contact_person": "Max", "email": "max@example.com", "phone": "+49 151 1234567", "message": "Hallo"}
+ORIGIN = "https://bau.ranjdar-group.com"
+
+REST_EVENT = {
+    "resource": "/api/v1/contact",
+    "httpMethod": "POST",
+    "headers": {"Origin": ORIGIN, "Content-Type": "text/plain;charset=UTF-8"},
+    "requestContext": {"requestId": "rest-1", "identity": {"sourceIp": "203.0.113.7"}},
+    "body": json.dumps(FORM),
+    "isBase64Encoded": False
+}
+
+HTTP_API_EVENT = {
+    "version": "2.0",
+    "routeKey": "POST /api/v1/contact",
+    "rawPath": "/api/v1/contact",
+    "headers": {"origin": ORIGIN, "content-type": "text/plain;charset=UTF-8"},
+    "stageVariables": {"business_unit": "construction"},
+    "requestContext": {
+        "requestId": "http-1",
+        "http": {"method": "POST", "path": "/api/v1/contact", "sourceIp": "198.51.100.9"}
+    },
+    "body": json.dumps(FORM),
+    "isBase64Encoded": False
+}
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    dynamodb = FakeDynamoDB()
+    install(dynamodb=dynamodb, ses=FakeSES())
+    monkeypatch.setattr(idempotency, "_recent", idempotency.OrderedDict())
+    monkeypatch.setattr(rate_limit, "_blocked", rate_limit.OrderedDict())
+    yield dynamodb
+    clients.reset_clients()
+
+
+def submit(event):
+    return handlers_manager.process_contact_form_submission(
+        event, "construction", "table", "system@ranjdar-group.com", "owner@example.com"
+    )
+
+
+@pytest.mark.parametrize("event, version, source_ip", [
+    (REST_EVENT, "1.0", "203.0.113.7"),
+    (HTTP_API_EVENT, "2.0", "198.51.100.9")
+])
+def test_event_fields_are_read_from_both_formats(event, version, source_ip):
+    assert get_payload_version(event) == version
+    assert get_header(event, "origin") == ORIGIN
+    assert get_source_ip(event) == source_ip
+
+
+def test_v2_responses_leave_cors_headers_to_the_http_api():
+    response = create_cors_response(429, {"error": "slow down"}, {"Retry-After": "30"}, ORIGIN, "2.0")
+
+    assert response == {
+        "statusCode": 429,
+        "headers": {"Content-Type": "application/json", "Retry-After": "30"},
+        "body": json.dumps({"error": "slow down"}),
+        "isBase64Encoded": False
+    }
+    assert create_cors_response(200, {}, origin=ORIGIN)["headers"]["Access-Control-Allow-Origin"] == ORIGIN
+
+
+def test_rest_submission_gets_v1_response(aws):
+    response = submit(REST_EVENT)
+
+    assert response["statusCode"] == 200
+    assert response["headers"]["Access-Control-Allow-Origin"] == ORIGIN
+    assert "isBase64Encoded" not in response
+
+
+def test_http_api_submission_is_stored_and_gets_v2_response(aws):
+    response = submit(HTTP_API_EVENT)
+
+    assert response["statusCode"] == 200
+    assert response["isBase64Encoded"] is False
+    assert not any(name.startswith("Access-Control-") for name in response["headers"])
+    (item,) = aws.items("table")
+    assert item["contact_id"] == json.loads(response["body"])["contact_id"]
+
+    # Rate limited by the HTTP API's source IP
+    assert aws.items("table", prefix=rate_limit.bucket_key("ip", "198.51.100.9"), raw=True)
+
+
+def test_http_api_rejection_is_v2_too(aws):
+    response = submit({**HTTP_API_EVENT, "body": "{not json"})
+
+    assert response["statusCode"] == 400
+    assert response["isBase64Encoded"] is False
+    assert aws.items("table") == []
@@ -1,15 +1,54 @@
 import aws_cdk as core
 import aws_cdk.assertions as assertions
 
-from ranjdar_group_infrastructure.ranjdar_group_infrastructure_stack import RanjdarGroupInfrastructureStack
+from infrastructure.stacks.construction.contact_stack_construction import ContactConstructionStack
 
-# example tests. To run these tests, uncomment this file along with the example
-# resource in ranjdar_group_infrastructure/ranjdar_group_infrastructure_stack.py
-def test_sqs_queue_created():
+
+def test_construction_stack_synthesizes():
+    app = core.App()
+    stack = ContactConstructionStack(app, "ContactConstructionStack")
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Handler": "construction.contact_handler_construction.contact_handler_construction"
+    })
+    template.resource_count_is("AWS::CloudFront::Distribution", 1)
+    for output in ("WebsiteURL", "ApiURL", "AdminApiKeyId", "ArchiveBucketName", "BucketName", "DistributionId"):
+        template.has_output(output, {})
+
+
+def test_website_assets_are_served_precompressed_with_long_lived_cache():
     app = core.App()
-    stack = RanjdarGroupInfrastructureStack(app, "ranjdar-group-infrastructure")
+    stack = ContactConstructionStack(app, "ContactConstructionStack")
+    template = assertions.Template.from_stack(stack)
+
+    template.resource_count_is("AWS::CloudFront::Function", 1)
+    template.has_resource_properties("AWS::CloudFront::Distribution", {
+        "DistributionConfig": assertions.Match.object_like({
+            "CacheBehaviors": [assertions.Match.object_like({
+                "PathPattern": "/assets/*",
+                "Compress": False,
+                "FunctionAssociations": [assertions.Match.object_like({"EventType": "viewer-request"})]
+            })]
+        })
+    })
+    template.has_resource_properties("Custom::CDKBucketDeployment", {
+        "SystemMetadata": assertions.Match.object_like({
+            "cache-control": "public, max-age=31536000, immutable",
+            "content-encoding": "gzip"
+        }),
+        "Prune": False
+    })
+    template.has_resource_properties("Custom::CDKBucketDeployment", {
+        "SystemMetadata": assertions.Match.object_like({"cache-control": "public, max-age=300, must-revalidate"}),
+        "DistributionPaths": assertions.Match.array_with(["/en/", "/en/index.html"])
+    })
+
+
+def test_incremental_website_deploy_leaves_the_bucket_to_the_tool():
+    app = core.App(context={"website_deploy": "incremental"})
+    stack = ContactConstructionStack(app, "ContactConstructionStack")
     template = assertions.Template.from_stack(stack)
 
-#     template.has_resource_properties("AWS::SQS::Queue", {
-#         "VisibilityTimeout": 300
-#     })
+    template.resource_count_is("Custom::CDKBucketDeployment", 0)
+    template.has_output("DistributionId", {})
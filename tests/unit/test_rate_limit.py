@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from shared import clients, handlers_manager, idempotency, rate_limit
+from tests.stand_ins import FakeDynamoDB, FakeSES, client_error, install
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    dynamodb = FakeDynamoDB()
+    install(dynamodb=dynamodb, ses=FakeSES())
+    monkeypatch.setattr(idempotency, "_recent", idempotency.OrderedDict())
+    monkeypatch.setattr(rate_limit, "_blocked", rate_limit.OrderedDict())
+    monkeypatch.setitem(rate_limit.RATE_LIMITS, "ip", {"limit": 2, "window_seconds": 600})
+    yield dynamodb
+    clients.reset_clients()
+
+
+def submit(message, ip="203.0.113.7", email="max@example.com"):
+    return handlers_manager.process_contact_form_submission(
+        event={
+            "headers": {"origin": "https://bau.ranjdar-group.com"},
+            "requestContext": {"identity": {"sourceIp": ip}},
+            "body": json.dumps({"contact_person": "Max", "email": email, "phone": "+49 151 1234567", "message": message})
+        },
+        business_unit="construction",
+        table_name="table",
+        from_email="system@ranjdar-group.com",
+        to_email="owner@example.com"
+    )
+
+
+def test_over_limit_ip_gets_localized_429_before_any_write(aws):
+    assert submit("one")["statusCode"] == 200
+    assert submit("two")["statusCode"] == 200
+    writes = len(aws.items("table"))
+
+    response = submit("three")
+
+    assert response["statusCode"] == 429
+    assert json.loads(response["body"])["error"] == "Zu viele Anfragen. Bitte versuchen Sie es später erneut."
+    assert int(response["headers"]["Retry-After"]) > 0
+    assert len(aws.items("table")) == writes
+
+
+def test_blocked_client_short_circuits_without_dynamodb(aws):
+    for message in ("one", "two", "three"):
+        submit(message)
+    calls = len(aws.calls)
+
+    assert submit("four")["statusCode"] == 429
+    assert len(aws.calls) == calls
+
+
+def test_email_limit_applies_across_ips(aws, monkeypatch):
+    monkeypatch.setitem(rate_limit.RATE_LIMITS, "email", {"limit": 1, "window_seconds": 3600})
+
+    assert submit("one", ip="198.51.100.1", email="Max@Example.com")["statusCode"] == 200
+    assert submit("two", ip="198.51.100.2", email="max@example.com ")["statusCode"] == 429
+
+
+def test_counters_are_ttld_and_hashed(aws):
+    submit("one")
+
+    counters = aws.items("table", prefix="RATE#")
+    assert {counter["hits"] for counter in counters} == {1}
+    assert all(counter["expires_at"] > 0 for counter in counters)
+    assert not any("203.0.113.7" in counter["pk"] for counter in counters)
+
+
+def test_window_rollover_allows_again(aws):
+    now = 1_000_000 * 600
+    assert rate_limit.take_token("table", "ip", "1.2.3.4", now)
+    assert rate_limit.take_token("table", "ip", "1.2.3.4", now)
+    assert not rate_limit.take_token("table", "ip", "1.2.3.4", now)
+    assert rate_limit.take_token("table", "ip", "1.2.3.4", now + 600)
+
+
+def test_dynamodb_errors_fail_open(aws):
+    aws.errors = [client_error("InternalServerError", "UpdateItem")]
+
+    assert rate_limit.take_token("table", "ip", "1.2.3.4")
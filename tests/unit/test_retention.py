@@ -0,0 +1,73 @@
+import gzip
+import json
+
+import pytest
+
+from shared import clients, retention
+from shared.dynamo import serialize_item
+from tests.stand_ins import FakeS3, install
+
+
+@pytest.fixture
+def s3():
+    fake = FakeS3()
+    install(s3=fake)
+    yield fake
+    clients.reset_clients()
+
+
+def stream_record(sequence_number, pk="BU#CONSTRUCTION", timestamp="2025-06-01T10:00:00+00:00", ttl=True, **item):
+    image = {"pk": pk, "sk": f"CONTACT#{timestamp}#{sequence_number}", "timestamp": timestamp, **item}
+    record = {
+        "eventName": "REMOVE",
+        "dynamodb": {
+            "Keys": serialize_item({"pk": image["pk"], "sk": image["sk"]}),
+            "OldImage": serialize_item(image),
+            "SequenceNumber": sequence_number
+        }
+    }
+    if ttl:
+        record["userIdentity"] = {"type": "Service", "principalId": "dynamodb.amazonaws.com"}
+    return record
+
+
+def read_archive(obj):
+    return [json.loads(line) for line in gzip.decompress(obj["Body"]).decode("utf-8").splitlines()]
+
+
+def test_expires_at_follows_retention_days():
+    assert retention.expires_at(1000.5, 7) == 1000 + 7 * 86400
+    assert retention.expires_at(1000, 0) is None
+
+
+def test_expired_submissions_are_partitioned_by_unit_and_date(s3):
+    event = {"Records": [
+        stream_record("100", business_unit="construction", contact_id="a"),
+        stream_record("200", business_unit="construction", contact_id="b"),
+        stream_record("300", business_unit="construction", contact_id="c", timestamp="2025-06-02T08:00:00+00:00"),
+        stream_record("400", pk="RATE#ip#abc"),  # rate-limit counter
+        stream_record("500", ttl=False, business_unit="construction", contact_id="d")  # manual delete
+    ]}
+
+    assert retention.process_stream_batch(event, "archive") == {"batchItemFailures": []}
+
+    assert set(s3.objects) == {
+        ("archive", "contacts/business_unit=construction/date=2025-06-01/100.ndjson.gz"),
+        ("archive", "contacts/business_unit=construction/date=2025-06-02/300.ndjson.gz")
+    }
+    first_day = read_archive(s3.objects[("archive", "contacts/business_unit=construction/date=2025-06-01/100.ndjson.gz")])
+    assert [item["contact_id"] for item in first_day] == ["a", "b"]
+
+
+def test_failed_upload_reports_earliest_failed_record(s3):
+    s3.failures = 1
+    event = {"Records": [
+        stream_record("900", business_unit="construction", contact_id="a"),
+        stream_record("1000", business_unit="construction", contact_id="b", timestamp="2025-06-02T08:00:00+00:00")
+    ]}
+
+    assert retention.process_stream_batch(event, "archive") == {"batchItemFailures": [{"itemIdentifier": "900"}]}
+
+    # Retry from 900 rewrites the same keys - no duplicate files
+    assert retention.process_stream_batch(event, "archive") == {"batchItemFailures": []}
+    assert len(s3.objects) == 2
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from shared import clients, idempotency, rate_limit, router
+from tests.stand_ins import FakeDynamoDB, FakeSES, install
+
+ENVIRON = {
+    "AWS_REGION": "eu-central-1",
+    "UNIT_CONSTRUCTION": json.dumps({
+        "TABLE_NAME": "construction-table", "FROM_EMAIL": "system@ranjdar-group.com", "TO_EMAIL": "bau@example.com",
+        "SHARD_COUNT": "4", "RETENTION_DAYS": "7"
+    }),
+    "UNIT_RETAIL": json.dumps({
+        "TABLE_NAME": "retail-table", "FROM_EMAIL": "system@ranjdar-group.com", "TO_EMAIL": "shop@example.com"
+    })
+}
+
+FORM = {"contact_person": "Max", "email": "max@example.com", "phone": "+49 151 1234567", "message": "Hallo"}
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    dynamodb, ses = FakeDynamoDB(), FakeSES()
+    install(dynamodb=dynamodb, ses=ses)
+    monkeypatch.setattr(idempotency, "_recent", idempotency.OrderedDict())
+    monkeypatch.setattr(rate_limit, "_blocked", rate_limit.OrderedDict())
+    yield dynamodb, ses
+    clients.reset_clients()
+
+
+def route(**event):
+    return router.route_contact_submission({"body": json.dumps(FORM), **event}, router.load_registry(ENVIRON))
+
+
+def test_registry_reads_only_unit_variables():
+    units = router.load_registry(ENVIRON)
+
+    assert set(units) == {"construction", "retail"}
+    assert units["construction"]["shard_count"] == 4 and units["construction"]["retention_days"] == 7
+    assert units["retail"]["notification_mode"] == "inline" and units["retail"]["shard_count"] == 1
+
+
+def test_dispatches_to_each_units_table_and_recipient(aws):
+    dynamodb, ses = aws
+
+    assert route(stageVariables={"business_unit": "construction"})["statusCode"] == 200
+    assert route(pathParameters={"business_unit": "Retail"})["statusCode"] == 200
+
+    (construction,) = dynamodb.items("construction-table")
+    (retail,) = dynamodb.items("retail-table")
+    assert construction["pk"].startswith("BU#CONSTRUCTION#") and "expires_at" in construction
+    assert retail["pk"] == "BU#RETAIL"
+    assert [email["Destination"]["ToAddresses"] for email in ses.sent] == [["bau@example.com"], ["shop@example.com"]]
+
+
+def test_stage_variable_wins_over_caller_supplied_unit(aws):
+    dynamodb, _ = aws
+
+    route(stageVariables={"business_unit": "construction"}, queryStringParameters={"business_unit": "retail"})
+
+    assert len(dynamodb.items("construction-table")) == 1
+    assert dynamodb.items("retail-table") == []
+
+
+@pytest.mark.parametrize("event", [{}, {"queryStringParameters": {"business_unit": "cosmetics"}}])
+def test_unknown_units_get_404_without_aws_calls(aws, event):
+    dynamodb, _ = aws
+
+    assert route(**event)["statusCode"] == 404
+    assert dynamodb.calls == []
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from infrastructure.shared.config.constants import get_contact_partition_key, get_contact_partition_keys
+from infrastructure.tools.migrate_shards import migrate_shards
+from infrastructure.shared.managers.lambda_bundles import module_file, shared_imports
+from shared import clients, contacts_query, handlers_manager, idempotency, rate_limit, shard_keys
+from tests.conftest import LAMBDAS_DIR
+from tests.stand_ins import FakeDynamoDB, FakeSES, install
+
+TABLE = "RanjdarGroup-ConstructionContactForm"
+
+
+@pytest.fixture
+def dynamodb(monkeypatch):
+    fake = FakeDynamoDB()
+    install(dynamodb=fake, ses=FakeSES())
+    monkeypatch.setattr(idempotency, "_recent", idempotency.OrderedDict())
+    monkeypatch.setattr(rate_limit, "_blocked", rate_limit.OrderedDict())
+    yield fake
+    clients.reset_clients()
+
+
+def test_shards_are_stable_and_spread():
+    ids = [f"00000000-0000-4000-8000-{i:012d}" for i in range(400)]
+    shards = [shard_keys.shard_for(contact_id, 4) for contact_id in ids]
+
+    assert shards == [shard_keys.shard_for(contact_id, 4) for contact_id in ids]
+    assert all(60 < shards.count(shard) < 140 for shard in range(4))
+    assert shard_keys.partition_key("construction", ids[0], 1) == "BU#CONSTRUCTION"
+
+
+def test_infrastructure_tools_use_the_lambda_key_scheme():
+    for contact_id in ("a", "b", "c", "d", "e"):
+        assert get_contact_partition_key("construction", contact_id, 8) == shard_keys.partition_key(
+            "construction", contact_id, 8
+        )
+    assert get_contact_partition_keys("construction", 8) == shard_keys.all_shard_keys("BU#CONSTRUCTION", 8)
+
+    # The tools import it as lambdas.shared.shard_keys - a shared.* import would break them
+    assert shared_imports(module_file("shared.shard_keys", LAMBDAS_DIR), LAMBDAS_DIR) == set()
+
+
+def test_migration_moves_legacy_items_to_their_shard(dynamodb):
+    for i in range(6):
+        handlers_manager.process_contact_form_submission(
+            event={"body": json.dumps({"contact_person": f"P{i}", "email": f"p{i}@example.com",
+                                       "phone": "+49 151 1234567", "message": f"M{i}"})},
+            business_unit="construction", table_name=TABLE, from_email="a@b.c", to_email="d@e.f"
+        )
+
+    assert migrate_shards(dynamodb, "construction", shard_count=4, page_size=4, dry_run=True)["moved"] == 6
+    assert migrate_shards(dynamodb, "construction", shard_count=4, page_size=4)["moved"] == 6
+
+    items = dynamodb.items(TABLE)
+    assert len(items) == 6
+    for item in items:
+        assert item["pk"] == shard_keys.partition_key("construction", item["contact_id"], 4)
+        assert item["bu_status"] == "CONSTRUCTION#new" + shard_keys.shard_suffix(item["contact_id"], 4)
+
+    # Nothing left to move, and reads still see every submission
+    assert migrate_shards(dynamodb, "construction", shard_count=4)["moved"] == 0
+    query = contacts_query.parse_query_parameters({"queryStringParameters": {"status": "new"}}, "construction")
+    assert contacts_query.query_contacts(TABLE, query, shard_count=4)["count"] == 6
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from shared import clients, handlers_manager, idempotency, notifications, rate_limit, tracing
+from tests.stand_ins import FakeDynamoDB, FakeSES, client_error, install
+
+FORM = {"contact_person": "Max", "email": "max@example.com", "phone": "+49 151 1234567", "message": "Hallo"}
+
+
+@pytest.fixture
+def collector(monkeypatch):
+    install(dynamodb=FakeDynamoDB(), ses=FakeSES())
+    monkeypatch.setattr(idempotency, "_recent", idempotency.OrderedDict())
+    monkeypatch.setattr(rate_limit, "_blocked", rate_limit.OrderedDict())
+    memory = tracing.InMemoryCollector()
+    tracing.set_collector(memory)
+    yield memory
+    tracing.reset_collector()
+    clients.reset_clients()
+
+
+def submit(mode="inline"):
+    return handlers_manager.process_contact_form_submission(
+        event={"requestContext": {"requestId": "req-123"}, "body": json.dumps(FORM)},
+        business_unit="construction",
+        table_name="table",
+        from_email="system@ranjdar-group.com",
+        to_email="owner@example.com",
+        notification_mode=mode
+    )
+
+
+@pytest.mark.parametrize("mode", ["inline", "concurrent"])
+def test_one_trace_ties_request_contact_and_ses_ids_together(collector, mode):
+    contact_id = json.loads(submit(mode)["body"])["contact_id"]
+
+    trace, = collector.traces
+    assert trace["request_id"] == "req-123"
+    assert trace["contact_id"] == contact_id
+    assert trace["business_unit"] == "construction"
+    assert trace["ses_message_id"]
+
+    spans = collector.spans()
+    root = spans["contact_form_submission"]
+    assert root["parent_id"] is None
+    # Critical path: the write and the send (also from the worker thread) are children of the submission
+    for name in ("dynamodb.put_item", "ses.send_email"):
+        assert spans[name]["parent_id"] == root["span_id"]
+        assert root["start"] <= spans[name]["start"] <= spans[name]["end"] <= root["end"]
+    assert spans["format_email_content"]["parent_id"] == root["span_id"]
+    assert spans["dynamodb.put_item"]["attributes"] == {"table": "table"}
+
+
+def test_failed_steps_are_marked_and_still_exported(collector):
+    dynamodb = FakeDynamoDB()
+    dynamodb.fail_puts("BU#", client_error("InternalServerError", "PutItem"))
+    install(dynamodb=dynamodb, ses=FakeSES())
+
+    assert submit()["statusCode"] == 500
+
+    spans = collector.spans()
+    assert spans["dynamodb.put_item"]["error"].startswith("ClientError")
+    assert "ses.send_email" not in spans
+
+
+def test_spans_outside_a_request_start_their_own_trace(collector, monkeypatch):
+    notifications.format_email_content("construction", "", "Max", "m@x.de", "+49", "Hi", "", "", "", "now", "EN")
+    assert [span["name"] for span in collector.traces[0]["spans"]] == ["format_email_content"]
+
+    monkeypatch.setattr(tracing, "ENABLED", False)
+    with tracing.span("ignored") as span:
+        assert span is None
+    assert len(collector.traces) == 1
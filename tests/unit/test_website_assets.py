@@ -0,0 +1,140 @@
+import gzip
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from infrastructure.shared.managers import website_assets
+from tests.conftest import ROOT
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <!-- layout -->
+    <style>
+        body { color: red;  margin: 0 auto; }
+        .quote::before { content: "a  b"; }
+    </style>
+</head>
+<body>
+    <pre>  keep
+  this  </pre>
+    <script src="api-config.js"></script>
+    <script type="application/ld+json">{"@type": "Organization"}</script>
+    <script>
+        // submit handler
+        const answer = 42;
+
+        console.log(answer);
+    </script>
+</body>
+</html>
+"""
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def by_key(manifest):
+    return {entry["key"]: entry for entry in manifest["files"]}
+
+
+def test_inline_assets_are_extracted_minified_and_fingerprinted(tmp_path):
+    source = tmp_path / "site"
+    write(str(source / "en" / "index.html"), PAGE)
+    write(str(source / "en" / "api-config.js"), "window.API_CONFIG = {};")
+
+    entries = by_key(website_assets.build_site(str(source), str(tmp_path / "build")))
+    files = tmp_path / "build" / website_assets.FILES_DIR
+
+    css_key = next(key for key in entries if key.endswith(".css"))
+    js_key = next(key for key in entries if key.endswith(".js"))
+    assert (files / css_key).read_text() == 'body{color:red;margin:0 auto}.quote::before{content:"a  b"}'
+    assert (files / js_key).read_text() == "const answer = 42;\nconsole.log(answer);"
+    assert entries[css_key]["cache_control"] == website_assets.CACHE_POLICIES["immutable"]
+
+    html = (files / "en" / "index.html").read_text()
+    assert f'<link rel="stylesheet" href="/{css_key}">' in html
+    assert f'<script src="/{js_key}"></script>' in html
+    assert f"<script>{website_assets.API_CONFIG_PLACEHOLDER}</script>" in html
+    assert '<script type="application/ld+json">{"@type": "Organization"}</script>' in html
+    assert "<pre>  keep\n  this  </pre>" in html
+    assert "<!--" not in html
+    assert entries["en/index.html"]["cache_control"] == website_assets.CACHE_POLICIES["html"]
+    assert entries["en/index.html"]["api_config"] is True
+
+    # Generated at deploy time - never shipped from the source folder
+    assert "en/api-config.js" not in entries
+
+
+def test_asset_names_change_only_with_their_content(tmp_path):
+    source = tmp_path / "site"
+    write(str(source / "index.html"), PAGE)
+    first = set(by_key(website_assets.build_site(str(source), str(tmp_path / "a"))))
+
+    write(str(source / "index.html"), PAGE.replace("<h1>", "<h1 class='x'>").replace("<pre>", "<p>hi</p><pre>"))
+    second = set(by_key(website_assets.build_site(str(source), str(tmp_path / "b"))))
+    assert {key for key in first if key.startswith("assets/")} == {key for key in second if key.startswith("assets/")}
+
+    write(str(source / "index.html"), PAGE.replace("color: red", "color: blue"))
+    third = set(by_key(website_assets.build_site(str(source), str(tmp_path / "c"))))
+    assert {key for key in third if key.endswith(".css")} != {key for key in first if key.endswith(".css")}
+
+
+def test_compressed_variants_decode_to_the_asset(tmp_path):
+    source = tmp_path / "site"
+    write(str(source / "index.html"), PAGE)
+    manifest = website_assets.build_site(str(source), str(tmp_path / "build"))
+    entries = by_key(manifest)
+    files = tmp_path / "build" / website_assets.FILES_DIR
+
+    css_key = next(key for key in entries if key.endswith(".css"))
+    variant = entries[css_key + ".gz"]
+    assert variant["content_encoding"] == "gzip"
+    assert variant["content_type"] == entries[css_key]["content_type"]
+    assert gzip.decompress((files / (css_key + ".gz")).read_bytes()) == (files / css_key).read_bytes()
+
+    # Same bytes every build (no timestamps) - unchanged assets don't change the deployment
+    rebuilt = by_key(website_assets.build_site(str(source), str(tmp_path / "again")))
+    assert rebuilt[css_key + ".gz"]["sha256"] == variant["sha256"]
+    assert manifest["encodings"] == list(website_assets.available_encodings())
+    assert website_assets.load_manifest(str(tmp_path / "build")) == manifest
+
+
+def test_encoding_function_offers_only_built_variants():
+    code = website_assets.encoding_function_code(("gzip",))
+    assert '["gzip", ".gz"]' in code
+    assert '"br"' not in code
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node to run the CloudFront Function")
+@pytest.mark.parametrize("accept_encoding, uri", [
+    ("gzip, deflate, br", "/assets/style.css.br"),
+    ("br;q=0, gzip", "/assets/style.css.gz"),
+    ("br;q=0.0, gzip;q=0.5", "/assets/style.css.gz"),
+    ("gzip;q=0", "/assets/style.css"),
+    ("Brotli, xgzip", "/assets/style.css"),
+    ("br ; q=1", "/assets/style.css.br"),
+    (None, "/assets/style.css")
+])
+def test_encoding_function_honours_refused_codings(accept_encoding, uri):
+    headers = {} if accept_encoding is None else {"accept-encoding": {"value": accept_encoding}}
+    event = {"request": {"uri": "/assets/style.css", "headers": headers}}
+    script = (website_assets.encoding_function_code(("br", "gzip"))
+              + f"\nconsole.log(JSON.stringify(handler({json.dumps(event)})));")
+    result = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout)["uri"] == uri
+
+
+def test_construction_site_builds(tmp_path):
+    manifest = website_assets.build_site(os.path.join(ROOT, "website", "construction"), str(tmp_path))
+    entries = by_key(manifest)
+
+    assert entries["en/index.html"]["api_config"] is True
+    assert any(key.startswith("assets/script.") for key in entries)
+    assert not any(key.endswith("api-config.js") for key in entries)